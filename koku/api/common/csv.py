@@ -4,6 +4,7 @@
 #
 """API views for CSV output."""
 from rest_framework_csv.renderers import CSVRenderer
+from rest_framework_csv.renderers import CSVStreamingRenderer
 
 
 class PaginatedCSVRenderer(CSVRenderer):
@@ -20,3 +21,28 @@ class PaginatedCSVRenderer(CSVRenderer):
         if not isinstance(data, list):
             data = data.get(self.results_field, [])
         return super().render(data, *args, **kwargs)
+
+
+class StreamingReportCSVRenderer(CSVStreamingRenderer):
+    """
+    A Streaming CSV Renderer for report rows.
+
+    To be used with StreamingHttpResponse. List and dict values are flattened
+    to indexed columns the same way CSVRenderer does it, so the rows are read
+    twice: once to build the header and once to write them.
+    """
+
+    def render(self, data, media_type=None, renderer_context=None):
+        """Render the rows returned by the callable data."""
+        header = self.get_header(data())
+        if not header:
+            return iter(())
+        renderer_context = {**(renderer_context or {}), "header": header}
+        return super().render(data(), media_type, renderer_context)
+
+    def get_header(self, data):
+        """Return the sorted columns of the flattened rows."""
+        header_fields = set()
+        for item in self.flatten_data(data):
+            header_fields.update(item.keys())
+        return sorted(header_fields)
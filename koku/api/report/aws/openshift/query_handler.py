@@ -13,6 +13,7 @@ from tenant_schemas.utils import tenant_context
 from api.models import Provider
 from api.report.aws.openshift.provider_map import OCPAWSProviderMap
 from api.report.aws.query_handler import AWSReportQueryHandler
+from api.report.queries import cache_query_result
 from api.report.queries import is_grouped_by_project
 
 LOG = logging.getLogger(__name__)
@@ -21,6 +22,15 @@ LOG = logging.getLogger(__name__)
 class OCPInfrastructureReportQueryHandlerBase(AWSReportQueryHandler):
     """Base class for OCP on Infrastructure."""
 
+    csv_field_map = {}
+
+    def _get_csv_query_data(self, annotations=None):
+        """Return the grouped report query for CSV streaming."""
+        if annotations is None:
+            annotations = self._mapper.report_type_map.get("annotations")
+        return super()._get_csv_query_data(annotations)
+
+    @cache_query_result
     def execute_query(self):  # noqa: C901
         """Execute query and return provided data.
 
@@ -6,12 +6,16 @@
 import copy
 import logging
 import operator
+from collections import defaultdict
 from functools import reduce
 
 from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Case
+from django.db.models import CharField
 from django.db.models import F
 from django.db.models import Q
 from django.db.models import Value
+from django.db.models import When
 from django.db.models.expressions import Func
 from django.db.models.functions import Coalesce
 from tenant_schemas.utils import tenant_context
@@ -19,6 +23,7 @@ from tenant_schemas.utils import tenant_context
 from api.models import Provider
 from api.report.aws.provider_map import AWSProviderMap
 from api.report.aws.provider_map import CSV_FIELD_MAP
+from api.report.queries import cache_query_result
 from api.report.queries import ReportQueryHandler
 from reporting.provider.aws.models import AWSOrganizationalUnit
 
@@ -56,6 +61,7 @@ class AWSReportQueryHandler(ReportQueryHandler):
     """Handles report queries and responses for AWS."""
 
     provider = Provider.PROVIDER_AWS
+    csv_field_map = CSV_FIELD_MAP
     network_services = {"AmazonVPC", "AmazonCloudFront", "AmazonRoute53", "AmazonAPIGateway"}
     database_services = {
         "AmazonRDS",
@@ -175,6 +181,32 @@ class AWSReportQueryHandler(ReportQueryHandler):
 
         return query_data
 
+    @property
+    def is_csv_streamable(self):
+        """Determine if the CSV report can be streamed from the database."""
+        group_by = self.parameters.parameters.get("group_by", {})
+        return (
+            super().is_csv_streamable
+            and "org_unit_id" not in group_by
+            and "or:org_unit_id" not in group_by
+            and not self.parameters.parameters.get("check_tags")
+        )
+
+    def _get_csv_query_data(self, annotations=None):
+        """Return the grouped report query for CSV streaming."""
+        if annotations is None:
+            annotations = copy.deepcopy(self._mapper.report_type_map.get("annotations", {}))
+            if not self.parameters.parameters.get("compute_count"):
+                # Query parameter indicates count should be removed from DB queries
+                annotations.pop("count", None)
+                annotations.pop("count_units", None)
+        query_data = super()._get_csv_query_data(annotations)
+        if "account" in self._get_group_by():
+            query_data = query_data.annotate(
+                account_alias=Coalesce(F(self._mapper.provider_map.get("alias")), "usage_account_id")
+            )
+        return query_data
+
     def _set_csv_output_fields(self, query_data):
         for rec in query_data:
             for target, mapped in CSV_FIELD_MAP.items():
@@ -184,6 +216,7 @@ class AWSReportQueryHandler(ReportQueryHandler):
 
         return query_data
 
+    @cache_query_result
     def execute_query(self):  # noqa: C901
         """Execute each query needed to return the results.
 
@@ -258,42 +291,28 @@ class AWSReportQueryHandler(ReportQueryHandler):
         # (without org_units this is the only query - with org_units this is the query to find the accounts)
         query_data, query_sum = self.execute_individual_query(org_unit_applied)
 
-        # Next we want to loop through each sub_org and execute the query for it
+        # Next we want to query the sub_orgs
         if org_unit_applied:
-            for sub_org_name, value in sub_orgs_dict.items():
-                sub_org_id, sub_org_path = value
-                if self.parameters.get_filter("org_unit_id"):
-                    self.parameters.parameters["filter"].pop("org_unit_id")
-                if self.parameters.get_filter("org_unit_single_level"):
-                    self.parameters.parameters["filter"].pop("org_unit_single_level")
-                if self.parameters.parameters["group_by"].get("account"):
-                    self.parameters.parameters["group_by"].pop("account")
-                # only add the org_unit to the filter if the user has access
-                # through RBAC so that we avoid returning a 403
-                org_access = None
-                if self.access:
-                    org_access = self.access.get("aws.organizational_unit", {}).get("read", [])
-                if org_access is None or (sub_org_id in org_access or "*" in org_access):
-                    # We need need to use the sub org path here because if we use the org unit id
-                    # it will grab partial data from other orgs if the org unit is moved during
-                    # the report period.
-                    self.parameters.set_filter(org_unit_id=[sub_org_path])
-                self.query_filter = self._get_filter()
-                sub_query_data, sub_query_sum = self.execute_individual_query(org_unit_applied)
+            if sub_orgs_dict and (self._delta or not self._has_sub_org_access(sub_orgs_dict)):
+                query_data_results, sub_query_sums = self.execute_individual_sub_org_queries(sub_orgs_dict)
+            elif sub_orgs_dict:
+                query_data_results, sub_query_sums = self.execute_sub_org_query(sub_orgs_dict)
+            else:
+                sub_query_sums = []
+            for sub_query_sum in sub_query_sums:
                 query_sum = self.total_sum(sub_query_sum, query_sum)
 
-                # If we're processing for CSV output, then just append the results to a
-                # CSV output list and ensure that id, alias, and type are filled out correctly
-                if not self.is_csv_output:
-                    query_data_results[sub_org_name] = sub_query_data
-                else:
-                    # Add the initial account query results, if not set
-                    if len(csv_results) == 0:
-                        csv_results = [dict(type="account", **d) for d in query_data]
+            # If we're processing for CSV output, then just append the results to a
+            # CSV output list and ensure that id, alias, and type are filled out correctly
+            if self.is_csv_output and query_data_results:
+                # Add the initial account query results
+                csv_results = [dict(type="account", **d) for d in query_data]
+                for sub_org_name, sub_query_data in query_data_results.items():
                     # And extend by the org unit query results
                     # keys "account_alias" and "account_id" are used here to match the query's
                     # structure so that the CSV MAPPER can rename the proper keys as one of the
                     # final steps in CSV processing
+                    sub_org_id = sub_orgs_dict[sub_org_name][0]
                     csv_results.extend(
                         dict(type="organizational_unit", account_alias=sub_org_name, account=sub_org_id, **d)
                         for d in sub_query_data
@@ -563,6 +582,126 @@ select coalesce(raa.account_alias, t.usage_account_id)::text as "account",
                     sum2[expected_key] = self.total_sum(sum1.get(expected_key), sum2.get(expected_key))
         return sum2
 
+    def _has_sub_org_access(self, sub_orgs_dict):
+        """Determine if the user has RBAC access to every sub org."""
+        org_access = None
+        if self.access:
+            org_access = self.access.get("aws.organizational_unit", {}).get("read", [])
+        if org_access is None or "*" in org_access:
+            return True
+        return all(sub_org_id in org_access for sub_org_id, _ in sub_orgs_dict.values())
+
+    def _remove_org_unit_parameters(self):
+        """Remove the org unit filters and the account group by used to query the parent org units."""
+        if self.parameters.get_filter("org_unit_id"):
+            self.parameters.parameters["filter"].pop("org_unit_id")
+        if self.parameters.get_filter("org_unit_single_level"):
+            self.parameters.parameters["filter"].pop("org_unit_single_level")
+        if self.parameters.parameters["group_by"].get("account"):
+            self.parameters.parameters["group_by"].pop("account")
+
+    def execute_individual_sub_org_queries(self, sub_orgs_dict):
+        """Execute a query for each sub org.
+
+        Args:
+            sub_orgs_dict: (dict) dictionary mapping the org_unit_names to ids and paths
+
+        Returns:
+            (dict, list) query data keyed by sub org name, and the sub org sums
+        """
+        query_data_results = {}
+        sub_query_sums = []
+        for sub_org_name, value in sub_orgs_dict.items():
+            sub_org_id, sub_org_path = value
+            self._remove_org_unit_parameters()
+            # only add the org_unit to the filter if the user has access
+            # through RBAC so that we avoid returning a 403
+            org_access = None
+            if self.access:
+                org_access = self.access.get("aws.organizational_unit", {}).get("read", [])
+            if org_access is None or (sub_org_id in org_access or "*" in org_access):
+                # We need need to use the sub org path here because if we use the org unit id
+                # it will grab partial data from other orgs if the org unit is moved during
+                # the report period.
+                self.parameters.set_filter(org_unit_id=[sub_org_path])
+            self.query_filter = self._get_filter()
+            sub_query_data, sub_query_sum = self.execute_individual_query(org_unit_applied=True)
+            query_data_results[sub_org_name] = sub_query_data
+            sub_query_sums.append(sub_query_sum)
+        return query_data_results, sub_query_sums
+
+    def execute_sub_org_query(self, sub_orgs_dict):
+        """Execute a single query for all of the sub orgs.
+
+        The organizational units under each sub org path are resolved up front
+        from AWSOrganizationalUnit, and the summary rows are grouped by the sub
+        org their organizational unit maps to, so the summary table is read
+        once rather than once per sub org.
+
+        Args:
+            sub_orgs_dict: (dict) dictionary mapping the org_unit_names to ids and paths
+
+        Returns:
+            (dict, list) query data keyed by sub org name, and the sub org sums
+        """
+        query_data_results = {sub_org_name: [] for sub_org_name in sub_orgs_dict}
+        self._remove_org_unit_parameters()
+        # We need need to use the sub org paths here because if we use the org unit ids
+        # it will grab partial data from other orgs if the org unit is moved during
+        # the report period.
+        self.parameters.set_filter(org_unit_id=[sub_org_path for _, sub_org_path in sub_orgs_dict.values()])
+        self.query_filter = self._get_filter()
+
+        with tenant_context(self.tenant):
+            sub_org_units = defaultdict(list)
+            for org_unit_pk, org_unit_path in AWSOrganizationalUnit.objects.values_list("id", "org_unit_path"):
+                for sub_org_name, (_, sub_org_path) in sub_orgs_dict.items():
+                    if sub_org_path.lower() in org_unit_path.lower():
+                        sub_org_units[sub_org_name].append(org_unit_pk)
+                        break
+            if not sub_org_units:
+                return query_data_results, []
+            sub_org_case = Case(
+                *[
+                    When(organizational_unit_id__in=org_unit_pks, then=Value(sub_org_name))
+                    for sub_org_name, org_unit_pks in sub_org_units.items()
+                ],
+                output_field=CharField(),
+            )
+
+            query = self.query_table.objects.filter(self.query_filter)
+            query_group_by = ["date"] + self._get_group_by()
+            query_order_by = ["-date"]
+            query_order_by.extend([self.order])  # add implicit ordering
+
+            annotations = copy.deepcopy(self._mapper.report_type_map.get("annotations", {}))
+            if not self.parameters.parameters.get("compute_count"):
+                # Query parameter indicates count should be removed from DB queries
+                annotations.pop("count", None)
+                annotations.pop("count_units", None)
+
+            query_data = (
+                query.annotate(**self.annotations, sub_org_name=sub_org_case)
+                .values(*query_group_by, "sub_org_name")
+                .annotate(**annotations)
+            )
+            sub_org_rows = defaultdict(list)
+            for row in query_data:
+                sub_org_rows[row.pop("sub_org_name")].append(row)
+
+            query_sum = self._build_sum(query, annotations)
+
+        for sub_org_name in query_data_results:
+            query_results = self.order_by(sub_org_rows.get(sub_org_name, []), query_order_by)
+            if not self.is_csv_output:
+                groups = copy.deepcopy(query_group_by)
+                groups.remove("date")
+                data = self._apply_group_by(query_results, groups)
+                query_results = self._transform_data(query_group_by, 0, data)
+            query_data_results[sub_org_name] = query_results
+
+        return query_data_results, [query_sum]
+
     def execute_individual_query(self, org_unit_applied=False):  # noqa: C901
         """Execute query and return provided data.
 
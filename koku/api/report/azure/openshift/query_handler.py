@@ -12,6 +12,7 @@ from tenant_schemas.utils import tenant_context
 from api.models import Provider
 from api.report.azure.openshift.provider_map import OCPAzureProviderMap
 from api.report.azure.query_handler import AzureReportQueryHandler
+from api.report.queries import cache_query_result
 from api.report.queries import is_grouped_by_project
 
 LOG = logging.getLogger(__name__)
@@ -64,6 +65,7 @@ class OCPAzureReportQueryHandler(AzureReportQueryHandler):
 
         return annotations
 
+    @cache_query_result
     def execute_query(self):  # noqa: C901
         """Execute query and return provided data.
 
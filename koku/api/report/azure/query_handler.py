@@ -13,6 +13,7 @@ from tenant_schemas.utils import tenant_context
 
 from api.models import Provider
 from api.report.azure.provider_map import AzureProviderMap
+from api.report.queries import cache_query_result
 from api.report.queries import ReportQueryHandler
 
 LOG = logging.getLogger(__name__)
@@ -126,6 +127,7 @@ class AzureReportQueryHandler(ReportQueryHandler):
             self._pack_data_object(query_sum, **self._mapper.PACK_DEFINITIONS)
         return query_sum
 
+    @cache_query_result
     def execute_query(self):
         """Execute query and return provided data.
 
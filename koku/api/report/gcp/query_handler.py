@@ -14,6 +14,7 @@ from tenant_schemas.utils import tenant_context
 
 from api.models import Provider
 from api.report.gcp.provider_map import GCPProviderMap
+from api.report.queries import cache_query_result
 from api.report.queries import ReportQueryHandler
 
 LOG = logging.getLogger(__name__)
@@ -135,6 +136,17 @@ class GCPReportQueryHandler(ReportQueryHandler):
             self._pack_data_object(query_sum, **self._mapper.PACK_DEFINITIONS)
         return query_sum
 
+    def _get_csv_query_data(self, annotations=None):
+        """Return the grouped report query for CSV streaming."""
+        if annotations is None:
+            annotations = copy.deepcopy(self._mapper.report_type_map.get("annotations"))
+            group_by = self._get_group_by()
+            for alias_key, alias_value in self.group_by_alias.items():
+                if alias_key in group_by:
+                    annotations[f"{alias_key}_alias"] = F(alias_value)
+        return super()._get_csv_query_data(annotations)
+
+    @cache_query_result
     def execute_query(self):
         """Execute query and return provided data.
 
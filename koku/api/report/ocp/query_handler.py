@@ -16,6 +16,7 @@ from tenant_schemas.utils import tenant_context
 
 from api.models import Provider
 from api.report.ocp.provider_map import OCPProviderMap
+from api.report.queries import cache_query_result
 from api.report.queries import is_grouped_by_project
 from api.report.queries import ReportQueryHandler
 
@@ -110,6 +111,7 @@ class OCPReportQueryHandler(ReportQueryHandler):
 
         return output
 
+    @cache_query_result
     def execute_query(self):
         """Execute query and return provided data.
 
@@ -4,32 +4,62 @@
 #
 """Query Handling for Reports."""
 import copy
+import hashlib
+import json
 import logging
+import pickle
 import random
 import re
 import string
+import time
 from collections import defaultdict
 from collections import OrderedDict
 from decimal import Decimal
 from decimal import DivisionByZero
 from decimal import InvalidOperation
+from functools import wraps
 from itertools import groupby
 from urllib.parse import quote_plus
 
+from django.conf import settings
+from django.core.cache import caches
 from django.db.models import F
 from django.db.models import Q
+from django.db.models import QuerySet
 from django.db.models import Window
 from django.db.models.expressions import OrderBy
 from django.db.models.expressions import RawSQL
+from django.db.models.functions import Lower
 from django.db.models.functions import Rank
+from tenant_schemas.utils import tenant_context
 
 from api.models import Provider
 from api.query_filter import QueryFilter
 from api.query_filter import QueryFilterCollection
 from api.query_handler import QueryHandler
+from koku.cache import get_query_cache_generation
+from koku.cache import PROVIDER_CACHE_PREFIX_MAP
+from koku.cache import QUERY_CACHE_HIT_COUNTER
+from koku.cache import QUERY_CACHE_LATENCY
+from koku.cache import QUERY_CACHE_MISS_COUNTER
+from koku.cache import QUERY_RESULT_CACHE_PREFIX
 
 LOG = logging.getLogger(__name__)
 
+NUMERIC_ORDERING = [
+    "date",
+    "rank",
+    "delta",
+    "delta_percent",
+    "total",
+    "usage",
+    "request",
+    "limit",
+    "sup_total",
+    "infra_total",
+    "cost_total",
+]
+
 
 def strip_tag_prefix(tag):
     """Remove the query tag prefix from a tag key."""
@@ -58,9 +88,50 @@ def check_view_filter_and_group_by_criteria(filter_set, group_by_set):
     return True
 
 
+def cache_query_result(execute_query):
+    """Cache the output of a ReportQueryHandler execute_query method.
+
+    Results are stored under ReportQueryHandler.query_cache_key, which
+    includes the tenant's query cache generation for the handler's provider.
+    Invalidation is a generation bump, see koku.cache.bump_query_cache_generation.
+    """
+
+    @wraps(execute_query)
+    def wrapper(self):
+        if not settings.QUERY_RESULT_CACHE_ENABLED:
+            return execute_query(self)
+
+        start = time.perf_counter()
+        cache = caches["default"]
+        cache_key = self.query_cache_key
+        cached = cache.get(cache_key)
+        if cached is not None:
+            self.max_rank = cached.get("max_rank")
+            QUERY_CACHE_HIT_COUNTER.labels(provider=self.provider).inc()
+            QUERY_CACHE_LATENCY.labels(provider=self.provider, result="hit").observe(time.perf_counter() - start)
+            return cached.get("output")
+
+        output = execute_query(self)
+        try:
+            cache.set(
+                cache_key,
+                {"output": output, "max_rank": self.max_rank},
+                timeout=settings.QUERY_RESULT_CACHE_TIMEOUT,
+            )
+        except (pickle.PicklingError, TypeError, AttributeError) as err:
+            LOG.warning(f"Unable to cache the query result for {type(self).__name__}: {err}")
+        QUERY_CACHE_MISS_COUNTER.labels(provider=self.provider).inc()
+        QUERY_CACHE_LATENCY.labels(provider=self.provider, result="miss").observe(time.perf_counter() - start)
+        return output
+
+    return wrapper
+
+
 class ReportQueryHandler(QueryHandler):
     """Handles report queries and responses."""
 
+    csv_field_map = {}
+
     def __init__(self, parameters):
         """Establish report query handler.
 
@@ -75,10 +146,33 @@ class ReportQueryHandler(QueryHandler):
         self._report_type = parameters.report_type
         self._delta = parameters.delta
         self._offset = parameters.get_filter("offset", default=0)
+        self._rank_offset = 0
+        self._ranked_count = None
         self.query_delta = {"value": None, "percent": None}
 
         self.query_filter = self._get_filter()
 
+    @property
+    def query_cache_key(self):
+        """Return the query result cache key for these query parameters.
+
+        The key hashes the normalized parameters, access list, tag keys,
+        tenant, and the current date, as relative time scopes move with it.
+        """
+        schema_name = self.tenant.schema_name
+        cache_key_prefix = PROVIDER_CACHE_PREFIX_MAP.get(self.provider, self.provider)
+        key_data = {
+            "handler": f"{type(self).__module__}.{type(self).__qualname__}",
+            "report_type": self._report_type,
+            "parameters": self.parameters.parameters,
+            "access": self.access,
+            "tag_keys": sorted(self._tag_keys),
+            "today": self.dh.today.date(),
+            "generation": get_query_cache_generation(schema_name, cache_key_prefix),
+        }
+        digest = hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        return f"{QUERY_RESULT_CACHE_PREFIX}:{schema_name}:{cache_key_prefix}:{digest}"
+
     @property
     def query_table_access_keys(self):
         """Return the access keys specific for selecting the query table."""
@@ -612,19 +706,6 @@ class ReportQueryHandler(QueryHandler):
             (list): The sorted/ordered list
 
         """
-        numeric_ordering = [
-            "date",
-            "rank",
-            "delta",
-            "delta_percent",
-            "total",
-            "usage",
-            "request",
-            "limit",
-            "sup_total",
-            "infra_total",
-            "cost_total",
-        ]
         tag_str = "tag:"
         db_tag_prefix = self._mapper.tag_column + "__"
         sorted_data = data
@@ -634,7 +715,7 @@ class ReportQueryHandler(QueryHandler):
             if field.startswith("-"):
                 reverse = True
                 field = field[1:]
-            if field in numeric_ordering:
+            if field in NUMERIC_ORDERING:
                 sorted_data = sorted(
                     sorted_data, key=lambda entry: (entry[field] is None, entry[field]), reverse=reverse
                 )
@@ -653,6 +734,74 @@ class ReportQueryHandler(QueryHandler):
                 )
         return sorted_data
 
+    @property
+    def is_csv_streamable(self):
+        """Determine if the CSV report can be streamed from the database.
+
+        Ranked, delta, unit converted, and capacity reports are built in
+        Python and are rendered from execute_query instead.
+        """
+        return bool(
+            settings.REPORT_CSV_STREAMING_ENABLED
+            and self.parameters.accept_type
+            and "text/csv" in self.parameters.accept_type
+            and not self._limit
+            and not self._delta
+            and "units" not in self.parameters.parameters
+            and "tag:" not in self.order_field
+            and not self._mapper.report_type_map.get("capacity_aggregate")
+        )
+
+    def _get_csv_query_data(self, annotations=None):
+        """Return the grouped report query for CSV streaming."""
+        query = self.query_table.objects.filter(self.query_filter)
+        query_group_by = ["date"] + self._get_group_by()
+        if annotations is None:
+            annotations = self._mapper.report_type_map.get("annotations")
+        return query.annotate(**self.annotations).values(*query_group_by).annotate(**annotations)
+
+    def _get_csv_order_by(self, columns):
+        """Return the database ordering matching order_by() for the CSV columns."""
+        order_by = [F("date").desc()]
+        field = self.order_field
+        if field in columns and field != "date":
+            expression = F(field) if field in NUMERIC_ORDERING else Lower(F(field))
+            if self.order_direction == "desc":
+                order_by.append(expression.desc(nulls_first=True))
+            else:
+                order_by.append(expression.asc(nulls_last=True))
+        return order_by
+
+    def stream_csv_rows(self, offset=0, limit=None):
+        """Return a generator function of CSV rows.
+
+        The rows are ordered and sliced by the database and read through a
+        server side cursor, so memory does not grow with the size of the report.
+        Each call of the returned function runs the query again.
+
+        Args:
+            offset (int): The number of rows to skip
+            limit (int): The maximum number of rows to return
+        Returns:
+            (Callable): A function returning a generator of the row dictionaries
+
+        """
+        query_data = self._get_csv_query_data()
+        sql_query = query_data.query
+        columns = [*sql_query.extra_select, *sql_query.values_select, *sql_query.annotation_select]
+        query_data = query_data.order_by(*self._get_csv_order_by(columns))
+        if limit is not None:
+            query_data = query_data[offset : offset + limit]  # noqa: E203
+        elif offset:
+            query_data = query_data[offset:]
+
+        def rows():
+            with tenant_context(self.tenant):
+                for row in query_data.iterator(chunk_size=settings.REPORT_CSV_STREAMING_CHUNK_SIZE):
+                    yield {self.csv_field_map.get(key, key): value for key, value in row.items()}
+
+        return rows
+
     def get_tag_order_by(self, tag):
         """Generate an OrderBy clause forcing JSON column->key to be used.
 
@@ -741,6 +890,9 @@ class ReportQueryHandler(QueryHandler):
 
         if tag_column in gb[0]:
             rank_orders.append(self.get_tag_order_by(gb[0]))
+        elif group_by_value:
+            # break ties on the group so every group gets its own rank and page
+            rank_orders.append(F(group_by_value[0]).asc())
 
         # this is a sub-query, but not really.
         # in the future, this could be accomplished using CTEs.
@@ -755,6 +907,9 @@ class ReportQueryHandler(QueryHandler):
         else:
             ranks = query.annotate(**self.annotations).values(*group_by_value).annotate(rank=rank_by_total)
 
+        if self._use_sql_rank_pagination(data, group_by_value):
+            ranks, data = self._paginate_ranks(query, ranks, data)
+
         rankings = []
         for rank in ranks:
             rank_value = rank.get(group_by_value[0])
@@ -766,6 +921,41 @@ class ReportQueryHandler(QueryHandler):
             query_return = self._apply_group_null_label(query_return, gb)
         return self._ranked_list(data, rankings)
 
+    def _use_sql_rank_pagination(self, data, group_by_value):
+        """Determine if filter[limit] and filter[offset] can be applied in the database."""
+        return (
+            settings.REPORT_SQL_PAGINATION_ENABLED
+            and "offset" in self.parameters.get("filter", {})
+            and len(group_by_value) == 1
+            and isinstance(data, QuerySet)
+        )
+
+    def _paginate_ranks(self, query, ranks, data):
+        """Limit the ranked groups to the requested page in SQL.
+
+        Only the page of ranks is fetched, using LIMIT/OFFSET on the ranked
+        query, and the grouped data is filtered to the groups on that page.
+        The number of groups for meta.count comes from a separate COUNT.
+
+        Args:
+            query (QuerySet): The filtered report query
+            ranks (QuerySet): The ranked group by query
+            data (QuerySet): The date grouped report data
+        Returns:
+            (List, QuerySet): The ranks on the page and the data for them
+
+        """
+        rank_field = self._get_group_by()[0]
+        self._ranked_count = query.annotate(**self.annotations).values(rank_field).distinct().count()
+        self._rank_offset = self._offset
+
+        page = list(ranks.order_by("rank", rank_field)[self._offset : self._offset + self._limit])  # noqa: E203
+        page_values = [rank.get(rank_field) for rank in page]
+        page_filter = Q(**{f"{rank_field}__in": [value for value in page_values if value is not None]})
+        if None in page_values:
+            page_filter |= Q(**{f"{rank_field}__isnull": True})
+        return page, data.filter(page_filter)
+
     def _ranked_list(self, data_list, ranks=None):
         """Get list of ranked items less than top.
 
@@ -776,7 +966,9 @@ class ReportQueryHandler(QueryHandler):
             List(Dict): List of data points meeting the rank criteria
 
         """
-        if ranks:
+        if self._ranked_count is not None:
+            self.max_rank = self._ranked_count
+        elif ranks:
             self.max_rank = len(ranks)
         elif data_list:
             self.max_rank = max(entry.get("rank", 0) for entry in data_list)
@@ -845,7 +1037,7 @@ class ReportQueryHandler(QueryHandler):
             if ranks:
                 ranked_value = data.get(self._get_group_by()[0])
                 ranked_value = self.check_missing_rank_value(ranked_value)
-                rank = ranks.index(ranked_value) + 1
+                rank = ranks.index(ranked_value) + 1 + self._rank_offset
                 data["rank"] = rank
             else:
                 rank = data.get("rank", 1)
@@ -1606,6 +1606,29 @@ class AWSReportQueryTest(IamTestCase):
             with self.subTest(org=org):
                 check_accounts_subous_totals(org)
 
+    @patch("api.query_params.QueryParameters.accept_type", new_callable=PropertyMock)
+    def test_execute_sub_org_query_matches_individual_queries(self, mock_accept):
+        """Test that the single sub org query returns the same report as a query per sub org."""
+        urls = [
+            "?group_by[org_unit_id]=R_001",
+            "?group_by[or:org_unit_id]=R_001&group_by[or:org_unit_id]=OU_001",
+            "?group_by[org_unit_id]=R_001&group_by[service]=*",
+        ]
+        for url in urls:
+            for accept_type in (None, "text/csv"):
+                with self.subTest(url=url, accept_type=accept_type):
+                    mock_accept.return_value = accept_type
+                    query_params = self.mocked_query_params(url, AWSCostView, "costs")
+                    with patch.object(AWSReportQueryHandler, "execute_individual_sub_org_queries") as mock_individual:
+                        data = AWSReportQueryHandler(query_params).execute_query()
+                        mock_individual.assert_not_called()
+
+                    query_params = self.mocked_query_params(url, AWSCostView, "costs")
+                    with patch.object(AWSReportQueryHandler, "_has_sub_org_access", return_value=False):
+                        expected = AWSReportQueryHandler(query_params).execute_query()
+
+                    self.assertEqual(data, expected)
+
     def test_execute_query_with_multiple_or_org_unit_group_by(self):
         """Test that when data has multiple grouped by org_unit_id, the totals add up correctly."""
         ou_to_compare = ["OU_001", "OU_002"]
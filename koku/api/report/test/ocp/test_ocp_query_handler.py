@@ -7,9 +7,14 @@ import logging
 from collections import defaultdict
 from decimal import Decimal
 from unittest.mock import patch
+from unittest.mock import PropertyMock
 
+from django.db.models import DecimalField
 from django.db.models import Max
+from django.db.models import Value
 from django.db.models.expressions import OrderBy
+from django.test.utils import override_settings
+from prometheus_client import REGISTRY
 from tenant_schemas.utils import tenant_context
 
 from api.iam.test.iam_test_case import IamTestCase
@@ -22,6 +27,7 @@ from api.report.ocp.view import OCPVolumeView
 from api.tags.ocp.queries import OCPTagQueryHandler
 from api.tags.ocp.view import OCPTagView
 from api.utils import DateHelper
+from koku.cache import invalidate_view_cache_for_tenant_and_source_type
 from reporting.models import OCPUsageLineItemDailySummary
 from reporting.provider.ocp.models import OCPUsageReportPeriod
 
@@ -74,6 +80,73 @@ class OCPReportQueryHandlerTest(IamTestCase):
         with tenant_context(self.tenant):
             return OCPUsageLineItemDailySummary.objects.filter(**filters).aggregate(**aggregates)
 
+    @override_settings(QUERY_RESULT_CACHE_ENABLED=True)
+    def test_execute_query_result_cache(self):
+        """Test that repeated queries are served from the query result cache until the generation changes."""
+        url = "?group_by[project]=*"
+        sample_labels = {"provider": "OCP"}
+        hits_before = REGISTRY.get_sample_value("query_result_cache_hits_total", sample_labels) or 0
+        misses_before = REGISTRY.get_sample_value("query_result_cache_misses_total", sample_labels) or 0
+
+        handler = OCPReportQueryHandler(self.mocked_query_params(url, OCPCpuView))
+        expected = handler.execute_query()
+        cached_handler = OCPReportQueryHandler(self.mocked_query_params(url, OCPCpuView))
+        with patch("api.report.ocp.query_handler.OCPReportQueryHandler._format_query_response") as mock_format:
+            self.assertEqual(cached_handler.execute_query(), expected)
+            mock_format.assert_not_called()
+        self.assertEqual(cached_handler.max_rank, handler.max_rank)
+        self.assertEqual(REGISTRY.get_sample_value("query_result_cache_hits_total", sample_labels), hits_before + 1)
+
+        invalidate_view_cache_for_tenant_and_source_type(self.schema_name, "OCP")
+        OCPReportQueryHandler(self.mocked_query_params(url, OCPCpuView)).execute_query()
+        self.assertEqual(
+            REGISTRY.get_sample_value("query_result_cache_misses_total", sample_labels), misses_before + 2
+        )
+
+    def test_execute_query_sql_rank_pagination(self):
+        """Test that paginating ranks in SQL returns the same page and count as paginating in Python."""
+        url = "?filter[resolution]=daily&filter[limit]=2&filter[offset]=1&group_by[project]=*&order_by[cost]=desc"
+        handler = OCPReportQueryHandler(self.mocked_query_params(url, OCPCostView))
+        expected = handler.execute_query()
+
+        with override_settings(REPORT_SQL_PAGINATION_ENABLED=True):
+            sql_handler = OCPReportQueryHandler(self.mocked_query_params(url, OCPCostView))
+            with patch.object(sql_handler, "_zerofill_ranks", wraps=sql_handler._zerofill_ranks) as mock_zerofill:
+                result = sql_handler.execute_query()
+                for call in mock_zerofill.call_args_list:
+                    self.assertLessEqual(len(call.args[1]), 2)
+
+        self.assertEqual(result, expected)
+        self.assertEqual(sql_handler.max_rank, handler.max_rank)
+
+    @override_settings(REPORT_SQL_PAGINATION_ENABLED=True)
+    def test_execute_query_sql_rank_pagination_ties(self):
+        """Test that groups tied on the order_by field are ranked and paged by group."""
+        base_url = "?filter[time_scope_units]=month&filter[time_scope_value]=-1&filter[resolution]=monthly"
+        base_url += "&group_by[project]=*&order_by[cost]=desc"
+        handler = OCPReportQueryHandler(self.mocked_query_params(base_url, OCPCostView))
+        with tenant_context(self.tenant):
+            projects = (
+                OCPUsageLineItemDailySummary.objects.filter(usage_start__gte=self.dh.this_month_start)
+                .exclude(namespace__isnull=True)
+                .values_list("namespace", flat=True)
+                .distinct()
+            )
+            expected = sorted(projects)
+
+        tied_cost = Max(Value(0, output_field=DecimalField()))
+        tied_annotations = {**handler.report_annotations, handler.order_field: tied_cost}
+        paged = []
+        with patch.object(OCPReportQueryHandler, "report_annotations", new_callable=PropertyMock) as mock_annotations:
+            mock_annotations.return_value = tied_annotations
+            for offset in range(len(expected)):
+                url = f"{base_url}&filter[limit]=1&filter[offset]={offset}"
+                query_output = OCPReportQueryHandler(self.mocked_query_params(url, OCPCostView)).execute_query()
+                for data in query_output.get("data"):
+                    paged.extend(project.get("project") for project in data.get("projects"))
+
+        self.assertEqual(paged, expected)
+
     def test_execute_sum_query(self):
         """Test that the sum query runs properly."""
         url = "?"
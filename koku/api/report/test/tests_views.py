@@ -3,7 +3,12 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Test the Report views."""
+import csv
+import io
+
+from django.http import StreamingHttpResponse
 from django.test import RequestFactory
+from django.test.utils import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -95,6 +100,29 @@ class ReportViewTest(IamTestCase):
                 self.assertEqual(response.accepted_media_type, "text/csv")
                 self.assertIsInstance(response.accepted_renderer, CSVRenderer)
 
+    @override_settings(REPORT_CSV_STREAMING_ENABLED=True)
+    def test_endpoint_csv_streaming(self):
+        """Test that CSV reports are streamed with the same rows as the rendered CSV."""
+        self.client = APIClient(HTTP_ACCEPT="text/csv")
+        endpoints = [endpoint for endpoint in self.ENDPOINTS if endpoint.endswith("-costs")]
+        for endpoint in endpoints:
+            with self.subTest(endpoint=endpoint):
+                url = reverse(endpoint) + "?filter[resolution]=daily&limit=1000"
+                response = self.client.get(url, content_type="text/csv", **self.headers)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertIsInstance(response, StreamingHttpResponse)
+                streamed = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+                with override_settings(REPORT_CSV_STREAMING_ENABLED=False):
+                    response = self.client.get(url, content_type="text/csv", **self.headers)
+                    response.render()
+                rendered = list(csv.reader(io.StringIO(response.content.decode())))
+
+                self.assertGreater(len(streamed), 1)
+                self.assertEqual(streamed[0], rendered[0])
+                # rows that tie on the ordering may come back in a different order
+                self.assertEqual(sorted(streamed[1:]), sorted(rendered[1:]))
+
     def test_find_unit_list(self):
         """Test that the correct unit is returned."""
         expected_unit = "Hrs"
@@ -5,6 +5,7 @@
 """View for Reports."""
 import logging
 
+from django.http import StreamingHttpResponse
 from django.utils.decorators import method_decorator
 from django.utils.translation import ugettext as _
 from django.views.decorators.vary import vary_on_headers
@@ -16,6 +17,7 @@ from rest_framework.serializers import ValidationError
 from rest_framework.views import APIView
 
 from api.common import CACHE_RH_IDENTITY_HEADER
+from api.common.csv import StreamingReportCSVRenderer
 from api.common.pagination import OrgUnitPagination
 from api.common.pagination import ReportPagination
 from api.common.pagination import ReportRankedPagination
@@ -43,6 +45,20 @@ def get_paginator(filter_query_params, count, group_by_params=False):
     return paginator
 
 
+def stream_csv_response(handler, request):
+    """Stream the CSV report rows for a query handler.
+
+    The limit and offset query params are applied the same way ReportPagination
+    applies them to CSV report data.
+    """
+    paginator = ReportPagination()
+    limit = paginator.get_limit(request)
+    offset = paginator.get_offset(request)
+    rows = handler.stream_csv_rows(offset=offset, limit=limit)
+    renderer = StreamingReportCSVRenderer()
+    return StreamingHttpResponse(renderer.render(rows), content_type=renderer.media_type)
+
+
 def _find_unit():
     """Find the original unit for a report dataset."""
     unit = None
@@ -153,6 +169,8 @@ class ReportView(APIView):
         except ValidationError as exc:
             return Response(data=exc.detail, status=status.HTTP_400_BAD_REQUEST)
         handler = self.query_handler(params)
+        if handler.is_csv_streamable:
+            return stream_csv_response(handler, request)
         output = handler.execute_query()
         max_rank = handler.max_rank
 
@@ -6,12 +6,17 @@
 import copy
 import logging
 
+from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg
 from django.db.models import Q
 from tenant_schemas.utils import tenant_context
 
+from api.models import Provider
 from api.query_filter import QueryFilter
 from api.query_filter import QueryFilterCollection
 from api.query_handler import QueryHandler
+from reporting.models import TagCatalogKey
+from reporting.models import TagCatalogValue
 
 LOG = logging.getLogger(__name__)
 
@@ -55,6 +60,20 @@ class TagQueryHandler(QueryHandler):
         "key": {"field": "key", "operation": "icontains", "composition_key": "key_filter"},
         "value": {"field": "value", "operation": "icontains", "composition_key": "value_filter"},
     }
+    # Providers whose tag summaries are added to the tag catalog
+    CATALOG_PROVIDERS = (Provider.PROVIDER_AWS, Provider.PROVIDER_AZURE, Provider.PROVIDER_GCP, Provider.PROVIDER_OCP)
+    # Filters the tag catalog can answer, queries with other filters use the data_sources
+    CATALOG_FILTERS = {
+        "key",
+        "value",
+        "type",
+        "enabled",
+        "time_scope_value",
+        "time_scope_units",
+        "resolution",
+        "limit",
+        "offset",
+    }
 
     def __init__(self, parameters):
         """Establish tag query handler.
@@ -346,6 +365,85 @@ class TagQueryHandler(QueryHandler):
         self.deduplicate_and_sort(final_data)
         return final_data
 
+    @property
+    def is_catalog_queryable(self):
+        """Return whether the tag catalog can answer the query."""
+        if not settings.TAG_CATALOG_ENABLED or self.provider not in self.CATALOG_PROVIDERS:
+            return False
+        if self.parameters.get("access") or not set(self.parameters.get("filter", {})) <= self.CATALOG_FILTERS:
+            return False
+        # The catalog records the first and last month a tag was seen in, which only
+        # matches the month based time filters for time frames ending this month
+        return self.end_datetime.date() >= self.dh.this_month_start.date()
+
+    def _get_catalog_filter(self):
+        """Create the tag catalog filter for the key, value, and enabled filters."""
+        filters = QueryFilterCollection()
+        filters.add(QueryFilter(field="provider_type", operation="exact", parameter=self.provider))
+        if hasattr(self, "key"):
+            filters.add(QueryFilter(field="key", operation="exact", parameter=self.key))
+        if not self.parameters.get_filter("value"):
+            start = self.dh.month_start(self.start_datetime).date()
+            end = self.dh.month_end(self.end_datetime).date()
+            filters.add(QueryFilter(field="last_seen", operation="gte", parameter=start))
+            filters.add(QueryFilter(field="first_seen", operation="lte", parameter=end))
+
+        for filter_key in ("key", "value", "enabled"):
+            if self.parameters.get_filter("value") and filter_key == "enabled":
+                continue
+            filter_value = self.parameters.get_filter(filter_key)
+            if filter_value is not None and not TagQueryHandler.has_wildcard(filter_value):
+                filter_obj = self.filter_map.get(filter_key)
+                if isinstance(filter_value, bool):
+                    filters.add(QueryFilter(**filter_obj))
+                else:
+                    for item in filter_value:
+                        filters.add(QueryFilter(parameter=item, **filter_obj))
+        return filters.compose()
+
+    def get_catalog_tag_keys(self):
+        """Get a list of tag keys from the tag catalog."""
+        type_filter = self.parameters.get_filter("type")
+        annotations = self.data_sources[0].get("annotations", {})
+        with tenant_context(self.tenant):
+            tag_keys_query = TagCatalogKey.objects.annotate(**annotations).filter(self._get_catalog_filter())
+            if type_filter:
+                tag_keys_query = tag_keys_query.filter(tag_type=type_filter)
+            return list(tag_keys_query.values_list("key", flat=True).distinct())
+
+    def get_catalog_tags(self):
+        """Get a list of tags and values from the tag catalog, in the format of get_tags."""
+        type_filter = self.parameters.get_filter("type")
+        annotations = self.data_sources[0].get("annotations", {})
+        group_by = ["key", *annotations]
+        order_by = ["key"]
+        final_data = []
+        with tenant_context(self.tenant):
+            tags_query = TagCatalogValue.objects.annotate(**annotations).filter(self._get_catalog_filter())
+            if type_filter:
+                group_by.append("tag_type")
+                # get_tags lists storage before pod tags of the same key
+                order_by.append("-tag_type")
+                if type_filter != "*":
+                    tags_query = tags_query.filter(tag_type=type_filter)
+            tags_query = tags_query.values(*group_by).annotate(values=ArrayAgg("value", distinct=True))
+            for row in tags_query.order_by(*order_by):
+                tag = {"key": row["key"], "values": row["values"]}
+                tag.update({annotation: row[annotation] for annotation in annotations})
+                if type_filter:
+                    tag["type"] = row["tag_type"]
+                final_data.append(tag)
+
+        self.deduplicate_and_sort(final_data)
+        return final_data
+
+    def get_catalog_tag_values(self):
+        """Get the values of a tag key from the tag catalog, in the format of get_tag_values."""
+        with tenant_context(self.tenant):
+            values_query = TagCatalogValue.objects.filter(self._get_catalog_filter())
+            values = list(values_query.values_list("value", flat=True).distinct())
+        return self.deduplicate_and_sort([{"key": self.key, "values": values}])
+
     def deduplicate_and_sort(self, data):
         for dikt in data:
             dikt["values"] = sorted(set(dikt["values"]), reverse=self.order_direction == "desc")
@@ -405,11 +503,12 @@ class TagQueryHandler(QueryHandler):
             (Dict): Dictionary response of query params and data
 
         """
+        use_catalog = self.is_catalog_queryable
         if self.parameters.get("key_only"):
-            tag_data = self.get_tag_keys()
+            tag_data = self.get_catalog_tag_keys() if use_catalog else self.get_tag_keys()
             query_data = sorted(tag_data, reverse=self.order_direction == "desc")
         elif self.parameters.get_filter("value"):
-            tag_data = self.get_tag_values()
+            tag_data = self.get_catalog_tag_values() if use_catalog else self.get_tag_values()
             # This is sorted by values that start with the filter first, then values that contain the filter
             # based on a discussion with UX
             vals = tag_data[0].get("values")
@@ -420,7 +519,7 @@ class TagQueryHandler(QueryHandler):
             )
             query_data = tag_data
         else:
-            tag_data = self.get_tags()
+            tag_data = self.get_catalog_tags() if use_catalog else self.get_tags()
             query_data = sorted(tag_data, key=lambda k: k["key"], reverse=self.order_direction == "desc")
 
         self.query_data = query_data
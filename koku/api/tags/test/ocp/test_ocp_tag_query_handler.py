@@ -3,6 +3,9 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Test the Report Queries."""
+from unittest.mock import patch
+
+from django.test.utils import override_settings
 from tenant_schemas.utils import tenant_context
 
 from api.functions import JSONBObjectKeys
@@ -378,3 +381,43 @@ class OCPTagQueryHandlerTest(IamTestCase):
             QueryFilter(field="report_period__cluster_alias", operation="icontains", parameter=["my-ocp-cluster-2"])
         )
         self.assertEqual(filters._filters, expected)
+
+    def test_execute_query_from_tag_catalog(self):
+        """Test that the tag catalog answers tag queries like the tag summary tables."""
+        urls = [
+            "?filter[time_scope_units]=day&filter[time_scope_value]=-10&filter[resolution]=daily&key_only=True",
+            "?filter[time_scope_units]=day&filter[time_scope_value]=-10&filter[resolution]=daily",
+            "?filter[time_scope_units]=month&filter[time_scope_value]=-2&filter[resolution]=monthly",
+            "?filter[time_scope_units]=day&filter[time_scope_value]=-30&filter[type]=*",
+            "?filter[time_scope_units]=day&filter[time_scope_value]=-10&filter[type]=pod&filter[enabled]=False",
+            "?filter[time_scope_units]=day&filter[time_scope_value]=-10&filter[key]=app",
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                query_params = self.mocked_query_params(url, OCPTagView)
+                expected = OCPTagQueryHandler(query_params).execute_query()
+                with override_settings(TAG_CATALOG_ENABLED=True):
+                    query_params = self.mocked_query_params(url, OCPTagView)
+                    handler = OCPTagQueryHandler(query_params)
+                    self.assertTrue(handler.is_catalog_queryable)
+                    with patch.object(handler, "get_tags") as mock_tags:
+                        with patch.object(handler, "get_tag_keys") as mock_keys:
+                            query_output = handler.execute_query()
+                    mock_tags.assert_not_called()
+                    mock_keys.assert_not_called()
+                self.assertEqual(query_output.get("data"), expected.get("data"))
+
+        url = "/app/?filter[value]=b"
+        query_params = self.mocked_query_params(url, OCPTagView)
+        query_params.kwargs = {"key": "app"}
+        expected = OCPTagQueryHandler(query_params).execute_query()
+        with override_settings(TAG_CATALOG_ENABLED=True):
+            query_params = self.mocked_query_params(url, OCPTagView)
+            query_params.kwargs = {"key": "app"}
+            query_output = OCPTagQueryHandler(query_params).execute_query()
+        self.assertEqual(query_output.get("data"), expected.get("data"))
+
+        url = "?filter[time_scope_units]=day&filter[time_scope_value]=-10&filter[project]=banking"
+        with override_settings(TAG_CATALOG_ENABLED=True):
+            handler = OCPTagQueryHandler(self.mocked_query_params(url, OCPTagView))
+            self.assertFalse(handler.is_catalog_queryable)
@@ -4,13 +4,25 @@
 #
 """Cache functions."""
 import logging
+import re
+import threading
+import time
+from abc import ABC
+from abc import abstractmethod
+from collections import defaultdict
 
-from django.conf import settings
 from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
 from django.core.cache.backends.dummy import DummyCache
 from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django_redis.cache import omit_exception
 from django_redis.cache import RedisCache
-from redis import Redis
+from django_redis.exceptions import ConnectionInterrupted
+from prometheus_client import Counter
+from prometheus_client import Histogram
+from redis.exceptions import RedisError
+from tenant_schemas.utils import schema_context
 
 from api.provider.models import Provider
 
@@ -31,6 +43,200 @@ OPENSHIFT_AWS_CACHE_PREFIX = "openshift-aws-view"
 OPENSHIFT_AZURE_CACHE_PREFIX = "openshift-azure-view"
 OPENSHIFT_ALL_CACHE_PREFIX = "openshift-all-view"
 SOURCES_PREFIX = "sources"
+QUERY_RESULT_CACHE_PREFIX = "query-result"
+QUERY_GENERATION_CACHE_PREFIX = "query-generation"
+VIEW_CACHE_KEYS_PREFIX = "view-cache-keys"
+VIEW_CACHE_PREFIXES = (
+    AWS_CACHE_PREFIX,
+    AZURE_CACHE_PREFIX,
+    GCP_CACHE_PREFIX,
+    OPENSHIFT_CACHE_PREFIX,
+    OPENSHIFT_AWS_CACHE_PREFIX,
+    OPENSHIFT_AZURE_CACHE_PREFIX,
+    OPENSHIFT_ALL_CACHE_PREFIX,
+)
+# A view prefix appears in cached keys as its own "." or ":" delimited token,
+# e.g. views.decorators.cache.cache_page.aws-view.GET.<url hash>.<header hash>
+VIEW_CACHE_PREFIX_PATTERN = re.compile(
+    r"(?<![\w-])(" + "|".join(re.escape(prefix) for prefix in VIEW_CACHE_PREFIXES) + r")(?![\w-])"
+)
+UNLINK_BATCH_SIZE = 1000
+
+PROVIDER_CACHE_PREFIX_MAP = {
+    Provider.PROVIDER_AWS: AWS_CACHE_PREFIX,
+    Provider.PROVIDER_AZURE: AZURE_CACHE_PREFIX,
+    Provider.PROVIDER_GCP: GCP_CACHE_PREFIX,
+    Provider.PROVIDER_OCP: OPENSHIFT_CACHE_PREFIX,
+    Provider.OCP_AWS: OPENSHIFT_AWS_CACHE_PREFIX,
+    Provider.OCP_AZURE: OPENSHIFT_AZURE_CACHE_PREFIX,
+    Provider.OCP_ALL: OPENSHIFT_ALL_CACHE_PREFIX,
+}
+
+QUERY_CACHE_HIT_COUNTER = Counter(
+    "query_result_cache_hits", "Number of report queries served from the query result cache", ["provider"]
+)
+QUERY_CACHE_MISS_COUNTER = Counter(
+    "query_result_cache_misses", "Number of report queries executed against the database", ["provider"]
+)
+QUERY_CACHE_LATENCY = Histogram(
+    "query_result_cache_latency_seconds", "Report query latency by query result cache outcome", ["provider", "result"]
+)
+
+
+def get_view_cache_keys_registry_key(schema_name, cache_key_prefix):
+    """Return the name of the set of cached keys for a tenant and view cache prefix."""
+    return f"{VIEW_CACHE_KEYS_PREFIX}:{schema_name}:{cache_key_prefix}"
+
+
+def _get_view_cache_registry_entries(keys):
+    """Return {registry key: [raw key, ...]} for the keys of cached views."""
+    entries = defaultdict(list)
+    for key in keys:
+        if str(key).startswith((QUERY_RESULT_CACHE_PREFIX, QUERY_GENERATION_CACHE_PREFIX)):
+            # query results are invalidated by their generation
+            continue
+        match = VIEW_CACHE_PREFIX_PATTERN.search(str(key))
+        if match:
+            entries[get_view_cache_keys_registry_key(connection.schema_name, match.group(1))].append(key)
+    return entries
+
+
+class ViewCacheRegistryMixin(ABC):
+    """Record the keys of cached views in a per-tenant, per-view-prefix registry.
+
+    Invalidating a tenant's views then only touches the registered keys
+    instead of scanning every key in the cache.
+    """
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, *args, **kwargs):
+        """Set a value and register its key."""
+        result = super().set(key, value, timeout, *args, **kwargs)
+        self.register_view_keys([key], timeout, version=kwargs.get("version", args[0] if args else None))
+        return result
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, *args, **kwargs):
+        """Add a value and register its key."""
+        result = super().add(key, value, timeout, *args, **kwargs)
+        if result:
+            self.register_view_keys([key], timeout, version=kwargs.get("version", args[0] if args else None))
+        return result
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, *args, **kwargs):
+        """Set many values and register their keys."""
+        result = super().set_many(data, timeout, *args, **kwargs)
+        self.register_view_keys(data.keys(), timeout, version=kwargs.get("version", args[0] if args else None))
+        return result
+
+    @abstractmethod
+    def register_view_keys(self, keys, timeout=DEFAULT_TIMEOUT, version=None):
+        """Add the keys of cached views to their registries."""
+
+    @abstractmethod
+    def invalidate_view_keys(self, schema_name, cache_key_prefix):
+        """Delete the registered keys for a tenant and view cache prefix, return the number of keys."""
+
+
+class KokuRedisCache(ViewCacheRegistryMixin, RedisCache):
+    """Redis cache that keeps a Redis set of cached keys per tenant and view cache prefix.
+
+    The registry talks to the Redis client directly, so Redis errors are raised as
+    ConnectionInterrupted like the django_redis client does, and IGNORE_EXCEPTIONS
+    applies to them through omit_exception.
+    """
+
+    @omit_exception
+    def register_view_keys(self, keys, timeout=DEFAULT_TIMEOUT, version=None):
+        """Add the keys of cached views to their registries."""
+        entries = _get_view_cache_registry_entries(keys)
+        if not entries:
+            return
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        client = self.client.get_client(write=True)
+        try:
+            with client.pipeline(transaction=False) as pipe:
+                for registry_key, registry_keys in entries.items():
+                    pipe.sadd(registry_key, *[self.make_key(key, version=version) for key in registry_keys])
+                    if timeout is not None:
+                        # registered keys expire with the view cache, so the set can too
+                        pipe.expire(registry_key, max(int(timeout), 1))
+                pipe.execute()
+        except RedisError as err:
+            raise ConnectionInterrupted(connection=client) from err
+
+    @omit_exception(return_value=0)
+    def invalidate_view_keys(self, schema_name, cache_key_prefix):
+        """Delete the registered keys for a tenant and view cache prefix, return the number of keys."""
+        registry_key = get_view_cache_keys_registry_key(schema_name, cache_key_prefix)
+        client = self.client.get_client(write=True)
+        try:
+            # read and drop the registry atomically so keys registered meanwhile go to a new set
+            with client.pipeline(transaction=True) as pipe:
+                pipe.smembers(registry_key)
+                pipe.unlink(registry_key)
+                keys, _ = pipe.execute()
+            keys = list(keys)
+            with client.pipeline(transaction=False) as pipe:
+                for i in range(0, len(keys), UNLINK_BATCH_SIZE):
+                    pipe.unlink(*keys[i : i + UNLINK_BATCH_SIZE])  # noqa: E203
+                pipe.execute()
+        except RedisError as err:
+            raise ConnectionInterrupted(connection=client) from err
+        return len(keys)
+
+
+class KokuLocMemCache(ViewCacheRegistryMixin, LocMemCache):
+    """Local memory cache with the same view key registry as KokuRedisCache, used in tests."""
+
+    _registries = defaultdict(set)
+    _registry_lock = threading.Lock()
+
+    def __init__(self, name, params):
+        """Initialize the cache."""
+        super().__init__(name, params)
+        self._name = name
+
+    def register_view_keys(self, keys, timeout=DEFAULT_TIMEOUT, version=None):
+        """Add the keys of cached views to their registries."""
+        with self._registry_lock:
+            for registry_key, registry_keys in _get_view_cache_registry_entries(keys).items():
+                self._registries[(self._name, registry_key)].update(
+                    self.make_key(key, version=version) for key in registry_keys
+                )
+
+    def invalidate_view_keys(self, schema_name, cache_key_prefix):
+        """Delete the registered keys for a tenant and view cache prefix, return the number of keys."""
+        registry_key = get_view_cache_keys_registry_key(schema_name, cache_key_prefix)
+        with self._registry_lock:
+            keys = self._registries.pop((self._name, registry_key), set())
+        with self._lock:
+            for key in keys:
+                self._delete(key)
+        return len(keys)
+
+    def clear(self):
+        """Clear the cache and its registries."""
+        super().clear()
+        with self._registry_lock:
+            for registry in [registry for registry in self._registries if registry[0] == self._name]:
+                del self._registries[registry]
+
+
+def _scan_delete_redis_keys(cache, schema_name, cache_key_prefixes):
+    """Delete a tenant's view keys from a Redis cache without a key registry, return the number of keys."""
+    client = cache.client.get_client(write=True)
+    deleted = 0
+    with client.pipeline(transaction=False) as pipe:
+        # the tenant aware key function puts the schema first, e.g. acct10001::1:views.decorators...
+        for key in client.scan_iter(match=f"{schema_name}:*", count=UNLINK_BATCH_SIZE):
+            match = VIEW_CACHE_PREFIX_PATTERN.search(key.decode("utf-8"))
+            if match and match.group(1) in cache_key_prefixes:
+                pipe.unlink(key)
+                deleted += 1
+                if deleted % UNLINK_BATCH_SIZE == 0:
+                    pipe.execute()
+        pipe.execute()
+    return deleted
 
 
 def invalidate_view_cache_for_tenant_and_cache_key(schema_name, cache_key_prefix=None):
@@ -39,15 +245,22 @@ def invalidate_view_cache_for_tenant_and_cache_key(schema_name, cache_key_prefix
     If cache_key_prefix is None, all views will be invalidated.
     """
     cache = caches["default"]
-    if isinstance(cache, RedisCache):
-        cache = Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB)
-        all_keys = cache.keys("*")
-        all_keys = [key.decode("utf-8") for key in all_keys]
+    cache_key_prefixes = (cache_key_prefix,) if cache_key_prefix else VIEW_CACHE_PREFIXES
+    if isinstance(cache, ViewCacheRegistryMixin):
+        deleted = sum(cache.invalidate_view_keys(schema_name, prefix) for prefix in cache_key_prefixes)
+    elif isinstance(cache, RedisCache):
+        deleted = _scan_delete_redis_keys(cache, schema_name, cache_key_prefixes)
     elif isinstance(cache, LocMemCache):
-        all_keys = cache._cache.keys()
-        all_keys = list(all_keys)
-        all_keys = [key.split(":") for key in all_keys]
-        all_keys = [":".join(splits[-2:]) for splits in all_keys]
+        all_keys = list(cache._cache.keys())
+        keys_to_invalidate = []
+        for key in all_keys:
+            match = VIEW_CACHE_PREFIX_PATTERN.search(key)
+            if key.startswith(f"{schema_name}:") and match and match.group(1) in cache_key_prefixes:
+                keys_to_invalidate.append(key)
+        with cache._lock:
+            for key in keys_to_invalidate:
+                cache._delete(key)
+        deleted = len(keys_to_invalidate)
     elif isinstance(cache, DummyCache):
         LOG.info("Skipping cache invalidation because views caching is disabled.")
         return
@@ -55,23 +268,15 @@ def invalidate_view_cache_for_tenant_and_cache_key(schema_name, cache_key_prefix
         msg = "Using an unsupported caching backend!"
         raise KokuCacheError(msg)
 
-    all_keys = all_keys if all_keys is not None else []
-
-    if cache_key_prefix:
-        keys_to_invalidate = [key for key in all_keys if (schema_name in key and cache_key_prefix in key)]
-    else:
-        # Invalidate all cached views for the tenant
-        keys_to_invalidate = [key for key in all_keys if schema_name in key]
-
-    for key in keys_to_invalidate:
-        cache.delete(key)
-
-    msg = f"Invalidated request cache for\n\ttenant: {schema_name}\n\tcache_key_prefix: {cache_key_prefix}"
+    msg = (
+        f"Invalidated request cache for\n\ttenant: {schema_name}\n\tcache_key_prefix: {cache_key_prefix}"
+        f"\n\tkeys deleted: {deleted}"
+    )
     LOG.info(msg)
 
 
-def invalidate_view_cache_for_tenant_and_source_type(schema_name, source_type):
-    """"Invalidate our view cache for a specific tenant and source type."""
+def get_cache_key_prefixes(source_type):
+    """Return the view cache prefixes whose data depends on a source type."""
     cache_key_prefixes = ()
     if source_type in (Provider.PROVIDER_AWS, Provider.PROVIDER_AWS_LOCAL):
         cache_key_prefixes = (AWS_CACHE_PREFIX, OPENSHIFT_AWS_CACHE_PREFIX, OPENSHIFT_ALL_CACHE_PREFIX)
@@ -86,6 +291,45 @@ def invalidate_view_cache_for_tenant_and_source_type(schema_name, source_type):
         cache_key_prefixes = (AZURE_CACHE_PREFIX, OPENSHIFT_AZURE_CACHE_PREFIX, OPENSHIFT_ALL_CACHE_PREFIX)
     elif source_type in (Provider.PROVIDER_GCP, Provider.PROVIDER_GCP_LOCAL):
         cache_key_prefixes = (GCP_CACHE_PREFIX,)
+    return cache_key_prefixes
+
 
-    for cache_key_prefix in cache_key_prefixes:
+def invalidate_view_cache_for_tenant_and_source_type(schema_name, source_type):
+    """"Invalidate our view cache for a specific tenant and source type."""
+    for cache_key_prefix in get_cache_key_prefixes(source_type):
         invalidate_view_cache_for_tenant_and_cache_key(schema_name, cache_key_prefix)
+        bump_query_cache_generation(schema_name, cache_key_prefix)
+
+
+def _get_query_generation_cache_key(schema_name, cache_key_prefix):
+    """Return the cache key of the query result generation for a tenant and view cache prefix."""
+    return f"{QUERY_GENERATION_CACHE_PREFIX}:{schema_name}:{cache_key_prefix}"
+
+
+def get_query_cache_generation(schema_name, cache_key_prefix):
+    """Return the current query result generation for a tenant and view cache prefix.
+
+    A missing generation starts from the clock, so a generation that was evicted
+    or deleted never comes back as a value older cached results were stored under.
+    """
+    cache = caches["default"]
+    key = _get_query_generation_cache_key(schema_name, cache_key_prefix)
+    with schema_context(schema_name):
+        generation = cache.get(key)
+        if generation is None:
+            cache.add(key, time.time_ns(), timeout=None)
+            generation = cache.get(key)
+    return generation
+
+
+def bump_query_cache_generation(schema_name, cache_key_prefix):
+    """Invalidate the cached query results of a tenant and view cache prefix."""
+    cache = caches["default"]
+    key = _get_query_generation_cache_key(schema_name, cache_key_prefix)
+    with schema_context(schema_name):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+    msg = f"Bumped query result cache generation for\n\ttenant: {schema_name}\n\tcache_key_prefix: {cache_key_prefix}"
+    LOG.info(msg)
@@ -8,6 +8,8 @@ from celery import Celery
 from celery import Task
 from celery.schedules import crontab
 from celery.signals import celeryd_after_setup
+from celery.signals import worker_process_shutdown
+from celery.signals import worker_shutdown
 from django.conf import settings
 from kombu.exceptions import OperationalError
 
@@ -164,6 +166,13 @@ app.conf.beat_schedule["remove_stale_tenants"] = {
     "schedule": crontab(hour=0, minute=0),
 }
 
+# Beat used to requeue coalesced summarizations whose scheduled task was lost
+if settings.SUMMARY_COALESCE_WINDOW:
+    app.conf.beat_schedule["summarize_stale_dirty_ranges"] = {
+        "task": "masu.processor.tasks.summarize_stale_dirty_ranges",
+        "schedule": crontab(minute="*/15"),
+    }
+
 # Celery timeout if broker is unavaiable to avoid blocking indefintely
 app.conf.broker_transport_options = {"max_retries": 4, "interval_start": 0, "interval_step": 0.5, "interval_max": 3}
 
@@ -182,6 +191,15 @@ def wait_for_migrations(sender, instance, **kwargs):  # pragma: no cover
         time.sleep(5)
 
 
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def close_presto_connections(**kwargs):  # pragma: no cover
+    """Close the pooled Trino connections of a worker or worker pool process."""
+    from .presto_database import close_pooled_connections
+
+    close_pooled_connections()
+
+
 def is_task_currently_running(task_name, task_id, check_args=None):
     """Check if a specific task with optional args is currently running."""
     try:
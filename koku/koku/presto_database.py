@@ -1,19 +1,52 @@
 import logging
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
 from decimal import Decimal
 
 import prestodb
 import sqlparse
 from prestodb.exceptions import PrestoQueryError
 from prestodb.transaction import IsolationLevel
+from prometheus_client import Histogram
 
+from api.common import log_json
 
 LOG = logging.getLogger(__name__)
 
 POSITIONAL_VARS = re.compile("%s")
 NAMED_VARS = re.compile(r"%(.+)s")
 EOT = re.compile(r",\s*\)$")  # pylint: disable=anomalous-backslash-in-string
+STATEMENT_TYPE = re.compile(r"^\W*([a-zA-Z]+)")
+STATEMENT_TYPES = {"alter", "call", "create", "delete", "describe", "drop", "insert", "select", "show", "with"}
+
+# Autocommit connections by (thread, connect arguments), least recently used first.
+# A connection keeps its HTTP session, so statements reuse kept-alive connections
+# to the coordinator.
+CONNECTION_POOL_SIZE = int(os.environ.get("TRINO_CONNECTION_POOL_SIZE", 8))
+_CONNECTION_POOL = OrderedDict()
+_CONNECTION_POOL_LOCK = threading.Lock()
+
+TRINO_STATEMENT_DURATION = Histogram(
+    "trino_statement_wall_seconds",
+    "Seconds from submitting a Trino statement to fetching its last row",
+    ["statement"],
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 1800),
+)
+TRINO_STATEMENT_QUEUED = Histogram(
+    "trino_statement_queued_seconds",
+    "Seconds a Trino statement waited in the coordinator queue",
+    ["statement"],
+    buckets=(0.01, 0.1, 0.5, 1, 5, 10, 30, 60, 300),
+)
+TRINO_STATEMENT_ROWS = Histogram(
+    "trino_statement_rows",
+    "Rows returned by a Trino statement",
+    ["statement"],
+    buckets=(0, 1, 10, 100, 1000, 10000, 100000, 1000000),
+)
 
 
 class PreprocessStatementError(Exception):
@@ -81,6 +114,9 @@ def sql_mogrify(sql, params=None):
 def connect(**connect_args):
     """
     Establish a prestodb connection.
+    Autocommit connections are pooled per thread and connect arguments, so
+    repeated calls reuse one HTTP session to the coordinator. The pool keeps the
+    TRINO_CONNECTION_POOL_SIZE most recently used connections.
     Keyword Params:
         schema (str) : prestodb schema (required)
         host (str) : prestodb hostname (can set from environment)
@@ -110,10 +146,81 @@ def connect(**connect_args):
         ),
         "schema": connect_args["schema"],
     }
-    conn = prestodb.dbapi.connect(**presto_connect_args)
+    if presto_connect_args["isolation_level"] != IsolationLevel.AUTOCOMMIT:
+        return prestodb.dbapi.connect(**presto_connect_args)
+
+    # Connections are not shared between threads, a cursor is bound to one statement at a time
+    pool_key = (threading.get_ident(), *(str(presto_connect_args[key]) for key in sorted(presto_connect_args)))
+    with _CONNECTION_POOL_LOCK:
+        conn = _CONNECTION_POOL.get(pool_key)
+        if conn is None:
+            conn = prestodb.dbapi.connect(**presto_connect_args)
+            _CONNECTION_POOL[pool_key] = conn
+        _CONNECTION_POOL.move_to_end(pool_key)
+        while len(_CONNECTION_POOL) > CONNECTION_POOL_SIZE:
+            _, evicted = _CONNECTION_POOL.popitem(last=False)
+            # A closed session opens new HTTP connections if a caller still uses it
+            evicted.close()
     return conn
 
 
+def release(conn):
+    """
+    Hand back a connection from connect() when the caller is done with it.
+    Pooled connections stay open for the next connect() of the thread, other
+    connections are closed.
+    Params:
+        conn (prestodb.dbapi.Connection) : connection returned by connect()
+    """
+    with _CONNECTION_POOL_LOCK:
+        if any(pooled is conn for pooled in _CONNECTION_POOL.values()):
+            return
+    conn.close()
+
+
+def close_pooled_connections():
+    """
+    Close every pooled connection and its HTTP session.
+    """
+    with _CONNECTION_POOL_LOCK:
+        for conn in _CONNECTION_POOL.values():
+            conn.close()
+        _CONNECTION_POOL.clear()
+
+
+def record_statement_stats(presto_cur, presto_stmt, wall_seconds, row_count):
+    """
+    Record the wall time, queued time, and row count of an executed statement
+    in Prometheus and log them with the Trino query ID.
+    Params:
+        presto_cur (prestodb.dbapi.Cursor) : Cursor that executed the statement
+        presto_stmt (str) : The executed statement
+        wall_seconds (float) : Seconds from execution to the last fetched row
+        row_count (int) : Number of rows fetched
+    Returns:
+        dict : The recorded statistics
+    """
+    trino_stats = getattr(presto_cur, "stats", None)
+    if not isinstance(trino_stats, dict):
+        trino_stats = {}
+    match = STATEMENT_TYPE.match(presto_stmt)
+    statement_type = match.group(1).lower() if match else "other"
+    if statement_type not in STATEMENT_TYPES:
+        statement_type = "other"
+    stats = {
+        "query_id": getattr(presto_cur, "query_id", None),
+        "statement_type": statement_type,
+        "wall_seconds": round(wall_seconds, 3),
+        "queued_seconds": trino_stats.get("queuedTimeMillis", 0) / 1000,
+        "rows": row_count,
+    }
+    TRINO_STATEMENT_DURATION.labels(statement=statement_type).observe(wall_seconds)
+    TRINO_STATEMENT_QUEUED.labels(statement=statement_type).observe(stats["queued_seconds"])
+    TRINO_STATEMENT_ROWS.labels(statement=statement_type).observe(row_count)
+    LOG.info(log_json(None, "Trino statement finished", stats))
+    return stats
+
+
 def _fetchall(presto_cur):
     """
     Wrapper around the prestodb.dbapi.Cursor.fetchall() method
@@ -170,11 +277,13 @@ def execute(presto_conn, sql, params=None):
     presto_cur = _cursor(presto_conn)
     try:
         LOG.debug(f"Executing PRESTO SQL: {presto_stmt}")
+        start = time.time()
         presto_cur = _execute(presto_cur, presto_stmt)
         results = _fetchall(presto_cur)
     except PrestoQueryError as e:
         LOG.error(f"Presto Query Error : {str(e)}{os.linesep}{presto_stmt}")
         raise e
+    record_statement_stats(presto_cur, presto_stmt, time.time() - start, len(results))
 
     return results
 
@@ -168,6 +168,14 @@ WSGI_APPLICATION = "koku.wsgi.application"
 
 WORKER_CACHE_KEY = "worker"
 CACHE_MIDDLEWARE_SECONDS = ENVIRONMENT.get_value("CACHE_TIMEOUT", default=3600)
+# Cache report query results, keyed on the query parameters and a per-tenant generation counter
+QUERY_RESULT_CACHE_ENABLED = ENVIRONMENT.bool("QUERY_RESULT_CACHE_ENABLED", default=False)
+QUERY_RESULT_CACHE_TIMEOUT = ENVIRONMENT.int("QUERY_RESULT_CACHE_TIMEOUT", default=CACHE_MIDDLEWARE_SECONDS)
+REPORT_SQL_PAGINATION_ENABLED = ENVIRONMENT.bool("REPORT_SQL_PAGINATION_ENABLED", default=False)
+REPORT_CSV_STREAMING_ENABLED = ENVIRONMENT.bool("REPORT_CSV_STREAMING_ENABLED", default=False)
+REPORT_CSV_STREAMING_CHUNK_SIZE = ENVIRONMENT.int("REPORT_CSV_STREAMING_CHUNK_SIZE", default=2000)
+# Answer the tags API from the tag catalog when a request has no RBAC or resource filters
+TAG_CATALOG_ENABLED = ENVIRONMENT.bool("TAG_CATALOG_ENABLED", default=False)
 
 HOSTNAME = ENVIRONMENT.get_value("HOSTNAME", default="localhost")
 
@@ -182,7 +190,7 @@ if "test" in sys.argv:
     TEST_RUNNER = "koku.koku_test_runner.KokuTestRunner"
     CACHES = {
         "default": {
-            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "BACKEND": "koku.cache.KokuLocMemCache",
             "LOCATION": TEST_CACHE_LOCATION,
             "KEY_FUNCTION": "tenant_schemas.cache.make_key",
             "REVERSE_KEY_FUNCTION": "tenant_schemas.cache.reverse_key",
@@ -193,7 +201,7 @@ if "test" in sys.argv:
 else:
     CACHES = {
         "default": {
-            "BACKEND": "django_redis.cache.RedisCache",
+            "BACKEND": "koku.cache.KokuRedisCache",
             "LOCATION": f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}",
             "KEY_FUNCTION": "tenant_schemas.cache.make_key",
             "REVERSE_KEY_FUNCTION": "tenant_schemas.cache.reverse_key",
@@ -415,13 +423,36 @@ S3_BUCKET_PATH = ENVIRONMENT.get_value("S3_BUCKET_PATH", default="data_archive")
 S3_BUCKET_NAME = CONFIGURATOR.get_object_store_bucket(REQUESTED_BUCKET)
 S3_ACCESS_KEY = CONFIGURATOR.get_object_store_access_key(REQUESTED_BUCKET)
 S3_SECRET = CONFIGURATOR.get_object_store_secret_key(REQUESTED_BUCKET)
+S3_CONCURRENT_UPLOADS = ENVIRONMENT.bool("S3_CONCURRENT_UPLOADS", default=False)
+S3_UPLOAD_CONCURRENCY = ENVIRONMENT.int("S3_UPLOAD_CONCURRENCY", default=4)
+S3_UPLOAD_QUEUE_SIZE = ENVIRONMENT.int("S3_UPLOAD_QUEUE_SIZE", default=8)
+S3_MULTIPART_THRESHOLD = ENVIRONMENT.int("S3_MULTIPART_THRESHOLD", default=64 * 1024 * 1024)
+S3_MULTIPART_CHUNKSIZE = ENVIRONMENT.int("S3_MULTIPART_CHUNKSIZE", default=16 * 1024 * 1024)
 
 ENABLE_S3_ARCHIVING = ENVIRONMENT.bool("ENABLE_S3_ARCHIVING", default=False)
 ENABLE_PARQUET_PROCESSING = ENVIRONMENT.bool("ENABLE_PARQUET_PROCESSING", default=False)
 PARQUET_PROCESSING_BATCH_SIZE = ENVIRONMENT.int("PARQUET_PROCESSING_BATCH_SIZE", default=200000)
+PARQUET_VECTORIZED_CONVERSION = ENVIRONMENT.bool("PARQUET_VECTORIZED_CONVERSION", default=False)
+PARQUET_STREAMING_WRITER = ENVIRONMENT.bool("PARQUET_STREAMING_WRITER", default=False)
+PARQUET_TARGET_FILE_SIZE = ENVIRONMENT.int("PARQUET_TARGET_FILE_SIZE", default=256 * 1024 * 1024)
+PARQUET_COMPRESSION = ENVIRONMENT.get_value("PARQUET_COMPRESSION", default="snappy")
+PARQUET_CONVERSION_WORKERS = ENVIRONMENT.int("PARQUET_CONVERSION_WORKERS", default=1)
+PARQUET_CONVERSION_WORKER_MEMORY_LIMIT = ENVIRONMENT.int("PARQUET_CONVERSION_WORKER_MEMORY_LIMIT", default=0)
+# Download GCP BigQuery results a page at a time straight into daily Parquet files
+GCP_ARROW_DOWNLOAD = ENVIRONMENT.bool("GCP_ARROW_DOWNLOAD", default=False)
+# Register new Hive partitions one by one, needs hive.allow-register-partition-procedure=true in Trino
+TRINO_REGISTER_PARTITIONS = ENVIRONMENT.bool("TRINO_REGISTER_PARTITIONS", default=False)
 ENABLE_TRINO_SOURCES = ENVIRONMENT.list("ENABLE_TRINO_SOURCES", default=[])
 ENABLE_TRINO_ACCOUNTS = ENVIRONMENT.list("ENABLE_TRINO_ACCOUNTS", default=[])
 ENABLE_TRINO_SOURCE_TYPE = ENVIRONMENT.list("ENABLE_TRINO_SOURCE_TYPE", default=[])
+# Number of materialized views refreshed at the same time, each on its own database connection
+MATERIALIZED_VIEW_REFRESH_WORKERS = ENVIRONMENT.int("MATERIALIZED_VIEW_REFRESH_WORKERS", default=1)
+# Charge OpenShift usage rates by every tier of the rate instead of the first tier value
+TIERED_RATES_ENABLED = ENVIRONMENT.bool("TIERED_RATES_ENABLED", default=False)
+# Seconds without new data before the summarizations requested for a provider billing month run as one, 0 disables
+SUMMARY_COALESCE_WINDOW = ENVIRONMENT.int("SUMMARY_COALESCE_WINDOW", default=0)
+# Most seconds a coalesced summarization waits for its first requested date range
+SUMMARY_COALESCE_MAX_LATENCY = ENVIRONMENT.int("SUMMARY_COALESCE_MAX_LATENCY", default=3600)
 
 # Presto Settings
 PRESTO_HOST = ENVIRONMENT.get_value("PRESTO_HOST", default=None)
@@ -8,10 +8,14 @@ import random
 
 from django.core.cache import caches
 from django.test.utils import override_settings
+from redis.exceptions import RedisError
+from tenant_schemas.utils import schema_context
 
 from api.iam.test.iam_test_case import IamTestCase
 from koku.cache import AWS_CACHE_PREFIX
 from koku.cache import AZURE_CACHE_PREFIX
+from koku.cache import bump_query_cache_generation
+from koku.cache import get_query_cache_generation
 from koku.cache import invalidate_view_cache_for_tenant_and_cache_key
 from koku.cache import invalidate_view_cache_for_tenant_and_source_type
 from koku.cache import KokuCacheError
@@ -31,6 +35,13 @@ CACHE_PREFIXES = (
     OPENSHIFT_AZURE_CACHE_PREFIX,
     OPENSHIFT_ALL_CACHE_PREFIX,
 )
+UNREACHABLE_REDIS_CACHE = {
+    "BACKEND": "koku.cache.KokuRedisCache",
+    "LOCATION": "redis://127.0.0.1:1/0",
+    "KEY_FUNCTION": "tenant_schemas.cache.make_key",
+    "REVERSE_KEY_FUNCTION": "tenant_schemas.cache.reverse_key",
+    "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient", "IGNORE_EXCEPTIONS": True},
+}
 
 
 class KokuCacheTest(IamTestCase):
@@ -50,18 +61,91 @@ class KokuCacheTest(IamTestCase):
 
     def test_invalidate_view_cache_for_tenant_and_cache_key(self):
         """Test that specific cache data is deleted."""
-        key_to_clear = f"{self.schema_name}:{self.cache_key_prefix}"
-        remaining_key = f"keeper:{self.cache_key_prefix}"
-        cache_data = {key_to_clear: "value", remaining_key: "value"}
-        self.cache.set_many(cache_data)
+        key_to_clear = f"views.decorators.cache.cache_page.{self.cache_key_prefix}.GET.abc.def"
+        other_prefix_key = "views.decorators.cache.cache_page.gcp-view.GET.abc.def"
+        with schema_context(self.schema_name):
+            self.cache.set_many({key_to_clear: "value", other_prefix_key: "value"})
+        with schema_context("public"):
+            self.cache.set(key_to_clear, "value")
 
-        self.assertIsNotNone(self.cache.get(key_to_clear))
-        self.assertIsNotNone(self.cache.get(remaining_key))
+        invalidate_view_cache_for_tenant_and_cache_key(self.schema_name, self.cache_key_prefix)
+
+        with schema_context(self.schema_name):
+            self.assertIsNone(self.cache.get(key_to_clear))
+            self.assertIsNotNone(self.cache.get(other_prefix_key))
+        with schema_context("public"):
+            self.assertIsNotNone(self.cache.get(key_to_clear))
+
+    def test_invalidate_view_cache_for_tenant_all_prefixes(self):
+        """Test that all of a tenant's views are deleted without a cache key prefix."""
+        keys = [f"views.decorators.cache.cache_page.{prefix}.GET.abc.def" for prefix in CACHE_PREFIXES]
+        with schema_context(self.schema_name):
+            self.cache.set_many({key: "value" for key in keys})
+
+        invalidate_view_cache_for_tenant_and_cache_key(self.schema_name)
+
+        with schema_context(self.schema_name):
+            for key in keys:
+                self.assertIsNone(self.cache.get(key))
+
+    def test_view_cache_registry_prefix_tokens(self):
+        """Test that a view prefix only matches as a whole token of the key."""
+        aws_key = "views.decorators.cache.cache_page.aws-view.GET.abc.def"
+        ocp_aws_key = "views.decorators.cache.cache_page.openshift-aws-view.GET.abc.def"
+        query_generation_key = f"query-generation:{self.schema_name}:aws-view"
+        with schema_context(self.schema_name):
+            self.cache.set_many({aws_key: "value", ocp_aws_key: "value"})
+            self.cache.set(query_generation_key, 1)
+
+        invalidate_view_cache_for_tenant_and_cache_key(self.schema_name, AWS_CACHE_PREFIX)
+
+        with schema_context(self.schema_name):
+            self.assertIsNone(self.cache.get(aws_key))
+            self.assertIsNotNone(self.cache.get(ocp_aws_key))
+            self.assertEqual(self.cache.get(query_generation_key), 1)
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "unregistered",
+                "KEY_FUNCTION": "tenant_schemas.cache.make_key",
+                "REVERSE_KEY_FUNCTION": "tenant_schemas.cache.reverse_key",
+            }
+        }
+    )
+    def test_invalidate_view_cache_for_tenant_and_cache_key_without_registry(self):
+        """Test that a cache without a key registry falls back to matching keys."""
+        cache = caches["default"]
+        key_to_clear = f"views.decorators.cache.cache_page.{self.cache_key_prefix}.GET.abc.def"
+        with schema_context(self.schema_name):
+            cache.set(key_to_clear, "value")
 
         invalidate_view_cache_for_tenant_and_cache_key(self.schema_name, self.cache_key_prefix)
 
-        self.assertIsNone(self.cache.get(key_to_clear))
-        self.assertIsNotNone(self.cache.get(remaining_key))
+        with schema_context(self.schema_name):
+            self.assertIsNone(cache.get(key_to_clear))
+
+    @override_settings(CACHES={"default": UNREACHABLE_REDIS_CACHE})
+    def test_view_cache_registry_redis_outage_ignored(self):
+        """Test that the key registry ignores Redis errors like the rest of the cache."""
+        cache = caches["default"]
+        key = f"views.decorators.cache.cache_page.{self.cache_key_prefix}.GET.abc.def"
+        with schema_context(self.schema_name):
+            cache.set(key, "value")
+            cache.set_many({key: "value"})
+            self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.invalidate_view_keys(self.schema_name, self.cache_key_prefix), 0)
+        invalidate_view_cache_for_tenant_and_cache_key(self.schema_name, self.cache_key_prefix)
+
+    @override_settings(CACHES={"default": {**UNREACHABLE_REDIS_CACHE, "OPTIONS": {"IGNORE_EXCEPTIONS": False}}})
+    def test_view_cache_registry_redis_outage_raised(self):
+        """Test that the key registry raises Redis errors when the cache does not ignore them."""
+        cache = caches["default"]
+        with self.assertRaises(RedisError):
+            cache.invalidate_view_keys(self.schema_name, self.cache_key_prefix)
+        with self.assertRaises(RedisError):
+            cache.register_view_keys([f"views.decorators.cache.cache_page.{self.cache_key_prefix}.GET.abc.def"])
 
     @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
     def test_invalidate_view_cache_for_tenant_and_cache_key_dummy_cache(self):
@@ -84,13 +168,15 @@ class KokuCacheTest(IamTestCase):
         aws_cache_key_prefixes = (AWS_CACHE_PREFIX, OPENSHIFT_AWS_CACHE_PREFIX, OPENSHIFT_ALL_CACHE_PREFIX)
         aws_cache_data = {}
         for prefix in aws_cache_key_prefixes:
-            aws_cache_data.update({f"{self.schema_name}:{prefix}": "value"})
-        self.cache.set_many(aws_cache_data)
+            aws_cache_data.update({f"views.decorators.cache.cache_page.{prefix}.GET.abc.def": "value"})
+        with schema_context(self.schema_name):
+            self.cache.set_many(aws_cache_data)
 
         invalidate_view_cache_for_tenant_and_source_type(self.schema_name, "AWS")
 
-        for key in aws_cache_data:
-            self.assertIsNone(self.cache.get(key))
+        with schema_context(self.schema_name):
+            for key in aws_cache_data:
+                self.assertIsNone(self.cache.get(key))
 
         openshift_cache_key_prefixes = (
             OPENSHIFT_CACHE_PREFIX,
@@ -101,22 +187,56 @@ class KokuCacheTest(IamTestCase):
 
         openshift_cache_data = {}
         for prefix in openshift_cache_key_prefixes:
-            openshift_cache_data.update({f"{self.schema_name}:{prefix}": "value"})
-        self.cache.set_many(openshift_cache_data)
+            openshift_cache_data.update({f"views.decorators.cache.cache_page.{prefix}.GET.abc.def": "value"})
+        with schema_context(self.schema_name):
+            self.cache.set_many(openshift_cache_data)
 
         invalidate_view_cache_for_tenant_and_source_type(self.schema_name, "OCP")
 
-        for key in openshift_cache_data:
-            self.assertIsNone(self.cache.get(key))
+        with schema_context(self.schema_name):
+            for key in openshift_cache_data:
+                self.assertIsNone(self.cache.get(key))
 
         azure_cache_key_prefixes = (AZURE_CACHE_PREFIX, OPENSHIFT_AZURE_CACHE_PREFIX, OPENSHIFT_ALL_CACHE_PREFIX)
 
         azure_cache_data = {}
         for prefix in azure_cache_key_prefixes:
-            azure_cache_data.update({f"{self.schema_name}:{prefix}": "value"})
-        self.cache.set_many(azure_cache_data)
+            azure_cache_data.update({f"views.decorators.cache.cache_page.{prefix}.GET.abc.def": "value"})
+        with schema_context(self.schema_name):
+            self.cache.set_many(azure_cache_data)
 
         invalidate_view_cache_for_tenant_and_source_type(self.schema_name, "Azure")
 
-        for key in azure_cache_data:
-            self.assertIsNone(self.cache.get(key))
+        with schema_context(self.schema_name):
+            for key in azure_cache_data:
+                self.assertIsNone(self.cache.get(key))
+
+    def test_bump_query_cache_generation(self):
+        """Test that bumping the query cache generation increments it."""
+        generation = get_query_cache_generation(self.schema_name, self.cache_key_prefix)
+        self.assertEqual(get_query_cache_generation(self.schema_name, self.cache_key_prefix), generation)
+
+        bump_query_cache_generation(self.schema_name, self.cache_key_prefix)
+        self.assertEqual(get_query_cache_generation(self.schema_name, self.cache_key_prefix), generation + 1)
+
+    def test_query_cache_generation_restarts_from_clock(self):
+        """Test that a lost generation never restarts below an earlier generation."""
+        generation = get_query_cache_generation(self.schema_name, self.cache_key_prefix)
+        bump_query_cache_generation(self.schema_name, self.cache_key_prefix)
+        self.cache.clear()
+
+        self.assertGreater(get_query_cache_generation(self.schema_name, self.cache_key_prefix), generation + 1)
+
+    def test_invalidate_view_cache_for_tenant_and_source_type_bumps_generation(self):
+        """Test that source type invalidation bumps the query cache generation of each dependent view."""
+        aws_generation = get_query_cache_generation(self.schema_name, AWS_CACHE_PREFIX)
+        ocp_aws_generation = get_query_cache_generation(self.schema_name, OPENSHIFT_AWS_CACHE_PREFIX)
+        azure_generation = get_query_cache_generation(self.schema_name, AZURE_CACHE_PREFIX)
+
+        invalidate_view_cache_for_tenant_and_source_type(self.schema_name, "AWS")
+
+        self.assertNotEqual(get_query_cache_generation(self.schema_name, AWS_CACHE_PREFIX), aws_generation)
+        self.assertNotEqual(
+            get_query_cache_generation(self.schema_name, OPENSHIFT_AWS_CACHE_PREFIX), ocp_aws_generation
+        )
+        self.assertEqual(get_query_cache_generation(self.schema_name, AZURE_CACHE_PREFIX), azure_generation)
@@ -1,14 +1,50 @@
 import datetime
+import json
+import threading
 import uuid
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from unittest.mock import patch
 
 from jinjasql import JinjaSql
 from prestodb.dbapi import Connection
+from prometheus_client import REGISTRY
 
 from . import presto_database as kpdb
 from api.iam.test.iam_test_case import FakePrestoConn
 from api.iam.test.iam_test_case import IamTestCase
 
 
+class FakeTrinoHandler(BaseHTTPRequestHandler):
+    """Answer every statement with one row, finished in a single response."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        """Record the statement and return a finished query."""
+        statement = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        self.server.statements.append(statement)
+        self.server.client_ports.add(self.client_address[1])
+        query_id = f"20210701_000000_{len(self.server.statements):05d}_fake"
+        body = json.dumps(
+            {
+                "id": query_id,
+                "infoUri": f"http://localhost/ui/query.html?{query_id}",
+                "columns": [{"name": "value", "type": "integer", "typeSignature": {"rawType": "integer"}}],
+                "data": [[1]],
+                "stats": {"state": "FINISHED", "queuedTimeMillis": 250, "elapsedTimeMillis": 400},
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Keep the test output quiet."""
+
+
 class TestPrestoDatabaseUtils(IamTestCase):
     def test_connect(self):
         """
@@ -111,3 +147,75 @@ select a from b;
         conn = FakePrestoConn()
         res = kpdb.executescript(conn, sqlscript)
         self.assertEqual(res, [["eek"], ["eek"]])
+
+    def test_connect_pooled(self):
+        """
+        Test that autocommit connections are reused until the pool is closed
+        """
+        conn = kpdb.connect(schema=self.schema_name, catalog="hive")
+        self.assertIs(kpdb.connect(schema=self.schema_name, catalog="hive"), conn)
+        self.assertIsNot(kpdb.connect(schema="other", catalog="hive"), conn)
+        kpdb.close_pooled_connections()
+        self.assertIsNot(kpdb.connect(schema=self.schema_name, catalog="hive"), conn)
+        kpdb.close_pooled_connections()
+
+    def test_release(self):
+        """
+        Test that released pooled connections stay open and others are closed
+        """
+        conn = kpdb.connect(schema=self.schema_name)
+        with patch.object(conn, "close") as mock_close:
+            kpdb.release(conn)
+            mock_close.assert_not_called()
+        self.assertIs(kpdb.connect(schema=self.schema_name), conn)
+
+        kpdb.close_pooled_connections()
+        with patch.object(conn, "close") as mock_close:
+            kpdb.release(conn)
+            mock_close.assert_called_once()
+
+    @patch.object(kpdb, "CONNECTION_POOL_SIZE", 2)
+    def test_connect_pool_size(self):
+        """
+        Test that the least recently used connection leaves a full pool
+        """
+        conn = kpdb.connect(schema=self.schema_name)
+        other_conn = kpdb.connect(schema="other")
+        self.assertIs(kpdb.connect(schema=self.schema_name), conn)
+        with patch.object(other_conn, "close") as mock_close:
+            kpdb.connect(schema="third")
+            mock_close.assert_called_once()
+        self.assertEqual(len(kpdb._CONNECTION_POOL), 2)
+        self.assertIs(kpdb.connect(schema=self.schema_name), conn)
+        self.assertIsNot(kpdb.connect(schema="other"), other_conn)
+        kpdb.close_pooled_connections()
+
+    def test_executescript_fake_trino_server(self):
+        """
+        Test that statements share one HTTP connection and their statistics are recorded
+        """
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTrinoHandler)
+        server.statements = []
+        server.client_ports = set()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        sample = ("trino_statement_wall_seconds_count", {"statement": "select"})
+        before = REGISTRY.get_sample_value(*sample) or 0
+        try:
+            conn = kpdb.connect(schema=self.schema_name, host="127.0.0.1", port=server.server_address[1])
+            with self.assertLogs("koku.presto_database", level="INFO") as logger:
+                results = kpdb.executescript(conn, "select 1; select 2;")
+                results += kpdb.executescript(
+                    kpdb.connect(schema=self.schema_name, host="127.0.0.1", port=server.server_address[1]), "select 3"
+                )
+        finally:
+            kpdb.close_pooled_connections()
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(results, [[1], [1], [1]])
+        self.assertEqual(server.statements, ["select 1", "select 2", "select 3"])
+        self.assertEqual(len(server.client_ports), 1)
+        self.assertEqual(REGISTRY.get_sample_value(*sample), before + 3)
+        queued = REGISTRY.get_sample_value("trino_statement_queued_seconds_sum", {"statement": "select"})
+        self.assertGreaterEqual(queued, 0.75)
+        self.assertIn("20210701_000000_00003_fake", "".join(logger.output))
@@ -31,6 +31,7 @@ from masu.external.accounts.hierarchy.aws.aws_org_unit_crawler import AWSOrgUnit
 from masu.external.date_accessor import DateAccessor
 from masu.processor import enable_trino_processing
 from masu.processor.orchestrator import Orchestrator
+from masu.processor.report_parquet_processor_base import clear_hive_partition_cache
 from masu.processor.tasks import autovacuum_tune_schema
 from masu.processor.tasks import DEFAULT
 from masu.processor.tasks import PRIORITY_QUEUE
@@ -159,6 +160,7 @@ def delete_archived_data(schema_name, provider_type, provider_uuid):
     for prefix in prefixes:
         LOG.info("Attempting to delete our archived data in S3 under %s", prefix)
         deleted_archived_with_prefix(settings.S3_BUCKET_NAME, prefix)
+    clear_hive_partition_cache(schema_name, provider_uuid)
 
 
 @celery_app.task(
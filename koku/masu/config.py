@@ -44,6 +44,8 @@ class Config:
     # Retention policy for the number of months of report data to keep.
     MASU_RETAIN_NUM_MONTHS = ENVIRONMENT.int("RETAIN_NUM_MONTHS", default=3)
     MASU_RETAIN_NUM_MONTHS_LINE_ITEM_ONLY = ENVIRONMENT.int("RETAIN_NUM_MONTHS", default=1)
+    # Drop the monthly partitions of expired summary data instead of deleting their rows.
+    MASU_EXPIRE_BY_PARTITION = ENVIRONMENT.bool("EXPIRE_BY_PARTITION", default=False)
 
     # TODO: Remove this if/when reporting model files are owned by masu
     # The decimal precision of our database Numeric columns
@@ -5,18 +5,18 @@
 """Database accessor for report data."""
 import json
 import logging
-import pkgutil
 import uuid
 
 from dateutil.parser import parse
 from django.db import connection
 from django.db.models import F
-from jinjasql import JinjaSql
 from tenant_schemas.utils import schema_context
 
+from api.models import Provider
 from masu.config import Config
 from masu.database import AWS_CUR_TABLE_MAP
 from masu.database.report_db_accessor_base import ReportDBAccessorBase
+from masu.database.sql_templates import SQL_TEMPLATES
 from masu.external.date_accessor import DateAccessor
 from reporting.provider.aws.models import AWSCostEntry
 from reporting.provider.aws.models import AWSCostEntryBill
@@ -43,7 +43,7 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
         super().__init__(schema)
         self._datetime_format = Config.AWS_DATETIME_STR_FORMAT
         self.date_accessor = DateAccessor()
-        self.jinja_sql = JinjaSql()
+        self.jinja_sql = SQL_TEMPLATES
 
     @property
     def line_item_daily_summary_table(self):
@@ -191,8 +191,7 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
         """
         table_name = AWS_CUR_TABLE_MAP["line_item_daily"]
 
-        daily_sql = pkgutil.get_data("masu.database", "sql/reporting_awscostentrylineitem_daily.sql")
-        daily_sql = daily_sql.decode("utf-8")
+        daily_sql = SQL_TEMPLATES.get_sql("sql/reporting_awscostentrylineitem_daily.sql")
         daily_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -215,8 +214,7 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
 
         """
         table_name = AWS_CUR_TABLE_MAP["line_item_daily_summary"]
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_awscostentrylineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("sql/reporting_awscostentrylineitem_daily_summary.sql")
         summary_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -240,8 +238,7 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
             (None)
 
         """
-        summary_sql = pkgutil.get_data("masu.database", "presto_sql/reporting_awscostentrylineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("presto_sql/reporting_awscostentrylineitem_daily_summary.sql")
         uuid_str = str(uuid.uuid4()).replace("-", "_")
         summary_sql_params = {
             "uuid": uuid_str,
@@ -274,11 +271,18 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
         """Populate the line item aggregated totals data table."""
         table_name = AWS_CUR_TABLE_MAP["tags_summary"]
 
-        agg_sql = pkgutil.get_data("masu.database", "sql/reporting_awstags_summary.sql")
-        agg_sql = agg_sql.decode("utf-8")
+        agg_sql = SQL_TEMPLATES.get_sql("sql/reporting_awstags_summary.sql")
         agg_sql_params = {"schema": self.schema, "bill_ids": bill_ids, "start_date": start_date, "end_date": end_date}
         agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
         self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
+        self.populate_tag_catalog(
+            Provider.PROVIDER_AWS,
+            table_name,
+            AWS_CUR_TABLE_MAP["bill"],
+            "cost_entry_bill_id",
+            "billing_period_start",
+            bill_ids,
+        )
 
     def populate_ocp_on_aws_cost_daily_summary(self, start_date, end_date, cluster_id, bill_ids, markup_value):
         """Populate the daily cost aggregated summary for OCP on AWS.
@@ -292,8 +296,7 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
 
         """
         table_name = AWS_CUR_TABLE_MAP["ocp_on_aws_daily_summary"]
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpawscostlineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpawscostlineitem_daily_summary.sql")
         summary_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -322,8 +325,7 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
             (None)
 
         """
-        summary_sql = pkgutil.get_data("masu.database", "presto_sql/reporting_ocpawscostlineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("presto_sql/reporting_ocpawscostlineitem_daily_summary.sql")
         summary_sql_params = {
             "schema": self.schema,
             "start_date": start_date,
@@ -342,10 +344,7 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
         """Populate the OCP on AWS and OCP daily summary tables. after populating the project table via trino."""
         table_name = AWS_CUR_TABLE_MAP["ocp_on_aws_daily_summary"]
 
-        sql = pkgutil.get_data(
-            "masu.database", "sql/reporting_ocpawscostentrylineitem_daily_summary_back_populate.sql"
-        )
-        sql = sql.decode("utf-8")
+        sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpawscostentrylineitem_daily_summary_back_populate.sql")
         sql_params = {
             "schema": self.schema,
             "start_date": start_date,
@@ -359,8 +358,7 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
         """Populate the line item aggregated totals data table."""
         table_name = AWS_CUR_TABLE_MAP["ocp_on_aws_tags_summary"]
 
-        agg_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpawstags_summary.sql")
-        agg_sql = agg_sql.decode("utf-8")
+        agg_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpawstags_summary.sql")
         agg_sql_params = {"schema": self.schema, "bill_ids": bill_ids, "start_date": start_date, "end_date": end_date}
         agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
         self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
@@ -391,8 +389,7 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
             (None)
         """
         table_name = AWS_CUR_TABLE_MAP["enabled_tag_keys"]
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_awsenabledtagkeys.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("sql/reporting_awsenabledtagkeys.sql")
         summary_sql_params = {
             "start_date": start_date,
             "end_date": end_date,
@@ -416,10 +413,9 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
             (None)
         """
         table_name = AWS_CUR_TABLE_MAP["line_item_daily_summary"]
-        summary_sql = pkgutil.get_data(
-            "masu.database", "sql/reporting_awscostentryline_item_daily_summary_update_enabled_tags.sql"
+        summary_sql = SQL_TEMPLATES.get_sql(
+            "sql/reporting_awscostentryline_item_daily_summary_update_enabled_tags.sql"
         )
-        summary_sql = summary_sql.decode("utf-8")
         summary_sql_params = {
             "start_date": start_date,
             "end_date": end_date,
@@ -433,8 +429,7 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
 
     def get_openshift_on_cloud_matched_tags(self, aws_bill_id, ocp_report_period_id):
         """Return a list of matched tags."""
-        sql = pkgutil.get_data("masu.database", "sql/reporting_ocpaws_matched_tags.sql")
-        sql = sql.decode("utf-8")
+        sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpaws_matched_tags.sql")
         sql_params = {"bill_id": aws_bill_id, "report_period_id": ocp_report_period_id, "schema": self.schema}
         sql, bind_params = self.jinja_sql.prepare_query(sql, sql_params)
         with connection.cursor() as cursor:
@@ -446,8 +441,7 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
 
     def get_openshift_on_cloud_matched_tags_trino(self, aws_source_uuid, ocp_source_uuid, start_date, end_date):
         """Return a list of matched tags."""
-        sql = pkgutil.get_data("masu.database", "presto_sql/reporting_ocpaws_matched_tags.sql")
-        sql = sql.decode("utf-8")
+        sql = SQL_TEMPLATES.get_sql("presto_sql/reporting_ocpaws_matched_tags.sql")
 
         sql_params = {
             "start_date": start_date,
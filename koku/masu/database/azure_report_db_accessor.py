@@ -5,19 +5,19 @@
 """Database accessor for Azure report data."""
 import json
 import logging
-import pkgutil
 import uuid
 from datetime import datetime
 
 from dateutil.parser import parse
 from django.db import connection
 from django.db.models import F
-from jinjasql import JinjaSql
 from tenant_schemas.utils import schema_context
 
+from api.models import Provider
 from masu.config import Config
 from masu.database import AZURE_REPORT_TABLE_MAP
 from masu.database.report_db_accessor_base import ReportDBAccessorBase
+from masu.database.sql_templates import SQL_TEMPLATES
 from masu.external.date_accessor import DateAccessor
 from reporting.provider.azure.models import AzureCostEntryBill
 from reporting.provider.azure.models import AzureCostEntryLineItemDaily
@@ -41,7 +41,7 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
         super().__init__(schema)
         self._datetime_format = Config.AZURE_DATETIME_STR_FORMAT
         self.date_accessor = DateAccessor()
-        self.jinja_sql = JinjaSql()
+        self.jinja_sql = SQL_TEMPLATES
 
     @property
     def line_item_daily_summary_table(self):
@@ -113,8 +113,7 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
         _end_date = end_date.date() if isinstance(end_date, datetime) else end_date
 
         table_name = AZURE_REPORT_TABLE_MAP["line_item_daily_summary"]
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_azurecostentrylineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("sql/reporting_azurecostentrylineitem_daily_summary.sql")
         summary_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": _start_date,
@@ -138,10 +137,7 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
             (None)
 
         """
-        summary_sql = pkgutil.get_data(
-            "masu.database", "presto_sql/reporting_azurecostentrylineitem_daily_summary.sql"
-        )
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("presto_sql/reporting_azurecostentrylineitem_daily_summary.sql")
         uuid_str = str(uuid.uuid4()).replace("-", "_")
         summary_sql_params = {
             "uuid": uuid_str,
@@ -164,11 +160,18 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
         """Populate the line item aggregated totals data table."""
         table_name = AZURE_REPORT_TABLE_MAP["tags_summary"]
 
-        agg_sql = pkgutil.get_data("masu.database", "sql/reporting_azuretags_summary.sql")
-        agg_sql = agg_sql.decode("utf-8")
+        agg_sql = SQL_TEMPLATES.get_sql("sql/reporting_azuretags_summary.sql")
         agg_sql_params = {"schema": self.schema, "bill_ids": bill_ids, "start_date": start_date, "end_date": end_date}
         agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
         self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
+        self.populate_tag_catalog(
+            Provider.PROVIDER_AZURE,
+            table_name,
+            AZURE_REPORT_TABLE_MAP["bill"],
+            "cost_entry_bill_id",
+            "billing_period_start",
+            bill_ids,
+        )
 
     def get_cost_entry_bills_by_date(self, start_date):
         """Return a cost entry bill for the specified start date."""
@@ -229,8 +232,7 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
 
         """
         table_name = AZURE_REPORT_TABLE_MAP["ocp_on_azure_daily_summary"]
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpazurecostlineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpazurecostlineitem_daily_summary.sql")
         summary_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -250,8 +252,7 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
         """Populate the line item aggregated totals data table."""
         table_name = AZURE_REPORT_TABLE_MAP["ocp_on_azure_tags_summary"]
 
-        agg_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpazuretags_summary.sql")
-        agg_sql = agg_sql.decode("utf-8")
+        agg_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpazuretags_summary.sql")
         agg_sql_params = {"schema": self.schema, "bill_ids": bill_ids, "start_date": start_date, "end_date": end_date}
         agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
         self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
@@ -267,8 +268,7 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
         markup_value,
     ):
         """Populate the daily cost aggregated summary for OCP on Azure."""
-        summary_sql = pkgutil.get_data("masu.database", "presto_sql/reporting_ocpazurecostlineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("presto_sql/reporting_ocpazurecostlineitem_daily_summary.sql")
         summary_sql_params = {
             "uuid": str(openshift_provider_uuid).replace("-", "_"),
             "schema": self.schema,
@@ -294,8 +294,7 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
             (None)
         """
         table_name = AZURE_REPORT_TABLE_MAP["enabled_tag_keys"]
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_azureenabledtagkeys.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("sql/reporting_azureenabledtagkeys.sql")
         summary_sql_params = {
             "start_date": start_date,
             "end_date": end_date,
@@ -317,10 +316,9 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
             (None)
         """
         table_name = AZURE_REPORT_TABLE_MAP["line_item_daily_summary"]
-        summary_sql = pkgutil.get_data(
-            "masu.database", "sql/reporting_azurecostentryline_item_daily_summary_update_enabled_tags.sql"
+        summary_sql = SQL_TEMPLATES.get_sql(
+            "sql/reporting_azurecostentryline_item_daily_summary_update_enabled_tags.sql"
         )
-        summary_sql = summary_sql.decode("utf-8")
         summary_sql_params = {
             "start_date": start_date,
             "end_date": end_date,
@@ -334,8 +332,7 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
 
     def get_openshift_on_cloud_matched_tags(self, azure_bill_id, ocp_report_period_id):
         """Return a list of matched tags."""
-        sql = pkgutil.get_data("masu.database", "sql/reporting_ocpazure_matched_tags.sql")
-        sql = sql.decode("utf-8")
+        sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpazure_matched_tags.sql")
         sql_params = {"bill_id": azure_bill_id, "report_period_id": ocp_report_period_id, "schema": self.schema}
         sql, bind_params = self.jinja_sql.prepare_query(sql, sql_params)
         with connection.cursor() as cursor:
@@ -347,8 +344,7 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
 
     def get_openshift_on_cloud_matched_tags_trino(self, azure_source_uuid, ocp_source_uuid, start_date, end_date):
         """Return a list of matched tags."""
-        sql = pkgutil.get_data("masu.database", "presto_sql/reporting_ocpazure_matched_tags.sql")
-        sql = sql.decode("utf-8")
+        sql = SQL_TEMPLATES.get_sql("presto_sql/reporting_ocpazure_matched_tags.sql")
 
         sql_params = {
             "start_date": start_date,
@@ -368,10 +364,7 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
         """Populate the OCP on AWS and OCP daily summary tables. after populating the project table via trino."""
         table_name = AZURE_REPORT_TABLE_MAP["ocp_on_azure_daily_summary"]
 
-        sql = pkgutil.get_data(
-            "masu.database", "sql/reporting_ocpazurecostentrylineitem_daily_summary_back_populate.sql"
-        )
-        sql = sql.decode("utf-8")
+        sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpazurecostentrylineitem_daily_summary_back_populate.sql")
         sql_params = {
             "schema": self.schema,
             "start_date": start_date,
@@ -92,6 +92,24 @@ class CostModelDBAccessor(KokuDBAccess):
             if metric_constants.SUPPLEMENTARY_COST_TYPE in value.get("tiered_rates").keys()
         }
 
+    @property
+    def infrastructure_tiered_rates(self):
+        """Return the rate tiers designated as infrastructure cost."""
+        return {
+            key: value.get("tiered_rates").get(metric_constants.INFRASTRUCTURE_COST_TYPE)
+            for key, value in self.price_list.items()
+            if metric_constants.INFRASTRUCTURE_COST_TYPE in value.get("tiered_rates").keys()
+        }
+
+    @property
+    def supplementary_tiered_rates(self):
+        """Return the rate tiers designated as supplementary cost."""
+        return {
+            key: value.get("tiered_rates").get(metric_constants.SUPPLEMENTARY_COST_TYPE)
+            for key, value in self.price_list.items()
+            if metric_constants.SUPPLEMENTARY_COST_TYPE in value.get("tiered_rates").keys()
+        }
+
     @property
     def markup(self):
         if self.cost_model:
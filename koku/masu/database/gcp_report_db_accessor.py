@@ -4,17 +4,17 @@
 #
 """Database accessor for GCP report data."""
 import logging
-import pkgutil
 import uuid
 from os import path
 
 from dateutil.parser import parse
 from django.db.models import F
-from jinjasql import JinjaSql
 from tenant_schemas.utils import schema_context
 
+from api.models import Provider
 from masu.database import GCP_REPORT_TABLE_MAP
 from masu.database.report_db_accessor_base import ReportDBAccessorBase
+from masu.database.sql_templates import SQL_TEMPLATES
 from masu.external.date_accessor import DateAccessor
 from reporting.provider.gcp.models import GCPCostEntryBill
 from reporting.provider.gcp.models import GCPCostEntryLineItem
@@ -39,7 +39,7 @@ class GCPReportDBAccessor(ReportDBAccessorBase):
         """
         super().__init__(schema)
         self.date_accessor = DateAccessor()
-        self.jinja_sql = JinjaSql()
+        self.jinja_sql = SQL_TEMPLATES
 
     @property
     def line_item_daily_summary_table(self):
@@ -124,8 +124,7 @@ class GCPReportDBAccessor(ReportDBAccessorBase):
         """
         table_name = GCP_REPORT_TABLE_MAP["line_item_daily"]
 
-        daily_sql = pkgutil.get_data("masu.database", "sql/reporting_gcpcostentrylineitem_daily.sql")
-        daily_sql = daily_sql.decode("utf-8")
+        daily_sql = SQL_TEMPLATES.get_sql("sql/reporting_gcpcostentrylineitem_daily.sql")
         daily_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -169,8 +168,7 @@ class GCPReportDBAccessor(ReportDBAccessorBase):
 
         """
         table_name = GCP_REPORT_TABLE_MAP["line_item_daily_summary"]
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_gcpcostentrylineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("sql/reporting_gcpcostentrylineitem_daily_summary.sql")
         summary_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -194,8 +192,7 @@ class GCPReportDBAccessor(ReportDBAccessorBase):
             (None)
 
         """
-        summary_sql = pkgutil.get_data("masu.database", "presto_sql/reporting_gcpcostentrylineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("presto_sql/reporting_gcpcostentrylineitem_daily_summary.sql")
         uuid_str = str(uuid.uuid4()).replace("-", "_")
         summary_sql_params = {
             "uuid": uuid_str,
@@ -218,11 +215,18 @@ class GCPReportDBAccessor(ReportDBAccessorBase):
         """Populate the line item aggregated totals data table."""
         table_name = GCP_REPORT_TABLE_MAP["tags_summary"]
 
-        agg_sql = pkgutil.get_data("masu.database", "sql/reporting_gcptags_summary.sql")
-        agg_sql = agg_sql.decode("utf-8")
+        agg_sql = SQL_TEMPLATES.get_sql("sql/reporting_gcptags_summary.sql")
         agg_sql_params = {"schema": self.schema, "bill_ids": bill_ids, "start_date": start_date, "end_date": end_date}
         agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
         self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
+        self.populate_tag_catalog(
+            Provider.PROVIDER_GCP,
+            table_name,
+            GCP_REPORT_TABLE_MAP["bill"],
+            "cost_entry_bill_id",
+            "billing_period_start",
+            bill_ids,
+        )
 
     def populate_markup_cost(self, markup, start_date, end_date, bill_ids=None):
         """Set markup costs in the database."""
@@ -288,8 +292,7 @@ class GCPReportDBAccessor(ReportDBAccessorBase):
             (None)
         """
         table_name = GCP_REPORT_TABLE_MAP["enabled_tag_keys"]
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_gcpenabledtagkeys.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("sql/reporting_gcpenabledtagkeys.sql")
         summary_sql_params = {
             "start_date": start_date,
             "end_date": end_date,
@@ -313,10 +316,9 @@ class GCPReportDBAccessor(ReportDBAccessorBase):
             (None)
         """
         table_name = GCP_REPORT_TABLE_MAP["line_item_daily_summary"]
-        summary_sql = pkgutil.get_data(
-            "masu.database", "sql/reporting_gcpcostentryline_item_daily_summary_update_enabled_tags.sql"
+        summary_sql = SQL_TEMPLATES.get_sql(
+            "sql/reporting_gcpcostentryline_item_daily_summary_update_enabled_tags.sql"
         )
-        summary_sql = summary_sql.decode("utf-8")
         summary_sql_params = {
             "start_date": start_date,
             "end_date": end_date,
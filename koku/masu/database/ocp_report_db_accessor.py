@@ -6,9 +6,8 @@
 import datetime
 import json
 import logging
-import pkgutil
 import uuid
-from decimal import Decimal
+from contextlib import contextmanager
 
 import pytz
 from dateutil.parser import parse
@@ -19,18 +18,23 @@ from django.db.models import DecimalField
 from django.db.models import F
 from django.db.models import Sum
 from django.db.models import Value
+from django.db.models.fields.json import KeyTextTransform
 from django.db.models.functions import Coalesce
-from jinjasql import JinjaSql
+from django.db.models.functions import Greatest
+from django.db.models.functions import Least
 from tenant_schemas.utils import schema_context
 
 import koku.presto_database as kpdb
 from api.metrics import constants as metric_constants
+from api.models import Provider
 from api.utils import DateHelper
 from koku.database import JSONBBuildObject
 from masu.config import Config
 from masu.database import AWS_CUR_TABLE_MAP
 from masu.database import OCP_REPORT_TABLE_MAP
 from masu.database.report_db_accessor_base import ReportDBAccessorBase
+from masu.database.sql_templates import SQL_TEMPLATES
+from masu.prometheus_stats import MONTHLY_COST_STATEMENTS_COUNTER
 from masu.util.common import month_date_range_tuple
 from reporting.provider.aws.models import PRESTO_LINE_ITEM_DAILY_TABLE as AWS_PRESTO_LINE_ITEM_DAILY_TABLE
 from reporting.provider.azure.models import PRESTO_LINE_ITEM_DAILY_TABLE as AZURE_PRESTO_LINE_ITEM_DAILY_TABLE
@@ -45,6 +49,17 @@ from reporting.provider.ocp.models import PRESTO_LINE_ITEM_TABLE_DAILY_MAP
 
 LOG = logging.getLogger(__name__)
 
+MONTHLY_COST_FIELD_MAP = {
+    metric_constants.INFRASTRUCTURE_COST_TYPE: "infrastructure_monthly_cost_json",
+    metric_constants.SUPPLEMENTARY_COST_TYPE: "supplementary_monthly_cost_json",
+}
+MONTHLY_COST_DATA_SOURCE_MAP = {"Node": "Pod", "Cluster": "Pod", "PVC": "Storage"}
+MONTHLY_COST_DISTRIBUTION_KEYS = [
+    metric_constants.CPU_DISTRIBUTION,
+    metric_constants.MEMORY_DISTRIBUTION,
+    metric_constants.PVC_DISTRIBUTION,
+]
+
 
 def create_filter(data_source, start_date, end_date, cluster_id):
     """Create filter with data source, start and end dates."""
@@ -69,7 +84,7 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         """
         super().__init__(schema)
         self._datetime_format = Config.OCP_DATETIME_STR_FORMAT
-        self.jinja_sql = JinjaSql()
+        self.jinja_sql = SQL_TEMPLATES
         self.date_helper = DateHelper()
 
     @property
@@ -330,8 +345,7 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
 
         table_name = OCP_REPORT_TABLE_MAP["line_item_daily"]
 
-        daily_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpusagelineitem_daily.sql")
-        daily_sql = daily_sql.decode("utf-8")
+        daily_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpusagelineitem_daily.sql")
         daily_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -352,10 +366,7 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             (None)
         """
         table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
-        summary_sql = pkgutil.get_data(
-            "masu.database", "sql/reporting_ocpusagelineitem_daily_summary_update_enabled_tags.sql"
-        )
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpusagelineitem_daily_summary_update_enabled_tags.sql")
         summary_sql_params = {
             "start_date": start_date,
             "end_date": end_date,
@@ -388,8 +399,7 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         if isinstance(start_date, str):
             start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
             end_date = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
-        infra_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpinfrastructure_provider_map.sql")
-        infra_sql = infra_sql.decode("utf-8")
+        infra_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpinfrastructure_provider_map.sql")
         infra_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -441,8 +451,7 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         if isinstance(start_date, str):
             start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
             end_date = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
-        infra_sql = pkgutil.get_data("masu.database", "presto_sql/reporting_ocpinfrastructure_provider_map.sql")
-        infra_sql = infra_sql.decode("utf-8")
+        infra_sql = SQL_TEMPLATES.get_sql("presto_sql/reporting_ocpinfrastructure_provider_map.sql")
         infra_sql_params = {
             "start_date": start_date,
             "end_date": end_date,
@@ -486,8 +495,7 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             end_date = end_date.date()
         table_name = OCP_REPORT_TABLE_MAP["storage_line_item_daily"]
 
-        daily_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpstoragelineitem_daily.sql")
-        daily_sql = daily_sql.decode("utf-8")
+        daily_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpstoragelineitem_daily.sql")
         daily_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -511,8 +519,7 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         """
         table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
 
-        daily_charge_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpusagelineitem_daily_pod_charge.sql")
-        charge_line_sql = daily_charge_sql.decode("utf-8")
+        charge_line_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpusagelineitem_daily_pod_charge.sql")
         charge_line_sql_params = {"cpu_temp": cpu_temp_table, "mem_temp": mem_temp_table, "schema": self.schema}
         charge_line_sql, charge_line_sql_params = self.jinja_sql.prepare_query(charge_line_sql, charge_line_sql_params)
         self._execute_raw_sql_query(table_name, charge_line_sql, bind_params=list(charge_line_sql_params))
@@ -529,8 +536,7 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         """
         table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
 
-        daily_charge_sql = pkgutil.get_data("masu.database", "sql/reporting_ocp_storage_charge.sql")
-        charge_line_sql = daily_charge_sql.decode("utf-8")
+        charge_line_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocp_storage_charge.sql")
         charge_line_sql_params = {"temp_table": temp_table_name, "schema": self.schema}
         charge_line_sql, charge_line_sql_params = self.jinja_sql.prepare_query(charge_line_sql, charge_line_sql_params)
         self._execute_raw_sql_query(table_name, charge_line_sql, bind_params=list(charge_line_sql_params))
@@ -557,8 +563,7 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             end_date = end_date.date()
         table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
 
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpusagelineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpusagelineitem_daily_summary.sql")
         summary_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -594,8 +599,7 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             end_date = end_date.date()
         table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
 
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpstoragelineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        summary_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpstoragelineitem_daily_summary.sql")
         summary_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -632,8 +636,7 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             start_date = start_date.date()
             end_date = end_date.date()
 
-        tmpl_summary_sql = pkgutil.get_data("masu.database", "presto_sql/reporting_ocpusagelineitem_daily_summary.sql")
-        tmpl_summary_sql = tmpl_summary_sql.decode("utf-8")
+        tmpl_summary_sql = SQL_TEMPLATES.get_sql("presto_sql/reporting_ocpusagelineitem_daily_summary.sql")
         summary_sql_params = {
             "uuid": str(source).replace("-", "_"),
             "start_date": start_date,
@@ -667,8 +670,8 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             LOG.info("PRESTO OCP: Commit actions")
             presto_conn.commit()
         finally:
-            LOG.info("PRESTO OCP: Close connection")
-            presto_conn.close()
+            LOG.info("PRESTO OCP: Release connection")
+            kpdb.release(presto_conn)
 
     def populate_pod_label_summary_table_presto(self, report_period_ids, start_date, end_date, source):
         """
@@ -691,8 +694,7 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             start_date = start_date.date()
             end_date = end_date.date()
 
-        agg_sql = pkgutil.get_data("masu.database", "presto_sql/reporting_ocp_usage_label_summary.sql")
-        agg_sql = agg_sql.decode("utf-8")
+        agg_sql = SQL_TEMPLATES.get_sql("presto_sql/reporting_ocp_usage_label_summary.sql")
         agg_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "schema": self.schema,
@@ -722,8 +724,8 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             LOG.info("PRESTO OCP: Commit actions")
             presto_conn.commit()
         finally:
-            LOG.info("PRESTO OCP: Close connection")
-            presto_conn.close()
+            LOG.info("PRESTO OCP: Release connection")
+            kpdb.release(presto_conn)
 
     def get_cost_summary_for_clusterid(self, cluster_identifier):
         """Get the cost summary for a cluster id query."""
@@ -736,8 +738,7 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         """Populate the line item aggregated totals data table."""
         table_name = OCP_REPORT_TABLE_MAP["pod_label_summary"]
 
-        agg_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpusagepodlabel_summary.sql")
-        agg_sql = agg_sql.decode("utf-8")
+        agg_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpusagepodlabel_summary.sql")
         agg_sql_params = {
             "schema": self.schema,
             "report_period_ids": report_period_ids,
@@ -746,13 +747,21 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         }
         agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
         self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
+        self.populate_tag_catalog(
+            Provider.PROVIDER_OCP,
+            table_name,
+            OCP_REPORT_TABLE_MAP["report_period"],
+            "report_period_id",
+            "report_period_start",
+            report_period_ids,
+            tag_type="pod",
+        )
 
     def populate_volume_label_summary_table(self, report_period_ids, start_date, end_date):
         """Populate the OCP volume label summary table."""
         table_name = OCP_REPORT_TABLE_MAP["volume_label_summary"]
 
-        agg_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpstoragevolumelabel_summary.sql")
-        agg_sql = agg_sql.decode("utf-8")
+        agg_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpstoragevolumelabel_summary.sql")
         agg_sql_params = {
             "schema": self.schema,
             "report_period_ids": report_period_ids,
@@ -761,6 +770,15 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         }
         agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
         self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
+        self.populate_tag_catalog(
+            Provider.PROVIDER_OCP,
+            table_name,
+            OCP_REPORT_TABLE_MAP["report_period"],
+            "report_period_id",
+            "report_period_start",
+            report_period_ids,
+            tag_type="storage",
+        )
 
     def populate_markup_cost(self, markup, start_date, end_date, cluster_id):
         """Set markup cost for OCP including infrastructure cost markup."""
@@ -804,22 +822,142 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             )
             return [(pvc[0], pvc[1], pvc[2]) for pvc in unique_pvcs]
 
-    def generate_monthly_cost_json_object(self, distribution, distributed_cost):
-        """Generates the default monthly cost dict."""
-        default_cost = Decimal(0)
-        if not isinstance(distributed_cost, Decimal) and distributed_cost:
-            distributed_cost = Decimal(distributed_cost)
-        if not distributed_cost:
-            distributed_cost = default_cost
-        cost_mapping = {distribution: distributed_cost}
-        return JSONBBuildObject(
-            Value(metric_constants.CPU_DISTRIBUTION),
-            cost_mapping.get(metric_constants.CPU_DISTRIBUTION, default_cost),
-            Value(metric_constants.MEMORY_DISTRIBUTION),
-            cost_mapping.get(metric_constants.MEMORY_DISTRIBUTION, default_cost),
-            Value(metric_constants.PVC_DISTRIBUTION),
-            cost_mapping.get(metric_constants.PVC_DISTRIBUTION, default_cost),
+    @contextmanager
+    def _count_monthly_cost_statements(self, cost_type):
+        """Count the statements issued while populating the monthly cost of a cost type."""
+
+        def count_statement(execute, sql, params, many, context):
+            MONTHLY_COST_STATEMENTS_COUNTER.labels(cost_type=cost_type).inc()
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_statement):
+            yield
+
+    def _upsert_monthly_cost_line_items(
+        self,
+        start_date,
+        report_period,
+        cluster_id,
+        cluster_alias,
+        monthly_cost_type,
+        rate_type,
+        distribution,
+        line_items,
+        accumulate=False,
+        match_node=True,
+    ):
+        """Update or insert the monthly cost line items of a cost type with a single statement.
+
+        args:
+            start_date (datetime): The first day of the month
+            report_period (OCPUsageReportPeriod): The report period of the cluster
+            cluster_id (str): The id of the cluster
+            cluster_alias: The name of the cluster
+            monthly_cost_type (str): The type of monthly cost. ex: "Node"
+            rate_type (str): Infrastructure or Supplementary
+            distribution: Choice of monthly distribution ex. memory
+            line_items (list): dicts of node, persistentvolumeclaim, namespace, and cost
+            accumulate (bool): Add the cost to the existing cost instead of replacing it
+            match_node (bool): Match existing line items on node, otherwise update any one of them
+        """
+        cost_field = MONTHLY_COST_FIELD_MAP.get(rate_type)
+        if not cost_field or not line_items:
+            return
+        if isinstance(start_date, datetime.datetime):
+            start_date = start_date.date()
+        for line_item in line_items:
+            line_item["uuid"] = str(uuid.uuid4())
+            line_item.setdefault("node")
+            line_item.setdefault("persistentvolumeclaim")
+            line_item.setdefault("namespace")
+
+        table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
+        monthly_cost_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpusagelineitem_daily_summary_monthly_cost.sql")
+        monthly_cost_sql_params = {
+            "schema": self.schema,
+            "start_date": start_date,
+            "report_period_id": report_period.id if report_period else None,
+            "cluster_id": cluster_id,
+            "cluster_alias": cluster_alias,
+            "monthly_cost_type": monthly_cost_type,
+            "data_source": MONTHLY_COST_DATA_SOURCE_MAP.get(monthly_cost_type),
+            "cost_field": cost_field,
+            "distribution": distribution,
+            "distribution_keys": MONTHLY_COST_DISTRIBUTION_KEYS,
+            "accumulate": accumulate,
+            "match_node": match_node,
+            "line_items": line_items,
+        }
+        monthly_cost_sql, monthly_cost_sql_params = self.jinja_sql.prepare_query(
+            monthly_cost_sql, monthly_cost_sql_params
         )
+        LOG.info(
+            "Upserting %s %s monthly cost line items for cluster %s.",
+            len(line_items),
+            monthly_cost_type,
+            cluster_id,
+        )
+        self._execute_raw_sql_query(table_name, monthly_cost_sql, bind_params=list(monthly_cost_sql_params))
+
+    def _get_monthly_tag_cost_label_values(
+        self, start_date, end_date, report_period, cluster_id, cluster_alias, tag_key, labels_field, entity_fields
+    ):
+        """Return the distinct (*entity_fields, tag value) rows of line items that carry the tag key."""
+        filters = {
+            "usage_start__gte": start_date,
+            "usage_end__lte": end_date,
+            "report_period": report_period,
+            "cluster_id": cluster_id,
+            "cluster_alias": cluster_alias,
+            f"{labels_field}__has_key": tag_key,
+        }
+        for field in entity_fields:
+            # PVC line items may not have a node, matching get_distinct_pvcs
+            if field != "node" or "persistentvolumeclaim" not in entity_fields:
+                filters[f"{field}__isnull"] = False
+        with schema_context(self.schema):
+            return list(
+                OCPUsageLineItemDailySummary.objects.filter(**filters)
+                .annotate(tag_value=KeyTextTransform(tag_key, labels_field))
+                .values_list(*entity_fields, "tag_value")
+                .distinct()
+            )
+
+    def _get_monthly_tag_costs(
+        self, start_date, end_date, report_period, cluster_id, cluster_alias, rate_dict, labels_field, entity_fields
+    ):
+        """Return {entity: cost} summed over the tag key:value rates found on each entity's line items.
+
+        One query per tag key returns every entity/value pair, instead of
+        checking each entity against each tag value.
+        """
+        costs = {}
+        for tag_key, tag_values in (rate_dict or {}).items():
+            label_values = self._get_monthly_tag_cost_label_values(
+                start_date, end_date, report_period, cluster_id, cluster_alias, tag_key, labels_field, entity_fields
+            )
+            for *entity, tag_value in label_values:
+                if tag_value in tag_values:
+                    entity = tuple(entity)
+                    costs[entity] = costs.get(entity, 0) + tag_values.get(tag_value)
+        return costs
+
+    def _get_monthly_tag_default_costs(
+        self, start_date, end_date, report_period, cluster_id, cluster_alias, rate_dict, labels_field, entity_fields
+    ):
+        """Return {entity: cost} of the default tag rate for every undefined tag value on each entity."""
+        costs = {}
+        for tag_key, tag_values in (rate_dict or {}).items():
+            tag_default = tag_values.get("default_value")
+            values_to_skip = set(tag_values.get("defined_keys", []))
+            label_values = self._get_monthly_tag_cost_label_values(
+                start_date, end_date, report_period, cluster_id, cluster_alias, tag_key, labels_field, entity_fields
+            )
+            for *entity, tag_value in label_values:
+                if tag_value not in values_to_skip:
+                    entity = tuple(entity)
+                    costs[entity] = costs.get(entity, 0) + tag_default
+        return costs
 
     def populate_monthly_cost(
         self, cost_type, rate_type, rate, start_date, end_date, cluster_id, cluster_alias, distribution
@@ -850,31 +988,44 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         end_date = datetime.datetime(*end_date.timetuple()[:3]).replace(hour=23, minute=59, second=59, tzinfo=pytz.UTC)
 
         # Calculate monthly cost for each month from start date to end date
-        for curr_month in rrule(freq=MONTHLY, until=end_date, dtstart=first_month):
-            first_curr_month, first_next_month = month_date_range_tuple(curr_month)
-            LOG.info("Populating monthly cost from %s to %s.", first_curr_month, first_next_month)
-            if cost_type == "Node":
-                if rate is None:
-                    self.remove_monthly_cost(first_curr_month, first_next_month, cluster_id, cost_type)
-                else:
-                    self.upsert_monthly_node_cost_line_item(
-                        first_curr_month, first_next_month, cluster_id, cluster_alias, rate_type, rate, distribution
-                    )
-            elif cost_type == "Cluster":
-                if rate is None:
-                    self.remove_monthly_cost(first_curr_month, first_next_month, cluster_id, cost_type)
-                else:
-                    # start_date, end_date, cluster_id, cluster_alias, rate_type, cluster_cost
-                    self.upsert_monthly_cluster_cost_line_item(
-                        first_curr_month, first_next_month, cluster_id, cluster_alias, rate_type, rate, distribution
-                    )
-            elif cost_type == "PVC":
-                if rate is None:
-                    self.remove_monthly_cost(first_curr_month, first_next_month, cluster_id, cost_type)
-                else:
-                    self.upsert_monthly_pvc_cost_line_item(
-                        first_curr_month, first_next_month, cluster_id, cluster_alias, rate_type, rate
-                    )
+        with self._count_monthly_cost_statements(cost_type):
+            for curr_month in rrule(freq=MONTHLY, until=end_date, dtstart=first_month):
+                first_curr_month, first_next_month = month_date_range_tuple(curr_month)
+                LOG.info("Populating monthly cost from %s to %s.", first_curr_month, first_next_month)
+                if cost_type == "Node":
+                    if rate is None:
+                        self.remove_monthly_cost(first_curr_month, first_next_month, cluster_id, cost_type)
+                    else:
+                        self.upsert_monthly_node_cost_line_item(
+                            first_curr_month,
+                            first_next_month,
+                            cluster_id,
+                            cluster_alias,
+                            rate_type,
+                            rate,
+                            distribution,
+                        )
+                elif cost_type == "Cluster":
+                    if rate is None:
+                        self.remove_monthly_cost(first_curr_month, first_next_month, cluster_id, cost_type)
+                    else:
+                        # start_date, end_date, cluster_id, cluster_alias, rate_type, cluster_cost
+                        self.upsert_monthly_cluster_cost_line_item(
+                            first_curr_month,
+                            first_next_month,
+                            cluster_id,
+                            cluster_alias,
+                            rate_type,
+                            rate,
+                            distribution,
+                        )
+                elif cost_type == "PVC":
+                    if rate is None:
+                        self.remove_monthly_cost(first_curr_month, first_next_month, cluster_id, cost_type)
+                    else:
+                        self.upsert_monthly_pvc_cost_line_item(
+                            first_curr_month, first_next_month, cluster_id, cluster_alias, rate_type, rate
+                        )
 
     def populate_monthly_tag_cost(
         self, cost_type, rate_type, rate_dict, start_date, end_date, cluster_id, cluster_alias, distribution
@@ -895,21 +1046,34 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         first_month = datetime.datetime(*start_date.replace(day=1).timetuple()[:3]).replace(tzinfo=pytz.UTC)
         end_date = datetime.datetime(*end_date.timetuple()[:3]).replace(hour=23, minute=59, second=59, tzinfo=pytz.UTC)
         # Calculate monthly cost for each month from start date to end date for each tag key:value pair in the rate
-        for curr_month in rrule(freq=MONTHLY, until=end_date, dtstart=first_month):
-            first_curr_month, first_next_month = month_date_range_tuple(curr_month)
-            LOG.info("Populating monthly tag based cost from %s to %s.", first_curr_month, first_next_month)
-            if cost_type == "Node":
-                self.tag_upsert_monthly_node_cost_line_item(
-                    first_curr_month, first_next_month, cluster_id, cluster_alias, rate_type, rate_dict, distribution
-                )
-            elif cost_type == "Cluster":
-                self.tag_upsert_monthly_cluster_cost_line_item(
-                    first_curr_month, first_next_month, cluster_id, cluster_alias, rate_type, rate_dict, distribution
-                )
-            elif cost_type == "PVC":
-                self.tag_upsert_monthly_pvc_cost_line_item(
-                    first_curr_month, first_next_month, cluster_id, cluster_alias, rate_type, rate_dict
-                )
+        with self._count_monthly_cost_statements(cost_type):
+            for curr_month in rrule(freq=MONTHLY, until=end_date, dtstart=first_month):
+                first_curr_month, first_next_month = month_date_range_tuple(curr_month)
+                LOG.info("Populating monthly tag based cost from %s to %s.", first_curr_month, first_next_month)
+                if cost_type == "Node":
+                    self.tag_upsert_monthly_node_cost_line_item(
+                        first_curr_month,
+                        first_next_month,
+                        cluster_id,
+                        cluster_alias,
+                        rate_type,
+                        rate_dict,
+                        distribution,
+                    )
+                elif cost_type == "Cluster":
+                    self.tag_upsert_monthly_cluster_cost_line_item(
+                        first_curr_month,
+                        first_next_month,
+                        cluster_id,
+                        cluster_alias,
+                        rate_type,
+                        rate_dict,
+                        distribution,
+                    )
+                elif cost_type == "PVC":
+                    self.tag_upsert_monthly_pvc_cost_line_item(
+                        first_curr_month, first_next_month, cluster_id, cluster_alias, rate_type, rate_dict
+                    )
 
     def populate_monthly_tag_default_cost(
         self, cost_type, rate_type, rate_dict, start_date, end_date, cluster_id, cluster_alias, distribution
@@ -930,21 +1094,36 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         first_month = datetime.datetime(*start_date.replace(day=1).timetuple()[:3]).replace(tzinfo=pytz.UTC)
         end_date = datetime.datetime(*end_date.timetuple()[:3]).replace(hour=23, minute=59, second=59, tzinfo=pytz.UTC)
         # Calculate monthly cost for each month from start date to end date for each tag key:value pair in the rate
-        for curr_month in rrule(freq=MONTHLY, until=end_date, dtstart=first_month):
-            first_curr_month, first_next_month = month_date_range_tuple(curr_month)
-            LOG.info("Populating monthly tag based default cost from %s to %s.", first_curr_month, first_next_month)
-            if cost_type == "Node":
-                self.tag_upsert_monthly_default_node_cost_line_item(
-                    first_curr_month, first_next_month, cluster_id, cluster_alias, rate_type, rate_dict, distribution
-                )
-            elif cost_type == "Cluster":
-                self.tag_upsert_monthly_default_cluster_cost_line_item(
-                    first_curr_month, first_next_month, cluster_id, cluster_alias, rate_type, rate_dict, distribution
-                )
-            elif cost_type == "PVC":
-                self.tag_upsert_monthly_default_pvc_cost_line_item(
-                    first_curr_month, first_next_month, cluster_id, cluster_alias, rate_type, rate_dict
+        with self._count_monthly_cost_statements(cost_type):
+            for curr_month in rrule(freq=MONTHLY, until=end_date, dtstart=first_month):
+                first_curr_month, first_next_month = month_date_range_tuple(curr_month)
+                LOG.info(
+                    "Populating monthly tag based default cost from %s to %s.", first_curr_month, first_next_month
                 )
+                if cost_type == "Node":
+                    self.tag_upsert_monthly_default_node_cost_line_item(
+                        first_curr_month,
+                        first_next_month,
+                        cluster_id,
+                        cluster_alias,
+                        rate_type,
+                        rate_dict,
+                        distribution,
+                    )
+                elif cost_type == "Cluster":
+                    self.tag_upsert_monthly_default_cluster_cost_line_item(
+                        first_curr_month,
+                        first_next_month,
+                        cluster_id,
+                        cluster_alias,
+                        rate_type,
+                        rate_dict,
+                        distribution,
+                    )
+                elif cost_type == "PVC":
+                    self.tag_upsert_monthly_default_pvc_cost_line_item(
+                        first_curr_month, first_next_month, cluster_id, cluster_alias, rate_type, rate_dict
+                    )
 
     def upsert_monthly_node_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, node_cost, distribution
@@ -952,40 +1131,13 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         """Update or insert daily summary line item for node cost."""
         unique_nodes = self.get_distinct_nodes(start_date, end_date, cluster_id)
         report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            for node in unique_nodes:
-                line_item = OCPUsageLineItemDailySummary.objects.filter(
-                    usage_start=start_date,
-                    usage_end=start_date,
-                    report_period=report_period,
-                    cluster_id=cluster_id,
-                    cluster_alias=cluster_alias,
-                    monthly_cost_type="Node",
-                    node=node,
-                    data_source="Pod",
-                ).first()
-                if not line_item:
-                    line_item = OCPUsageLineItemDailySummary(
-                        uuid=uuid.uuid4(),
-                        usage_start=start_date,
-                        usage_end=start_date,
-                        report_period=report_period,
-                        cluster_id=cluster_id,
-                        cluster_alias=cluster_alias,
-                        monthly_cost_type="Node",
-                        node=node,
-                        data_source="Pod",
-                    )
-                monthly_cost = self.generate_monthly_cost_json_object(distribution, node_cost)
-                if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                    LOG.info("Node (%s) has a monthly infrastructure cost of %s.", node, node_cost)
-                    line_item.infrastructure_monthly_cost_json = monthly_cost
-                elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                    LOG.info("Node (%s) has a monthly supplemenarty cost of %s.", node, node_cost)
-                    line_item.supplementary_monthly_cost_json = monthly_cost
-                line_item.save()
-
-    def tag_upsert_monthly_node_cost_line_item(  # noqa: C901
+        LOG.info("%s nodes have a monthly %s cost of %s.", len(unique_nodes), rate_type, node_cost)
+        line_items = [{"node": node, "cost": node_cost} for node in unique_nodes]
+        self._upsert_monthly_cost_line_items(
+            start_date, report_period, cluster_id, cluster_alias, "Node", rate_type, distribution, line_items
+        )
+
+    def tag_upsert_monthly_node_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, rate_dict, distribution
     ):
         """
@@ -995,69 +1147,24 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         that contains the tag key:value pair,
         if it does then the price is added to the monthly cost.
         """
-        unique_nodes = self.get_distinct_nodes(start_date, end_date, cluster_id)
         report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            for node in unique_nodes:
-                if rate_dict is not None:
-                    for tag_key in rate_dict:
-                        tag_values = rate_dict.get(tag_key)
-                        for value_name, rate_value in tag_values.items():
-                            # this makes sure that there is an entry for that node
-                            # that contains the specified key_value pair
-                            item_check = OCPUsageLineItemDailySummary.objects.filter(
-                                usage_start__gte=start_date,
-                                usage_end__lte=end_date,
-                                report_period=report_period,
-                                cluster_id=cluster_id,
-                                cluster_alias=cluster_alias,
-                                node=node,
-                                pod_labels__contains={tag_key: value_name},
-                            ).first()
-                            if item_check:
-                                line_item = OCPUsageLineItemDailySummary.objects.filter(
-                                    usage_start=start_date,
-                                    usage_end=start_date,
-                                    report_period=report_period,
-                                    cluster_id=cluster_id,
-                                    cluster_alias=cluster_alias,
-                                    monthly_cost_type="Node",
-                                    node=node,
-                                    data_source="Pod",
-                                ).first()
-                                if not line_item:
-                                    line_item = OCPUsageLineItemDailySummary(
-                                        uuid=uuid.uuid4(),
-                                        usage_start=start_date,
-                                        usage_end=start_date,
-                                        report_period=report_period,
-                                        cluster_id=cluster_id,
-                                        cluster_alias=cluster_alias,
-                                        monthly_cost_type="Node",
-                                        node=node,
-                                        data_source="Pod",
-                                    )
-                                node_cost = rate_value
-                                if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                                    LOG.info("Node (%s) has a monthly infrastructure cost of %s.", node, rate_value)
-                                    if line_item.infrastructure_monthly_cost_json:
-                                        node_cost = (
-                                            line_item.infrastructure_monthly_cost_json.get(distribution, 0)
-                                            + rate_value
-                                        )
-                                    monthly_cost = self.generate_monthly_cost_json_object(distribution, node_cost)
-                                    line_item.infrastructure_monthly_cost_json = monthly_cost
-                                elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                                    LOG.info("Node (%s) has a monthly supplemenarty cost of %s.", node, rate_value)
-                                    if line_item.supplementary_monthly_cost_json:
-                                        node_cost = (
-                                            line_item.supplementary_monthly_cost_json.get(distribution, 0) + rate_value
-                                        )
-                                    monthly_cost = self.generate_monthly_cost_json_object(distribution, node_cost)
-                                    line_item.supplementary_monthly_cost_json = monthly_cost
-                                line_item.save()
-
-    def tag_upsert_monthly_default_node_cost_line_item(  # noqa: C901
+        node_costs = self._get_monthly_tag_costs(
+            start_date, end_date, report_period, cluster_id, cluster_alias, rate_dict, "pod_labels", ["node"]
+        )
+        line_items = [{"node": node, "cost": cost} for (node,), cost in node_costs.items()]
+        self._upsert_monthly_cost_line_items(
+            start_date,
+            report_period,
+            cluster_id,
+            cluster_alias,
+            "Node",
+            rate_type,
+            distribution,
+            line_items,
+            accumulate=True,
+        )
+
+    def tag_upsert_monthly_default_node_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, rate_dict, distribution
     ):
         """
@@ -1066,79 +1173,24 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         that contains the tag key:value pair,
         if it does then the price is added to the monthly cost.
         """
-        unique_nodes = self.get_distinct_nodes(start_date, end_date, cluster_id)
         report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            for node in unique_nodes:
-                if rate_dict is not None:
-                    for tag_key in rate_dict:
-                        tag_values = rate_dict.get(tag_key)
-                        tag_default = tag_values.get("default_value")
-                        values_to_skip = tag_values.get("defined_keys")
-                        item_check = OCPUsageLineItemDailySummary.objects.filter(
-                            usage_start__gte=start_date,
-                            usage_end__lte=end_date,
-                            report_period=report_period,
-                            cluster_id=cluster_id,
-                            cluster_alias=cluster_alias,
-                            node=node,
-                            pod_labels__has_key=tag_key,
-                        )
-                        for value in values_to_skip:
-                            item_check = item_check.exclude(pod_labels__contains={tag_key: value})
-                        # this won't run if there are no matching items and item_check will continue to be
-                        # filtered until there are no items left
-                        while item_check:
-                            # get the first value for our tag key and exclude it from the queryset for the next check
-                            # will remove values until there are none left
-                            tag_key_value = item_check.first().pod_labels.get(tag_key)
-                            item_check = item_check.exclude(pod_labels__contains={tag_key: tag_key_value})
-                            line_item = OCPUsageLineItemDailySummary.objects.filter(
-                                usage_start=start_date,
-                                usage_end=start_date,
-                                report_period=report_period,
-                                cluster_id=cluster_id,
-                                cluster_alias=cluster_alias,
-                                monthly_cost_type="Node",
-                                node=node,
-                                data_source="Pod",
-                            ).first()
-                            if not line_item:
-                                line_item = OCPUsageLineItemDailySummary(
-                                    uuid=uuid.uuid4(),
-                                    usage_start=start_date,
-                                    usage_end=start_date,
-                                    report_period=report_period,
-                                    cluster_id=cluster_id,
-                                    cluster_alias=cluster_alias,
-                                    monthly_cost_type="Node",
-                                    node=node,
-                                    data_source="Pod",
-                                )
-                            node_cost = tag_default
-                            if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                                LOG.info(
-                                    "Node (%s) has a default monthly infrastructure cost of %s.", node, tag_default
-                                )
-                                if line_item.infrastructure_monthly_cost_json:
-                                    node_cost = (
-                                        line_item.infrastructure_monthly_cost_json.get(distribution, 0) + tag_default
-                                    )
-                                monthly_cost = self.generate_monthly_cost_json_object(distribution, node_cost)
-                                line_item.infrastructure_monthly_cost_json = monthly_cost
-                            elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                                LOG.info(
-                                    "Node (%s) has a default monthly supplemenarty cost of %s.", node, tag_default
-                                )
-                                if line_item.supplementary_monthly_cost_json:
-                                    node_cost = (
-                                        line_item.supplementary_monthly_cost_json.get(distribution, 0) + tag_default
-                                    )
-                                monthly_cost = self.generate_monthly_cost_json_object(distribution, node_cost)
-                                line_item.supplementary_monthly_cost_json = monthly_cost
-                            line_item.save()
-
-    def tag_upsert_monthly_default_pvc_cost_line_item(  # noqa: C901
+        node_costs = self._get_monthly_tag_default_costs(
+            start_date, end_date, report_period, cluster_id, cluster_alias, rate_dict, "pod_labels", ["node"]
+        )
+        line_items = [{"node": node, "cost": cost} for (node,), cost in node_costs.items()]
+        self._upsert_monthly_cost_line_items(
+            start_date,
+            report_period,
+            cluster_id,
+            cluster_alias,
+            "Node",
+            rate_type,
+            distribution,
+            line_items,
+            accumulate=True,
+        )
+
+    def tag_upsert_monthly_default_pvc_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, rate_dict
     ):
         """
@@ -1147,80 +1199,32 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         that contains the tag key:value pair,
         if it does then the price is added to the monthly cost.
         """
-        distribution = metric_constants.PVC_DISTRIBUTION
-        unique_pvcs = self.get_distinct_pvcs(start_date, end_date, cluster_id)
         report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            for pvc, node, namespace in unique_pvcs:
-                if rate_dict is not None:
-                    for tag_key in rate_dict:
-                        tag_values = rate_dict.get(tag_key)
-                        tag_default = tag_values.get("default_value")
-                        values_to_skip = tag_values.get("defined_keys")
-                        item_check = OCPUsageLineItemDailySummary.objects.filter(
-                            usage_start__gte=start_date,
-                            usage_end__lte=end_date,
-                            report_period=report_period,
-                            cluster_id=cluster_id,
-                            cluster_alias=cluster_alias,
-                            persistentvolumeclaim=pvc,
-                            node=node,
-                            volume_labels__has_key=tag_key,
-                            namespace=namespace,
-                        )
-                        for value in values_to_skip:
-                            item_check = item_check.exclude(volume_labels__contains={tag_key: value})
-                        # this won't run if there are no matching items and item_check will continue to be
-                        # filtered until there are no items left
-                        while item_check:
-                            # get the first value for our tag key and exclude it from the queryset for the next check
-                            # will remove values until there are none left
-                            tag_key_value = item_check.first().volume_labels.get(tag_key)
-                            item_check = item_check.exclude(volume_labels__contains={tag_key: tag_key_value})
-                            line_item = OCPUsageLineItemDailySummary.objects.filter(
-                                usage_start=start_date,
-                                usage_end=start_date,
-                                report_period=report_period,
-                                cluster_id=cluster_id,
-                                cluster_alias=cluster_alias,
-                                monthly_cost_type="PVC",
-                                persistentvolumeclaim=pvc,
-                                node=node,
-                                data_source="Storage",
-                                namespace=namespace,
-                            ).first()
-                            if not line_item:
-                                line_item = OCPUsageLineItemDailySummary(
-                                    uuid=uuid.uuid4(),
-                                    usage_start=start_date,
-                                    usage_end=start_date,
-                                    report_period=report_period,
-                                    cluster_id=cluster_id,
-                                    cluster_alias=cluster_alias,
-                                    monthly_cost_type="PVC",
-                                    persistentvolumeclaim=pvc,
-                                    node=node,
-                                    data_source="Storage",
-                                    namespace=namespace,
-                                )
-                            pvc_cost = tag_default
-                            if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                                LOG.info("PVC (%s) has a default monthly infrastructure cost of %s.", pvc, tag_default)
-                                if line_item.infrastructure_monthly_cost_json:
-                                    pvc_cost = (
-                                        line_item.infrastructure_monthly_cost_json.get(distribution, 0) + tag_default
-                                    )
-                                monthly_cost = self.generate_monthly_cost_json_object(distribution, pvc_cost)
-                                line_item.infrastructure_monthly_cost_json = monthly_cost
-                            elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                                LOG.info("PVC (%s) has a default monthly supplemenarty cost of %s.", pvc, tag_default)
-                                if line_item.supplementary_monthly_cost_json:
-                                    pvc_cost = (
-                                        line_item.supplementary_monthly_cost_json.get(distribution, 0) + tag_default
-                                    )
-                                monthly_cost = self.generate_monthly_cost_json_object(distribution, pvc_cost)
-                                line_item.supplementary_monthly_cost_json = monthly_cost
-                            line_item.save()
+        pvc_costs = self._get_monthly_tag_default_costs(
+            start_date,
+            end_date,
+            report_period,
+            cluster_id,
+            cluster_alias,
+            rate_dict,
+            "volume_labels",
+            ["persistentvolumeclaim", "node", "namespace"],
+        )
+        line_items = [
+            {"persistentvolumeclaim": pvc, "node": node, "namespace": namespace, "cost": cost}
+            for (pvc, node, namespace), cost in pvc_costs.items()
+        ]
+        self._upsert_monthly_cost_line_items(
+            start_date,
+            report_period,
+            cluster_id,
+            cluster_alias,
+            "PVC",
+            rate_type,
+            metric_constants.PVC_DISTRIBUTION,
+            line_items,
+            accumulate=True,
+        )
 
     def get_cluster_to_node_distribution(self, start_date, end_date, cluster_id, distribution, cluster_cost):
         """Returns a list of dictionaries containing the distributed cost.
@@ -1281,51 +1285,19 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             start_date, end_date, cluster_id, distribution, cluster_cost
         )
         if report_period:
-            with schema_context(self.schema):
-                # NOTE: I implemented a logic change here, now instead of one entry per cluster cost
-                # We now have multiple cluster cost entries for each node.
-                LOG.info("Cluster (%s) has a monthly cost of %s.", cluster_id, cluster_cost)
-                LOG.info("Distributing the cluster cost to nodes using %s distribution.", distribution)
-                for node_dikt in distribution_list:
-                    node = node_dikt.get("node")
-                    distributed_cost = node_dikt.get("distributed_cost")
-                    line_item = OCPUsageLineItemDailySummary.objects.filter(
-                        usage_start=start_date,
-                        usage_end=start_date,
-                        report_period=report_period,
-                        cluster_id=cluster_id,
-                        cluster_alias=cluster_alias,
-                        monthly_cost_type="Cluster",
-                        node=node,
-                        data_source="Pod",
-                    ).first()
-                    if not line_item:
-                        line_item = OCPUsageLineItemDailySummary(
-                            uuid=uuid.uuid4(),
-                            usage_start=start_date,
-                            usage_end=start_date,
-                            report_period=report_period,
-                            cluster_id=cluster_id,
-                            cluster_alias=cluster_alias,
-                            monthly_cost_type="Cluster",
-                            node=node,
-                            data_source="Pod",
-                        )
-                    monthly_cost = self.generate_monthly_cost_json_object(distribution, distributed_cost)
-                    log_statement = (
-                        f"Distributing Cluster Cost to Nodes:\n"
-                        f" cluster ({cluster_id}) cost: {cluster_cost} \n"
-                        f" node ({node}) distributed cost: {distributed_cost}\n"
-                        f" distribution type: {distribution}\n"
-                    )
-                    if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                        line_item.infrastructure_monthly_cost_json = monthly_cost
-                    elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                        line_item.supplementary_monthly_cost_json = monthly_cost
-                    LOG.info(log_statement)
-                    line_item.save()
-
-    def tag_upsert_monthly_pvc_cost_line_item(  # noqa: C901
+            # NOTE: I implemented a logic change here, now instead of one entry per cluster cost
+            # We now have multiple cluster cost entries for each node.
+            LOG.info("Cluster (%s) has a monthly cost of %s.", cluster_id, cluster_cost)
+            LOG.info("Distributing the cluster cost to nodes using %s distribution.", distribution)
+            line_items = [
+                {"node": node_dikt.get("node"), "cost": node_dikt.get("distributed_cost")}
+                for node_dikt in distribution_list
+            ]
+            self._upsert_monthly_cost_line_items(
+                start_date, report_period, cluster_id, cluster_alias, "Cluster", rate_type, distribution, line_items
+            )
+
+    def tag_upsert_monthly_pvc_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, rate_dict
     ):
         """
@@ -1335,115 +1307,54 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         that contains the tag key:value pair,
         if it does then the price is added to the monthly cost.
         """
-        distribution = metric_constants.PVC_DISTRIBUTION
-        unique_pvcs = self.get_distinct_pvcs(start_date, end_date, cluster_id)
         report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            for pvc, node, namespace in unique_pvcs:
-                if rate_dict is not None:
-                    for tag_key in rate_dict:
-                        tag_values = rate_dict.get(tag_key)
-                        for value_name, rate_value in tag_values.items():
-                            item_check = OCPUsageLineItemDailySummary.objects.filter(
-                                usage_start__gte=start_date,
-                                usage_end__lte=end_date,
-                                report_period=report_period,
-                                cluster_id=cluster_id,
-                                cluster_alias=cluster_alias,
-                                persistentvolumeclaim=pvc,
-                                node=node,
-                                volume_labels__contains={tag_key: value_name},
-                                namespace=namespace,
-                            ).first()
-                            if item_check:
-                                line_item = OCPUsageLineItemDailySummary.objects.filter(
-                                    usage_start=start_date,
-                                    usage_end=start_date,
-                                    report_period=report_period,
-                                    cluster_id=cluster_id,
-                                    cluster_alias=cluster_alias,
-                                    monthly_cost_type="PVC",
-                                    persistentvolumeclaim=pvc,
-                                    node=node,
-                                    data_source="Storage",
-                                    namespace=namespace,
-                                ).first()
-                                if not line_item:
-                                    line_item = OCPUsageLineItemDailySummary(
-                                        uuid=uuid.uuid4(),
-                                        usage_start=start_date,
-                                        usage_end=start_date,
-                                        report_period=report_period,
-                                        cluster_id=cluster_id,
-                                        cluster_alias=cluster_alias,
-                                        monthly_cost_type="PVC",
-                                        persistentvolumeclaim=pvc,
-                                        node=node,
-                                        data_source="Storage",
-                                        namespace=namespace,
-                                    )
-                                pvc_cost = rate_value
-                                if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                                    LOG.info("PVC (%s) has a monthly infrastructure cost of %s.", pvc, rate_value)
-                                    if line_item.infrastructure_monthly_cost_json:
-                                        pvc_cost = (
-                                            line_item.infrastructure_monthly_cost_json.get(distribution, 0)
-                                            + rate_value
-                                        )
-                                    monthly_cost = self.generate_monthly_cost_json_object(distribution, pvc_cost)
-                                    line_item.infrastructure_monthly_cost_json = monthly_cost
-                                elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                                    LOG.info("PVC (%s) has a monthly supplemenarty cost of %s.", pvc, rate_value)
-                                    if line_item.supplementary_monthly_cost_json:
-                                        pvc_cost = (
-                                            line_item.supplementary_monthly_cost_json.get(distribution, 0) + rate_value
-                                        )
-                                    monthly_cost = self.generate_monthly_cost_json_object(distribution, pvc_cost)
-                                    line_item.supplementary_monthly_cost_json = monthly_cost
-                                line_item.save()
+        pvc_costs = self._get_monthly_tag_costs(
+            start_date,
+            end_date,
+            report_period,
+            cluster_id,
+            cluster_alias,
+            rate_dict,
+            "volume_labels",
+            ["persistentvolumeclaim", "node", "namespace"],
+        )
+        line_items = [
+            {"persistentvolumeclaim": pvc, "node": node, "namespace": namespace, "cost": cost}
+            for (pvc, node, namespace), cost in pvc_costs.items()
+        ]
+        self._upsert_monthly_cost_line_items(
+            start_date,
+            report_period,
+            cluster_id,
+            cluster_alias,
+            "PVC",
+            rate_type,
+            metric_constants.PVC_DISTRIBUTION,
+            line_items,
+            accumulate=True,
+        )
 
     def upsert_monthly_pvc_cost_line_item(self, start_date, end_date, cluster_id, cluster_alias, rate_type, pvc_cost):
         """Update or insert daily summary line item for pvc cost."""
         unique_pvcs = self.get_distinct_pvcs(start_date, end_date, cluster_id)
         report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            for pvc, node, namespace in unique_pvcs:
-                line_item = OCPUsageLineItemDailySummary.objects.filter(
-                    usage_start=start_date,
-                    usage_end=start_date,
-                    report_period=report_period,
-                    cluster_id=cluster_id,
-                    cluster_alias=cluster_alias,
-                    monthly_cost_type="PVC",
-                    persistentvolumeclaim=pvc,
-                    node=node,
-                    data_source="Storage",
-                    namespace=namespace,
-                ).first()
-                if not line_item:
-                    line_item = OCPUsageLineItemDailySummary(
-                        uuid=uuid.uuid4(),
-                        usage_start=start_date,
-                        usage_end=start_date,
-                        report_period=report_period,
-                        cluster_id=cluster_id,
-                        cluster_alias=cluster_alias,
-                        monthly_cost_type="PVC",
-                        persistentvolumeclaim=pvc,
-                        node=node,
-                        data_source="Storage",
-                        namespace=namespace,
-                    )
-                monthly_cost = self.generate_monthly_cost_json_object(metric_constants.PVC_DISTRIBUTION, pvc_cost)
-                if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                    LOG.info("PVC (%s) has a monthly infrastructure cost of %s.", pvc, pvc_cost)
-                    line_item.infrastructure_monthly_cost_json = monthly_cost
-                elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                    LOG.info("PVC (%s) has a monthly supplemenarty cost of %s.", pvc, pvc_cost)
-                    line_item.supplementary_monthly_cost_json = monthly_cost
-                line_item.save()
-
-    def tag_upsert_monthly_cluster_cost_line_item(  # noqa: C901
+        LOG.info("%s PVCs have a monthly %s cost of %s.", len(unique_pvcs), rate_type, pvc_cost)
+        line_items = [
+            {"persistentvolumeclaim": pvc, "node": node, "namespace": namespace, "cost": pvc_cost}
+            for pvc, node, namespace in unique_pvcs
+        ]
+        self._upsert_monthly_cost_line_items(
+            start_date,
+            report_period,
+            cluster_id,
+            cluster_alias,
+            "PVC",
+            rate_type,
+            metric_constants.PVC_DISTRIBUTION,
+            line_items,
+        )
+
+    def tag_upsert_monthly_cluster_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, rate_dict, distribution
     ):
         """
@@ -1454,71 +1365,30 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         """
         report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
         if report_period:
-            with schema_context(self.schema):
-                if rate_dict is not None:
-                    for tag_key in rate_dict:
-                        tag_values = rate_dict.get(tag_key)
-                        for value_name, rate_value in tag_values.items():
-                            # this makes sure that there is an entry for that node
-                            # that contains the specified key_value pair
-                            item_check = line_item = OCPUsageLineItemDailySummary.objects.filter(
-                                usage_start__gte=start_date,
-                                usage_end__lte=end_date,
-                                report_period=report_period,
-                                cluster_id=cluster_id,
-                                cluster_alias=cluster_alias,
-                                pod_labels__contains={tag_key: value_name},
-                            ).first()
-                            if item_check:
-                                line_item = OCPUsageLineItemDailySummary.objects.filter(
-                                    usage_start=start_date,
-                                    usage_end=start_date,
-                                    report_period=report_period,
-                                    cluster_id=cluster_id,
-                                    cluster_alias=cluster_alias,
-                                    monthly_cost_type="Cluster",
-                                    data_source="Pod",
-                                ).first()
-                                if not line_item:
-                                    line_item = OCPUsageLineItemDailySummary(
-                                        uuid=uuid.uuid4(),
-                                        usage_start=start_date,
-                                        usage_end=start_date,
-                                        report_period=report_period,
-                                        cluster_id=cluster_id,
-                                        cluster_alias=cluster_alias,
-                                        monthly_cost_type="Cluster",
-                                        data_source="Pod",
-                                    )
-                                cluster_cost = rate_value
-                                if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                                    LOG.info(
-                                        "Cluster (%s) has a monthly infrastructure cost of %s from tag rates.",
-                                        cluster_id,
-                                        rate_value,
-                                    )
-                                    if line_item.infrastructure_monthly_cost_json:
-                                        cluster_cost = (
-                                            line_item.infrastructure_monthly_cost_json.get(distribution, 0)
-                                            + rate_value
-                                        )
-                                    monthly_cost = self.generate_monthly_cost_json_object(distribution, cluster_cost)
-                                    line_item.infrastructure_monthly_cost_json = monthly_cost
-                                elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                                    LOG.info(
-                                        "Cluster (%s) has a monthly supplemenarty cost of %s from tag rates.",
-                                        cluster_id,
-                                        rate_value,
-                                    )
-                                    if line_item.supplementary_monthly_cost_json:
-                                        cluster_cost = (
-                                            line_item.supplementary_monthly_cost_json.get(distribution, 0) + rate_value
-                                        )
-                                    monthly_cost = self.generate_monthly_cost_json_object(distribution, cluster_cost)
-                                    line_item.supplementary_monthly_cost_json = monthly_cost
-                                line_item.save()
-
-    def tag_upsert_monthly_default_cluster_cost_line_item(  # noqa: C901
+            cluster_costs = self._get_monthly_tag_costs(
+                start_date, end_date, report_period, cluster_id, cluster_alias, rate_dict, "pod_labels", []
+            )
+            LOG.info(
+                "Cluster (%s) has a monthly %s cost of %s from tag rates.",
+                cluster_id,
+                rate_type,
+                cluster_costs.get((), 0),
+            )
+            line_items = [{"cost": cost} for cost in cluster_costs.values()]
+            self._upsert_monthly_cost_line_items(
+                start_date,
+                report_period,
+                cluster_id,
+                cluster_alias,
+                "Cluster",
+                rate_type,
+                distribution,
+                line_items,
+                accumulate=True,
+                match_node=False,
+            )
+
+    def tag_upsert_monthly_default_cluster_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, rate_dict, distribution
     ):
         """
@@ -1529,73 +1399,25 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         if it does then the price is added to the monthly cost.
         """
         report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            if rate_dict is not None:
-                for tag_key in rate_dict:
-                    tag_values = rate_dict.get(tag_key)
-                    tag_default = tag_values.get("default_value")
-                    values_to_skip = tag_values.get("defined_keys")
-                    item_check = OCPUsageLineItemDailySummary.objects.filter(
-                        usage_start__gte=start_date,
-                        usage_end__lte=end_date,
-                        report_period=report_period,
-                        cluster_id=cluster_id,
-                        cluster_alias=cluster_alias,
-                        pod_labels__has_key=tag_key,
-                    )
-                    for value in values_to_skip:
-                        item_check = item_check.exclude(pod_labels__contains={tag_key: value})
-                    # this won't run if there are no matching items and item_check will continue to be
-                    # filtered until there are no items left
-                    while item_check:
-                        # get the first value for our tag key and exclude it from the queryset for the next check
-                        # will remove values until there are none left
-                        tag_key_value = item_check.first().pod_labels.get(tag_key)
-                        item_check = item_check.exclude(pod_labels__contains={tag_key: tag_key_value})
-                        line_item = OCPUsageLineItemDailySummary.objects.filter(
-                            usage_start=start_date,
-                            usage_end=start_date,
-                            report_period=report_period,
-                            cluster_id=cluster_id,
-                            cluster_alias=cluster_alias,
-                            monthly_cost_type="Cluster",
-                            data_source="Pod",
-                        ).first()
-                        if not line_item:
-                            line_item = OCPUsageLineItemDailySummary(
-                                uuid=uuid.uuid4(),
-                                usage_start=start_date,
-                                usage_end=start_date,
-                                report_period=report_period,
-                                cluster_id=cluster_id,
-                                cluster_alias=cluster_alias,
-                                monthly_cost_type="Cluster",
-                                data_source="Pod",
-                            )
-                        cluster_cost = tag_default
-                        if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                            LOG.info(
-                                "Cluster (%s) has a default monthly infrastructure cost of %s.",
-                                cluster_id,
-                                tag_default,
-                            )
-                            if line_item.infrastructure_monthly_cost_json:
-                                cluster_cost = (
-                                    line_item.infrastructure_monthly_cost_json.get(distribution, 0) + tag_default
-                                )
-                            monthly_cost = self.generate_monthly_cost_json_object(distribution, cluster_cost)
-                            line_item.infrastructure_monthly_cost_json = monthly_cost
-                        elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                            LOG.info(
-                                "Cluster (%s) has a default monthly supplemenarty cost of %s.", cluster_id, tag_default
-                            )
-                            if line_item.supplementary_monthly_cost_json:
-                                cluster_cost = (
-                                    line_item.supplementary_monthly_cost_json.get(distribution, 0) + tag_default
-                                )
-                            monthly_cost = self.generate_monthly_cost_json_object(distribution, cluster_cost)
-                            line_item.supplementary_monthly_cost_json = monthly_cost
-                        line_item.save()
+        cluster_costs = self._get_monthly_tag_default_costs(
+            start_date, end_date, report_period, cluster_id, cluster_alias, rate_dict, "pod_labels", []
+        )
+        LOG.info(
+            "Cluster (%s) has a default monthly %s cost of %s.", cluster_id, rate_type, cluster_costs.get((), 0)
+        )
+        line_items = [{"cost": cost} for cost in cluster_costs.values()]
+        self._upsert_monthly_cost_line_items(
+            start_date,
+            report_period,
+            cluster_id,
+            cluster_alias,
+            "Cluster",
+            rate_type,
+            distribution,
+            line_items,
+            accumulate=True,
+            match_node=False,
+        )
 
     def remove_monthly_cost(self, start_date, end_date, cluster_id, cost_type):
         """Delete all monthly costs of a specific type over a date range."""
@@ -1649,8 +1471,7 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             end_date = end_date.date()
         table_name = OCP_REPORT_TABLE_MAP["node_label_line_item_daily"]
 
-        daily_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpnodelabellineitem_daily.sql")
-        daily_sql = daily_sql.decode("utf-8")
+        daily_sql = SQL_TEMPLATES.get_sql("sql/reporting_ocpnodelabellineitem_daily.sql")
         daily_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -1661,8 +1482,42 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         daily_sql, daily_sql_params = self.jinja_sql.prepare_query(daily_sql, daily_sql_params)
         self._execute_raw_sql_query(table_name, daily_sql, start_date, end_date, bind_params=list(daily_sql_params))
 
+    @staticmethod
+    def _usage_cost(rate, usage_column):
+        """Return an expression charging a usage column by a rate.
+
+        Args:
+            rate (Decimal|list): A flat rate, or the (lower_limit, upper_limit, rate)
+                schedule of a tiered rate where the final upper_limit is None
+            usage_column (str): The summary usage column to charge
+
+        Returns:
+            (Expression): The usage cost of each summary row
+
+        """
+        usage = Coalesce(F(usage_column), Value(0), output_field=DecimalField())
+        if not isinstance(rate, (list, tuple)):
+            return Value(rate, output_field=DecimalField()) * usage
+
+        # Every tier is charged for the part of the row usage between its limits
+        cost = Value(0, output_field=DecimalField())
+        for lower_limit, upper_limit, tier_rate in rate:
+            lower = Value(lower_limit, output_field=DecimalField())
+            if upper_limit is None:
+                tier_usage = usage - Greatest(Least(usage, lower), Value(0, output_field=DecimalField()))
+            else:
+                upper = Value(upper_limit, output_field=DecimalField())
+                tier_usage = Greatest(Least(usage, upper) - lower, Value(0, output_field=DecimalField()))
+            cost = cost + Value(tier_rate, output_field=DecimalField()) * tier_usage
+        return cost
+
     def populate_usage_costs(self, infrastructure_rates, supplementary_rates, start_date, end_date, cluster_id):
-        """Update the reporting_ocpusagelineitem_daily_summary table with usage costs."""
+        """Update the reporting_ocpusagelineitem_daily_summary table with usage costs.
+
+        Rates are either flat rates or tier schedules from
+        OCPCostModelCostUpdater._get_tier_schedule, the tiers apply to the usage
+        of each summary row.
+        """
         # Cast start_date and end_date to date object, if they aren't already
         if isinstance(start_date, str):
             start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
@@ -1671,68 +1526,44 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             start_date = start_date.date()
             end_date = end_date.date()
 
-        OCPUsageLineItemDailySummary.objects.filter(
-            cluster_id=cluster_id, usage_start__gte=start_date, usage_start__lte=end_date
-        ).update(
-            infrastructure_usage_cost=JSONBBuildObject(
-                Value("cpu"),
-                Coalesce(
-                    Value(infrastructure_rates.get("cpu_core_usage_per_hour", 0), output_field=DecimalField())
-                    * Coalesce(F("pod_usage_cpu_core_hours"), Value(0), output_field=DecimalField())
-                    + Value(infrastructure_rates.get("cpu_core_request_per_hour", 0), output_field=DecimalField())
-                    * Coalesce(F("pod_request_cpu_core_hours"), Value(0), output_field=DecimalField()),
-                    0,
-                    output_field=DecimalField(),
-                ),
-                Value("memory"),
-                Coalesce(
-                    Value(infrastructure_rates.get("memory_gb_usage_per_hour", 0), output_field=DecimalField())
-                    * Coalesce(F("pod_usage_memory_gigabyte_hours"), Value(0), output_field=DecimalField())
-                    + Value(infrastructure_rates.get("memory_gb_request_per_hour", 0), output_field=DecimalField())
-                    * Coalesce(F("pod_request_memory_gigabyte_hours"), Value(0), output_field=DecimalField()),
-                    0,
-                    output_field=DecimalField(),
-                ),
-                Value("storage"),
-                Coalesce(
-                    Value(infrastructure_rates.get("storage_gb_usage_per_month", 0), output_field=DecimalField())
-                    * Coalesce(F("persistentvolumeclaim_usage_gigabyte_months"), Value(0), output_field=DecimalField())
-                    + Value(infrastructure_rates.get("storage_gb_request_per_month", 0), output_field=DecimalField())
-                    * Coalesce(F("volume_request_storage_gigabyte_months"), Value(0), output_field=DecimalField()),
-                    0,
-                    output_field=DecimalField(),
-                ),
-            ),
-            supplementary_usage_cost=JSONBBuildObject(
+        usage_costs = {}
+        for cost_column, rates in (
+            ("infrastructure_usage_cost", infrastructure_rates),
+            ("supplementary_usage_cost", supplementary_rates),
+        ):
+            usage_costs[cost_column] = JSONBBuildObject(
                 Value("cpu"),
                 Coalesce(
-                    Value(supplementary_rates.get("cpu_core_usage_per_hour", 0), output_field=DecimalField())
-                    * Coalesce(F("pod_usage_cpu_core_hours"), Value(0), output_field=DecimalField())
-                    + Value(supplementary_rates.get("cpu_core_request_per_hour", 0), output_field=DecimalField())
-                    * Coalesce(F("pod_request_cpu_core_hours"), Value(0), output_field=DecimalField()),
+                    self._usage_cost(rates.get("cpu_core_usage_per_hour", 0), "pod_usage_cpu_core_hours")
+                    + self._usage_cost(rates.get("cpu_core_request_per_hour", 0), "pod_request_cpu_core_hours"),
                     0,
                     output_field=DecimalField(),
                 ),
                 Value("memory"),
                 Coalesce(
-                    Value(supplementary_rates.get("memory_gb_usage_per_hour", 0), output_field=DecimalField())
-                    * Coalesce(F("pod_usage_memory_gigabyte_hours"), Value(0), output_field=DecimalField())
-                    + Value(supplementary_rates.get("memory_gb_request_per_hour", 0), output_field=DecimalField())
-                    * Coalesce(F("pod_request_memory_gigabyte_hours"), Value(0), output_field=DecimalField()),
+                    self._usage_cost(rates.get("memory_gb_usage_per_hour", 0), "pod_usage_memory_gigabyte_hours")
+                    + self._usage_cost(
+                        rates.get("memory_gb_request_per_hour", 0), "pod_request_memory_gigabyte_hours"
+                    ),
                     0,
                     output_field=DecimalField(),
                 ),
                 Value("storage"),
                 Coalesce(
-                    Value(supplementary_rates.get("storage_gb_usage_per_month", 0), output_field=DecimalField())
-                    * Coalesce(F("persistentvolumeclaim_usage_gigabyte_months"), Value(0), output_field=DecimalField())
-                    + Value(supplementary_rates.get("storage_gb_request_per_month", 0), output_field=DecimalField())
-                    * Coalesce(F("volume_request_storage_gigabyte_months"), Value(0), output_field=DecimalField()),
+                    self._usage_cost(
+                        rates.get("storage_gb_usage_per_month", 0), "persistentvolumeclaim_usage_gigabyte_months"
+                    )
+                    + self._usage_cost(
+                        rates.get("storage_gb_request_per_month", 0), "volume_request_storage_gigabyte_months"
+                    ),
                     0,
                     output_field=DecimalField(),
                 ),
-            ),
-        )
+            )
+
+        OCPUsageLineItemDailySummary.objects.filter(
+            cluster_id=cluster_id, usage_start__gte=start_date, usage_start__lte=end_date
+        ).update(**usage_costs)
 
     def populate_tag_usage_costs(  # noqa: C901
         self, infrastructure_rates, supplementary_rates, start_date, end_date, cluster_id
@@ -1740,8 +1571,8 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         """
         Update the reporting_ocpusagelineitem_daily_summary table with
         usage costs based on tag rates.
-        Due to the way the tag_keys are stored it loops through all of
-        the tag keys to filter and update costs.
+        Every tag key/value rate for a rate type is passed to a single
+        UPDATE, so the summary table is scanned once per rate type.
 
         The data structure for infrastructure and supplementary rates are
         a dictionary that include the metric name, the tag key,
@@ -1774,10 +1605,12 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         if isinstance(start_date, datetime.datetime):
             start_date = start_date.date()
             end_date = end_date.date()
-        # updates costs from tags
+        # updates costs from tags, one statement per rate type covering every tag value
+        table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
         for rate_type in rate_types:
             rate = rate_type.get("rates")
             sql_file = rate_type.get("sql_file")
+            tag_rates = []
             for metric in rate:
                 tags = rate.get(metric, {})
                 usage_type = metric_usage_type_map.get(metric)
@@ -1785,34 +1618,34 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
                     labels_field = "volume_labels"
                 else:
                     labels_field = "pod_labels"
-                table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
                 for tag_key in tags:
                     tag_vals = tags.get(tag_key, {})
-                    value_names = list(tag_vals.keys())
-                    for val_name in value_names:
-                        rate_value = tag_vals[val_name]
-                        key_value_pair = json.dumps({tag_key: val_name})
-                        tag_rates_sql = pkgutil.get_data("masu.database", sql_file)
-                        tag_rates_sql = tag_rates_sql.decode("utf-8")
-                        tag_rates_sql_params = {
-                            "start_date": start_date,
-                            "end_date": end_date,
-                            "rate": rate_value,
-                            "cluster_id": cluster_id,
-                            "schema": self.schema,
-                            "usage_type": usage_type,
-                            "metric": metric,
-                            "k_v_pair": key_value_pair,
-                            "labels_field": labels_field,
-                        }
-                        tag_rates_sql, tag_rates_sql_params = self.jinja_sql.prepare_query(
-                            tag_rates_sql, tag_rates_sql_params
-                        )
-                        msg = f"Running populate_tag_usage_costs SQL with params: {tag_rates_sql_params}"
-                        LOG.info(msg)
-                        self._execute_raw_sql_query(
-                            table_name, tag_rates_sql, start_date, end_date, bind_params=list(tag_rates_sql_params)
+                    for val_name, rate_value in tag_vals.items():
+                        tag_rates.append(
+                            {
+                                "metric": metric,
+                                "usage_type": usage_type,
+                                "labels_field": labels_field,
+                                "k_v_pair": json.dumps({tag_key: val_name}),
+                                "rate": rate_value,
+                            }
                         )
+            if not tag_rates:
+                continue
+            tag_rates_sql = SQL_TEMPLATES.get_sql(sql_file)
+            tag_rates_sql_params = {
+                "start_date": start_date,
+                "end_date": end_date,
+                "cluster_id": cluster_id,
+                "schema": self.schema,
+                "tag_rates": tag_rates,
+            }
+            tag_rates_sql, tag_rates_sql_params = self.jinja_sql.prepare_query(tag_rates_sql, tag_rates_sql_params)
+            msg = f"Running populate_tag_usage_costs SQL for {len(tag_rates)} tag rates from {sql_file}."
+            LOG.info(msg)
+            self._execute_raw_sql_query(
+                table_name, tag_rates_sql, start_date, end_date, bind_params=list(tag_rates_sql_params)
+            )
 
     def populate_tag_usage_default_costs(  # noqa: C901
         self, infrastructure_rates, supplementary_rates, start_date, end_date, cluster_id
@@ -1856,10 +1689,12 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             start_date = start_date.date()
             end_date = end_date.date()
 
-        # updates costs from tags
+        # updates costs from tags, one statement per rate type covering every tag key
+        table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
         for rate_type in rate_types:
             rate = rate_type.get("rates")
             sql_file = rate_type.get("sql_file")
+            tag_rates = []
             for metric in rate:
                 tags = rate.get(metric, {})
                 usage_type = metric_usage_type_map.get(metric)
@@ -1867,39 +1702,38 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
                     labels_field = "volume_labels"
                 else:
                     labels_field = "pod_labels"
-                table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
                 for tag_key in tags:
-                    key_value_pair = []
                     tag_vals = tags.get(tag_key)
                     rate_value = tag_vals.get("default_value", 0)
                     if rate_value == 0:
                         continue
                     value_names = tag_vals.get("defined_keys", [])
-                    for value_to_skip in value_names:
-                        key_value_pair.append(json.dumps({tag_key: value_to_skip}))
-                    json.dumps(key_value_pair)
-                    tag_rates_sql = pkgutil.get_data("masu.database", sql_file)
-                    tag_rates_sql = tag_rates_sql.decode("utf-8")
-                    tag_rates_sql_params = {
-                        "start_date": start_date,
-                        "end_date": end_date,
-                        "rate": rate_value,
-                        "cluster_id": cluster_id,
-                        "schema": self.schema,
-                        "usage_type": usage_type,
-                        "metric": metric,
-                        "tag_key": tag_key,
-                        "k_v_pair": key_value_pair,
-                        "labels_field": labels_field,
-                    }
-                    tag_rates_sql, tag_rates_sql_params = self.jinja_sql.prepare_query(
-                        tag_rates_sql, tag_rates_sql_params
-                    )
-                    msg = f"Running populate_tag_usage_default_costs SQL with params: {tag_rates_sql_params}"
-                    LOG.info(msg)
-                    self._execute_raw_sql_query(
-                        table_name, tag_rates_sql, start_date, end_date, bind_params=list(tag_rates_sql_params)
+                    tag_rates.append(
+                        {
+                            "metric": metric,
+                            "usage_type": usage_type,
+                            "labels_field": labels_field,
+                            "tag_key": tag_key,
+                            "k_v_pairs": json.dumps([{tag_key: value_to_skip} for value_to_skip in value_names]),
+                            "rate": rate_value,
+                        }
                     )
+            if not tag_rates:
+                continue
+            tag_rates_sql = SQL_TEMPLATES.get_sql(sql_file)
+            tag_rates_sql_params = {
+                "start_date": start_date,
+                "end_date": end_date,
+                "cluster_id": cluster_id,
+                "schema": self.schema,
+                "tag_rates": tag_rates,
+            }
+            tag_rates_sql, tag_rates_sql_params = self.jinja_sql.prepare_query(tag_rates_sql, tag_rates_sql_params)
+            msg = f"Running populate_tag_usage_default_costs SQL for {len(tag_rates)} tag rates from {sql_file}."
+            LOG.info(msg)
+            self._execute_raw_sql_query(
+                table_name, tag_rates_sql, start_date, end_date, bind_params=list(tag_rates_sql_params)
+            )
 
     def populate_openshift_cluster_information_tables(self, provider, cluster_id, cluster_alias, start_date, end_date):
         """Populate the cluster, node, PVC, and project tables for the cluster."""
@@ -4,6 +4,7 @@
 #
 """Database accessor for report data."""
 import logging
+import time
 import uuid
 from decimal import Decimal
 from decimal import InvalidOperation
@@ -13,14 +14,15 @@ import django.apps
 from dateutil.relativedelta import relativedelta
 from django.db import connection
 from django.db import transaction
-from jinjasql import JinjaSql
 from tenant_schemas.utils import schema_context
 
 import koku.presto_database as kpdb
+from api.utils import DateHelper
 from koku.database import execute_delete_sql as exec_del_sql
 from masu.config import Config
 from masu.database.koku_database_access import KokuDBAccess
 from masu.database.koku_database_access import mini_transaction_delete
+from masu.database.sql_templates import SQL_TEMPLATES
 from reporting.models import PartitionedTable
 from reporting_common import REPORT_COLUMN_MAP
 
@@ -344,7 +346,7 @@ class ReportDBAccessorBase(KokuDBAccess):
         else:
             LOG.info("Updating %s", table)
 
-        with connection.cursor() as cursor:
+        with connection.cursor() as cursor, SQL_TEMPLATES.timer(sql):
             cursor.db.set_schema(self.schema)
             cursor.execute(sql, params=bind_params)
         LOG.info("Finished updating %s.", table)
@@ -353,15 +355,20 @@ class ReportDBAccessorBase(KokuDBAccess):
         """Execute a single presto query"""
         presto_conn = kpdb.connect(schema=schema)
         presto_cur = presto_conn.cursor()
-        presto_cur.execute(sql, bind_params)
-        return presto_cur.fetchall()
+        start = time.time()
+        with SQL_TEMPLATES.timer(sql):
+            presto_cur.execute(sql, bind_params)
+            rows = presto_cur.fetchall()
+        kpdb.record_statement_stats(presto_cur, sql, time.time() - start, len(rows))
+        return rows
 
     def _execute_presto_multipart_sql_query(
-        self, schema, sql, bind_params=None, preprocessor=JinjaSql().prepare_query
+        self, schema, sql, bind_params=None, preprocessor=SQL_TEMPLATES.prepare_query
     ):
         """Execute multiple related SQL queries in Presto."""
         presto_conn = kpdb.connect(schema=self.schema)
-        return kpdb.executescript(presto_conn, sql, params=bind_params, preprocessor=preprocessor)
+        with SQL_TEMPLATES.timer(sql):
+            return kpdb.executescript(presto_conn, sql, params=bind_params, preprocessor=preprocessor)
 
     def get_existing_partitions(self, table):
         if isinstance(table, str):
@@ -421,6 +428,52 @@ class ReportDBAccessorBase(KokuDBAccess):
         if created:
             LOG.info(f"Created a new partition for {newpart.partition_of_table_name} : {newpart.table_name}")
 
+    def drop_expired_partitions(self, tables, expired_date, simulate=False):
+        """Drop the monthly partitions of the tables that hold only expired data.
+
+        Report data expires by billing period, so every partition of a month
+        starting on or before the expired date holds only expired rows.
+
+        Args:
+            tables (list): The partitioned table names
+            expired_date (datetime.datetime): The cutoff date for removing data.
+            simulate (bool): Whether to only list the partitions.
+
+        Returns:
+            ([{}]) List of dictionaries containing 'table', 'partition', 'partition_start' and 'bytes'
+
+        """
+        dropped_partitions = []
+        with schema_context(self.schema):
+            partitions = PartitionedTable.objects.filter(
+                schema_name=self.schema, partition_of_table_name__in=tables, partition_type=PartitionedTable.RANGE
+            ).order_by("partition_of_table_name", "table_name")
+            for partition in partitions:
+                if partition.partition_parameters["default"]:
+                    continue
+                partition_start = ciso8601.parse_datetime(partition.partition_parameters["from"]).date()
+                if partition_start > expired_date.date():
+                    continue
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT pg_total_relation_size(format('%%I.%%I', %s, %s)::regclass)",
+                        [partition.schema_name, partition.table_name],
+                    )
+                    partition_bytes = cursor.fetchone()[0]
+                if not simulate:
+                    # The partitioned_tables trigger detaches and drops the partition
+                    partition.delete()
+                    LOG.info(f"Dropped expired partition {partition.table_name} ({partition_bytes} bytes)")
+                dropped_partitions.append(
+                    {
+                        "table": partition.partition_of_table_name,
+                        "partition": partition.table_name,
+                        "partition_start": str(partition_start),
+                        "bytes": partition_bytes,
+                    }
+                )
+        return dropped_partitions
+
     def delete_line_item_daily_summary_entries_for_date_range(self, source_uuid, start_date, end_date):
         msg = f"Deleting records from {self.line_item_daily_summary_table} from {start_date} to {end_date}"
         LOG.info(msg)
@@ -432,6 +485,67 @@ class ReportDBAccessorBase(KokuDBAccess):
         msg = f"Deleted {count} records from {self.line_item_daily_summary_table}"
         LOG.info(msg)
 
+    def populate_tag_catalog(
+        self, provider_type, summary_table, period_table, period_column, period_start_column, period_ids, tag_type=""
+    ):
+        """Add the keys and values of a tag summary table to the tenant tag catalog.
+
+        Args:
+            provider_type (str): The provider type the tags are cataloged under
+            summary_table (str): The tag summary table, with key and values columns
+            period_table (str): The bill or report period table the summary references
+            period_column (str): The summary column referencing the period table
+            period_start_column (str): The period table column holding the period start
+            period_ids (list): The period ids to catalog, all periods if empty
+            tag_type (str): The OCP tag type, pod or storage
+
+        """
+        catalog_sql = SQL_TEMPLATES.get_sql("sql/reporting_tag_catalog.sql")
+        catalog_sql_params = {
+            "schema": self.schema,
+            "provider_type": provider_type,
+            "tag_type": tag_type,
+            "summary_table": summary_table,
+            "period_table": period_table,
+            "period_column": period_column,
+            "period_start_column": period_start_column,
+            "period_ids": period_ids,
+        }
+        catalog_sql, catalog_sql_params = self.jinja_sql.prepare_query(catalog_sql, catalog_sql_params)
+        self._execute_raw_sql_query("reporting_tag_catalog_value", catalog_sql, bind_params=list(catalog_sql_params))
+
+    def populate_summary_rollup(self, rollup_table, start_date, end_date=None, source_uuid=None):
+        """Replace a date range of a summary rollup table with rows rolled up from the daily summary.
+
+        Args:
+            rollup_table (str): The rollup table, rolled up by the SQL template of the same name
+            start_date (datetime.date): The first usage_start to replace
+            end_date (datetime.date): The last usage_start to replace, all later dates if None
+            source_uuid (str): The source to replace, all sources if None
+
+        """
+        partition_end = end_date or DateHelper().today.date()
+        partition_start = start_date.replace(day=1)
+        partition_starts = []
+        while partition_start <= partition_end:
+            partition_starts.append(partition_start)
+            partition_start += relativedelta(months=1)
+        self.add_partitions(self.get_existing_partitions(rollup_table), partition_starts)
+
+        rollup_sql = SQL_TEMPLATES.get_sql(f"sql/{rollup_table}.sql")
+        rollup_sql_params = {
+            "schema": self.schema,
+            "start_date": start_date,
+            "end_date": end_date,
+            "source_uuid": source_uuid,
+        }
+        rollup_sql, rollup_sql_params = self.jinja_sql.prepare_query(rollup_sql, rollup_sql_params)
+        # The delete and insert run in one transaction so the API never reads a missing range
+        with transaction.atomic():
+            self._execute_raw_sql_query(
+                rollup_table, rollup_sql, start_date, end_date, bind_params=list(rollup_sql_params)
+            )
+
     def table_exists_trino(self, table_name):
         """Check if table exists."""
         table_check_sql = f"SHOW TABLES LIKE '{table_name}'"
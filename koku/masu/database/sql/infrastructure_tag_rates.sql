@@ -1,31 +1,64 @@
+WITH tag_rates AS (
+    SELECT *
+    FROM (
+        VALUES
+        {% for tag_rate in tag_rates %}
+            (
+                {{tag_rate.metric}},
+                {{tag_rate.usage_type}},
+                {{tag_rate.labels_field}},
+                {{tag_rate.k_v_pair}}::jsonb,
+                {{tag_rate.rate}}::numeric
+            ){% if not loop.last %},{% endif %}
+        {% endfor %}
+    ) AS t (metric, usage_type, labels_field, k_v_pair, rate)
+),
+tag_costs AS (
+    SELECT lids.uuid,
+        tr.usage_type,
+        sum(
+            coalesce(
+                tr.rate * CASE
+                WHEN tr.metric='cpu_core_usage_per_hour' THEN lids.pod_usage_cpu_core_hours
+                WHEN tr.metric='cpu_core_request_per_hour' THEN lids.pod_request_cpu_core_hours
+                WHEN tr.metric='memory_gb_usage_per_hour' THEN lids.pod_usage_memory_gigabyte_hours
+                WHEN tr.metric='memory_gb_request_per_hour' THEN lids.pod_request_memory_gigabyte_hours
+                WHEN tr.metric='storage_gb_usage_per_month' THEN lids.persistentvolumeclaim_usage_gigabyte_months
+                WHEN tr.metric='storage_gb_request_per_month' THEN lids.volume_request_storage_gigabyte_months
+                END,
+                0.0
+            )
+        ) as cost
+    FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary AS lids
+    JOIN tag_rates AS tr
+        ON CASE
+            WHEN tr.labels_field = 'volume_labels' THEN lids.volume_labels
+            ELSE lids.pod_labels
+            END @> tr.k_v_pair
+    WHERE lids.cluster_id = {{cluster_id}}
+        AND lids.usage_start >= {{start_date}}
+        AND lids.usage_start <= {{end_date}}
+    GROUP BY lids.uuid, tr.usage_type
+)
 UPDATE {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary AS lids
 SET infrastructure_usage_cost = other_sub.infrastructure_usage_cost
 FROM (
-    SELECT sub.uuid,
+    SELECT lids.uuid,
         jsonb_object_agg(key,
             CASE
-            WHEN key = {{usage_type}} THEN value::numeric + coalesce(({{rate}}::numeric * usage), 0.0)
-            ELSE value::numeric
+            WHEN tc.cost IS NULL THEN value::numeric
+            ELSE value::numeric + tc.cost
             END) as infrastructure_usage_cost
-    FROM (
-        SELECT lids.uuid,
-            key,
-            value,
-            CASE
-            WHEN {{metric}}='cpu_core_usage_per_hour' THEN lids.pod_usage_cpu_core_hours
-            WHEN {{metric}}='cpu_core_request_per_hour' THEN lids.pod_request_cpu_core_hours
-            WHEN {{metric}}='memory_gb_usage_per_hour' THEN lids.pod_usage_memory_gigabyte_hours
-            WHEN {{metric}}='memory_gb_request_per_hour' THEN lids.pod_request_memory_gigabyte_hours
-            WHEN {{metric}}='storage_gb_usage_per_month' THEN lids.persistentvolumeclaim_usage_gigabyte_months
-            WHEN {{metric}}='storage_gb_request_per_month' THEN lids.volume_request_storage_gigabyte_months
-            END as usage
-        FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary AS lids,
-            jsonb_each_text(lids.infrastructure_usage_cost) infrastructure_usage_cost
-        WHERE lids.{{labels_field | sqlsafe}} @> {{k_v_pair}}
-            AND lids.cluster_id = {{cluster_id}}
-            AND lids.usage_start >= {{start_date}}
-            AND lids.usage_start <= {{end_date}}
-    ) AS sub
-    GROUP BY sub.uuid
+    FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary AS lids
+    JOIN (SELECT DISTINCT uuid FROM tag_costs) AS matched
+        ON matched.uuid = lids.uuid
+    CROSS JOIN jsonb_each_text(lids.infrastructure_usage_cost) infrastructure_usage_cost
+    LEFT JOIN tag_costs AS tc
+        ON tc.uuid = lids.uuid
+        AND tc.usage_type = key
+    WHERE lids.cluster_id = {{cluster_id}}
+        AND lids.usage_start >= {{start_date}}
+        AND lids.usage_start <= {{end_date}}
+    GROUP BY lids.uuid
 ) other_sub
 WHERE lids.uuid = other_sub.uuid
@@ -0,0 +1,83 @@
+DELETE FROM {{schema | sqlsafe}}.reporting_ocp_pod_summary
+WHERE usage_start >= {{start_date}}::date
+    {% if end_date %}
+    AND usage_start <= {{end_date}}::date
+    {% endif %}
+    {% if source_uuid %}
+    AND source_uuid = {{source_uuid}}::uuid
+    {% endif %}
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_ocp_pod_summary (
+    usage_start,
+    usage_end,
+    cluster_id,
+    cluster_alias,
+    data_source,
+    resource_ids,
+    resource_count,
+    supplementary_usage_cost,
+    infrastructure_usage_cost,
+    infrastructure_raw_cost,
+    infrastructure_markup_cost,
+    pod_usage_cpu_core_hours,
+    pod_request_cpu_core_hours,
+    pod_limit_cpu_core_hours,
+    cluster_capacity_cpu_core_hours,
+    pod_usage_memory_gigabyte_hours,
+    pod_request_memory_gigabyte_hours,
+    pod_limit_memory_gigabyte_hours,
+    cluster_capacity_memory_gigabyte_hours,
+    supplementary_monthly_cost_json,
+    infrastructure_monthly_cost_json,
+    source_uuid
+)
+    SELECT usage_start,
+        usage_start,
+        cluster_id,
+        cluster_alias,
+        max(data_source),
+        array_agg(DISTINCT resource_id),
+        count(DISTINCT resource_id),
+        json_build_object(
+            'cpu', sum((supplementary_usage_cost->>'cpu')::decimal),
+            'memory', sum((supplementary_usage_cost->>'memory')::decimal),
+            'storage', sum((supplementary_usage_cost->>'storage')::decimal)
+        ),
+        json_build_object(
+            'cpu', sum((infrastructure_usage_cost->>'cpu')::decimal),
+            'memory', sum((infrastructure_usage_cost->>'memory')::decimal),
+            'storage', sum((infrastructure_usage_cost->>'storage')::decimal)
+        ),
+        sum(infrastructure_raw_cost),
+        sum(infrastructure_markup_cost),
+        sum(pod_usage_cpu_core_hours),
+        sum(pod_request_cpu_core_hours),
+        sum(pod_limit_cpu_core_hours),
+        max(cluster_capacity_cpu_core_hours),
+        sum(pod_usage_memory_gigabyte_hours),
+        sum(pod_request_memory_gigabyte_hours),
+        sum(pod_limit_memory_gigabyte_hours),
+        max(cluster_capacity_memory_gigabyte_hours),
+        json_build_object(
+            'cpu', sum(((coalesce(supplementary_monthly_cost_json, '{"cpu": 0}'::jsonb))->>'cpu')::decimal),
+            'memory', sum(((coalesce(supplementary_monthly_cost_json, '{"memory": 0}'::jsonb))->>'memory')::decimal),
+            'pvc', sum(((coalesce(supplementary_monthly_cost_json, '{"pvc": 0}'::jsonb))->>'pvc')::decimal)
+        ),
+        json_build_object(
+            'cpu', sum(((coalesce(infrastructure_monthly_cost_json, '{"cpu": 0}'::jsonb))->>'cpu')::decimal),
+            'memory', sum(((coalesce(infrastructure_monthly_cost_json, '{"memory": 0}'::jsonb))->>'memory')::decimal),
+            'pvc', sum(((coalesce(infrastructure_monthly_cost_json, '{"pvc": 0}'::jsonb))->>'pvc')::decimal)
+        ),
+        source_uuid
+    FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary
+    WHERE usage_start >= {{start_date}}::date
+        {% if end_date %}
+        AND usage_start <= {{end_date}}::date
+        {% endif %}
+        {% if source_uuid %}
+        AND source_uuid = {{source_uuid}}::uuid
+        {% endif %}
+        AND data_source = 'Pod'
+    GROUP BY usage_start, cluster_id, cluster_alias, source_uuid
+;
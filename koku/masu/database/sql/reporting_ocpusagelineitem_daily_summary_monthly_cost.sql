@@ -0,0 +1,100 @@
+WITH line_items AS (
+    SELECT *
+    FROM (
+        VALUES
+        {% for line_item in line_items %}
+            (
+                {{line_item.uuid}}::uuid,
+                {{line_item.node}}::text,
+                {{line_item.persistentvolumeclaim}}::text,
+                {{line_item.namespace}}::text,
+                coalesce({{line_item.cost}}::numeric, 0)
+            ){% if not loop.last %},{% endif %}
+        {% endfor %}
+    ) AS t (uuid, node, persistentvolumeclaim, namespace, cost)
+),
+updated AS (
+    UPDATE {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary AS lids
+    SET {{cost_field | sqlsafe}} = jsonb_build_object(
+        {% for key in distribution_keys %}
+            {{key}}::text,
+            {% if key == distribution %}
+                li.cost
+                {% if accumulate %}
+                    + coalesce((lids.{{cost_field | sqlsafe}}->>{{key}})::numeric, 0)
+                {% endif %}
+            {% else %}
+                0
+            {% endif %}
+            {% if not loop.last %},{% endif %}
+        {% endfor %}
+    )
+    FROM line_items AS li
+    WHERE lids.usage_start = {{start_date}}
+        AND lids.usage_end = {{start_date}}
+        AND lids.report_period_id IS NOT DISTINCT FROM {{report_period_id}}
+        AND lids.cluster_id = {{cluster_id}}
+        AND lids.cluster_alias IS NOT DISTINCT FROM {{cluster_alias}}
+        AND lids.monthly_cost_type = {{monthly_cost_type}}
+        AND lids.data_source = {{data_source}}
+        {% if match_node %}
+        AND lids.node IS NOT DISTINCT FROM li.node
+        {% else %}
+        AND lids.uuid = (
+            SELECT uuid
+            FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary
+            WHERE usage_start = {{start_date}}
+                AND usage_end = {{start_date}}
+                AND report_period_id IS NOT DISTINCT FROM {{report_period_id}}
+                AND cluster_id = {{cluster_id}}
+                AND cluster_alias IS NOT DISTINCT FROM {{cluster_alias}}
+                AND monthly_cost_type = {{monthly_cost_type}}
+                AND data_source = {{data_source}}
+            LIMIT 1
+        )
+        {% endif %}
+        {% if monthly_cost_type == 'PVC' %}
+        AND lids.persistentvolumeclaim IS NOT DISTINCT FROM li.persistentvolumeclaim
+        AND lids.namespace IS NOT DISTINCT FROM li.namespace
+        {% endif %}
+    RETURNING li.uuid
+)
+INSERT INTO {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary (
+    uuid,
+    usage_start,
+    usage_end,
+    report_period_id,
+    cluster_id,
+    cluster_alias,
+    monthly_cost_type,
+    node,
+    persistentvolumeclaim,
+    namespace,
+    data_source,
+    {{cost_field | sqlsafe}}
+)
+SELECT li.uuid,
+    {{start_date}},
+    {{start_date}},
+    {{report_period_id}},
+    {{cluster_id}},
+    {{cluster_alias}},
+    {{monthly_cost_type}},
+    li.node,
+    li.persistentvolumeclaim,
+    li.namespace,
+    {{data_source}},
+    jsonb_build_object(
+        {% for key in distribution_keys %}
+            {{key}}::text,
+            {% if key == distribution %}li.cost{% else %}0{% endif %}
+            {% if not loop.last %},{% endif %}
+        {% endfor %}
+    )
+FROM line_items AS li
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM updated
+    WHERE updated.uuid = li.uuid
+)
+;
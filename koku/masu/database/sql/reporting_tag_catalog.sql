@@ -0,0 +1,49 @@
+WITH cte_tag_value AS (
+    SELECT ts.key,
+        tv.value,
+        min(p.{{period_start_column | sqlsafe}})::date AS first_seen,
+        max(p.{{period_start_column | sqlsafe}})::date AS last_seen
+    FROM {{schema | sqlsafe}}.{{summary_table | sqlsafe}} AS ts
+    JOIN {{schema | sqlsafe}}.{{period_table | sqlsafe}} AS p
+        ON p.id = ts.{{period_column | sqlsafe}},
+        unnest(ts."values") AS tv(value)
+    {% if period_ids %}
+    WHERE ts.{{period_column | sqlsafe}} IN (
+        {%- for period_id in period_ids -%}
+        {{period_id}}{% if not loop.last %},{% endif %}
+        {%- endfor -%}
+    )
+    {% endif %}
+    GROUP BY ts.key, tv.value
+),
+cte_catalog_value AS (
+    INSERT INTO {{schema | sqlsafe}}.reporting_tag_catalog_value AS cv (provider_type, tag_type, key, value, first_seen, last_seen)
+    SELECT {{provider_type}},
+        {{tag_type}},
+        key,
+        value,
+        first_seen,
+        last_seen
+    FROM cte_tag_value
+    ON CONFLICT (provider_type, tag_type, key, value) DO UPDATE
+        SET first_seen = least(cv.first_seen, EXCLUDED.first_seen),
+            last_seen = greatest(cv.last_seen, EXCLUDED.last_seen)
+        WHERE EXCLUDED.first_seen < cv.first_seen
+            OR EXCLUDED.last_seen > cv.last_seen
+    -- xmax is 0 for rows inserted by this statement and set for rows it updated
+    RETURNING key, first_seen, last_seen, (xmax = 0) AS inserted
+)
+INSERT INTO {{schema | sqlsafe}}.reporting_tag_catalog_key AS ck (provider_type, tag_type, key, value_count, first_seen, last_seen)
+SELECT {{provider_type}},
+    {{tag_type}},
+    key,
+    count(*) FILTER (WHERE inserted),
+    min(first_seen),
+    max(last_seen)
+FROM cte_catalog_value
+GROUP BY key
+ON CONFLICT (provider_type, tag_type, key) DO UPDATE
+    SET value_count = ck.value_count + EXCLUDED.value_count,
+        first_seen = least(ck.first_seen, EXCLUDED.first_seen),
+        last_seen = greatest(ck.last_seen, EXCLUDED.last_seen)
+;
@@ -0,0 +1,157 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Registry of the compiled SQL templates of the report DB accessors."""
+import logging
+import os
+import pkgutil
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from jinjasql import JinjaSql
+
+from masu.prometheus_stats import SQL_TEMPLATE_DURATION
+
+LOG = logging.getLogger(__name__)
+
+
+def _freeze(value):
+    """Return a hashable key that tells template parameter values apart."""
+    if isinstance(value, dict):
+        return ("dict", tuple((repr(key), _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_freeze(item) for item in value))
+    return (type(value).__name__, repr(value))
+
+
+class SQLTemplateRegistry:
+    """Load, compile and render the SQL templates of a package once per process.
+
+    A drop in replacement for JinjaSql.prepare_query. Every template file under
+    the directories is read and compiled the first time any template is used.
+    SQL that is not a template file, like the statements of a Presto script, is
+    compiled once and kept in a bounded cache.
+
+    Rendered SQL is memoized on the template and the exact parameters, the
+    templates inline sqlsafe values and branch on parameter values so the SQL
+    depends on more than the parameter names and types.
+    """
+
+    def __init__(self, package, directories, cache_size=256):
+        """Set up an empty registry.
+
+        Args:
+            package (str): The package holding the template directories
+            directories (tuple): The template directories, relative to the package
+            cache_size (int): The number of compiled statements and rendered queries to keep
+
+        """
+        self._package = package
+        self._directories = directories
+        self._cache_size = cache_size
+        self._jinja_sql = JinjaSql()
+        self._lock = threading.Lock()
+        self._sql = None
+        self._templates = None
+        self._compiled = OrderedDict()
+        self._rendered = OrderedDict()
+        self._template_names = OrderedDict()
+
+    def _load(self):
+        """Read and compile every template file of the package."""
+        with self._lock:
+            if self._templates is not None:
+                return
+            package_path = os.path.dirname(pkgutil.get_loader(self._package).get_filename())
+            sql, templates = {}, {}
+            for directory in self._directories:
+                for file_name in sorted(os.listdir(os.path.join(package_path, directory))):
+                    if not file_name.endswith(".sql"):
+                        continue
+                    name = f"{directory}/{file_name}"
+                    sql[name] = pkgutil.get_data(self._package, name).decode("utf-8")
+                    templates[sql[name]] = (name, self._jinja_sql.env.from_string(sql[name]))
+            self._sql = sql
+            self._templates = templates
+        LOG.info(f"Compiled {len(templates)} SQL templates of {self._package}")
+
+    def _cache(self, cache, key, value):
+        """Add a value to one of the bounded caches."""
+        with self._lock:
+            cache[key] = value
+            while len(cache) > self._cache_size:
+                cache.popitem(last=False)
+
+    def _get_template(self, source):
+        """Return the name and compiled template of SQL."""
+        if self._templates is None:
+            self._load()
+        if source in self._templates:
+            return self._templates[source]
+        compiled = self._compiled.get(source)
+        if compiled is None:
+            compiled = (None, self._jinja_sql.env.from_string(source))
+            self._cache(self._compiled, source, compiled)
+        return compiled
+
+    def get_sql(self, name):
+        """Return the SQL of a template file.
+
+        Args:
+            name (str): The template path relative to the package, e.g. sql/reporting_awstags_summary.sql
+
+        Returns:
+            (str): The template SQL
+
+        """
+        if self._sql is None:
+            self._load()
+        return self._sql[name]
+
+    def prepare_query(self, source, data):
+        """Render SQL and return it with its bind parameters, like JinjaSql.prepare_query.
+
+        Args:
+            source (str): The template SQL
+            data (dict): The template parameters
+
+        Returns:
+            (str, list): The rendered SQL and its bind parameters
+
+        """
+        name, template = self._get_template(source)
+        key = (source, _freeze(data))
+        rendered = self._rendered.get(key)
+        if rendered is None:
+            rendered = self._jinja_sql.prepare_query(template, data)
+            self._cache(self._rendered, key, rendered)
+        if name:
+            self._cache(self._template_names, rendered[0], name)
+        sql, bind_params = rendered
+        return sql, list(bind_params)
+
+    def template_name(self, sql):
+        """Return the name of the template file SQL was rendered from, or None."""
+        if self._templates is None:
+            self._load()
+        if sql in self._templates:
+            return self._templates[sql][0]
+        return self._template_names.get(sql)
+
+    @contextmanager
+    def timer(self, sql):
+        """Time the execution of SQL under the name of its template file.
+
+        SQL that was not rendered from a template file is not timed.
+        """
+        name = self.template_name(sql)
+        start = time.time()
+        yield
+        if name:
+            SQL_TEMPLATE_DURATION.labels(template=name).observe(time.time() - start)
+
+
+SQL_TEMPLATES = SQLTemplateRegistry("masu.database", ("sql", "presto_sql"))
@@ -26,9 +26,13 @@ from masu.external.date_accessor import DateAccessor
 from masu.external.downloader.downloader_interface import DownloaderInterface
 from masu.external.downloader.report_downloader_base import ReportDownloaderBase
 from masu.processor import enable_trino_processing
+from masu.processor.parquet.parquet_writer import StreamingParquetWriter
 from masu.util.aws.common import copy_local_report_file_to_s3_bucket
 from masu.util.common import date_range_pair
 from masu.util.common import get_path_prefix
+from masu.util.gcp.common import gcp_bigquery_to_csv_data_frame
+from masu.util.gcp.common import gcp_bigquery_to_data_frame
+from masu.util.gcp.common import gcp_post_processor
 from providers.gcp.provider import GCPProvider
 
 DATA_DIR = Config.TMP_DIR
@@ -38,31 +42,30 @@ LOG = logging.getLogger(__name__)
 def divide_csv_daily(file_path):
     """
     Split local file into daily content.
+
+    The file is read in chunks of PARQUET_PROCESSING_BATCH_SIZE rows and each
+    chunk is appended to the files of its days, so memory use is bounded by the
+    chunk size rather than the file size. Values are kept as the exported text.
     """
-    daily_files = []
+    daily_files = {}
     directory = os.path.dirname(file_path)
 
     try:
-        data_frame = pd.read_csv(file_path)
+        with pd.read_csv(
+            file_path, chunksize=settings.PARQUET_PROCESSING_BATCH_SIZE, dtype=str, keep_default_na=False
+        ) as reader:
+            for data_frame in reader:
+                for day, df in data_frame.groupby(data_frame.usage_start_time.str[:10], sort=False):
+                    day_file = f"{day}.csv"
+                    day_filepath = f"{directory}/{day_file}"
+                    first_write = day not in daily_files
+                    df.to_csv(day_filepath, mode="w" if first_write else "a", index=False, header=first_write)
+                    daily_files[day] = {"filename": day_file, "filepath": day_filepath}
     except Exception as error:
         LOG.error(f"File {file_path} could not be parsed. Reason: {str(error)}")
         raise error
 
-    unique_times = data_frame.usage_start_time.unique()
-    days = list({cur_dt[:10] for cur_dt in unique_times})
-    daily_data_frames = [
-        {"data_frame": data_frame[data_frame.usage_start_time.str.contains(cur_day)], "date": cur_day}
-        for cur_day in days
-    ]
-
-    for daily_data in daily_data_frames:
-        day = daily_data.get("date")
-        df = daily_data.get("data_frame")
-        day_file = f"{day}.csv"
-        day_filepath = f"{directory}/{day_file}"
-        df.to_csv(day_filepath, index=False, header=True)
-        daily_files.append({"filename": day_file, "filepath": day_filepath})
-    return daily_files
+    return list(daily_files.values())
 
 
 def create_daily_archives(request_id, account, provider_uuid, filename, filepath, manifest_id, start_date, context={}):
@@ -395,6 +398,14 @@ class GCPReportDownloader(ReportDownloaderBase, DownloaderInterface):
         directory_path = self._get_local_directory_path()
         full_local_path = self._get_local_file_path(directory_path, key)
         os.makedirs(directory_path, exist_ok=True)
+        if settings.GCP_ARROW_DOWNLOAD and enable_trino_processing(
+            self._provider_uuid, Provider.PROVIDER_GCP, self.account
+        ):
+            msg = f"Downloading {key} to daily Parquet files in {directory_path}"
+            LOG.info(log_json(self.request_id, msg, self.context))
+            file_names = self._download_daily_parquet(query_job, directory_path, manifest_id, start_date)
+            return full_local_path, self.etag, DateHelper().today, file_names
+
         msg = f"Downloading {key} to {full_local_path}"
         LOG.info(log_json(self.request_id, msg, self.context))
         try:
@@ -429,6 +440,94 @@ class GCPReportDownloader(ReportDownloaderBase, DownloaderInterface):
 
         return full_local_path, self.etag, dh.today, file_names
 
+    def _download_daily_parquet(self, query_job, directory_path, manifest_id, start_date):
+        """
+        Write the query results to a local Parquet file per usage day.
+
+        The results are read a page at a time and converted the way the Parquet
+        report processor converts the CSV export, so the processor only
+        has to upload the files. Daily CSV files are archived to S3 only when
+        ENABLE_S3_ARCHIVING is set.
+
+        Args:
+            query_job (QueryJob): The BigQuery billing query
+            directory_path (str): The local directory of the daily files
+            manifest_id (int): The manifest identifier
+            start_date (Datetime): The start datetime of the report
+
+        Returns:
+            list of the local daily Parquet file paths.
+
+        """
+        writers = {}
+        csv_files = {}
+        try:
+            for page_frame in query_job.result().to_dataframe_iterable():
+                self._write_daily_files(page_frame, directory_path, writers, csv_files)
+            for writer in writers.values():
+                writer.close()
+        except Exception as exc:
+            self._remove_daily_files(writers, csv_files)
+            if not isinstance(exc, (OSError, IOError, GoogleCloudError)):
+                raise
+            err_msg = (
+                "Could not create GCP billing data parquet files."
+                f"\n  Provider: {self._provider_uuid}"
+                f"\n  Customer: {self.customer_name}"
+                f"\n  Response: {exc}"
+            )
+            raise GCPReportDownloaderError(err_msg)
+
+        s3_csv_path = get_path_prefix(
+            self.account, Provider.PROVIDER_GCP, self._provider_uuid, start_date, Config.CSV_DATA_TYPE
+        )
+        for day, csv_file in csv_files.items():
+            copy_local_report_file_to_s3_bucket(
+                self.request_id, s3_csv_path, csv_file, f"{day}.csv", manifest_id, start_date, self.context
+            )
+            os.remove(csv_file)
+        return [file_path for writer in writers.values() for file_path in writer.files]
+
+    def _write_daily_files(self, page_frame, directory_path, writers, csv_files):
+        """Append a page of query results to the daily Parquet writers and CSV files.
+
+        Args:
+            page_frame (DataFrame): A page of the BigQuery results
+            directory_path (str): The local directory of the daily files
+            writers (dict): The StreamingParquetWriter of each day, new days are added
+            csv_files (dict): The CSV file path of each day, new days are added
+
+        """
+        # BigQuery names result columns after their last field, e.g. service.id is returned as id
+        page_frame.columns = self.gcp_big_query_columns
+        data_frame, _ = gcp_post_processor(gcp_bigquery_to_data_frame(page_frame))
+        days = data_frame.usage_start_time.dt.strftime("%Y-%m-%d")
+        for day, day_frame in data_frame.groupby(days, sort=False):
+            if day not in writers:
+                writers[day] = StreamingParquetWriter(
+                    directory_path, day, settings.PARQUET_TARGET_FILE_SIZE, compression=settings.PARQUET_COMPRESSION
+                )
+            writers[day].write(day_frame)
+        if settings.ENABLE_S3_ARCHIVING:
+            csv_frame = gcp_bigquery_to_csv_data_frame(page_frame)
+            for day, day_frame in csv_frame.groupby(days, sort=False):
+                first_write = day not in csv_files
+                csv_files[day] = f"{directory_path}/{day}.csv"
+                day_frame.to_csv(csv_files[day], mode="w" if first_write else "a", index=False, header=first_write)
+
+    def _remove_daily_files(self, writers, csv_files):
+        """Remove the daily Parquet and CSV files of a failed download."""
+        for writer in writers.values():
+            writer.abort()
+            for file_path in writer.files:
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+        for csv_file in csv_files.values():
+            if os.path.exists(csv_file):
+                os.remove(csv_file)
+        msg = "Removed the daily files of the failed download."
+        LOG.info(log_json(self.request_id, msg, self.context))
+
     def _get_local_directory_path(self):
         """
         Get the local directory path destination for downloading files.
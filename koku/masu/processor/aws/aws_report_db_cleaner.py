@@ -8,6 +8,7 @@ from datetime import datetime
 
 from tenant_schemas.utils import schema_context
 
+from masu.config import Config
 from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 
 LOG = logging.getLogger(__name__)
@@ -102,6 +103,12 @@ class AWSReportDBCleaner:
                 bill_objects = accessor.get_bill_query_before_date(expired_date)
             else:
                 bill_objects = accessor.get_cost_entry_bills_query_by_provider(provider_uuid)
+
+            summary_table = accessor.line_item_daily_summary_table._meta.db_table
+            dropped_partitions = []
+            if expired_date is not None and Config.MASU_EXPIRE_BY_PARTITION:
+                dropped_partitions = accessor.drop_expired_partitions([summary_table], expired_date, simulate)
+            dropped_months = {p["partition_start"] for p in dropped_partitions if p["table"] == summary_table}
             with schema_context(self._schema):
                 for bill in bill_objects.all():
                     bill_id = bill.id
@@ -123,8 +130,9 @@ class AWSReportDBCleaner:
                         del_count = accessor.execute_delete_sql(accessor.get_daily_query_for_billid(bill_id))
                         LOG.info("Removing %s cost entry daily items for bill id %s", del_count, bill_id)
 
-                        del_count = accessor.execute_delete_sql(accessor.get_summary_query_for_billid(bill_id))
-                        LOG.info("Removing %s cost entry summary items for bill id %s", del_count, bill_id)
+                        if str(removed_billing_period_start.date().replace(day=1)) not in dropped_months:
+                            del_count = accessor.execute_delete_sql(accessor.get_summary_query_for_billid(bill_id))
+                            LOG.info("Removing %s cost entry summary items for bill id %s", del_count, bill_id)
 
                         del_count = accessor.execute_delete_sql(accessor.get_cost_entry_query_for_billid(bill_id))
                         LOG.info("Removing %s cost entry items for bill id %s", del_count, bill_id)
@@ -144,4 +152,8 @@ class AWSReportDBCleaner:
                 if not simulate:
                     bill_objects.delete()
 
+        if dropped_partitions:
+            reclaimed = sum(partition["bytes"] for partition in dropped_partitions)
+            LOG.info("%s expired partitions holding %s bytes", "Found" if simulate else "Dropped", reclaimed)
+            removed_items.extend(dropped_partitions)
         return removed_items
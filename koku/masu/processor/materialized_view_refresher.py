@@ -0,0 +1,228 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Refresh the materialized views that depend on changed summary tables."""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ciso8601
+from django.conf import settings
+from django.db import connection
+from tenant_schemas.utils import schema_context
+
+from api.models import Provider
+from api.utils import DateHelper
+from api.utils import materialized_view_month_start
+from masu.database import AWS_CUR_TABLE_MAP
+from masu.database import AZURE_REPORT_TABLE_MAP
+from masu.database import GCP_REPORT_TABLE_MAP
+from masu.database import OCP_REPORT_TABLE_MAP
+from masu.processor.summary_rollup_updater import SUMMARY_ROLLUPS
+from masu.processor.summary_rollup_updater import SummaryRollupUpdater
+from masu.prometheus_stats import MATERIALIZED_VIEW_REFRESH_DURATION
+from masu.prometheus_stats import MATERIALIZED_VIEW_REFRESH_SKIPPED_COUNTER
+
+LOG = logging.getLogger(__name__)
+
+SUMMARY_TABLES = {
+    Provider.PROVIDER_AWS: (AWS_CUR_TABLE_MAP["line_item_daily_summary"],),
+    Provider.PROVIDER_AZURE: (AZURE_REPORT_TABLE_MAP["line_item_daily_summary"],),
+    Provider.PROVIDER_GCP: (GCP_REPORT_TABLE_MAP["line_item_daily_summary"],),
+    Provider.PROVIDER_OCP: (OCP_REPORT_TABLE_MAP["line_item_daily_summary"],),
+}
+SUMMARY_TABLES[Provider.PROVIDER_AWS_LOCAL] = SUMMARY_TABLES[Provider.PROVIDER_AWS]
+SUMMARY_TABLES[Provider.PROVIDER_AZURE_LOCAL] = SUMMARY_TABLES[Provider.PROVIDER_AZURE]
+SUMMARY_TABLES[Provider.PROVIDER_GCP_LOCAL] = SUMMARY_TABLES[Provider.PROVIDER_GCP]
+
+OCP_ON_CLOUD_SUMMARY_TABLES = {
+    Provider.PROVIDER_AWS: (
+        AWS_CUR_TABLE_MAP["ocp_on_aws_daily_summary"],
+        AWS_CUR_TABLE_MAP["ocp_on_aws_project_daily_summary"],
+    ),
+    Provider.PROVIDER_AZURE: (
+        AZURE_REPORT_TABLE_MAP["ocp_on_azure_daily_summary"],
+        AZURE_REPORT_TABLE_MAP["ocp_on_azure_project_daily_summary"],
+    ),
+}
+OCP_ON_CLOUD_SUMMARY_TABLES[Provider.PROVIDER_AWS_LOCAL] = OCP_ON_CLOUD_SUMMARY_TABLES[Provider.PROVIDER_AWS]
+OCP_ON_CLOUD_SUMMARY_TABLES[Provider.PROVIDER_AZURE_LOCAL] = OCP_ON_CLOUD_SUMMARY_TABLES[Provider.PROVIDER_AZURE]
+
+# The tables and materialized views each materialized view in a schema selects from
+VIEW_DEPENDENCIES_SQL = """
+SELECT DISTINCT v.relname AS view_name,
+       t.relname AS table_name
+  FROM pg_class AS v
+  JOIN pg_namespace AS n
+    ON n.oid = v.relnamespace
+  JOIN pg_rewrite AS r
+    ON r.ev_class = v.oid
+  JOIN pg_depend AS d
+    ON d.objid = r.oid
+   AND d.classid = 'pg_rewrite'::regclass
+   AND d.refclassid = 'pg_class'::regclass
+  JOIN pg_class AS t
+    ON t.oid = d.refobjid
+ WHERE n.nspname = %s
+   AND v.relkind = 'm'
+   AND t.oid <> v.oid
+"""
+
+
+def get_summary_changes(provider_type, provider_uuid, start_date, end_date, infra_map=None):
+    """Return change records for the summary tables updated when summarizing a provider.
+
+    Args:
+        provider_type (str): The type of the summarized provider
+        provider_uuid (str): The uuid of the summarized provider
+        start_date (str): The first summarized date
+        end_date (str): The last summarized date
+        infra_map (dict): The OpenShift on cloud relationships that were summarized,
+            {OpenShift provider uuid: (infrastructure provider uuid, infrastructure provider type)}
+
+    Returns:
+        (list): A change record {table, source_uuid, start_date, end_date} per table and source
+
+    """
+    changes = {(table, str(provider_uuid)) for table in SUMMARY_TABLES.get(provider_type, ())}
+    for ocp_provider_uuid, (infra_provider_uuid, infra_provider_type) in (infra_map or {}).items():
+        changes.update(
+            (table, str(infra_provider_uuid)) for table in OCP_ON_CLOUD_SUMMARY_TABLES.get(infra_provider_type, ())
+        )
+        # OpenShift on cloud summaries also update the infrastructure costs of the OpenShift source
+        changes.update((table, str(ocp_provider_uuid)) for table in SUMMARY_TABLES[Provider.PROVIDER_OCP])
+    return [
+        {"table": table, "source_uuid": source_uuid, "start_date": str(start_date), "end_date": str(end_date)}
+        for table, source_uuid in sorted(changes)
+    ]
+
+
+class MaterializedViewRefresher:
+    """Refresh the materialized views of a schema.
+
+    Views are refreshed in dependency order, views that do not depend on each
+    other are refreshed concurrently over MATERIALIZED_VIEW_REFRESH_WORKERS
+    database connections. Summary rollup tables among the views are updated
+    incrementally by the SummaryRollupUpdater.
+    """
+
+    def __init__(self, schema_name, max_workers=None):
+        """Initialize the refresher.
+
+        Args:
+            schema_name (str): The schema of the materialized views
+            max_workers (int): The number of views to refresh at the same time
+
+        """
+        self._schema_name = schema_name
+        self._max_workers = max_workers or settings.MATERIALIZED_VIEW_REFRESH_WORKERS
+
+    def get_view_dependencies(self):
+        """Return the tables and materialized views each materialized view selects from."""
+        dependencies = {}
+        with connection.cursor() as cursor:
+            cursor.execute(VIEW_DEPENDENCIES_SQL, [self._schema_name])
+            for view_name, table_name in cursor.fetchall():
+                dependencies.setdefault(view_name, set()).add(table_name)
+        return dependencies
+
+    @staticmethod
+    def get_changed_tables(summary_changes):
+        """Return the tables changed within the date range held by the materialized views."""
+        view_start = materialized_view_month_start(DateHelper()).date()
+        changed_tables = set()
+        for change in summary_changes:
+            if ciso8601.parse_datetime(change["end_date"]).date() < view_start:
+                LOG.info(f"Changes to {change['table']} end on {change['end_date']}, before {view_start}.")
+                continue
+            changed_tables.add(change["table"])
+        return changed_tables
+
+    def get_refresh_layers(self, view_names, summary_changes=None):
+        """Return the views to refresh, as a list of layers that are refreshed in order.
+
+        Args:
+            view_names (list): The candidate materialized views
+            summary_changes (list): Change records from get_summary_changes, None refreshes all views
+
+        Returns:
+            (list): Lists of view names, views in a layer do not depend on each other
+
+        """
+        dependencies = self.get_view_dependencies()
+        if summary_changes is None:
+            to_refresh = set(view_names)
+        else:
+            changed = self.get_changed_tables(summary_changes)
+            # Views without known dependencies are always refreshed
+            to_refresh = set(view_names) - set(dependencies)
+            # A view is refreshed when one of its tables changed or a view it selects from is refreshed
+            while True:
+                found = {
+                    view
+                    for view in view_names
+                    if view not in to_refresh and dependencies[view] & (changed | to_refresh)
+                }
+                if not found:
+                    break
+                to_refresh |= found
+
+        layers = []
+        remaining = set(to_refresh)
+        while remaining:
+            layer = sorted(view for view in remaining if not dependencies.get(view, set()) & (remaining - {view}))
+            if not layer:
+                # A dependency cycle cannot happen between views, refresh whatever is left in one go
+                layer = sorted(remaining)
+            layers.append(layer)
+            remaining -= set(layer)
+
+        for view in set(view_names) - to_refresh:
+            MATERIALIZED_VIEW_REFRESH_SKIPPED_COUNTER.labels(view=view).inc()
+        return layers
+
+    def _refresh_view(self, view_name):
+        """Refresh one materialized view."""
+        start = time.time()
+        with schema_context(self._schema_name):
+            with connection.cursor() as cursor:
+                cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view_name}")
+        duration = time.time() - start
+        MATERIALIZED_VIEW_REFRESH_DURATION.labels(view=view_name).observe(duration)
+        LOG.info(f"Refreshed {view_name} in {duration:.3f} seconds.")
+
+    def _refresh_view_in_thread(self, view_name):
+        """Refresh one materialized view on the database connection of a worker thread."""
+        try:
+            self._refresh_view(view_name)
+        finally:
+            connection.close()
+
+    def refresh(self, view_names, summary_changes=None):
+        """Refresh the materialized views affected by the summary changes.
+
+        Args:
+            view_names (list): The candidate materialized views
+            summary_changes (list): Change records from get_summary_changes, None refreshes all views
+
+        Returns:
+            (list): The refreshed view names
+
+        """
+        rollup_tables = [view_name for view_name in view_names if view_name in SUMMARY_ROLLUPS]
+        view_names = [view_name for view_name in view_names if view_name not in SUMMARY_ROLLUPS]
+        refreshed = SummaryRollupUpdater(self._schema_name).update(rollup_tables, summary_changes)
+
+        with schema_context(self._schema_name):
+            layers = self.get_refresh_layers(view_names, summary_changes)
+        for layer in layers:
+            if self._max_workers > 1 and len(layer) > 1:
+                with ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="matview") as executor:
+                    # list() re-raises the first refresh error
+                    list(executor.map(self._refresh_view_in_thread, layer))
+            else:
+                for view_name in layer:
+                    self._refresh_view(view_name)
+            refreshed.extend(layer)
+        return refreshed
@@ -35,7 +35,7 @@ class OCPCloudReportSummaryUpdater(OCPCloudUpdaterBase):
             end_date   (str) The date to end on.
 
         Returns
-            None
+            (dict) The summarized OpenShift on cloud relationships, see get_infra_map
 
         """
         infra_map = self.get_infra_map()
@@ -64,6 +64,7 @@ class OCPCloudReportSummaryUpdater(OCPCloudUpdaterBase):
                 OCPCostModelCostUpdater(self._schema, provider_accessor.provider)._update_markup_cost(
                     start_date, end_date
                 )
+        return infra_map
 
     def update_aws_summary_tables(self, openshift_provider_uuid, aws_provider_uuid, start_date, end_date):
         """Update operations specifically for OpenShift on AWS."""
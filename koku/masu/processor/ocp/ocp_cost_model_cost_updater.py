@@ -7,6 +7,7 @@ import logging
 from decimal import Decimal
 
 from dateutil.parser import parse
+from django.conf import settings
 from tenant_schemas.utils import schema_context
 
 from api.metrics import constants as metric_constants
@@ -43,6 +44,8 @@ class OCPCostModelCostUpdater(OCPCloudUpdaterBase):
             self._tag_infra_rates = cost_model_accessor.tag_infrastructure_rates
             self._tag_default_infra_rates = cost_model_accessor.tag_default_infrastructure_rates
             self._supplementary_rates = cost_model_accessor.supplementary_rates
+            self._infra_tiered_rates = cost_model_accessor.infrastructure_tiered_rates
+            self._supplementary_tiered_rates = cost_model_accessor.supplementary_tiered_rates
             self._tag_supplementary_rates = cost_model_accessor.tag_supplementary_rates
             self._tag_default_supplementary_rates = cost_model_accessor.tag_default_supplementary_rates
             self._distribution = cost_model_accessor.distribution
@@ -140,6 +143,33 @@ class OCPCostModelCostUpdater(OCPCloudUpdaterBase):
 
         return Decimal(charge)
 
+    def _get_tier_schedule(self, tiered_rates):
+        """Return the usage limits and rate of each tier of a tiered rate.
+
+        The limits accumulate the tier sizes the way _calculate_variable_charge
+        walks the tiers, so usage is charged the same by both.
+
+        Returns:
+            (list): (lower_limit, upper_limit, rate) for each tier, the final upper_limit is None
+
+        """
+        schedule = []
+        seen_buckets = set()
+        lower_limit = Decimal(0)
+        for bucket in self._normalize_tier(tiered_rates):
+            # A single tier is both the first and the last tier of the normalized tiers
+            if id(bucket) in seen_buckets:
+                continue
+            seen_buckets.add(id(bucket))
+            usage_end = bucket.get("usage", {}).get("usage_end")
+            usage_start = bucket.get("usage", {}).get("usage_start")
+            upper_limit = None
+            if usage_end:
+                upper_limit = lower_limit + Decimal(usage_end) - (Decimal(usage_start) if usage_start else 0)
+            schedule.append((lower_limit, upper_limit, Decimal(bucket.get("value"))))
+            lower_limit = upper_limit
+        return schedule
+
     def _update_markup_cost(self, start_date, end_date):
         """Populate markup costs for OpenShift.
 
@@ -309,9 +339,24 @@ class OCPCostModelCostUpdater(OCPCloudUpdaterBase):
 
     def _update_usage_costs(self, start_date, end_date):
         """Update infrastructure and supplementary usage costs."""
+        infra_rates = self._infra_rates
+        supplementary_rates = self._supplementary_rates
+        if settings.TIERED_RATES_ENABLED:
+            try:
+                infra_rates = {
+                    metric: self._get_tier_schedule(tiers) for metric, tiers in self._infra_tiered_rates.items()
+                }
+                supplementary_rates = {
+                    metric: self._get_tier_schedule(tiers)
+                    for metric, tiers in self._supplementary_tiered_rates.items()
+                }
+            except OCPCostModelCostUpdaterError as error:
+                LOG.error("Unable to update usage costs. Error: %s", str(error))
+                return
+
         with OCPReportDBAccessor(self._schema) as report_accessor:
             report_accessor.populate_usage_costs(
-                self._infra_rates, self._supplementary_rates, start_date, end_date, self._cluster_id
+                infra_rates, supplementary_rates, start_date, end_date, self._cluster_id
             )
 
     def _update_tag_usage_costs(self, start_date, end_date):
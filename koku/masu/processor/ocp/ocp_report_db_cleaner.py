@@ -8,8 +8,10 @@ from datetime import datetime
 
 from tenant_schemas.utils import schema_context
 
+from masu.config import Config
 from masu.database.koku_database_access import mini_transaction_delete
 from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
+from masu.processor.summary_rollup_updater import SUMMARY_ROLLUPS
 
 LOG = logging.getLogger(__name__)
 
@@ -99,6 +101,14 @@ class OCPReportDBCleaner:
                 usage_period_objs = accessor.get_usage_period_on_or_before_date(expired_date)
             else:
                 usage_period_objs = accessor.get_usage_period_query_by_provider(provider_uuid)
+
+            summary_table = accessor.line_item_daily_summary_table._meta.db_table
+            dropped_partitions = []
+            if expired_date is not None and Config.MASU_EXPIRE_BY_PARTITION:
+                dropped_partitions = accessor.drop_expired_partitions(
+                    [summary_table, *SUMMARY_ROLLUPS], expired_date, simulate
+                )
+            dropped_months = {p["partition_start"] for p in dropped_partitions if p["table"] == summary_table}
             with schema_context(self._schema):
                 for usage_period in usage_period_objs.all():
                     report_period_id = usage_period.id
@@ -112,8 +122,11 @@ class OCPReportDBCleaner:
                         qty = accessor.execute_delete_sql(accessor.get_daily_usage_query_for_clusterid(cluster_id))
                         LOG.info("Removing %s usage daily items for cluster id %s", qty, cluster_id)
 
-                        qty = accessor.execute_delete_sql(accessor.get_summary_usage_query_for_clusterid(cluster_id))
-                        LOG.info("Removing %s usage summary items for cluster id %s", qty, cluster_id)
+                        if str(removed_usage_start_period.date().replace(day=1)) not in dropped_months:
+                            qty = accessor.execute_delete_sql(
+                                accessor.get_summary_usage_query_for_clusterid(cluster_id)
+                            )
+                            LOG.info("Removing %s usage summary items for cluster id %s", qty, cluster_id)
 
                         qty = accessor.execute_delete_sql(accessor.get_cost_summary_for_clusterid(cluster_id))
                         LOG.info("Removing %s cost summary items for cluster id %s", qty, cluster_id)
@@ -158,4 +171,9 @@ class OCPReportDBCleaner:
 
                 if not simulate:
                     usage_period_objs.delete()
+
+        if dropped_partitions:
+            reclaimed = sum(partition["bytes"] for partition in dropped_partitions)
+            LOG.info("%s expired partitions holding %s bytes", "Found" if simulate else "Dropped", reclaimed)
+            removed_items.extend(dropped_partitions)
         return removed_items
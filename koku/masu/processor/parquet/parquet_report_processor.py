@@ -4,14 +4,21 @@
 #
 """Processor to convert Cost Usage Reports to parquet."""
 import datetime
+import json
 import logging
 import os
+import resource
+from contextlib import contextmanager
+from contextlib import nullcontext
 from functools import partial
 from pathlib import Path
 
 import pandas as pd
+import pyarrow.parquet as pq
+from billiard.pool import Pool
 from dateutil import parser
 from django.conf import settings
+from django.db import connections
 
 from api.common import log_json
 from api.provider.models import Provider
@@ -22,17 +29,22 @@ from masu.processor.aws.aws_report_parquet_processor import AWSReportParquetProc
 from masu.processor.azure.azure_report_parquet_processor import AzureReportParquetProcessor
 from masu.processor.gcp.gcp_report_parquet_processor import GCPReportParquetProcessor
 from masu.processor.ocp.ocp_report_parquet_processor import OCPReportParquetProcessor
+from masu.processor.parquet.parquet_writer import PARQUET_EXT
+from masu.processor.parquet.parquet_writer import StreamingParquetWriter
 from masu.util.aws.common import aws_generate_daily_data
 from masu.util.aws.common import aws_post_processor
 from masu.util.aws.common import copy_data_to_s3_bucket
 from masu.util.aws.common import get_column_converters as aws_column_converters
 from masu.util.aws.common import remove_files_not_in_set_from_s3_bucket
+from masu.util.aws.common import S3UploadQueue
 from masu.util.azure.common import azure_generate_daily_data
 from masu.util.azure.common import azure_post_processor
 from masu.util.azure.common import get_column_converters as azure_column_converters
 from masu.util.common import create_enabled_keys
 from masu.util.common import get_hive_table_path
 from masu.util.common import get_path_prefix
+from masu.util.common import get_vectorized_read_csv_kwargs
+from masu.util.common import vectorized_column_conversion
 from masu.util.gcp.common import gcp_post_processor
 from masu.util.gcp.common import get_column_converters as gcp_column_converters
 from masu.util.ocp.common import detect_type
@@ -47,7 +59,6 @@ from reporting.provider.ocp.models import OCPEnabledTagKeys
 LOG = logging.getLogger(__name__)
 CSV_GZIP_EXT = ".csv.gz"
 CSV_EXT = ".csv"
-PARQUET_EXT = ".parquet"
 
 DAILY_FILE_TYPE = "daily"
 
@@ -63,6 +74,30 @@ class ParquetReportProcessorError(Exception):
     pass
 
 
+def _init_conversion_worker(memory_limit):
+    """Apply the address space limit to a conversion worker process."""
+    if memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+
+def _convert_file_in_worker(processor_class, processor_kwargs, csv_filename):
+    """Convert a single CSV file in a worker process.
+
+    Only the Parquet files are written and sent to S3. The tables and enabled
+    tag keys are created by the parent process once every file is converted,
+    from the files and keys returned here.
+    """
+    processor = processor_class(**processor_kwargs)
+    result = processor._write_parquet_files(csv_filename)
+    result["daily_parquet_file"] = None
+    if processor.provider_type not in (Provider.PROVIDER_AZURE, Provider.PROVIDER_GCP):
+        result["daily_parquet_file"] = processor._write_daily_parquet(
+            result.get("parquet_base_filename"), result.get("daily_data_frames")
+        )
+    result["files_to_remove"] = processor.files_to_remove
+    return result
+
+
 class ParquetReportProcessor:
     """Parquet report processor."""
 
@@ -76,6 +111,11 @@ class ParquetReportProcessor:
         self._context = context
         self.presto_table_exists = {}
         self.files_to_remove = []
+        self._upload_queue = None
+        self._failed_uploads = []
+        # The CSV file each queued Parquet file was converted from
+        self._queued_files = {}
+        self._converting_file = None
 
     @property
     def schema_name(self):
@@ -150,6 +190,26 @@ class ParquetReportProcessor:
         """Whether to create the Hive/Trino table"""
         return self._context.get("create_table", False)
 
+    @property
+    def vectorized_conversion(self):
+        """Whether to convert CSV columns with vectorized operations instead of per-cell converters."""
+        return self._context.get("vectorized_conversion", settings.PARQUET_VECTORIZED_CONVERSION)
+
+    @property
+    def streaming_writer(self):
+        """Whether to append chunks as row groups to size-bounded files instead of one file per chunk."""
+        return self._context.get("streaming_writer", settings.PARQUET_STREAMING_WRITER)
+
+    @property
+    def concurrent_uploads(self):
+        """Whether to upload Parquet files in the background while conversion continues."""
+        return self._context.get("concurrent_uploads", settings.S3_CONCURRENT_UPLOADS)
+
+    @property
+    def conversion_workers(self):
+        """The number of processes used to convert the files in file_list."""
+        return self._context.get("conversion_workers", settings.PARQUET_CONVERSION_WORKERS)
+
     @property
     def file_extension(self):
         """File format compression."""
@@ -158,6 +218,8 @@ class ParquetReportProcessor:
             return CSV_EXT
         elif first_file.lower().endswith(CSV_GZIP_EXT):
             return CSV_GZIP_EXT
+        elif first_file.lower().endswith(PARQUET_EXT):
+            return PARQUET_EXT
         else:
             msg = f"File {first_file} is not valid CSV. Conversion to parquet skipped."
             LOG.error(log_json(self.request_id, msg, self.error_context))
@@ -295,7 +357,6 @@ class ParquetReportProcessor:
         of temporary AWS S3 connectivity issues because it is relatively important
         for us to convert the archived data.
         """
-        parquet_base_filename = ""
         if not enable_trino_processing(self.provider_uuid, self.provider_type, self.schema_name):
             msg = "Skipping convert_to_parquet. Parquet processing is disabled."
             LOG.info(log_json(self.request_id, msg, self.error_context))
@@ -327,18 +388,10 @@ class ParquetReportProcessor:
             )
             manifest_accessor.mark_s3_parquet_cleared(manifest)
 
-        failed_conversion = []
-        for csv_filename in self.file_list:
-            if self.provider_type == Provider.PROVIDER_OCP and self.report_type is None:
-                msg = f"Could not establish report type for {csv_filename}."
-                LOG.warn(log_json(self.request_id, msg, self.error_context))
-                failed_conversion.append(csv_filename)
-                continue
-
-            parquet_base_filename, daily_data_frames, success = self.convert_csv_to_parquet(csv_filename)
-            if self.provider_type not in (Provider.PROVIDER_AZURE, Provider.PROVIDER_GCP):
-                self.create_daily_parquet(parquet_base_filename, daily_data_frames)
-            if not success:
+        with self._queued_uploads():
+            parquet_base_filename, daily_data_frames, failed_conversion = self._convert_files()
+        for csv_filename in self._get_failed_upload_files():
+            if csv_filename not in failed_conversion:
                 failed_conversion.append(csv_filename)
 
         if failed_conversion:
@@ -346,8 +399,119 @@ class ParquetReportProcessor:
             LOG.warn(log_json(self.request_id, msg, self.error_context))
         return parquet_base_filename, daily_data_frames
 
+    def _convert_files(self):
+        """Convert the files in file_list, in worker processes when there are PARQUET_CONVERSION_WORKERS.
+
+        Returns:
+            (str, list, list): The last Parquet base file name, its daily data frames and the failed CSV files
+
+        """
+        parquet_base_filename = ""
+        daily_data_frames = []
+        failed_conversion = []
+        if self.provider_type == Provider.PROVIDER_OCP and self.report_type is None:
+            for csv_filename in self.file_list:
+                msg = f"Could not establish report type for {csv_filename}."
+                LOG.warn(log_json(self.request_id, msg, self.error_context))
+                failed_conversion.append(csv_filename)
+        elif self.conversion_workers > 1 and len(self.file_list) > 1:
+            return self._convert_files_in_parallel()
+        else:
+            for csv_filename in self.file_list:
+                parquet_base_filename, daily_data_frames, success = self.convert_csv_to_parquet(csv_filename)
+                if self.provider_type not in (Provider.PROVIDER_AZURE, Provider.PROVIDER_GCP):
+                    self.create_daily_parquet(parquet_base_filename, daily_data_frames)
+                if not success:
+                    failed_conversion.append(csv_filename)
+        return parquet_base_filename, daily_data_frames, failed_conversion
+
+    @contextmanager
+    def _queued_uploads(self):
+        """Send Parquet files to S3 through an upload queue while converting, with S3_CONCURRENT_UPLOADS."""
+        if self.concurrent_uploads:
+            self._upload_queue = S3UploadQueue(
+                self.request_id, manifest_id=self.manifest_id, context=self.error_context
+            )
+        try:
+            yield
+        finally:
+            if self._upload_queue:
+                self._failed_uploads.extend(self._upload_queue.shutdown())
+                self._upload_queue = None
+
+    def _get_failed_upload_files(self):
+        """Return the CSV files whose queued Parquet files failed to upload."""
+        return [self._queued_files.get(file_name, file_name) for file_name, _ in self._failed_uploads]
+
+    def _convert_files_in_parallel(self):
+        """Convert the files in file_list across a pool of worker processes.
+
+        Workers only write and upload Parquet files. The Trino tables and
+        enabled tag keys are created here once every worker has finished.
+        """
+        processor_kwargs = {
+            "schema_name": self._schema_name,
+            "report_path": self._report_file,
+            "provider_uuid": self._provider_uuid,
+            "provider_type": self._provider_type,
+            "manifest_id": self._manifest_id,
+            "context": {**self._context, "concurrent_uploads": False},
+        }
+        parquet_base_filename = ""
+        daily_data_frames = []
+        failed_conversion = []
+        unique_keys = set()
+        parquet_file = None
+        daily_parquet_file = None
+
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+        # Celery prefork workers are daemonic processes, which multiprocessing does not allow to
+        # start children, so the files are converted in a billiard pool like the worker's own
+        pool = Pool(
+            processes=self.conversion_workers,
+            initializer=_init_conversion_worker,
+            initargs=(settings.PARQUET_CONVERSION_WORKER_MEMORY_LIMIT,),
+        )
+        try:
+            results = {
+                csv_filename: pool.apply_async(_convert_file_in_worker, (type(self), processor_kwargs, csv_filename))
+                for csv_filename in self.file_list
+            }
+            pool.close()
+            for csv_filename, async_result in results.items():
+                try:
+                    result = async_result.get()
+                except Exception as err:
+                    msg = f"File {csv_filename} could not be converted in a worker process. Reason: {str(err)}"
+                    LOG.warn(log_json(self.request_id, msg, self.error_context))
+                    failed_conversion.append(csv_filename)
+                    continue
+                parquet_base_filename = result.get("parquet_base_filename")
+                daily_data_frames = result.get("daily_data_frames")
+                self.files_to_remove.extend(result.get("files_to_remove"))
+                unique_keys.update(result.get("unique_keys"))
+                parquet_file = result.get("parquet_file") or parquet_file
+                daily_parquet_file = result.get("daily_parquet_file") or daily_parquet_file
+                if not result.get("success"):
+                    failed_conversion.append(csv_filename)
+        finally:
+            pool.terminate()
+            pool.join()
+
+        if parquet_file and self.create_table and not self.presto_table_exists.get(self.report_type):
+            self.create_parquet_table(parquet_file)
+        if daily_parquet_file:
+            self.create_parquet_table(daily_parquet_file, daily=True)
+        create_enabled_keys(self._schema_name, self.enabled_tags_model, unique_keys)
+
+        return parquet_base_filename, daily_data_frames, failed_conversion
+
     def create_parquet_table(self, parquet_file, daily=False):
         """Create parquet table."""
+        if self._upload_queue:
+            # Partitions can only be synced once their files are in S3
+            self._failed_uploads.extend(self._upload_queue.flush())
         processor = self._set_report_processor(parquet_file, daily=daily)
         bill_date = self.start_date.replace(day=1)
         if not processor.schema_exists():
@@ -357,17 +521,66 @@ class ParquetReportProcessor:
         if not daily:
             processor.create_bill(bill_date=bill_date)
         processor.get_or_create_postgres_partition(bill_date=bill_date)
-        processor.sync_hive_partitions()
+        processor.sync_hive_partitions(bill_date=bill_date)
         self.presto_table_exists[self.report_type] = True
 
-    def convert_csv_to_parquet(self, csv_filename):  # noqa: C901
-        """Convert CSV file to parquet and send to S3."""
+    def _load_parquet_file(self, parquet_filename):
+        """Send a Parquet file the downloader already wrote in its final form to S3.
+
+        Returns:
+            (dict): The Parquet base file name, daily data frames, success, unique tag keys and Parquet file
+
+        """
+        parquet_name = os.path.basename(parquet_filename)
+        result = {
+            "parquet_base_filename": parquet_name.replace(PARQUET_EXT, ""),
+            "daily_data_frames": [],
+            "success": False,
+            "unique_keys": set(),
+            "parquet_file": None,
+        }
+
+        msg = f"Running load_parquet_file on file {parquet_filename}."
+        LOG.info(log_json(self.request_id, msg, self.error_context))
+
+        try:
+            # Downloaded Parquet files carry their tags as JSON in the labels column
+            if "labels" in pq.read_schema(parquet_filename).names:
+                labels = pq.read_table(parquet_filename, columns=["labels"]).column("labels").unique()
+                for label in labels.to_pylist():
+                    result["unique_keys"].update(json.loads(label).keys())
+            if self._copy_parquet_file_to_s3(parquet_filename, parquet_name):
+                result["success"] = True
+                result["parquet_file"] = parquet_filename
+        except Exception as err:
+            msg = f"File {parquet_filename} could not be loaded to S3. Reason: {str(err)}"
+            LOG.warn(log_json(self.request_id, msg, self.error_context))
+
+        return result
+
+    def _write_parquet_files(self, csv_filename):  # noqa: C901
+        """Convert a CSV file to Parquet files and send them to S3.
+
+        Returns:
+            (dict): The Parquet base file name, daily data frames, success, unique tag keys and last Parquet file
+
+        """
+        self._converting_file = csv_filename
+        if csv_filename.lower().endswith(PARQUET_EXT):
+            return self._load_parquet_file(csv_filename)
         daily_data_frames = []
         converters = self._get_column_converters()
         csv_path, csv_name = os.path.split(csv_filename)
         unique_keys = set()
         parquet_file = None
         parquet_base_filename = csv_name.replace(self.file_extension, "")
+        result = {
+            "parquet_base_filename": parquet_base_filename,
+            "daily_data_frames": daily_data_frames,
+            "success": False,
+            "unique_keys": unique_keys,
+            "parquet_file": None,
+        }
         kwargs = {}
         if self.file_extension == CSV_GZIP_EXT:
             kwargs = {"compression": "gzip"}
@@ -377,11 +590,19 @@ class ParquetReportProcessor:
 
         try:
             col_names = pd.read_csv(csv_filename, nrows=0, **kwargs).columns
-            converters.update({col: str for col in col_names if col not in converters})
-            with pd.read_csv(
-                csv_filename, converters=converters, chunksize=settings.PARQUET_PROCESSING_BATCH_SIZE, **kwargs
+            if self.vectorized_conversion:
+                kwargs.update(get_vectorized_read_csv_kwargs())
+            else:
+                converters.update({col: str for col in col_names if col not in converters})
+                kwargs["converters"] = converters
+            writer = self._get_parquet_writer(parquet_base_filename) if self.streaming_writer else None
+            # The streaming writer removes its partial file if the conversion fails
+            with writer or nullcontext(), pd.read_csv(
+                csv_filename, chunksize=settings.PARQUET_PROCESSING_BATCH_SIZE, **kwargs
             ) as reader:
                 for i, data_frame in enumerate(reader):
+                    if self.vectorized_conversion:
+                        data_frame = vectorized_column_conversion(data_frame, converters)
                     parquet_filename = f"{parquet_base_filename}_{i}{PARQUET_EXT}"
                     parquet_file = f"{self.local_path}/{parquet_filename}"
                     if self.post_processor:
@@ -394,28 +615,65 @@ class ParquetReportProcessor:
                     if self.daily_data_processor is not None:
                         daily_data_frames.append(self.daily_data_processor(data_frame))
 
-                    success = self._write_parquet_to_file(parquet_file, parquet_filename, data_frame)
-                    if not success:
-                        return parquet_base_filename, daily_data_frames, False
-            if self.create_table and not self.presto_table_exists.get(self.report_type):
-                self.create_parquet_table(parquet_file)
-            create_enabled_keys(self._schema_name, self.enabled_tags_model, unique_keys)
+                    if writer:
+                        writer.write(data_frame)
+                        continue
+                    if not self._write_parquet_to_file(parquet_file, parquet_filename, data_frame):
+                        return result
+            if writer:
+                if writer.failed_files:
+                    return result
+                parquet_file = writer.files[-1] if writer.files else parquet_file
         except Exception as err:
             msg = (
                 f"File {csv_filename} could not be written as parquet to temp file {parquet_file}. Reason: {str(err)}"
             )
             LOG.warn(log_json(self.request_id, msg, self.error_context))
+            return result
+
+        result["success"] = True
+        result["parquet_file"] = parquet_file
+        return result
+
+    def convert_csv_to_parquet(self, csv_filename):
+        """Convert CSV file to parquet and send to S3."""
+        result = self._write_parquet_files(csv_filename)
+        parquet_base_filename = result.get("parquet_base_filename")
+        daily_data_frames = result.get("daily_data_frames")
+        if not result.get("success"):
+            return parquet_base_filename, daily_data_frames, False
+        try:
+            if self.create_table and not self.presto_table_exists.get(self.report_type):
+                self.create_parquet_table(result.get("parquet_file"))
+            create_enabled_keys(self._schema_name, self.enabled_tags_model, result.get("unique_keys"))
+        except Exception as err:
+            msg = (
+                f"File {csv_filename} could not be written as parquet to temp file {result.get('parquet_file')}. "
+                f"Reason: {str(err)}"
+            )
+            LOG.warn(log_json(self.request_id, msg, self.error_context))
             return parquet_base_filename, daily_data_frames, False
 
         return parquet_base_filename, daily_data_frames, True
 
+    def _write_daily_parquet(self, parquet_base_filename, data_frames):
+        """Write and send the Parquet files of daily aggregated data and return the last file."""
+        file_path = None
+        if self.streaming_writer:
+            with self._get_parquet_writer(f"{parquet_base_filename}_{DAILY_FILE_TYPE}", DAILY_FILE_TYPE) as writer:
+                for data_frame in data_frames:
+                    writer.write(data_frame)
+            file_path = writer.files[-1] if writer.files else None
+        else:
+            for i, data_frame in enumerate(data_frames):
+                file_name = f"{parquet_base_filename}_{DAILY_FILE_TYPE}_{i}{PARQUET_EXT}"
+                file_path = f"{self.local_path}/{file_name}"
+                self._write_parquet_to_file(file_path, file_name, data_frame, file_type=DAILY_FILE_TYPE)
+        return file_path
+
     def create_daily_parquet(self, parquet_base_filename, data_frames):
         """Create a parquet file for daily aggregated data."""
-        file_path = None
-        for i, data_frame in enumerate(data_frames):
-            file_name = f"{parquet_base_filename}_{DAILY_FILE_TYPE}_{i}{PARQUET_EXT}"
-            file_path = f"{self.local_path}/{file_name}"
-            self._write_parquet_to_file(file_path, file_name, data_frame, file_type=DAILY_FILE_TYPE)
+        file_path = self._write_daily_parquet(parquet_base_filename, data_frames)
         if file_path:
             self.create_parquet_table(file_path, daily=True)
 
@@ -427,10 +685,29 @@ class ParquetReportProcessor:
             s3_path = self.parquet_path_s3
         return s3_path
 
+    def _get_parquet_writer(self, parquet_base_filename, file_type=None):
+        """Return a streaming Parquet writer that sends each finished file to S3."""
+        return StreamingParquetWriter(
+            self.local_path,
+            parquet_base_filename,
+            settings.PARQUET_TARGET_FILE_SIZE,
+            compression=settings.PARQUET_COMPRESSION,
+            on_file_closed=partial(self._copy_parquet_file_to_s3, file_type=file_type),
+        )
+
     def _write_parquet_to_file(self, file_path, file_name, data_frame, file_type=None):
         """Write Parquet file and send to S3."""
-        s3_path = self._determin_s3_path(file_type)
         data_frame.to_parquet(file_path, allow_truncated_timestamps=True, coerce_timestamps="ms", index=False)
+        return self._copy_parquet_file_to_s3(file_path, file_name, file_type=file_type)
+
+    def _copy_parquet_file_to_s3(self, file_path, file_name, file_type=None):
+        """Send a local Parquet file to S3."""
+        s3_path = self._determin_s3_path(file_type)
+        if self._upload_queue:
+            self._upload_queue.submit(s3_path, file_path, file_name)
+            self._queued_files[file_name] = self._converting_file or file_name
+            self.files_to_remove.append(file_path)
+            return True
         try:
             with open(file_path, "rb") as fin:
                 copy_data_to_s3_bucket(
@@ -0,0 +1,149 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Streaming writer that appends data frames to size-bounded Parquet files as row groups."""
+import logging
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+LOG = logging.getLogger(__name__)
+PARQUET_EXT = ".parquet"
+
+
+class StreamingParquetWriter:
+    """Write data frames as row groups, rolling over to a new file at a target size.
+
+    Example:
+        with StreamingParquetWriter(local_path, base_name, on_file_closed=upload) as writer:
+            for data_frame in reader:
+                writer.write(data_frame)
+        writer.stats
+
+    """
+
+    def __init__(self, local_path, base_filename, target_file_size, compression="snappy", on_file_closed=None):
+        """Initialize the writer.
+
+        Args:
+            local_path (str): Directory where the Parquet files are written
+            base_filename (str): File name prefix, files are named {base_filename}_{index}.parquet
+            target_file_size (int): Size in bytes after which the current file is closed
+            compression (str): Parquet compression codec, e.g. snappy, gzip, zstd, or none
+            on_file_closed (callable): Called with (file_path, file_name) for every closed file,
+                a return value of False marks the file as failed
+
+        """
+        self._local_path = local_path
+        self._base_filename = base_filename
+        self._target_file_size = target_file_size
+        self._compression = compression
+        self._on_file_closed = on_file_closed
+        self._file_index = 0
+        self._sink = None
+        self._writer = None
+        self._schema = None
+        self._current = None
+        self.files = []
+        self.failed_files = []
+        self.stats = []
+
+    def __enter__(self):
+        """Return the writer."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the current file, or remove it when the block raised."""
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @property
+    def file_path(self):
+        """The local path of the file currently being written."""
+        return self._current.get("file_path") if self._current else None
+
+    def _open(self, schema):
+        """Open a new Parquet file for the given schema."""
+        file_name = f"{self._base_filename}_{self._file_index}{PARQUET_EXT}"
+        file_path = f"{self._local_path}/{file_name}"
+        self._file_index += 1
+        self._schema = schema
+        self._sink = pa.OSFile(file_path, "wb")
+        self._writer = pq.ParquetWriter(
+            self._sink,
+            schema,
+            compression=self._compression,
+            coerce_timestamps="ms",
+            allow_truncated_timestamps=True,
+        )
+        self._current = {"file_name": file_name, "file_path": file_path, "row_groups": 0, "rows": 0, "bytes": 0}
+
+    def _to_table(self, data_frame):
+        """Convert a data frame to an Arrow table, matching the open file schema where possible."""
+        table = pa.Table.from_pandas(data_frame, preserve_index=False)
+        if self._schema is not None and not table.schema.equals(self._schema):
+            try:
+                table = table.cast(self._schema)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError):
+                LOG.info(f"Schema changed while writing {self.file_path}. Starting a new file.")
+                self.close()
+        return table
+
+    def write(self, data_frame):
+        """Append a data frame to the current file as a row group."""
+        if data_frame.empty:
+            return
+        table = self._to_table(data_frame)
+        if self._writer is None:
+            self._open(table.schema)
+        self._writer.write_table(table)
+        self._current["row_groups"] += 1
+        self._current["rows"] += table.num_rows
+        self._current["bytes"] = self._sink.tell()
+        if self._current["bytes"] >= self._target_file_size:
+            self.close()
+
+    def close(self):
+        """Close the current file and hand it off to the on_file_closed callback."""
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._current["bytes"] = self._sink.tell()
+        self._sink.close()
+        current = self._current
+        self._writer = None
+        self._sink = None
+        self._schema = None
+        self._current = None
+
+        self.files.append(current.get("file_path"))
+        self.stats.append(current)
+        LOG.info(
+            f"Closed {current.get('file_name')} with {current.get('row_groups')} row groups, "
+            f"{current.get('rows')} rows, and {current.get('bytes')} bytes."
+        )
+        if self._on_file_closed:
+            if self._on_file_closed(current.get("file_path"), current.get("file_name")) is False:
+                self.failed_files.append(current.get("file_path"))
+
+    def abort(self):
+        """Close and remove the current partial file without handing it off."""
+        if self._writer is None:
+            return
+        file_path = self.file_path
+        try:
+            self._writer.close()
+            self._sink.close()
+        except (OSError, pa.ArrowException) as err:
+            LOG.warning(f"Unable to close {file_path}. Reason: {err}")
+        self._writer = None
+        self._sink = None
+        self._schema = None
+        self._current = None
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        LOG.info(f"Removed partial Parquet file {file_path}.")
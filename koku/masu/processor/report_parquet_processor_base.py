@@ -5,7 +5,6 @@
 """Processor for Parquet files."""
 import logging
 
-import prestodb
 import pyarrow.parquet as pq
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
@@ -14,12 +13,27 @@ from prestodb.exceptions import PrestoQueryError
 from prestodb.exceptions import PrestoUserError
 from tenant_schemas.utils import schema_context
 
+import koku.presto_database as kpdb
 from api.models import Provider
 from masu.util.common import strip_characters_from_column_name
 from reporting.models import PartitionedTable
 
 LOG = logging.getLogger(__name__)
 
+HIVE_PARTITION_COLUMNS = ("source", "year", "month")
+# Hive partitions registered by this process, keyed by (schema, table, source, year, month)
+_KNOWN_HIVE_PARTITIONS = set()
+
+
+def clear_hive_partition_cache(schema_name=None, provider_uuid=None):
+    """Forget the Hive partitions registered by this process, for a schema, a source of a schema, or all."""
+    if schema_name is None:
+        _KNOWN_HIVE_PARTITIONS.clear()
+        return
+    for cache_key in list(_KNOWN_HIVE_PARTITIONS):
+        if cache_key[0] == schema_name and (provider_uuid is None or cache_key[2] == str(provider_uuid)):
+            _KNOWN_HIVE_PARTITIONS.discard(cache_key)
+
 
 class PostgresSummaryTableError(Exception):
     """Postgres summary table is not defined."""
@@ -45,18 +59,18 @@ class ReportParquetProcessorBase:
         """Return error if unimplemented in subclass."""
         raise PostgresSummaryTableError("This must be a property on the sub class.")
 
-    def _execute_sql(self, sql, schema_name):  # pragma: no cover
-        """Execute presto SQL."""
+    def _execute_sql(self, sql, schema_name, ignore_user_errors=True):  # pragma: no cover
+        """Execute presto SQL, user errors are logged or, without ignore_user_errors, raised."""
         rows = []
         try:
-            with prestodb.dbapi.connect(
+            conn = kpdb.connect(
                 host=settings.PRESTO_HOST, port=settings.PRESTO_PORT, user="admin", catalog="hive", schema=schema_name
-            ) as conn:
-                cur = conn.cursor()
-                cur.execute(sql)
-                rows = cur.fetchall()
-                LOG.debug(f"_execute_sql rows: {str(rows)}. Type: {type(rows)}")
+            )
+            rows = kpdb.execute(conn, sql)
+            LOG.debug(f"_execute_sql rows: {str(rows)}. Type: {type(rows)}")
         except PrestoUserError as err:
+            if not ignore_user_errors:
+                raise
             LOG.error(err)
         except (PrestoExternalError, PrestoQueryError) as err:
             LOG.error(err)
@@ -159,9 +173,56 @@ class ReportParquetProcessorBase:
 
         return created
 
-    def sync_hive_partitions(self):
-        """Sync hive partition metadata for new partitions."""
+    def sync_hive_partitions(self, bill_date=None):
+        """Make the Hive partition of a billing month written for this source known to Trino.
+
+        Partitions this process already registered are skipped, Trino reads new
+        files in a known partition without a metadata update. With
+        TRINO_REGISTER_PARTITIONS only the new partition is registered, otherwise
+        or without a bill date the partition metadata of the whole table is synced.
+        """
+        if bill_date is None:
+            self._sync_all_hive_partitions()
+            return
+
+        partition_values = (str(self._provider_uuid), bill_date.strftime("%Y"), bill_date.strftime("%m"))
+        cache_key = (self._schema_name, self._table_name, *partition_values)
+        if cache_key in _KNOWN_HIVE_PARTITIONS:
+            LOG.info(f"Trino/Hive partition {partition_values} of {self._table_name} is already registered.")
+            return
+
+        if settings.TRINO_REGISTER_PARTITIONS:
+            synced = self._register_hive_partition(partition_values)
+        else:
+            synced = self._sync_all_hive_partitions()
+        if synced:
+            _KNOWN_HIVE_PARTITIONS.add(cache_key)
+
+    def _call_partition_procedure(self, sql):
+        """Call a Hive partition procedure, return whether the partition metadata is up to date."""
+        LOG.info(sql)
+        try:
+            self._execute_sql(sql, self._schema_name, ignore_user_errors=False)
+        except PrestoUserError as err:
+            if err.error_name != "ALREADY_EXISTS":
+                LOG.error(err)
+                return False
+            # An already registered partition is left as is
+            LOG.info(err.message)
+        return True
+
+    def _sync_all_hive_partitions(self):
+        """Sync hive partition metadata for new partitions, return whether the sync succeeded."""
         LOG.info("Syncing Trino/Hive partitions.")
         sql = f"CALL system.sync_partition_metadata('{self._schema_name}', '{self._table_name}', 'FULL')"
-        LOG.info(sql)
-        self._execute_sql(sql, self._schema_name)
+        return self._call_partition_procedure(sql)
+
+    def _register_hive_partition(self, partition_values):
+        """Register one partition without listing the rest of the table in S3, return whether it is registered."""
+        partition_path = "/".join(f"{col}={value}" for col, value in zip(HIVE_PARTITION_COLUMNS, partition_values))
+        location = f"s3a://{settings.S3_BUCKET_NAME}/{self._s3_path}/{partition_path}"
+        sql = (
+            f"CALL system.register_partition('{self._schema_name}', '{self._table_name}', "
+            f"ARRAY{list(HIVE_PARTITION_COLUMNS)}, ARRAY{list(partition_values)}, '{location}')"
+        )
+        return self._call_partition_procedure(sql)
@@ -18,6 +18,7 @@ from masu.processor.azure.azure_report_parquet_summary_updater import AzureRepor
 from masu.processor.azure.azure_report_summary_updater import AzureReportSummaryUpdater
 from masu.processor.gcp.gcp_report_parquet_summary_updater import GCPReportParquetSummaryUpdater
 from masu.processor.gcp.gcp_report_summary_updater import GCPReportSummaryUpdater
+from masu.processor.materialized_view_refresher import get_summary_changes
 from masu.processor.ocp.ocp_cloud_parquet_summary_updater import OCPCloudParquetReportSummaryUpdater
 from masu.processor.ocp.ocp_cloud_summary_updater import OCPCloudReportSummaryUpdater
 from masu.processor.ocp.ocp_report_parquet_summary_updater import OCPReportParquetSummaryUpdater
@@ -176,7 +177,7 @@ class ReportSummaryUpdater:
             manifest_id (str): The particular manifest to use.
 
         Returns:
-            None
+            (list): Change records of the updated summary tables, see get_summary_changes
 
         """
         start_date, end_date = self._format_dates(start_date, end_date)
@@ -186,8 +187,10 @@ class ReportSummaryUpdater:
         start_date, end_date = self._updater.update_summary_tables(start_date, end_date)
 
         try:
-            self._ocp_cloud_updater.update_summary_tables(start_date, end_date)
+            infra_map = self._ocp_cloud_updater.update_summary_tables(start_date, end_date)
         except Exception as ex:
             raise ReportSummaryUpdaterCloudError(str(ex))
 
         invalidate_view_cache_for_tenant_and_source_type(self._schema, self._provider.type)
+
+        return get_summary_changes(self._provider.type, self._provider_uuid, start_date, end_date, infra_map)
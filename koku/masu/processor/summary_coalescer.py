@@ -0,0 +1,165 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Merge the summarizations requested for a provider billing month into one."""
+import datetime
+import logging
+
+import ciso8601
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from reporting_common.models import SummaryDirtyRange
+
+LOG = logging.getLogger(__name__)
+
+# Widen the dirty range of the billing month, or start one.
+# xmax is 0 only for the rows this statement inserted.
+MARK_DIRTY_SQL = """
+INSERT INTO public.reporting_common_summarydirtyrange AS dr (
+    schema_name,
+    provider_type,
+    provider_uuid,
+    billing_month,
+    start_date,
+    end_date,
+    manifest_ids,
+    request_count,
+    first_marked,
+    last_marked
+)
+VALUES (%s, %s, %s, %s, %s, %s, array_remove(ARRAY[%s]::integer[], NULL), 1, %s, %s)
+ON CONFLICT (schema_name, provider_uuid, billing_month) DO UPDATE
+    SET start_date = least(dr.start_date, EXCLUDED.start_date),
+        end_date = greatest(dr.end_date, EXCLUDED.end_date),
+        manifest_ids = ARRAY(SELECT DISTINCT unnest(dr.manifest_ids || EXCLUDED.manifest_ids)),
+        request_count = dr.request_count + 1,
+        last_marked = EXCLUDED.last_marked
+RETURNING (xmax = 0) AS inserted
+;
+"""
+
+
+def _to_date(value):
+    """Return a date from a date, datetime or date string."""
+    if isinstance(value, str):
+        value = ciso8601.parse_datetime(value)
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    return value
+
+
+def get_month_ranges(start_date, end_date):
+    """Split a date range at the billing month boundaries.
+
+    Returns:
+        (list): (billing month, start date, end date) tuples
+
+    """
+    start_date = _to_date(start_date)
+    end_date = _to_date(end_date)
+    ranges = []
+    while start_date <= end_date:
+        billing_month = start_date.replace(day=1)
+        month_end = min(billing_month + relativedelta(months=1, days=-1), end_date)
+        ranges.append((billing_month, start_date, month_end))
+        start_date = month_end + relativedelta(days=1)
+    return ranges
+
+
+def mark_summary_dirty(schema_name, provider_type, provider_uuid, start_date, end_date, manifest_id=None):
+    """Add a date range to the dirty ranges of its provider billing months.
+
+    Args:
+        schema_name (str): The DB schema name
+        provider_type (str): The provider type
+        provider_uuid (str): The provider uuid
+        start_date (str): The first date to summarize
+        end_date (str): The last date to summarize
+        manifest_id (int): The manifest of the new data
+
+    Returns:
+        (list): The billing months that had no dirty range yet and need a summarization scheduled
+
+    """
+    now = timezone.now()
+    new_months = []
+    with connection.cursor() as cursor:
+        for billing_month, month_start, month_end in get_month_ranges(start_date, end_date):
+            params = [
+                schema_name,
+                provider_type,
+                provider_uuid,
+                billing_month,
+                month_start,
+                month_end,
+                manifest_id,
+                now,
+                now,
+            ]
+            cursor.execute(MARK_DIRTY_SQL, params)
+            if cursor.fetchone()[0]:
+                new_months.append(str(billing_month))
+    LOG.info(
+        f"Marked {start_date} - {end_date} dirty for provider {provider_uuid} in {schema_name}, "
+        f"new billing months: {new_months}."
+    )
+    return new_months
+
+
+def pop_dirty_range(schema_name, provider_uuid, billing_month):
+    """Remove and return the dirty range of a provider billing month once it is due.
+
+    A range is due when no date range was added to it for SUMMARY_COALESCE_WINDOW
+    seconds, or when its first date range was added SUMMARY_COALESCE_MAX_LATENCY
+    seconds ago.
+
+    Args:
+        schema_name (str): The DB schema name
+        provider_uuid (str): The provider uuid
+        billing_month (str): The first day of the billing month
+
+    Returns:
+        (SummaryDirtyRange, float): The due range or None, and the seconds until the range is due
+
+    """
+    with transaction.atomic():
+        dirty_range = (
+            SummaryDirtyRange.objects.select_for_update()
+            .filter(schema_name=schema_name, provider_uuid=provider_uuid, billing_month=_to_date(billing_month))
+            .first()
+        )
+        if dirty_range is None:
+            return None, 0
+        due = min(
+            dirty_range.last_marked + datetime.timedelta(seconds=settings.SUMMARY_COALESCE_WINDOW),
+            dirty_range.first_marked + datetime.timedelta(seconds=settings.SUMMARY_COALESCE_MAX_LATENCY),
+        )
+        countdown = (due - timezone.now()).total_seconds()
+        if countdown > 0:
+            return None, countdown
+        dirty_range.delete()
+    return dirty_range, 0
+
+
+def get_stale_dirty_ranges():
+    """Return the dirty ranges that were due a SUMMARY_COALESCE_WINDOW ago and are still waiting.
+
+    These ranges lost their scheduled summarize_dirty_range task, e.g. when a
+    worker was restarted before the countdown ran out.
+
+    Returns:
+        (QuerySet): The stale SummaryDirtyRange rows
+
+    """
+    window = datetime.timedelta(seconds=settings.SUMMARY_COALESCE_WINDOW)
+    max_latency = datetime.timedelta(seconds=settings.SUMMARY_COALESCE_MAX_LATENCY)
+    stale_before = timezone.now() - window
+    return SummaryDirtyRange.objects.filter(
+        Q(last_marked__lt=stale_before - window) | Q(first_marked__lt=stale_before - max_latency)
+    ).order_by("first_marked")
@@ -0,0 +1,127 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Incrementally update the summary rollup tables from their daily summary tables."""
+import logging
+import time
+from datetime import datetime
+from datetime import timedelta
+
+import ciso8601
+from django.db import connection
+from tenant_schemas.utils import schema_context
+
+from api.utils import DateHelper
+from api.utils import materialized_view_month_start
+from masu.database import OCP_REPORT_TABLE_MAP
+from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
+from masu.prometheus_stats import MATERIALIZED_VIEW_REFRESH_DURATION
+from reporting.models import OCPCostSummary
+from reporting.models import OCPCostSummaryByNode
+from reporting.models import OCPCostSummaryByProject
+from reporting.models import OCPPodSummary
+from reporting.models import OCPPodSummaryByProject
+from reporting.models import OCPVolumeSummary
+from reporting.models import OCPVolumeSummaryByProject
+
+LOG = logging.getLogger(__name__)
+
+# The summary rollup tables and the daily summary table each one is rolled up from
+SUMMARY_ROLLUPS = {
+    model._meta.db_table: OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
+    for model in (
+        OCPCostSummary,
+        OCPCostSummaryByNode,
+        OCPCostSummaryByProject,
+        OCPPodSummary,
+        OCPPodSummaryByProject,
+        OCPVolumeSummary,
+        OCPVolumeSummaryByProject,
+    )
+}
+
+
+class SummaryRollupUpdater:
+    """Keep the summary rollup tables of a schema in step with their daily summary tables.
+
+    Rollup tables hold the same rows as the materialized views they replaced,
+    but only the usage_start ranges of a changed daily summary are rolled up
+    again instead of recomputing the whole table.
+    """
+
+    def __init__(self, schema_name):
+        """Initialize the updater.
+
+        Args:
+            schema_name (str): The schema of the rollup tables
+
+        """
+        self._schema_name = schema_name
+
+    @staticmethod
+    def get_rollup_ranges(rollup_table, summary_changes=None):
+        """Return the ranges of a rollup table to roll up again.
+
+        Args:
+            rollup_table (str): The rollup table
+            summary_changes (list): Change records from get_summary_changes, None rolls up every row
+
+        Returns:
+            (list): (source_uuid, start_date, end_date) tuples, None matches every source or later date
+
+        """
+        window_start = materialized_view_month_start(DateHelper()).date()
+        if summary_changes is None:
+            return [(None, window_start, None)]
+
+        ranges = []
+        for change in summary_changes:
+            if change["table"] != SUMMARY_ROLLUPS[rollup_table]:
+                continue
+            end_date = ciso8601.parse_datetime(change["end_date"]).date()
+            if end_date < window_start:
+                continue
+            start_date = max(ciso8601.parse_datetime(change["start_date"]).date(), window_start)
+            ranges.append((change["source_uuid"], start_date, end_date))
+        return ranges
+
+    def _expire_rollup(self, accessor, rollup_table, window_start):
+        """Remove the rows that have aged out of the rollup window.
+
+        The monthly partitions before the window are dropped whole, only rows
+        outside of them, e.g. in the default partition, are deleted.
+        """
+        expired_date = datetime.combine(window_start - timedelta(days=1), datetime.min.time())
+        accessor.drop_expired_partitions([rollup_table], expired_date)
+        with schema_context(self._schema_name):
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {rollup_table} WHERE usage_start < %s", [window_start])
+
+    def update(self, rollup_tables, summary_changes=None):
+        """Roll up the daily summary ranges affected by the summary changes.
+
+        Args:
+            rollup_tables (list): The candidate rollup tables
+            summary_changes (list): Change records from get_summary_changes, None rolls up every row
+
+        Returns:
+            (list): The updated rollup tables
+
+        """
+        window_start = materialized_view_month_start(DateHelper()).date()
+        updated = []
+        with OCPReportDBAccessor(self._schema_name) as accessor:
+            for rollup_table in sorted(set(rollup_tables)):
+                ranges = self.get_rollup_ranges(rollup_table, summary_changes)
+                if not ranges:
+                    continue
+                start = time.time()
+                for source_uuid, start_date, end_date in ranges:
+                    accessor.populate_summary_rollup(rollup_table, start_date, end_date, source_uuid)
+                self._expire_rollup(accessor, rollup_table, window_start)
+                duration = time.time() - start
+                MATERIALIZED_VIEW_REFRESH_DURATION.labels(view=rollup_table).observe(duration)
+                LOG.info(f"Rolled up {len(ranges)} ranges of {rollup_table} in {duration:.3f} seconds.")
+                updated.append(rollup_table)
+        return updated
@@ -13,8 +13,10 @@ from decimal import InvalidOperation
 import ciso8601
 from celery import chain
 from dateutil import parser
+from django.conf import settings
 from django.db import connection
 from django.db.utils import IntegrityError
+from django.utils import timezone
 from tenant_schemas.utils import schema_context
 
 import masu.prometheus_stats as worker_stats
@@ -37,10 +39,14 @@ from masu.processor._tasks.download import _get_report_files
 from masu.processor._tasks.process import _process_report_file
 from masu.processor._tasks.remove_expired import _remove_expired_data
 from masu.processor.cost_model_cost_updater import CostModelCostUpdater
+from masu.processor.materialized_view_refresher import MaterializedViewRefresher
 from masu.processor.report_processor import ReportProcessorDBError
 from masu.processor.report_processor import ReportProcessorError
 from masu.processor.report_summary_updater import ReportSummaryUpdater
 from masu.processor.report_summary_updater import ReportSummaryUpdaterCloudError
+from masu.processor.summary_coalescer import get_stale_dirty_ranges
+from masu.processor.summary_coalescer import mark_summary_dirty
+from masu.processor.summary_coalescer import pop_dirty_range
 from masu.processor.worker_cache import WorkerCache
 from reporting.models import AWS_MATERIALIZED_VIEWS
 from reporting.models import AZURE_MATERIALIZED_VIEWS
@@ -295,6 +301,25 @@ def summarize_reports(reports_to_summarize, queue_name=None):
                     start_date = start_date.strftime("%Y-%m-%d")
                     end_date = DateAccessor().today().strftime("%Y-%m-%d")
                 LOG.info("report to summarize: %s", str(report))
+                if settings.SUMMARY_COALESCE_WINDOW:
+                    billing_months = mark_summary_dirty(
+                        report.get("schema_name"),
+                        report.get("provider_type"),
+                        str(report.get("provider_uuid")),
+                        start_date,
+                        end_date,
+                        manifest_id=report.get("manifest_id"),
+                    )
+                    for billing_month in billing_months:
+                        summarize_dirty_range.s(
+                            report.get("schema_name"),
+                            str(report.get("provider_uuid")),
+                            billing_month,
+                            queue_name=queue_name,
+                        ).apply_async(
+                            countdown=settings.SUMMARY_COALESCE_WINDOW, queue=queue_name or UPDATE_SUMMARY_TABLES_QUEUE
+                        )
+                    continue
                 update_summary_tables.s(
                     report.get("schema_name"),
                     report.get("provider_type"),
@@ -306,6 +331,73 @@ def summarize_reports(reports_to_summarize, queue_name=None):
                 ).apply_async(queue=queue_name or UPDATE_SUMMARY_TABLES_QUEUE)
 
 
+@celery_app.task(name="masu.processor.tasks.summarize_dirty_range", queue=UPDATE_SUMMARY_TABLES_QUEUE)
+def summarize_dirty_range(schema_name, provider_uuid, billing_month, queue_name=None):
+    """Run one summarization for the date ranges requested for a provider billing month.
+
+    Args:
+        schema_name (str) The DB schema name.
+        provider_uuid (str) The provider uuid.
+        billing_month (str) The first day of the billing month.
+        queue_name (str) The queue of the summarization tasks.
+
+    Returns
+        None
+
+    """
+    dirty_range, countdown = pop_dirty_range(schema_name, provider_uuid, billing_month)
+    if countdown:
+        # New data arrived during the window, wait for the billing month to settle
+        summarize_dirty_range.s(schema_name, provider_uuid, billing_month, queue_name=queue_name).apply_async(
+            countdown=countdown, queue=queue_name or UPDATE_SUMMARY_TABLES_QUEUE
+        )
+        return
+    if dirty_range is None:
+        return
+
+    provider_type = dirty_range.provider_type
+    worker_stats.SUMMARY_COALESCED_COUNTER.labels(provider_type=provider_type).inc(dirty_range.request_count - 1)
+    worker_stats.SUMMARY_COALESCE_DELAY.labels(provider_type=provider_type).observe(
+        (timezone.now() - dirty_range.first_marked).total_seconds()
+    )
+    LOG.info(
+        f"Summarizing {dirty_range.start_date} - {dirty_range.end_date} for provider {provider_uuid} "
+        f"in {schema_name}, merged from {dirty_range.request_count} requests."
+    )
+
+    # The earlier manifests are summarized with the latest one and completed with it
+    manifest_ids = sorted(dirty_range.manifest_ids)
+    manifest_id = manifest_ids[-1] if manifest_ids else None
+    update_summary_tables.s(
+        schema_name,
+        provider_type,
+        provider_uuid,
+        start_date=str(dirty_range.start_date),
+        end_date=str(dirty_range.end_date),
+        manifest_id=manifest_id,
+        queue_name=queue_name,
+        coalesced_manifest_ids=manifest_ids[:-1],
+    ).apply_async(queue=queue_name or UPDATE_SUMMARY_TABLES_QUEUE)
+
+
+@celery_app.task(name="masu.processor.tasks.summarize_stale_dirty_ranges", queue=DEFAULT)
+def summarize_stale_dirty_ranges():
+    """Queue the summarizations of dirty ranges that lost their scheduled task."""
+    for dirty_range in get_stale_dirty_ranges():
+        LOG.info(
+            f"Summarization of {dirty_range.start_date} - {dirty_range.end_date} for provider "
+            f"{dirty_range.provider_uuid} in {dirty_range.schema_name} is overdue. Requeuing."
+        )
+        provider_type = dirty_range.provider_type
+        queue_name = OCP_QUEUE if provider_type and provider_type.lower() == "ocp" else None
+        summarize_dirty_range.s(
+            dirty_range.schema_name,
+            str(dirty_range.provider_uuid),
+            str(dirty_range.billing_month),
+            queue_name=queue_name,
+        ).apply_async(queue=queue_name or UPDATE_SUMMARY_TABLES_QUEUE)
+
+
 @celery_app.task(name="masu.processor.tasks.update_summary_tables", queue=UPDATE_SUMMARY_TABLES_QUEUE)
 def update_summary_tables(  # noqa: C901
     schema_name,
@@ -316,6 +408,7 @@ def update_summary_tables(  # noqa: C901
     manifest_id=None,
     queue_name=None,
     synchronous=False,
+    coalesced_manifest_ids=None,
 ):
     """Populate the summary tables for reporting.
 
@@ -326,6 +419,7 @@ def update_summary_tables(  # noqa: C901
         report_dict (dict) The report data dict from previous task.
         start_date  (str) The date to start populating the table.
         end_date    (str) The date to end on.
+        coalesced_manifest_ids (list) Earlier manifests summarized with this one, completed with it.
 
     Returns
         None
@@ -348,6 +442,7 @@ def update_summary_tables(  # noqa: C901
                 end_date=end_date,
                 manifest_id=manifest_id,
                 queue_name=queue_name,
+                coalesced_manifest_ids=coalesced_manifest_ids,
             ).apply_async(queue=queue_name or UPDATE_SUMMARY_TABLES_QUEUE)
             return
         worker_cache.lock_single_task(task_name, cache_args, timeout=3600)
@@ -362,10 +457,12 @@ def update_summary_tables(  # noqa: C901
     )
     LOG.info(stmt)
 
+    # Without change records every materialized view of the provider type is refreshed
+    summary_changes = None
     try:
         updater = ReportSummaryUpdater(schema_name, provider_uuid, manifest_id)
         start_date, end_date = updater.update_daily_tables(start_date, end_date)
-        updater.update_summary_tables(start_date, end_date)
+        summary_changes = updater.update_summary_tables(start_date, end_date)
     except ReportSummaryUpdaterCloudError as ex:
         LOG.info(f"Failed to correlate OpenShift metrics for provider: {str(provider_uuid)}. Error: {str(ex)}")
     except Exception as ex:
@@ -375,7 +472,11 @@ def update_summary_tables(  # noqa: C901
 
     if not provider_uuid:
         refresh_materialized_views.s(
-            schema_name, provider, manifest_id=manifest_id, queue_name=queue_name
+            schema_name,
+            provider,
+            manifest_id=manifest_id,
+            queue_name=queue_name,
+            coalesced_manifest_ids=coalesced_manifest_ids,
         ).apply_async(queue=queue_name or REFRESH_MATERIALIZED_VIEWS_QUEUE)
         return
 
@@ -400,7 +501,12 @@ def update_summary_tables(  # noqa: C901
         linked_tasks = update_cost_model_costs.s(schema_name, provider_uuid, start_date, end_date).set(
             queue=queue_name or UPDATE_COST_MODEL_COSTS_QUEUE
         ) | refresh_materialized_views.si(
-            schema_name, provider, provider_uuid=provider_uuid, manifest_id=manifest_id
+            schema_name,
+            provider,
+            provider_uuid=provider_uuid,
+            manifest_id=manifest_id,
+            summary_changes=summary_changes,
+            coalesced_manifest_ids=coalesced_manifest_ids,
         ).set(
             queue=queue_name or REFRESH_MATERIALIZED_VIEWS_QUEUE
         )
@@ -412,7 +518,12 @@ def update_summary_tables(  # noqa: C901
         )
         LOG.info(stmt)
         linked_tasks = refresh_materialized_views.s(
-            schema_name, provider, provider_uuid=provider_uuid, manifest_id=manifest_id
+            schema_name,
+            provider,
+            provider_uuid=provider_uuid,
+            manifest_id=manifest_id,
+            summary_changes=summary_changes,
+            coalesced_manifest_ids=coalesced_manifest_ids,
         ).set(queue=queue_name or REFRESH_MATERIALIZED_VIEWS_QUEUE)
 
     dh = DateHelper(utc=True)
@@ -528,9 +639,27 @@ def update_cost_model_costs(
 
 @celery_app.task(name="masu.processor.tasks.refresh_materialized_views", queue=REFRESH_MATERIALIZED_VIEWS_QUEUE)
 def refresh_materialized_views(  # noqa: C901
-    schema_name, provider_type, manifest_id=None, provider_uuid=None, synchronous=False, queue_name=None
+    schema_name,
+    provider_type,
+    manifest_id=None,
+    provider_uuid=None,
+    synchronous=False,
+    queue_name=None,
+    summary_changes=None,
+    coalesced_manifest_ids=None,
 ):
-    """Refresh the database's materialized views for reporting."""
+    """Refresh the database's materialized views for reporting.
+
+    Args:
+        schema_name (str) The DB schema name.
+        provider_type (str) The provider type.
+        manifest_id (int) The manifest to mark as completed.
+        provider_uuid (str) The provider to set the data updated timestamp of.
+        summary_changes (list) Change records of the summary tables, see get_summary_changes.
+            Only views that depend on the changed tables are refreshed, all views when None.
+        coalesced_manifest_ids (list) Earlier manifests summarized with manifest_id, also marked as completed.
+
+    """
     task_name = "masu.processor.tasks.refresh_materialized_views"
     cache_args = [schema_name, provider_type]
     if not synchronous:
@@ -545,6 +674,8 @@ def refresh_materialized_views(  # noqa: C901
                 provider_uuid=provider_uuid,
                 synchronous=synchronous,
                 queue_name=queue_name,
+                summary_changes=summary_changes,
+                coalesced_manifest_ids=coalesced_manifest_ids,
             ).apply_async(queue=queue_name or REFRESH_MATERIALIZED_VIEWS_QUEUE)
             return
         worker_cache.lock_single_task(task_name, cache_args, timeout=600)
@@ -567,12 +698,8 @@ def refresh_materialized_views(  # noqa: C901
     elif provider_type in (Provider.PROVIDER_GCP, Provider.PROVIDER_GCP_LOCAL):
         materialized_views = GCP_MATERIALIZED_VIEWS
     try:
-        with schema_context(schema_name):
-            for view in materialized_views:
-                table_name = view._meta.db_table
-                with connection.cursor() as cursor:
-                    cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {table_name}")
-                    LOG.info(f"Refreshed {table_name}.")
+        view_names = [view._meta.db_table for view in materialized_views]
+        MaterializedViewRefresher(schema_name).refresh(view_names, summary_changes)
 
         invalidate_view_cache_for_tenant_and_source_type(schema_name, provider_type)
 
@@ -581,8 +708,9 @@ def refresh_materialized_views(  # noqa: C901
         if manifest_id:
             # Processing for this monifest should be complete after this step
             with ReportManifestDBAccessor() as manifest_accessor:
-                manifest = manifest_accessor.get_manifest_by_id(manifest_id)
-                manifest_accessor.mark_manifest_as_completed(manifest)
+                for completed_manifest_id in [*(coalesced_manifest_ids or []), manifest_id]:
+                    manifest = manifest_accessor.get_manifest_by_id(completed_manifest_id)
+                    manifest_accessor.mark_manifest_as_completed(manifest)
     except Exception as ex:
         if not synchronous:
             worker_cache.release_single_task(task_name, cache_args)
@@ -6,6 +6,7 @@
 from prometheus_client import CollectorRegistry
 from prometheus_client import Counter
 from prometheus_client import Gauge
+from prometheus_client import Histogram
 from prometheus_client import multiprocess
 
 
@@ -44,6 +45,47 @@ COST_SUMMARY_ATTEMPTS_COUNTER = Counter(
     "cost_summary_attempts_count", "Number of cost summary update attempts", registry=WORKER_REGISTRY
 )
 
+MONTHLY_COST_STATEMENTS_COUNTER = Counter(
+    "monthly_cost_statements_count",
+    "Number of SQL statements issued to populate monthly cost line items",
+    ["cost_type"],
+    registry=WORKER_REGISTRY,
+)
+
+MATERIALIZED_VIEW_REFRESH_DURATION = Histogram(
+    "materialized_view_refresh_duration_seconds",
+    "Duration of materialized view refreshes",
+    ["view"],
+    buckets=(0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1200),
+    registry=WORKER_REGISTRY,
+)
+MATERIALIZED_VIEW_REFRESH_SKIPPED_COUNTER = Counter(
+    "materialized_view_refresh_skipped_count",
+    "Number of materialized view refreshes skipped because no input of the view changed",
+    ["view"],
+    registry=WORKER_REGISTRY,
+)
+SUMMARY_COALESCED_COUNTER = Counter(
+    "summary_coalesced_count",
+    "Number of summarizations saved by merging the date ranges of a provider billing month",
+    ["provider_type"],
+    registry=WORKER_REGISTRY,
+)
+SUMMARY_COALESCE_DELAY = Histogram(
+    "summary_coalesce_delay_seconds",
+    "Seconds from the first requested date range of a provider billing month to its merged summarization",
+    ["provider_type"],
+    buckets=(60, 300, 600, 900, 1800, 3600, 7200, 14400),
+    registry=WORKER_REGISTRY,
+)
+SQL_TEMPLATE_DURATION = Histogram(
+    "sql_template_duration_seconds",
+    "Seconds spent executing the SQL rendered from a masu.database template",
+    ["template"],
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 1800),
+    registry=WORKER_REGISTRY,
+)
+
 KAFKA_CONNECTION_ERRORS_COUNTER = Counter(
     "kafka_connection_errors", "Number of Kafka connection errors", registry=WORKER_REGISTRY
 )
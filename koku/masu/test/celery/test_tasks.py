@@ -165,8 +165,9 @@ class TestCeleryTasks(MasuTestCase):
         self.assertIn("Found 1 objects after attempting", captured_logs.output[-1])
 
     @override_settings(ENABLE_S3_ARCHIVING=True)
+    @patch("masu.celery.tasks.clear_hive_partition_cache")
     @patch("masu.celery.tasks.deleted_archived_with_prefix")
-    def test_delete_archived_data_success(self, mock_delete):
+    def test_delete_archived_data_success(self, mock_delete, mock_clear_partitions):
         """Test that delete_archived_data correctly interacts with AWS S3."""
         schema_name = "acct10001"
         provider_type = Provider.PROVIDER_AWS
@@ -174,6 +175,7 @@ class TestCeleryTasks(MasuTestCase):
 
         tasks.delete_archived_data(schema_name, provider_type, provider_uuid)
         mock_delete.assert_called()
+        mock_clear_partitions.assert_called_with(schema_name, provider_uuid)
 
     @override_settings(ENABLE_S3_ARCHIVING=False)
     def test_delete_archived_data_archiving_false(self):
@@ -13,6 +13,7 @@ from django.db import connection
 from django.db.models import Max
 from django.db.models import Min
 from django.db.models.query import QuerySet
+from django.test.utils import CaptureQueriesContext
 from tenant_schemas.utils import schema_context
 
 from api.iam.test.iam_test_case import FakePrestoConn
@@ -23,6 +24,7 @@ from masu.database import OCP_REPORT_TABLE_MAP
 from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
 from masu.database.provider_db_accessor import ProviderDBAccessor
 from masu.external.date_accessor import DateAccessor
+from masu.prometheus_stats import WORKER_REGISTRY
 from masu.test import MasuTestCase
 from masu.test.database.helpers import ReportObjectCreator
 from masu.util.common import month_date_range_tuple
@@ -739,6 +741,42 @@ class OCPReportDBAccessorTest(MasuTestCase):
                             monthly_cost_row.infrastructure_monthly_cost_json.get(distribution), node_rate
                         )
 
+    def test_populate_monthly_cost_node_statement_count(self):
+        """Test that node monthly costs are upserted with a fixed number of statements."""
+        dh = DateHelper()
+        start_date = dh.this_month_start
+        end_date = dh.this_month_end
+        first_month, first_next_month = month_date_range_tuple(start_date)
+        self.cluster_id = self.ocp_provider.authentication.credentials.get("cluster_id")
+        sample_labels = {"cost_type": "Node"}
+        unique_nodes = self.accessor.get_distinct_nodes(first_month, first_next_month, self.cluster_id)
+        self.assertGreater(len(unique_nodes), 1)
+
+        for _ in range(2):
+            statements_before = WORKER_REGISTRY.get_sample_value("monthly_cost_statements_count_total", sample_labels)
+            with CaptureQueriesContext(connection) as captured:
+                self.accessor.populate_monthly_cost(
+                    "Node",
+                    metric_constants.INFRASTRUCTURE_COST_TYPE,
+                    random.randrange(1, 100),
+                    start_date,
+                    end_date,
+                    self.cluster_id,
+                    "test_cluster_alias",
+                    metric_constants.CPU_DISTRIBUTION,
+                )
+            statements_after = WORKER_REGISTRY.get_sample_value("monthly_cost_statements_count_total", sample_labels)
+            # distinct nodes, report period, and the upsert
+            self.assertEqual(len(captured), 3)
+            self.assertEqual(statements_after - (statements_before or 0), 3)
+
+        with schema_context(self.schema):
+            monthly_cost_rows = OCPUsageLineItemDailySummary.objects.filter(
+                usage_start=first_month, cluster_id=self.cluster_id, monthly_cost_type="Node"
+            )
+            # the second run updates the rows inserted by the first
+            self.assertEqual(monthly_cost_rows.count(), len(unique_nodes))
+
     def test_populate_monthly_cost_node_supplementary_cost(self):
         """Test that the monthly supplementary cost row for nodes in the summary table is populated."""
         distribution_choices = [metric_constants.CPU_DISTRIBUTION, metric_constants.MEMORY_DISTRIBUTION]
@@ -1005,15 +1043,15 @@ class OCPReportDBAccessorTest(MasuTestCase):
         mock_connect.assert_called()
         mock_executescript.assert_called()
 
-    @patch("masu.database.ocp_report_db_accessor.pkgutil.get_data")
+    @patch("masu.database.ocp_report_db_accessor.SQL_TEMPLATES.get_sql")
     @patch("masu.database.ocp_report_db_accessor.kpdb.connect")
-    def test_populate_line_item_daily_summary_table_presto_preprocess_exception(self, mock_connect, mock_get_data):
+    def test_populate_line_item_daily_summary_table_presto_preprocess_exception(self, mock_connect, mock_get_sql):
         """
         Test that OCP presto processing converts datetime to date for start, end dates
         """
         presto_conn = FakePrestoConn()
         mock_connect.return_value = presto_conn
-        mock_get_data.return_value = b"""
+        mock_get_sql.return_value = """
 select * from eek where val1 in {{report_period_id}} ;
 """
         start_date = "2020-01-01"
@@ -1045,15 +1083,15 @@ select * from eek where val1 in {{report_period_id}} ;
         mock_connect.assert_called()
         mock_executescript.assert_called()
 
-    @patch("masu.database.ocp_report_db_accessor.pkgutil.get_data")
+    @patch("masu.database.ocp_report_db_accessor.SQL_TEMPLATES.get_sql")
     @patch("masu.database.ocp_report_db_accessor.kpdb.connect")
-    def test_populate_pod_label_summary_table_presto_preprocess_exception(self, mock_connect, mock_get_data):
+    def test_populate_pod_label_summary_table_presto_preprocess_exception(self, mock_connect, mock_get_sql):
         """
         Test that OCP presto processing converts datetime to date for start, end dates
         """
         presto_conn = FakePrestoConn()
         mock_connect.return_value = presto_conn
-        mock_get_data.return_value = b"""
+        mock_get_sql.return_value = """
 select * from eek where val1 in {{report_period_ids}} ;
 """
         start_date = "2020-01-01"
@@ -1759,6 +1797,54 @@ select * from eek where val1 in {{report_period_ids}} ;
                     self.assertAlmostEqual(rate_total, qset_total, 7)
                     self.assertEqual(rate_total, qset_total)
 
+    def test_populate_monthly_tag_cost_cluster_existing_node_row(self):
+        """Test that tag based cluster costs are added to an existing cluster row that has a node."""
+        distribution = metric_constants.CPU_DISTRIBUTION
+        tag_rates = {"app": {"banking": random.randrange(1, 100), "mobile": random.randrange(1, 100)}}
+        rate_total = sum(tag_rates["app"].values())
+        dh = DateHelper()
+        start_date = dh.this_month_start
+        end_date = dh.this_month_end
+        self.cluster_id = "OCP-on-Azure"
+        with schema_context(self.schema):
+            cluster_alias = (
+                OCPUsageLineItemDailySummary.objects.filter(cluster_id=self.cluster_id)
+                .values_list("cluster_alias", flat=True)
+                .first()
+            )
+            qset = OCPUsageLineItemDailySummary.objects.filter(cluster_id=self.cluster_id, monthly_cost_type="Cluster")
+            self.accessor.populate_monthly_cost(
+                "Cluster",
+                metric_constants.SUPPLEMENTARY_COST_TYPE,
+                random.randrange(1, 100),
+                start_date,
+                end_date,
+                self.cluster_id,
+                cluster_alias,
+                distribution,
+            )
+            cluster_rows = qset.count()
+            self.assertGreater(cluster_rows, 0)
+            self.assertFalse(qset.filter(node__isnull=True).exists())
+
+            self.accessor.populate_monthly_tag_cost(
+                "Cluster",
+                metric_constants.INFRASTRUCTURE_COST_TYPE,
+                tag_rates,
+                start_date,
+                end_date,
+                self.cluster_id,
+                cluster_alias,
+                distribution,
+            )
+            # the tag cost is added to one of the existing rows instead of a new row without a node
+            self.assertEqual(qset.count(), cluster_rows)
+            infrastructure_rows = qset.filter(infrastructure_monthly_cost_json__isnull=False)
+            self.assertEqual(infrastructure_rows.count(), 1)
+            infrastructure_row = infrastructure_rows.first()
+            self.assertIsNotNone(infrastructure_row.node)
+            self.assertEqual(infrastructure_row.infrastructure_monthly_cost_json.get(distribution), rate_total)
+
     def test_populate_monthly_tag_cost_cluster_supplementary_cost(self):
         """
         Test that the monthly supplementary cost row for nodes in the summary table
@@ -2352,6 +2438,35 @@ select * from eek where val1 in {{report_period_ids}} ;
                                 )
                                 self.assertAlmostEqual(actual_diff, expected_diff)
 
+    def test_populate_tag_usage_costs_single_statement_per_rate_type(self):
+        """Test that every tag rate for a rate type is applied with one statement."""
+        dh = DateHelper()
+        start_date = dh.this_month_start
+        end_date = dh.this_month_end
+        infrastructure_rates = {
+            "cpu_core_usage_per_hour": {"app": {"banking": 1, "mobile": 2, "weather": 3}},
+            "storage_gb_usage_per_month": {"app": {"banking": 4}, "environment": {"prod": 5}},
+        }
+        supplementary_rates = {"memory_gb_usage_per_hour": {"app": {"weather": 6}}}
+        with patch.object(self.accessor, "_execute_raw_sql_query") as mock_execute:
+            self.accessor.populate_tag_usage_costs(
+                infrastructure_rates, supplementary_rates, start_date, end_date, self.cluster_id
+            )
+        self.assertEqual(mock_execute.call_count, 2)
+        infrastructure_params = mock_execute.call_args_list[0][1].get("bind_params")
+        self.assertIn('{"environment": "prod"}', infrastructure_params)
+
+        default_rates = {
+            "cpu_core_usage_per_hour": {"app": {"default_value": 1, "defined_keys": ["banking", "mobile"]}},
+            "memory_gb_usage_per_hour": {"app": {"default_value": 0, "defined_keys": []}},
+        }
+        with patch.object(self.accessor, "_execute_raw_sql_query") as mock_execute:
+            self.accessor.populate_tag_usage_default_costs(default_rates, {}, start_date, end_date, self.cluster_id)
+        mock_execute.assert_called_once()
+        default_params = mock_execute.call_args[1].get("bind_params")
+        self.assertIn('[{"app": "banking"}, {"app": "mobile"}]', default_params)
+        self.assertNotIn("memory_gb_usage_per_hour", default_params)
+
     def test_update_line_item_daily_summary_with_enabled_tags(self):
         """Test that we filter the daily summary table's tags with only enabled tags."""
         dh = DateHelper()
@@ -0,0 +1,83 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Test the SQLTemplateRegistry."""
+import datetime
+import os
+import pkgutil
+
+from jinjasql import JinjaSql
+
+from masu.database.sql_templates import SQL_TEMPLATES
+from masu.database.sql_templates import SQLTemplateRegistry
+from masu.prometheus_stats import WORKER_REGISTRY
+from masu.test import MasuTestCase
+
+
+class SQLTemplateRegistryTest(MasuTestCase):
+    """Test Cases for the SQLTemplateRegistry."""
+
+    def setUp(self):
+        """Set up a fresh registry."""
+        super().setUp()
+        self.registry = SQLTemplateRegistry("masu.database", ("sql", "presto_sql"))
+
+    def test_get_sql(self):
+        """Test that every template file is loaded."""
+        package_path = os.path.dirname(pkgutil.get_loader("masu.database").get_filename())
+        for directory in ("sql", "presto_sql"):
+            for file_name in os.listdir(os.path.join(package_path, directory)):
+                if file_name.endswith(".sql"):
+                    name = f"{directory}/{file_name}"
+                    expected = pkgutil.get_data("masu.database", name).decode("utf-8")
+                    self.assertEqual(self.registry.get_sql(name), expected)
+
+    def test_prepare_query(self):
+        """Test that rendering matches JinjaSql and is memoized."""
+        sql = self.registry.get_sql("sql/reporting_awstags_summary.sql")
+        params = {"schema": self.schema, "bill_ids": ["1", "2"], "start_date": datetime.date(2021, 1, 1)}
+        expected = JinjaSql().prepare_query(sql, params)
+
+        result = self.registry.prepare_query(sql, params)
+        self.assertEqual(result[0], expected[0])
+        self.assertEqual(list(result[1]), list(expected[1]))
+        self.assertEqual(len(self.registry._rendered), 1)
+
+        self.assertEqual(self.registry.prepare_query(sql, dict(params)), result)
+        self.assertEqual(len(self.registry._rendered), 1)
+
+        other = self.registry.prepare_query(sql, {**params, "schema": "acct10002"})
+        self.assertNotEqual(other[0], result[0])
+        self.assertEqual(len(self.registry._rendered), 2)
+
+    def test_prepare_query_not_a_template_file(self):
+        """Test that SQL that is not a template file is compiled once and not named."""
+        sql = "SELECT * FROM {{schema | sqlsafe}}.eek WHERE id = {{id}}"
+        rendered, bind_params = self.registry.prepare_query(sql, {"schema": self.schema, "id": 1})
+        self.registry.prepare_query(sql, {"schema": self.schema, "id": 2})
+        self.assertEqual(rendered, f"SELECT * FROM {self.schema}.eek WHERE id = %s")
+        self.assertEqual(bind_params, [1])
+        self.assertEqual(len(self.registry._compiled), 1)
+        self.assertIsNone(self.registry.template_name(rendered))
+
+    def test_cache_size(self):
+        """Test that the rendered queries are bounded."""
+        registry = SQLTemplateRegistry("masu.database", ("sql",), cache_size=2)
+        sql = registry.get_sql("sql/reporting_awstags_summary.sql")
+        for bill_id in range(3):
+            registry.prepare_query(sql, {"schema": self.schema, "bill_ids": [bill_id]})
+        self.assertEqual(len(registry._rendered), 2)
+
+    def test_timer(self):
+        """Test that the execution of rendered SQL is timed under its template name."""
+        name = "sql/reporting_awstags_summary.sql"
+        labels = {"template": name}
+        before = WORKER_REGISTRY.get_sample_value("sql_template_duration_seconds_count", labels) or 0
+        sql, _ = SQL_TEMPLATES.prepare_query(SQL_TEMPLATES.get_sql(name), {"schema": self.schema})
+        self.assertEqual(SQL_TEMPLATES.template_name(sql), name)
+        with SQL_TEMPLATES.timer(sql):
+            pass
+        with SQL_TEMPLATES.timer("SELECT 1"):
+            pass
+        self.assertEqual(WORKER_REGISTRY.get_sample_value("sql_template_duration_seconds_count", labels), before + 1)
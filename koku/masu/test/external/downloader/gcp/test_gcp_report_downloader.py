@@ -6,6 +6,7 @@ from unittest.mock import patch
 from uuid import uuid4
 
 import pandas as pd
+import pyarrow.parquet as pq
 from dateutil.relativedelta import relativedelta
 from django.test.utils import override_settings
 from faker import Faker
@@ -40,6 +41,47 @@ def create_expected_csv_files(start_date, end_date, invoice_month, etag, keys=Fa
     return files
 
 
+class FakeQueryJob:
+    """A BigQuery query job whose results are the given pages."""
+
+    def __init__(self, pages):
+        """Initialize the job."""
+        self.pages = pages
+
+    def result(self):
+        """Return the job as its own row iterator."""
+        return self
+
+    def to_dataframe_iterable(self):
+        """Yield the pages as data frames."""
+        yield from self.pages
+
+
+class FakeBigQueryClient:
+    """A BigQuery client whose queries return pages of data frames."""
+
+    def __init__(self, pages):
+        """Initialize the client."""
+        self.pages = pages
+
+    def query(self, query):
+        """Return a job yielding the pages."""
+        return FakeQueryJob(self.pages)
+
+
+def create_page_frame(columns, usage_start_times):
+    """Return a page of BigQuery billing rows starting at the given times."""
+    rows = len(usage_start_times)
+    data = {column: [""] * rows for column in columns}
+    data["usage_start_time"] = pd.to_datetime(usage_start_times, utc=True)
+    data["cost"] = [1.5] * rows
+    data["labels"] = [[{"key": "app", "value": "web"}]] * rows
+    page_frame = pd.DataFrame(data, columns=columns)
+    # BigQuery names the result columns after their last field
+    page_frame.columns = [column.split(".")[-1] for column in columns]
+    return page_frame
+
+
 class GCPReportDownloaderTest(MasuTestCase):
     """Test Cases for the GCPReportDownloader object."""
 
@@ -274,6 +316,89 @@ class GCPReportDownloaderTest(MasuTestCase):
 
         os.remove(file_path)
 
+    @override_settings(GCP_ARROW_DOWNLOAD=True, ENABLE_S3_ARCHIVING=True)
+    @patch("masu.external.downloader.gcp.gcp_report_downloader.copy_local_report_file_to_s3_bucket")
+    @patch("masu.external.downloader.gcp.gcp_report_downloader.enable_trino_processing", return_value=True)
+    @patch("masu.external.downloader.gcp.gcp_report_downloader.bigquery")
+    def test_download_file_arrow(self, mock_bigquery, mock_trino, mock_s3):
+        """Test that BigQuery result pages are written to daily Parquet files without a CSV download."""
+        key = "202102_1234_2021-02-01:2021-02-03.csv"
+        downloader = self.create_gcp_downloader_with_mocked_values(customer_name="Cody")
+        columns = downloader.gcp_big_query_columns
+        mock_bigquery.Client.return_value = FakeBigQueryClient(
+            [
+                create_page_frame(columns, ["2021-02-01T00:00:00Z", "2021-02-02T00:00:00Z"]),
+                create_page_frame(columns, ["2021-02-01T01:00:00Z"]),
+            ]
+        )
+
+        full_path, etag, _, file_names = downloader.download_file(key, start_date=DateHelper().this_month_start)
+
+        self.assertEqual(etag, self.etag)
+        self.assertFalse(os.path.exists(full_path))
+        self.assertEqual(
+            sorted(os.path.basename(file_name) for file_name in file_names),
+            ["2021-02-01_0.parquet", "2021-02-02_0.parquet"],
+        )
+        day_table = pq.read_table(f"{DATA_DIR}/Cody/gcp/2021-02-01_0.parquet")
+        self.assertEqual(day_table.num_rows, 2)
+        self.assertIn("service_description", day_table.column_names)
+        self.assertEqual(day_table.column("labels").to_pylist(), ['{"app": "web"}'] * 2)
+        self.assertEqual(sorted(call.args[3] for call in mock_s3.call_args_list), ["2021-02-01.csv", "2021-02-02.csv"])
+
+    @override_settings(GCP_ARROW_DOWNLOAD=True, ENABLE_S3_ARCHIVING=True)
+    @patch("masu.external.downloader.gcp.gcp_report_downloader.copy_local_report_file_to_s3_bucket")
+    @patch("masu.external.downloader.gcp.gcp_report_downloader.enable_trino_processing", return_value=True)
+    @patch("masu.external.downloader.gcp.gcp_report_downloader.bigquery")
+    def test_download_file_arrow_failure(self, mock_bigquery, mock_trino, mock_s3):
+        """Test that a failed page removes the daily Parquet and CSV files already written."""
+        key = "202102_1234_2021-02-01:2021-02-03.csv"
+        downloader = self.create_gcp_downloader_with_mocked_values(customer_name="Cody")
+        columns = downloader.gcp_big_query_columns
+        mock_bigquery.Client.return_value = FakeBigQueryClient(
+            [
+                create_page_frame(columns, ["2021-02-01T00:00:00Z", "2021-02-02T00:00:00Z"]),
+                pd.DataFrame({"unexpected": [1]}),
+            ]
+        )
+
+        with self.assertRaises(ValueError):
+            downloader.download_file(key, start_date=DateHelper().this_month_start)
+        self.assertEqual(os.listdir(f"{DATA_DIR}/Cody/gcp"), [])
+        mock_s3.assert_not_called()
+
+    @override_settings(PARQUET_PROCESSING_BATCH_SIZE=2)
+    def test_divide_csv_daily_chunked(self):
+        """Test that days spread over several chunks are written to one file each."""
+        data = {
+            "usage_start_time": [
+                "2021-02-01T00:00:00Z",
+                "2021-02-02T00:00:00Z",
+                "2021-02-01T01:00:00Z",
+                "2021-02-02T01:00:00Z",
+                "2021-02-01T02:00:00Z",
+            ],
+            "usage": ["1", "2", "3", "4", ""],
+            "cost": ["0.100000001", "5", "6", "7", "8"],
+        }
+        file_path = "/tmp/test.csv"
+        pd.DataFrame(data).to_csv(file_path, index=False, header=True)
+
+        daily_files = divide_csv_daily(file_path)
+        self.assertEqual(
+            sorted(entry.get("filepath") for entry in daily_files), ["/tmp/2021-02-01.csv", "/tmp/2021-02-02.csv"]
+        )
+
+        day_df = pd.read_csv("/tmp/2021-02-01.csv", dtype=str, keep_default_na=False)
+        self.assertEqual(len(day_df), 3)
+        self.assertEqual(list(day_df.cost), ["0.100000001", "6", "8"])
+        self.assertEqual(list(day_df.usage), ["1", "3", ""])
+        self.assertEqual(len(pd.read_csv("/tmp/2021-02-02.csv")), 2)
+
+        for daily_file in daily_files:
+            os.remove(daily_file.get("filepath"))
+        os.remove(file_path)
+
     @override_settings(ENABLE_PARQUET_PROCESSING=True)
     @patch("masu.external.downloader.gcp.gcp_report_downloader.copy_local_report_file_to_s3_bucket")
     def test_create_daily_archives(self, mock_s3):
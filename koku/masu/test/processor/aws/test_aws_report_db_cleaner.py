@@ -4,16 +4,19 @@
 #
 """Test the AWSReportDBCleaner utility object."""
 import datetime
+from unittest.mock import patch
 
 from dateutil import relativedelta
 from tenant_schemas.utils import schema_context
 
+from masu.config import Config
 from masu.database import AWS_CUR_TABLE_MAP
 from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 from masu.processor.aws.aws_report_db_cleaner import AWSReportDBCleaner
 from masu.processor.aws.aws_report_db_cleaner import AWSReportDBCleanerError
 from masu.test import MasuTestCase
 from masu.test.database.helpers import ReportObjectCreator
+from reporting.models import PartitionedTable
 
 
 class AWSReportDBCleanerTest(MasuTestCase):
@@ -150,6 +153,41 @@ class AWSReportDBCleanerTest(MasuTestCase):
             self.assertIsNotNone(self.accessor._get_db_obj_query(line_item_table_name).first())
             self.assertIsNotNone(self.accessor._get_db_obj_query(cost_entry_table_name).first())
 
+    @patch.object(Config, "MASU_EXPIRE_BY_PARTITION", True)
+    def test_purge_expired_report_data_drop_partitions(self):
+        """Test that expired months of the daily summary are dropped as whole partitions."""
+        summary_table_name = AWS_CUR_TABLE_MAP["line_item_daily_summary"]
+        cleaner = AWSReportDBCleaner(self.schema)
+
+        with schema_context(self.schema):
+            first_bill = (
+                self.accessor._get_db_obj_query(AWS_CUR_TABLE_MAP["bill"]).order_by("-billing_period_start").first()
+            )
+        cutoff_date = first_bill.billing_period_start
+        partition_start = cutoff_date.date().replace(day=1)
+        partition_end = partition_start + relativedelta.relativedelta(months=1)
+        partition_name = f"{summary_table_name}_{partition_start.strftime('%Y_%m')}"
+        self.accessor.add_partitions(self.accessor.get_existing_partitions(summary_table_name), [partition_start])
+        partition_query = PartitionedTable.objects.filter(schema_name=self.schema, table_name=partition_name)
+
+        removed_data = cleaner.purge_expired_report_data(cutoff_date, simulate=True)
+        dropped = {entry["partition"]: entry for entry in removed_data if "partition" in entry}
+        self.assertIn(partition_name, dropped)
+        self.assertEqual(dropped[partition_name]["partition_start"], str(partition_start))
+        self.assertGreater(dropped[partition_name]["bytes"], 0)
+        with schema_context(self.schema):
+            self.assertTrue(partition_query.exists())
+
+        removed_data = cleaner.purge_expired_report_data(cutoff_date)
+        self.assertIn(partition_name, [entry.get("partition") for entry in removed_data])
+        with schema_context(self.schema):
+            self.assertFalse(partition_query.exists())
+            self.assertFalse(
+                self.accessor._get_db_obj_query(summary_table_name)
+                .filter(usage_start__gte=partition_start, usage_start__lt=partition_end)
+                .exists()
+            )
+
     def test_purge_expired_report_data_for_provider(self):
         """Test that the provider_uuid deletes all data for the provider."""
         bill_table_name = AWS_CUR_TABLE_MAP["bill"]
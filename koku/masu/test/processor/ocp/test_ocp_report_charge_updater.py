@@ -3,11 +3,13 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Test the OCPReportDBAccessor utility object."""
+import copy
 import random
 from decimal import Decimal
 from unittest.mock import patch
 
 from dateutil.relativedelta import relativedelta
+from django.test.utils import override_settings
 from tenant_schemas.utils import schema_context
 
 from api.utils import DateHelper
@@ -198,6 +200,28 @@ class OCPCostModelCostUpdaterTest(MasuTestCase):
             tier_charge = self.updater._calculate_variable_charge(usage, rate_json)
             self.assertEqual(tier_charge, expected_results.get(key))
 
+    def test_get_tier_schedule(self):
+        """Test that tiers are converted to cumulative usage limits."""
+        tiered_rates = [
+            {"usage": {"usage_start": "19.8", "usage_end": "22.6"}, "value": "0.30", "unit": "USD"},
+            {"usage": {"usage_start": None, "usage_end": "10.3"}, "value": "0.10", "unit": "USD"},
+            {"usage": {"usage_start": "22.6", "usage_end": None}, "value": "0.40", "unit": "USD"},
+            {"usage": {"usage_start": "10.3", "usage_end": "19.8"}, "value": "0.20", "unit": "USD"},
+        ]
+        expected = [
+            (Decimal("0"), Decimal("10.3"), Decimal("0.10")),
+            (Decimal("10.3"), Decimal("19.8"), Decimal("0.20")),
+            (Decimal("19.8"), Decimal("22.6"), Decimal("0.30")),
+            (Decimal("22.6"), None, Decimal("0.40")),
+        ]
+        self.assertEqual(self.updater._get_tier_schedule(tiered_rates), expected)
+
+    def test_get_tier_schedule_single_tier(self):
+        """Test that a single tier is scheduled once with no upper limit."""
+        tiered_rates = [{"usage": {"usage_start": None, "usage_end": None}, "value": "0.25", "unit": "USD"}]
+        expected = [(Decimal("0"), None, Decimal("0.25"))]
+        self.assertEqual(self.updater._get_tier_schedule(tiered_rates), expected)
+
     @patch("masu.processor.ocp.ocp_cost_model_cost_updater.CostModelDBAccessor")
     def test_update_markup_cost(self, mock_cost_accessor):
         """Test that markup is calculated."""
@@ -317,6 +341,41 @@ class OCPCostModelCostUpdaterTest(MasuTestCase):
                 self.assertEqual(line_item.supplementary_usage_cost.get("memory"), 0)
                 self.assertNotEqual(line_item.supplementary_usage_cost.get("storage"), 0)
 
+    @patch("masu.processor.ocp.ocp_cost_model_cost_updater.CostModelDBAccessor")
+    def test_update_usage_costs_tiered(self, mock_cost_accessor):
+        """Test that tiered usage costs match the charge of each usage value."""
+        tiered_rates = [
+            {"usage": {"usage_start": None, "usage_end": "0.5"}, "value": "0.50", "unit": "USD"},
+            {"usage": {"usage_start": "0.5", "usage_end": "1"}, "value": "0.40", "unit": "USD"},
+            {"usage": {"usage_start": "1", "usage_end": "2.5"}, "value": "0.30", "unit": "USD"},
+            {"usage": {"usage_start": "2.5", "usage_end": "5"}, "value": "0.20", "unit": "USD"},
+            {"usage": {"usage_start": "5", "usage_end": None}, "value": "0.10", "unit": "USD"},
+        ]
+        mock_cost_accessor.return_value.__enter__.return_value.infrastructure_tiered_rates = {
+            "cpu_core_usage_per_hour": copy.deepcopy(tiered_rates)
+        }
+        mock_cost_accessor.return_value.__enter__.return_value.supplementary_tiered_rates = {}
+
+        start_date = self.dh.this_month_start
+        end_date = self.dh.this_month_end
+
+        updater = OCPCostModelCostUpdater(schema=self.schema, provider=self.provider)
+        with override_settings(TIERED_RATES_ENABLED=True):
+            updater._update_usage_costs(start_date, end_date)
+
+        with schema_context(self.schema):
+            pod_line_items = OCPUsageLineItemDailySummary.objects.filter(
+                cluster_id=self.cluster_id, usage_start__gte=start_date, data_source="Pod"
+            ).all()
+            self.assertTrue(pod_line_items)
+            for line_item in pod_line_items:
+                usage = line_item.pod_usage_cpu_core_hours or Decimal(0)
+                expected = updater._calculate_variable_charge(usage, {"tiered_rates": copy.deepcopy(tiered_rates)})
+                cost = Decimal(str(line_item.infrastructure_usage_cost.get("cpu")))
+                self.assertAlmostEqual(cost, expected, places=6)
+                self.assertEqual(line_item.infrastructure_usage_cost.get("memory"), 0)
+                self.assertEqual(line_item.supplementary_usage_cost.get("cpu"), 0)
+
     @patch("masu.processor.ocp.ocp_cost_model_cost_updater.CostModelDBAccessor")
     def test_update_monthly_cost_infrastructure(self, mock_cost_accessor):
         """Test OCP charge for monthly costs is updated."""
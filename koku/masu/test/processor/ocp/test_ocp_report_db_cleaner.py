@@ -5,16 +5,19 @@
 """Test the OCPReportDBCleaner utility object."""
 import datetime
 import logging
+from unittest.mock import patch
 
 from dateutil import relativedelta
 from tenant_schemas.utils import schema_context
 
+from masu.config import Config
 from masu.database import OCP_REPORT_TABLE_MAP
 from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
 from masu.processor.ocp.ocp_report_db_cleaner import OCPReportDBCleaner
 from masu.processor.ocp.ocp_report_db_cleaner import OCPReportDBCleanerError
 from masu.test import MasuTestCase
 from masu.test.database.helpers import ReportObjectCreator
+from reporting.models import PartitionedTable
 
 LOG = logging.getLogger(__name__)
 
@@ -188,6 +191,40 @@ class OCPReportDBCleanerTest(MasuTestCase):
             self.assertIsNotNone(self.accessor._get_db_obj_query(line_item_table_name).first())
             self.assertIsNotNone(self.accessor._get_db_obj_query(storage_line_item_table_name).first())
 
+    @patch.object(Config, "MASU_EXPIRE_BY_PARTITION", True)
+    def test_purge_expired_report_data_drop_partitions(self):
+        """Test that only months before the cutoff are dropped as partitions."""
+        summary_table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
+        cleaner = OCPReportDBCleaner(self.schema)
+
+        with schema_context(self.schema):
+            first_period = (
+                self.accessor._get_db_obj_query(OCP_REPORT_TABLE_MAP["report_period"])
+                .order_by("-report_period_start")
+                .first()
+            )
+        cutoff_date = first_period.report_period_start
+        partition_start = cutoff_date.date().replace(day=1)
+        later_start = partition_start + relativedelta.relativedelta(months=1)
+        self.accessor.add_partitions(
+            self.accessor.get_existing_partitions(summary_table_name), [partition_start, later_start]
+        )
+        expired_name = f"{summary_table_name}_{partition_start.strftime('%Y_%m')}"
+        retained_name = f"{summary_table_name}_{later_start.strftime('%Y_%m')}"
+
+        removed_data = cleaner.purge_expired_report_data(cutoff_date, simulate=True)
+        dropped = [entry["partition"] for entry in removed_data if "partition" in entry]
+        self.assertIn(expired_name, dropped)
+        self.assertNotIn(retained_name, dropped)
+
+        cleaner.purge_expired_report_data(cutoff_date)
+        with schema_context(self.schema):
+            partitions = PartitionedTable.objects.filter(
+                schema_name=self.schema, partition_of_table_name=summary_table_name
+            )
+            self.assertFalse(partitions.filter(table_name=expired_name).exists())
+            self.assertTrue(partitions.filter(table_name=retained_name).exists())
+
     def test_purge_expired_report_data_for_provider(self):
         """Test that the provider_uuid deletes all data for the provider."""
         report_period_table_name = OCP_REPORT_TABLE_MAP["report_period"]
@@ -8,6 +8,7 @@ import os
 import shutil
 from datetime import timedelta
 from functools import partial
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
 from unittest.mock import patch
 from unittest.mock import PropertyMock
@@ -23,6 +24,7 @@ from masu.processor.aws.aws_report_parquet_processor import AWSReportParquetProc
 from masu.processor.azure.azure_report_parquet_processor import AzureReportParquetProcessor
 from masu.processor.gcp.gcp_report_parquet_processor import GCPReportParquetProcessor
 from masu.processor.ocp.ocp_report_parquet_processor import OCPReportParquetProcessor
+from masu.processor.parquet.parquet_report_processor import _convert_file_in_worker
 from masu.processor.parquet.parquet_report_processor import CSV_EXT
 from masu.processor.parquet.parquet_report_processor import CSV_GZIP_EXT
 from masu.processor.parquet.parquet_report_processor import ParquetReportProcessor
@@ -72,6 +74,39 @@ class TestParquetReportProcessor(MasuTestCase):
             context={"request_id": self.request_id, "start_date": DateHelper().today, "create_table": True},
         )
 
+    @patch("masu.processor.parquet.parquet_report_processor.ParquetReportProcessor.create_parquet_table")
+    @patch("masu.processor.parquet.parquet_report_processor.create_enabled_keys")
+    @patch("masu.processor.parquet.parquet_report_processor.copy_data_to_s3_bucket")
+    def test_convert_csv_to_parquet_downloaded_parquet(self, mock_copy, mock_keys, mock_table):
+        """Test that Parquet files written by the downloader are uploaded without conversion."""
+        file_path = "/tmp/2021-02-01_0.parquet"
+        pd.DataFrame({"labels": ['{"app": "web"}', '{"env": "prod"}'], "cost": [1.0, 2.0]}).to_parquet(
+            file_path, index=False
+        )
+        processor = ParquetReportProcessor(
+            schema_name=self.schema,
+            report_path="/tmp/202102.csv",
+            provider_uuid=self.gcp_provider_uuid,
+            provider_type=Provider.PROVIDER_GCP,
+            manifest_id=self.manifest_id,
+            context={
+                "request_id": self.request_id,
+                "start_date": DateHelper().today,
+                "create_table": True,
+                "split_files": [file_path],
+            },
+        )
+
+        parquet_base_filename, daily_data_frames, success = processor.convert_csv_to_parquet(file_path)
+
+        self.assertTrue(success)
+        self.assertEqual(parquet_base_filename, "2021-02-01_0")
+        self.assertEqual(daily_data_frames, [])
+        mock_copy.assert_called_once()
+        mock_table.assert_called_with(file_path)
+        mock_keys.assert_called_with(self.schema, GCPEnabledTagKeys, {"app", "env"})
+        os.remove(file_path)
+
     def test_resolve_enabled_tag_keys_model(self):
         """
         Test that the expected enabled tag keys model is resolved from each provider type.
@@ -376,6 +411,253 @@ class TestParquetReportProcessor(MasuTestCase):
                         self.assertTrue(result)
                         shutil.rmtree(local_path, ignore_errors=True)
 
+    @override_settings(PARQUET_VECTORIZED_CONVERSION=False)
+    def test_vectorized_conversion(self):
+        """Test that the vectorized conversion mode is resolved from context and settings."""
+        self.assertFalse(self.report_processor.vectorized_conversion)
+        with override_settings(PARQUET_VECTORIZED_CONVERSION=True):
+            self.assertTrue(self.report_processor.vectorized_conversion)
+
+        report_processor = ParquetReportProcessor(
+            schema_name=self.schema,
+            report_path=self.report_path,
+            provider_uuid=self.aws_provider_uuid,
+            provider_type=Provider.PROVIDER_AWS_LOCAL,
+            manifest_id=self.manifest_id,
+            context={"request_id": self.request_id, "vectorized_conversion": True},
+        )
+        self.assertTrue(report_processor.vectorized_conversion)
+
+    @patch("masu.processor.parquet.parquet_report_processor.os.path.exists")
+    @patch("masu.processor.parquet.parquet_report_processor.os.remove")
+    def test_convert_csv_to_parquet_vectorized(self, mock_remove, mock_exists):
+        """Test convert_csv_to_parquet with the vectorized conversion mode."""
+        with patch("masu.processor.parquet.parquet_report_processor.copy_data_to_s3_bucket"):
+            with patch("masu.processor.parquet.parquet_report_processor.ParquetReportProcessor.create_parquet_table"):
+                test_report_test_path = "./koku/masu/test/data/test_cur.csv.gz"
+                local_path = f"{Config.TMP_DIR}/{self.account_id}/{self.aws_provider_uuid}"
+                Path(local_path).mkdir(parents=True, exist_ok=True)
+                test_report = f"{local_path}/test_cur.csv.gz"
+                shutil.copy2(test_report_test_path, test_report)
+
+                report_processor = ParquetReportProcessor(
+                    schema_name=self.schema,
+                    report_path=test_report,
+                    provider_uuid=self.aws_provider_uuid,
+                    provider_type=Provider.PROVIDER_AWS_LOCAL,
+                    manifest_id=self.manifest_id,
+                    context={
+                        "request_id": self.request_id,
+                        "start_date": DateHelper().today,
+                        "create_table": True,
+                        "vectorized_conversion": True,
+                    },
+                )
+                _, __, result = report_processor.convert_csv_to_parquet(test_report)
+                self.assertTrue(result)
+                shutil.rmtree(local_path, ignore_errors=True)
+
+    @patch("masu.processor.parquet.parquet_report_processor.os.path.exists")
+    @patch("masu.processor.parquet.parquet_report_processor.os.remove")
+    def test_convert_csv_to_parquet_streaming_writer(self, mock_remove, mock_exists):
+        """Test that the streaming writer appends chunks to a single file."""
+        with patch("masu.processor.parquet.parquet_report_processor.copy_data_to_s3_bucket") as mock_copy:
+            with patch(
+                "masu.processor.parquet.parquet_report_processor.ParquetReportProcessor.create_parquet_table"
+            ) as mock_create_table:
+                test_report_test_path = "./koku/masu/test/data/test_cur.csv.gz"
+                local_path = f"{Config.TMP_DIR}/{self.account_id}/{self.aws_provider_uuid}"
+                Path(local_path).mkdir(parents=True, exist_ok=True)
+                test_report = f"{local_path}/test_cur.csv.gz"
+                shutil.copy2(test_report_test_path, test_report)
+
+                report_processor = ParquetReportProcessor(
+                    schema_name=self.schema,
+                    report_path=test_report,
+                    provider_uuid=self.aws_provider_uuid,
+                    provider_type=Provider.PROVIDER_AWS_LOCAL,
+                    manifest_id=self.manifest_id,
+                    context={
+                        "request_id": self.request_id,
+                        "start_date": DateHelper().today,
+                        "create_table": True,
+                        "streaming_writer": True,
+                    },
+                )
+                with override_settings(PARQUET_PROCESSING_BATCH_SIZE=2):
+                    _, __, result = report_processor.convert_csv_to_parquet(test_report)
+                self.assertTrue(result)
+                mock_copy.assert_called_once()
+                mock_create_table.assert_called_with(f"{local_path}/test_cur_0.parquet")
+                shutil.rmtree(local_path, ignore_errors=True)
+
+    @patch.object(ParquetReportProcessor, "post_processor", new_callable=PropertyMock)
+    @patch("masu.processor.parquet.parquet_report_processor.copy_data_to_s3_bucket")
+    def test_convert_csv_to_parquet_streaming_writer_failure(self, mock_copy, mock_post_processor):
+        """Test that the streaming writer removes its partial file when the conversion fails."""
+        chunks = []
+
+        def post_processor(data_frame):
+            chunks.append(data_frame)
+            if len(chunks) > 1:
+                raise ValueError("bad chunk")
+            return data_frame
+
+        mock_post_processor.return_value = post_processor
+        test_report_test_path = "./koku/masu/test/data/test_cur.csv.gz"
+        local_path = f"{Config.TMP_DIR}/{self.account_id}/{self.aws_provider_uuid}"
+        Path(local_path).mkdir(parents=True, exist_ok=True)
+        test_report = f"{local_path}/test_cur.csv.gz"
+        shutil.copy2(test_report_test_path, test_report)
+
+        report_processor = ParquetReportProcessor(
+            schema_name=self.schema,
+            report_path=test_report,
+            provider_uuid=self.aws_provider_uuid,
+            provider_type=Provider.PROVIDER_AWS_LOCAL,
+            manifest_id=self.manifest_id,
+            context={"request_id": self.request_id, "start_date": DateHelper().today, "streaming_writer": True},
+        )
+        with override_settings(PARQUET_PROCESSING_BATCH_SIZE=2):
+            _, __, result = report_processor.convert_csv_to_parquet(test_report)
+        self.assertFalse(result)
+        self.assertEqual(len(chunks), 2)
+        mock_copy.assert_not_called()
+        self.assertFalse(os.path.exists(f"{local_path}/test_cur_0.parquet"))
+        shutil.rmtree(local_path, ignore_errors=True)
+
+    @patch("masu.processor.parquet.parquet_report_processor.S3UploadQueue")
+    def test_copy_parquet_file_to_s3_upload_queue(self, mock_queue):
+        """Test that files are queued for upload and failures are reported after the barrier."""
+        self.report_processor._upload_queue = mock_queue.return_value
+        result = self.report_processor._copy_parquet_file_to_s3("/tmp/file.parquet", "file.parquet")
+        self.assertTrue(result)
+        mock_queue.return_value.submit.assert_called_once_with(
+            self.report_processor.parquet_path_s3, "/tmp/file.parquet", "file.parquet"
+        )
+        self.assertIn("/tmp/file.parquet", self.report_processor.files_to_remove)
+
+    @patch("masu.processor.parquet.parquet_report_processor.S3UploadQueue")
+    def test_failed_uploads_report_csv_files(self, mock_queue):
+        """Test that a failed queued upload is reported under the CSV file it was converted from."""
+        self.report_processor._context["concurrent_uploads"] = True
+        mock_queue.return_value.shutdown.return_value = [("file_0.parquet", Exception("Error"))]
+
+        def convert(csv_filename):
+            self.report_processor._converting_file = csv_filename
+            self.report_processor._copy_parquet_file_to_s3("/tmp/file_0.parquet", "file_0.parquet")
+            self.report_processor._copy_parquet_file_to_s3("/tmp/file_1.parquet", "file_1.parquet")
+
+        with self.report_processor._queued_uploads():
+            self.assertIs(self.report_processor._upload_queue, mock_queue.return_value)
+            convert("file.csv")
+        self.assertIsNone(self.report_processor._upload_queue)
+        self.assertEqual(self.report_processor._get_failed_upload_files(), ["file.csv"])
+
+    @patch("masu.processor.parquet.parquet_report_processor.connections")
+    @patch("masu.processor.parquet.parquet_report_processor.create_enabled_keys")
+    @patch("masu.processor.parquet.parquet_report_processor.ParquetReportProcessor.create_parquet_table")
+    @patch("masu.processor.parquet.parquet_report_processor._convert_file_in_worker")
+    @patch("masu.processor.parquet.parquet_report_processor.Pool", ThreadPool)
+    def test_convert_files_in_parallel(self, mock_worker, mock_create_table, mock_create_keys, mock_connections):
+        """Test that tables and tag keys are created once after all workers finish."""
+        report_processor = ParquetReportProcessor(
+            schema_name=self.schema,
+            report_path=self.report_path,
+            provider_uuid=self.aws_provider_uuid,
+            provider_type=Provider.PROVIDER_AWS_LOCAL,
+            manifest_id=self.manifest_id,
+            context={
+                "request_id": self.request_id,
+                "start_date": DateHelper().today,
+                "create_table": True,
+                "split_files": ["file_1.csv.gz", "file_2.csv.gz", "file_3.csv.gz"],
+            },
+        )
+
+        def worker(processor_class, processor_kwargs, csv_filename):
+            if csv_filename == "file_3.csv.gz":
+                raise MemoryError()
+            name = csv_filename.replace(".csv.gz", "")
+            return {
+                "parquet_base_filename": name,
+                "daily_data_frames": [],
+                "success": csv_filename != "file_2.csv.gz",
+                "files_to_remove": [f"{name}_0.parquet"],
+                "unique_keys": {name},
+                "parquet_file": f"{name}_0.parquet",
+                "daily_parquet_file": f"{name}_daily_0.parquet",
+            }
+
+        mock_worker.side_effect = worker
+        base_filename, _, failed = report_processor._convert_files_in_parallel()
+
+        self.assertEqual(base_filename, "file_2")
+        self.assertEqual(failed, ["file_2.csv.gz", "file_3.csv.gz"])
+        self.assertEqual(mock_create_table.call_count, 2)
+        mock_create_table.assert_any_call("file_2_0.parquet")
+        mock_create_table.assert_any_call("file_2_daily_0.parquet", daily=True)
+        mock_create_keys.assert_called_once_with(self.schema, AWSEnabledTagKeys, {"file_1", "file_2"})
+        self.assertEqual(report_processor.files_to_remove, ["file_1_0.parquet", "file_2_0.parquet"])
+        _, processor_kwargs, _ = mock_worker.call_args[0]
+        self.assertFalse(processor_kwargs.get("context").get("concurrent_uploads"))
+        mock_connections.close_all.assert_called_once()
+
+    @patch("masu.processor.parquet.parquet_report_processor.ParquetReportProcessor.create_daily_parquet")
+    @patch("masu.processor.parquet.parquet_report_processor.ParquetReportProcessor.convert_csv_to_parquet")
+    @patch("masu.processor.parquet.parquet_report_processor.ParquetReportProcessor._convert_files_in_parallel")
+    def test_convert_files(self, mock_parallel, mock_convert, mock_create_daily):
+        """Test that files are converted in worker processes only with more than one worker and file."""
+        mock_parallel.return_value = ("file_2", [], [])
+        mock_convert.side_effect = [("file_1", [], True), ("file_2", [], False)]
+        self.report_processor._context["split_files"] = ["file_1.csv.gz", "file_2.csv.gz"]
+
+        self.report_processor._context["conversion_workers"] = 2
+        self.assertEqual(self.report_processor._convert_files(), ("file_2", [], []))
+        mock_parallel.assert_called_once()
+        mock_convert.assert_not_called()
+
+        self.report_processor._context["conversion_workers"] = 1
+        self.assertEqual(self.report_processor._convert_files(), ("file_2", [], ["file_2.csv.gz"]))
+        self.assertEqual(mock_convert.call_count, 2)
+        self.assertEqual(mock_create_daily.call_count, 2)
+        mock_parallel.assert_called_once()
+
+    def test_convert_file_in_worker(self):
+        """Test that a worker returns the files and keys for the tables instead of creating them."""
+        written = {
+            "parquet_base_filename": "file",
+            "daily_data_frames": [],
+            "success": True,
+            "unique_keys": {"app"},
+            "parquet_file": "file_0.parquet",
+        }
+        with patch.object(ParquetReportProcessor, "_write_parquet_files", return_value=written) as mock_write:
+            with patch.object(
+                ParquetReportProcessor, "_write_daily_parquet", return_value="file_daily_0.parquet"
+            ) as mock_daily:
+                with patch.object(ParquetReportProcessor, "create_parquet_table") as mock_create_table:
+                    result = _convert_file_in_worker(
+                        ParquetReportProcessor,
+                        {
+                            "schema_name": self.schema,
+                            "report_path": self.report_path,
+                            "provider_uuid": self.aws_provider_uuid,
+                            "provider_type": Provider.PROVIDER_AWS,
+                            "manifest_id": self.manifest_id,
+                            "context": {"request_id": self.request_id},
+                        },
+                        "file.csv.gz",
+                    )
+        mock_write.assert_called_once_with("file.csv.gz")
+        mock_daily.assert_called_once_with("file", [])
+        mock_create_table.assert_not_called()
+        self.assertTrue(result.get("success"))
+        self.assertEqual(result.get("unique_keys"), {"app"})
+        self.assertEqual(result.get("parquet_file"), "file_0.parquet")
+        self.assertEqual(result.get("daily_parquet_file"), "file_daily_0.parquet")
+        self.assertEqual(result.get("files_to_remove"), [])
+
     def test_convert_csv_to_parquet_report_type_already_processed(self):
         """Test that we don't re-create a table when we already have created this run."""
         with patch("masu.processor.parquet.parquet_report_processor.settings", ENABLE_S3_ARCHIVING=True):
@@ -0,0 +1,105 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Test the StreamingParquetWriter."""
+import os
+import tempfile
+from unittest.mock import Mock
+
+import pandas as pd
+import pyarrow.parquet as pq
+from django.test import TestCase
+
+from masu.processor.parquet.parquet_writer import StreamingParquetWriter
+
+
+class StreamingParquetWriterTest(TestCase):
+    """Test cases for StreamingParquetWriter."""
+
+    def setUp(self):
+        """Set up shared test variables."""
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.local_path = self.temp_dir.name
+        self.data_frame = pd.DataFrame(
+            {"name": ["a", "b", "c"], "value": [1.0, 2.0, 3.0], "date": pd.to_datetime(["2021-01-01"] * 3)}
+        )
+
+    def tearDown(self):
+        """Clean up the temp directory."""
+        super().tearDown()
+        self.temp_dir.cleanup()
+
+    def test_write_appends_row_groups(self):
+        """Test that each data frame is appended to the same file as a row group."""
+        on_file_closed = Mock(return_value=True)
+        with StreamingParquetWriter(
+            self.local_path, "test", 256 * 1024 * 1024, on_file_closed=on_file_closed
+        ) as writer:
+            for _ in range(3):
+                writer.write(self.data_frame)
+
+        self.assertEqual(len(writer.files), 1)
+        parquet_file = pq.ParquetFile(writer.files[0])
+        self.assertEqual(parquet_file.num_row_groups, 3)
+        self.assertEqual(parquet_file.metadata.num_rows, 9)
+        self.assertEqual(writer.stats[0].get("row_groups"), 3)
+        self.assertEqual(writer.stats[0].get("rows"), 9)
+        self.assertEqual(writer.stats[0].get("file_name"), "test_0.parquet")
+        on_file_closed.assert_called_once_with(writer.files[0], "test_0.parquet")
+        self.assertEqual(writer.failed_files, [])
+
+    def test_write_rolls_over_at_target_size(self):
+        """Test that a new file is started once the target size is reached."""
+        with StreamingParquetWriter(self.local_path, "test", 1, compression="gzip") as writer:
+            for _ in range(3):
+                writer.write(self.data_frame)
+
+        self.assertEqual(len(writer.files), 3)
+        self.assertEqual([stat.get("row_groups") for stat in writer.stats], [1, 1, 1])
+        self.assertEqual(pq.ParquetFile(writer.files[0]).metadata.row_group(0).column(0).compression, "GZIP")
+
+    def test_write_casts_to_open_schema(self):
+        """Test that a chunk with an all null column is cast to the open file schema."""
+        null_data_frame = self.data_frame.copy()
+        null_data_frame["name"] = None
+        with StreamingParquetWriter(self.local_path, "test", 256 * 1024 * 1024) as writer:
+            writer.write(self.data_frame)
+            writer.write(null_data_frame)
+
+        self.assertEqual(len(writer.files), 1)
+        self.assertEqual(pq.ParquetFile(writer.files[0]).num_row_groups, 2)
+
+    def test_write_skips_empty_data_frame(self):
+        """Test that an empty data frame does not create a file."""
+        with StreamingParquetWriter(self.local_path, "test", 256 * 1024 * 1024) as writer:
+            writer.write(pd.DataFrame())
+
+        self.assertEqual(writer.files, [])
+        self.assertIsNone(writer.file_path)
+
+    def test_failed_files(self):
+        """Test that files the callback could not handle are tracked."""
+        with StreamingParquetWriter(
+            self.local_path, "test", 256 * 1024 * 1024, on_file_closed=Mock(return_value=False)
+        ) as writer:
+            writer.write(self.data_frame)
+
+        self.assertEqual(writer.failed_files, writer.files)
+
+    def test_abort_on_error(self):
+        """Test that the partial file is removed and not handed off when the block raises."""
+        on_file_closed = Mock(return_value=True)
+        with self.assertRaises(ValueError):
+            with StreamingParquetWriter(
+                self.local_path, "test", 256 * 1024 * 1024, on_file_closed=on_file_closed
+            ) as writer:
+                writer.write(self.data_frame)
+                file_path = writer.file_path
+                raise ValueError("bad chunk")
+
+        self.assertFalse(os.path.exists(file_path))
+        self.assertIsNone(writer.file_path)
+        self.assertEqual(writer.files, [])
+        on_file_closed.assert_not_called()
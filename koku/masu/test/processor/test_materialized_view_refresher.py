@@ -0,0 +1,91 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Test the MaterializedViewRefresher."""
+from unittest.mock import patch
+
+from api.models import Provider
+from api.utils import DateHelper
+from masu.database import AWS_CUR_TABLE_MAP
+from masu.database import OCP_REPORT_TABLE_MAP
+from masu.processor.materialized_view_refresher import get_summary_changes
+from masu.processor.materialized_view_refresher import MaterializedViewRefresher
+from masu.processor.summary_rollup_updater import SUMMARY_ROLLUPS
+from masu.test import MasuTestCase
+from reporting.models import OCP_MATERIALIZED_VIEWS
+from reporting.models import OCP_ON_AWS_MATERIALIZED_VIEWS
+from reporting.models import OCP_ON_AZURE_MATERIALIZED_VIEWS
+from reporting.models import OCP_ON_INFRASTRUCTURE_MATERIALIZED_VIEWS
+
+
+class MaterializedViewRefresherTest(MasuTestCase):
+    """Test cases for the MaterializedViewRefresher."""
+
+    def setUp(self):
+        """Set up the test."""
+        super().setUp()
+        self.dh = DateHelper()
+        self.start_date = self.dh.this_month_start.date()
+        self.end_date = self.dh.today.date()
+        views = (
+            OCP_MATERIALIZED_VIEWS
+            + OCP_ON_AWS_MATERIALIZED_VIEWS
+            + OCP_ON_AZURE_MATERIALIZED_VIEWS
+            + OCP_ON_INFRASTRUCTURE_MATERIALIZED_VIEWS
+        )
+        self.ocp_view_names = [view._meta.db_table for view in views]
+
+    def test_get_summary_changes(self):
+        """Test that OpenShift on cloud tables only change with an infrastructure relationship."""
+        changes = get_summary_changes(
+            Provider.PROVIDER_OCP, self.ocp_provider_uuid, self.start_date, self.end_date, infra_map={}
+        )
+        self.assertEqual([change["table"] for change in changes], [OCP_REPORT_TABLE_MAP["line_item_daily_summary"]])
+        self.assertEqual(changes[0]["source_uuid"], str(self.ocp_provider_uuid))
+        self.assertEqual(changes[0]["end_date"], str(self.end_date))
+
+        infra_map = {self.ocp_provider_uuid: (self.aws_provider_uuid, Provider.PROVIDER_AWS_LOCAL)}
+        changes = get_summary_changes(
+            Provider.PROVIDER_AWS_LOCAL, self.aws_provider_uuid, self.start_date, self.end_date, infra_map=infra_map
+        )
+        expected = {
+            AWS_CUR_TABLE_MAP["line_item_daily_summary"],
+            AWS_CUR_TABLE_MAP["ocp_on_aws_daily_summary"],
+            AWS_CUR_TABLE_MAP["ocp_on_aws_project_daily_summary"],
+            OCP_REPORT_TABLE_MAP["line_item_daily_summary"],
+        }
+        self.assertEqual({change["table"] for change in changes}, expected)
+        sources = {change["table"]: change["source_uuid"] for change in changes}
+        self.assertEqual(sources[OCP_REPORT_TABLE_MAP["line_item_daily_summary"]], str(self.ocp_provider_uuid))
+        self.assertEqual(sources[AWS_CUR_TABLE_MAP["ocp_on_aws_daily_summary"]], str(self.aws_provider_uuid))
+
+    def test_refresh_changed_views(self):
+        """Test that only the views selecting from changed tables are refreshed."""
+        changes = get_summary_changes(Provider.PROVIDER_OCP, self.ocp_provider_uuid, self.start_date, self.end_date)
+        refreshed = MaterializedViewRefresher(self.schema).refresh(self.ocp_view_names, changes)
+
+        for view in OCP_MATERIALIZED_VIEWS:
+            self.assertIn(view._meta.db_table, refreshed)
+        for view in OCP_ON_AWS_MATERIALIZED_VIEWS + OCP_ON_AZURE_MATERIALIZED_VIEWS:
+            self.assertNotIn(view._meta.db_table, refreshed)
+
+    def test_refresh_all_views(self):
+        """Test that every view is refreshed without change records."""
+        refreshed = MaterializedViewRefresher(self.schema).refresh(self.ocp_view_names)
+        self.assertEqual(sorted(refreshed), sorted(set(self.ocp_view_names)))
+
+    def test_refresh_skips_changes_before_views(self):
+        """Test that changes older than the materialized view data do not refresh views."""
+        start_date = self.dh.this_month_start.date().replace(year=self.start_date.year - 1)
+        changes = get_summary_changes(Provider.PROVIDER_OCP, self.ocp_provider_uuid, start_date, start_date)
+        refreshed = MaterializedViewRefresher(self.schema).refresh(self.ocp_view_names, changes)
+        self.assertEqual(refreshed, [])
+
+    def test_refresh_in_parallel(self):
+        """Test that independent views are refreshed by worker threads."""
+        refresher = MaterializedViewRefresher(self.schema, max_workers=4)
+        with patch.object(refresher, "_refresh_view") as mock_refresh:
+            refreshed = refresher.refresh(self.ocp_view_names)
+        self.assertEqual(mock_refresh.call_count, len(set(self.ocp_view_names) - set(SUMMARY_ROLLUPS)))
+        self.assertEqual(sorted(refreshed), sorted(set(self.ocp_view_names)))
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Test the ReportParquetProcessorBase."""
+import datetime
 import shutil
 import tempfile
 import uuid
@@ -10,7 +11,9 @@ from unittest.mock import patch
 
 import pandas as pd
 from django.test.utils import override_settings
+from prestodb.exceptions import PrestoUserError
 
+from masu.processor.report_parquet_processor_base import clear_hive_partition_cache
 from masu.processor.report_parquet_processor_base import PostgresSummaryTableError
 from masu.processor.report_parquet_processor_base import ReportParquetProcessorBase
 from masu.test import MasuTestCase
@@ -126,6 +129,62 @@ class ReportParquetProcessorBaseTest(MasuTestCase):
             self.processor.sync_hive_partitions()
             self.assertIn(expected_log, logger.output)
 
+    @override_settings(TRINO_REGISTER_PARTITIONS=True)
+    @patch("masu.processor.report_parquet_processor_base.ReportParquetProcessorBase._execute_sql")
+    def test_sync_hive_partitions_register(self, mock_execute):
+        """Test that only a new partition is registered and only once per process."""
+        clear_hive_partition_cache()
+        bill_date = datetime.date(2021, 2, 1)
+        self.processor.sync_hive_partitions(bill_date=bill_date)
+        self.processor.sync_hive_partitions(bill_date=bill_date)
+
+        mock_execute.assert_called_once()
+        sql = mock_execute.call_args.args[0]
+        self.assertIn("CALL system.register_partition", sql)
+        self.assertIn(f"ARRAY['{self.provider_uuid}', '2021', '02']", sql)
+        self.assertIn(f"{self.s3_path}/source={self.provider_uuid}/year=2021/month=02'", sql)
+
+        self.processor.sync_hive_partitions(bill_date=datetime.date(2021, 3, 1))
+        self.assertEqual(mock_execute.call_count, 2)
+
+        clear_hive_partition_cache(self.processor._schema_name, uuid.uuid4())
+        self.processor.sync_hive_partitions(bill_date=bill_date)
+        self.assertEqual(mock_execute.call_count, 2)
+
+        clear_hive_partition_cache(self.processor._schema_name, self.provider_uuid)
+        self.processor.sync_hive_partitions(bill_date=bill_date)
+        self.assertEqual(mock_execute.call_count, 3)
+
+    @override_settings(TRINO_REGISTER_PARTITIONS=True)
+    @patch("masu.processor.report_parquet_processor_base.ReportParquetProcessorBase._execute_sql")
+    def test_sync_hive_partitions_register_failed(self, mock_execute):
+        """Test that a partition is registered again after a failed registration."""
+        clear_hive_partition_cache()
+        bill_date = datetime.date(2021, 2, 1)
+        error = {"errorName": "PROCEDURE_CALL_FAILED", "message": "register_partition procedure is disabled"}
+        mock_execute.side_effect = PrestoUserError(error, "query_id")
+        self.processor.sync_hive_partitions(bill_date=bill_date)
+        self.assertEqual(mock_execute.call_args.kwargs, {"ignore_user_errors": False})
+
+        error = {"errorName": "ALREADY_EXISTS", "message": "Partition is already registered"}
+        mock_execute.side_effect = PrestoUserError(error, "query_id")
+        self.processor.sync_hive_partitions(bill_date=bill_date)
+        mock_execute.side_effect = None
+        self.processor.sync_hive_partitions(bill_date=bill_date)
+        self.assertEqual(mock_execute.call_count, 2)
+
+    @override_settings(TRINO_REGISTER_PARTITIONS=False)
+    @patch("masu.processor.report_parquet_processor_base.ReportParquetProcessorBase._execute_sql")
+    def test_sync_hive_partitions_full_sync_once(self, mock_execute):
+        """Test that the whole table is synced only for a partition this process has not seen."""
+        clear_hive_partition_cache()
+        bill_date = datetime.date(2021, 2, 1)
+        self.processor.sync_hive_partitions(bill_date=bill_date)
+        self.processor.sync_hive_partitions(bill_date=bill_date)
+
+        mock_execute.assert_called_once()
+        self.assertIn("'FULL'", mock_execute.call_args.args[0])
+
     @patch("masu.processor.report_parquet_processor_base.ReportParquetProcessorBase._execute_sql")
     def test_schema_exists(self, mock_execute):
         """Test that hive partitions are synced."""
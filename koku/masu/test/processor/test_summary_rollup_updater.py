@@ -0,0 +1,146 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Test the SummaryRollupUpdater."""
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.db import connection
+from django.db.models import Sum
+from tenant_schemas.utils import schema_context
+
+from api.models import Provider
+from api.utils import DateHelper
+from api.utils import materialized_view_month_start
+from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
+from masu.processor.materialized_view_refresher import get_summary_changes
+from masu.processor.ocp.ocp_cloud_summary_updater import OCPCloudReportSummaryUpdater
+from masu.processor.summary_rollup_updater import SUMMARY_ROLLUPS
+from masu.processor.summary_rollup_updater import SummaryRollupUpdater
+from masu.test import MasuTestCase
+from reporting.models import OCPCostSummary
+from reporting.models import OCPUsageLineItemDailySummary
+from reporting.models import PartitionedTable
+
+
+class SummaryRollupUpdaterTest(MasuTestCase):
+    """Test cases for the SummaryRollupUpdater."""
+
+    def setUp(self):
+        """Set up the test."""
+        super().setUp()
+        self.dh = DateHelper()
+        self.start_date = self.dh.this_month_start.date()
+        self.end_date = self.dh.today.date()
+        self.updater = SummaryRollupUpdater(self.schema)
+
+    def get_rollup_rows(self, rollup_table):
+        """Return the rows of a rollup table without their generated ids."""
+        with schema_context(self.schema):
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT * FROM {rollup_table}")
+                columns = [column.name for column in cursor.description]
+                rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        for row in rows:
+            del row["id"]
+        return sorted(rows, key=str)
+
+    def test_get_rollup_ranges(self):
+        """Test that change ranges are limited to the rollup window."""
+        window_start = materialized_view_month_start(self.dh).date()
+        rollup_table = OCPCostSummary._meta.db_table
+        self.assertEqual(self.updater.get_rollup_ranges(rollup_table), [(None, window_start, None)])
+
+        old_start = window_start.replace(year=window_start.year - 1)
+        changes = get_summary_changes(Provider.PROVIDER_OCP, self.ocp_provider_uuid, old_start, old_start)
+        self.assertEqual(self.updater.get_rollup_ranges(rollup_table, changes), [])
+
+        changes = get_summary_changes(Provider.PROVIDER_OCP, self.ocp_provider_uuid, old_start, self.end_date)
+        expected = [(str(self.ocp_provider_uuid), window_start, self.end_date)]
+        self.assertEqual(self.updater.get_rollup_ranges(rollup_table, changes), expected)
+
+        changes = get_summary_changes(Provider.PROVIDER_AWS, self.aws_provider_uuid, self.start_date, self.end_date)
+        self.assertEqual(self.updater.get_rollup_ranges(rollup_table, changes), [])
+
+    def test_incremental_update_matches_full_recompute(self):
+        """Test that rolling up only the changed ranges gives the rows of a full recompute."""
+        self.updater.update(SUMMARY_ROLLUPS)
+        with schema_context(self.schema):
+            OCPUsageLineItemDailySummary.objects.filter(
+                source_uuid=self.ocp_provider_uuid, usage_start__gte=self.start_date
+            ).update(infrastructure_raw_cost=Decimal("10"))
+            expected_cost = OCPUsageLineItemDailySummary.objects.filter(
+                source_uuid=self.ocp_provider_uuid, usage_start__gte=self.start_date
+            ).aggregate(cost=Sum("infrastructure_raw_cost"))["cost"]
+
+        changes = get_summary_changes(Provider.PROVIDER_OCP, self.ocp_provider_uuid, self.start_date, self.end_date)
+        updated = self.updater.update(SUMMARY_ROLLUPS, changes)
+        self.assertEqual(sorted(updated), sorted(SUMMARY_ROLLUPS))
+        with schema_context(self.schema):
+            cost = OCPCostSummary.objects.filter(
+                source_uuid=self.ocp_provider_uuid, usage_start__gte=self.start_date
+            ).aggregate(cost=Sum("infrastructure_raw_cost"))["cost"]
+        self.assertEqual(cost, expected_cost)
+
+        incremental_rows = {rollup_table: self.get_rollup_rows(rollup_table) for rollup_table in SUMMARY_ROLLUPS}
+        self.updater.update(SUMMARY_ROLLUPS)
+        for rollup_table in SUMMARY_ROLLUPS:
+            with self.subTest(rollup_table=rollup_table):
+                self.assertEqual(incremental_rows[rollup_table], self.get_rollup_rows(rollup_table))
+
+    def test_update_drops_expired_partitions(self):
+        """Test that the rollup partitions before the window are dropped."""
+        window_start = materialized_view_month_start(self.dh).date()
+        expired_start = window_start - relativedelta(months=1)
+        rollup_table = OCPCostSummary._meta.db_table
+        partition_name = f"{rollup_table}_{expired_start.strftime('%Y_%m')}"
+        with OCPReportDBAccessor(self.schema) as accessor:
+            accessor.add_partitions(accessor.get_existing_partitions(rollup_table), [expired_start])
+        with schema_context(self.schema):
+            partition_query = PartitionedTable.objects.filter(schema_name=self.schema, table_name=partition_name)
+            self.assertTrue(partition_query.exists())
+
+        self.assertEqual(self.updater.update([rollup_table]), [rollup_table])
+        with schema_context(self.schema):
+            self.assertFalse(partition_query.exists())
+            self.assertFalse(OCPCostSummary.objects.filter(usage_start__lt=window_start).exists())
+
+    def test_update_skips_unchanged_rollups(self):
+        """Test that changes to other summary tables leave the rollups alone."""
+        changes = get_summary_changes(Provider.PROVIDER_AWS, self.aws_provider_uuid, self.start_date, self.end_date)
+        self.assertEqual(self.updater.update(SUMMARY_ROLLUPS, changes), [])
+
+    def test_update_after_ocp_on_aws_summary(self):
+        """Test that the infrastructure costs of an OpenShift on AWS summary reach the OpenShift rollups."""
+        ocp_provider_uuid = str(self.ocp_on_aws_ocp_provider.uuid)
+        with schema_context(self.schema):
+            OCPUsageLineItemDailySummary.objects.filter(
+                source_uuid=ocp_provider_uuid, usage_start__gte=self.start_date
+            ).update(infrastructure_raw_cost=None)
+        self.updater.update(SUMMARY_ROLLUPS)
+
+        updater = OCPCloudReportSummaryUpdater(schema=self.schema, provider=self.aws_provider, manifest=None)
+        infra_map = updater.update_summary_tables(self.start_date, self.dh.this_month_end.date())
+        self.assertIn(ocp_provider_uuid, [str(uuid) for uuid in infra_map])
+        with schema_context(self.schema):
+            expected_cost = OCPUsageLineItemDailySummary.objects.filter(
+                source_uuid=ocp_provider_uuid, usage_start__gte=self.start_date
+            ).aggregate(cost=Sum("infrastructure_raw_cost"))["cost"]
+        self.assertIsNotNone(expected_cost)
+
+        changes = get_summary_changes(
+            Provider.PROVIDER_AWS, self.aws_provider_uuid, self.start_date, self.end_date, infra_map
+        )
+        self.assertIn(OCPCostSummary._meta.db_table, self.updater.update(SUMMARY_ROLLUPS, changes))
+        with schema_context(self.schema):
+            cost = OCPCostSummary.objects.filter(
+                source_uuid=ocp_provider_uuid, usage_start__gte=self.start_date
+            ).aggregate(cost=Sum("infrastructure_raw_cost"))["cost"]
+        self.assertEqual(cost, expected_cost)
+
+        incremental_rows = {rollup_table: self.get_rollup_rows(rollup_table) for rollup_table in SUMMARY_ROLLUPS}
+        self.updater.update(SUMMARY_ROLLUPS)
+        for rollup_table in SUMMARY_ROLLUPS:
+            with self.subTest(rollup_table=rollup_table):
+                self.assertEqual(incremental_rows[rollup_table], self.get_rollup_rows(rollup_table))
@@ -23,6 +23,8 @@ from django.core.cache import caches
 from django.db.models import Max
 from django.db.models import Min
 from django.db.utils import IntegrityError
+from django.test import override_settings
+from django.utils import timezone
 from tenant_schemas.utils import schema_context
 
 from api.iam.models import Tenant
@@ -45,6 +47,7 @@ from masu.processor.report_summary_updater import ReportSummaryUpdaterCloudError
 from masu.processor.tasks import autovacuum_tune_schema
 from masu.processor.tasks import get_report_files
 from masu.processor.tasks import normalize_table_options
+from masu.processor.tasks import OCP_QUEUE
 from masu.processor.tasks import record_all_manifest_files
 from masu.processor.tasks import record_report_status
 from masu.processor.tasks import refresh_materialized_views
@@ -52,7 +55,9 @@ from masu.processor.tasks import REFRESH_MATERIALIZED_VIEWS_QUEUE
 from masu.processor.tasks import remove_expired_data
 from masu.processor.tasks import REMOVE_EXPIRED_DATA_QUEUE
 from masu.processor.tasks import remove_stale_tenants
+from masu.processor.tasks import summarize_dirty_range
 from masu.processor.tasks import summarize_reports
+from masu.processor.tasks import summarize_stale_dirty_ranges
 from masu.processor.tasks import update_all_summary_tables
 from masu.processor.tasks import update_cost_model_costs
 from masu.processor.tasks import UPDATE_COST_MODEL_COSTS_QUEUE
@@ -67,6 +72,7 @@ from reporting.models import AZURE_MATERIALIZED_VIEWS
 from reporting.models import GCP_MATERIALIZED_VIEWS
 from reporting.models import OCP_MATERIALIZED_VIEWS
 from reporting_common.models import CostUsageReportStatus
+from reporting_common.models import SummaryDirtyRange
 
 
 LOG = logging.getLogger(__name__)
@@ -400,6 +406,103 @@ class ProcessReportFileTests(MasuTestCase):
         summarize_reports(reports_to_summarize)
         mock_update_summary.s.assert_not_called()
 
+    @override_settings(SUMMARY_COALESCE_WINDOW=600)
+    @patch("masu.processor.tasks.summarize_dirty_range")
+    @patch("masu.processor.tasks.update_summary_tables")
+    def test_summarize_reports_coalesced(self, mock_update_summary, mock_dirty_range):
+        """Test that reports of the same billing month are merged into one dirty range."""
+        today = DateHelper().today
+        start_date = today.replace(day=1)
+        reports_to_summarize = [
+            {
+                "schema_name": self.schema,
+                "provider_type": Provider.PROVIDER_OCP,
+                "provider_uuid": self.ocp_test_provider_uuid,
+                "manifest_id": manifest_id,
+                "start": str(start_date + timedelta(days=offset)),
+                "end": str(start_date + timedelta(days=offset)),
+            }
+            for manifest_id, offset in ((1, 0), (2, 1))
+        ]
+
+        summarize_reports(reports_to_summarize[:1])
+        summarize_reports(reports_to_summarize[1:])
+
+        mock_update_summary.s.assert_not_called()
+        mock_dirty_range.s.assert_called_once_with(
+            self.schema, str(self.ocp_test_provider_uuid), str(start_date.date()), queue_name=None
+        )
+        dirty_range = SummaryDirtyRange.objects.get(schema_name=self.schema, provider_uuid=self.ocp_test_provider_uuid)
+        self.assertEqual(dirty_range.start_date, start_date.date())
+        self.assertEqual(dirty_range.end_date, (start_date + timedelta(days=1)).date())
+        self.assertEqual(sorted(dirty_range.manifest_ids), [1, 2])
+        self.assertEqual(dirty_range.request_count, 2)
+
+    @override_settings(SUMMARY_COALESCE_WINDOW=600, SUMMARY_COALESCE_MAX_LATENCY=3600)
+    @patch("masu.processor.tasks.summarize_dirty_range.s")
+    @patch("masu.processor.tasks.update_summary_tables")
+    def test_summarize_dirty_range(self, mock_update_summary, mock_dirty_range):
+        """Test that a due dirty range runs one summarization and a new one waits."""
+        billing_month = DateHelper().this_month_start.date()
+        now = timezone.now()
+        dirty_range = SummaryDirtyRange.objects.create(
+            schema_name=self.schema,
+            provider_type=Provider.PROVIDER_OCP,
+            provider_uuid=self.ocp_test_provider_uuid,
+            billing_month=billing_month,
+            start_date=billing_month,
+            end_date=billing_month + timedelta(days=3),
+            manifest_ids=[2, 1],
+            request_count=3,
+            first_marked=now,
+            last_marked=now,
+        )
+
+        summarize_dirty_range(self.schema, str(self.ocp_test_provider_uuid), str(billing_month))
+        mock_dirty_range.assert_called()
+        mock_update_summary.s.assert_not_called()
+
+        dirty_range.last_marked = now - timedelta(seconds=601)
+        dirty_range.save()
+        summarize_dirty_range(self.schema, str(self.ocp_test_provider_uuid), str(billing_month))
+        mock_update_summary.s.assert_called_once_with(
+            self.schema,
+            Provider.PROVIDER_OCP,
+            str(self.ocp_test_provider_uuid),
+            start_date=str(billing_month),
+            end_date=str(billing_month + timedelta(days=3)),
+            manifest_id=2,
+            queue_name=None,
+            coalesced_manifest_ids=[1],
+        )
+        self.assertFalse(SummaryDirtyRange.objects.filter(schema_name=self.schema).exists())
+
+    @override_settings(SUMMARY_COALESCE_WINDOW=600, SUMMARY_COALESCE_MAX_LATENCY=3600)
+    @patch("masu.processor.tasks.summarize_dirty_range")
+    def test_summarize_stale_dirty_ranges(self, mock_dirty_range):
+        """Test that only dirty ranges overdue by a window are summarized again."""
+        billing_month = DateHelper().this_month_start.date()
+        now = timezone.now()
+        for months, marked in ((0, now), (1, now - timedelta(seconds=1201))):
+            SummaryDirtyRange.objects.create(
+                schema_name=self.schema,
+                provider_type=Provider.PROVIDER_OCP,
+                provider_uuid=self.ocp_test_provider_uuid,
+                billing_month=billing_month - relativedelta.relativedelta(months=months),
+                start_date=billing_month,
+                end_date=billing_month,
+                first_marked=marked,
+                last_marked=marked,
+            )
+
+        summarize_stale_dirty_ranges()
+        mock_dirty_range.s.assert_called_once_with(
+            self.schema,
+            str(self.ocp_test_provider_uuid),
+            str(billing_month - relativedelta.relativedelta(months=1)),
+            queue_name=OCP_QUEUE,
+        )
+
 
 class TestProcessorTasks(MasuTestCase):
     """Test cases for Processor Celery tasks."""
@@ -756,7 +859,12 @@ class TestUpdateSummaryTablesTask(MasuTestCase):
                 queue=UPDATE_COST_MODEL_COSTS_QUEUE
             )
             | refresh_materialized_views.si(
-                self.schema, provider, provider_uuid=provider_aws_uuid, manifest_id=manifest_id
+                self.schema,
+                provider,
+                provider_uuid=provider_aws_uuid,
+                manifest_id=manifest_id,
+                summary_changes=ANY,
+                coalesced_manifest_ids=None,
             ).set(queue=REFRESH_MATERIALIZED_VIEWS_QUEUE)
             | remove_expired_data.si(self.schema, provider, False, provider_aws_uuid, True, None).set(
                 queue=REMOVE_EXPIRED_DATA_QUEUE
@@ -847,8 +955,16 @@ class TestUpdateSummaryTablesTask(MasuTestCase):
             manifest = manifest_accessor.add(**manifest_dict)
             manifest.save()
 
+        with ReportManifestDBAccessor() as manifest_accessor:
+            coalesced_manifest = manifest_accessor.add(**{**manifest_dict, "assembly_id": "12344"})
+            coalesced_manifest.save()
+
         refresh_materialized_views(
-            self.schema, Provider.PROVIDER_OCP, provider_uuid=self.ocp_provider_uuid, manifest_id=manifest.id
+            self.schema,
+            Provider.PROVIDER_OCP,
+            provider_uuid=self.ocp_provider_uuid,
+            manifest_id=manifest.id,
+            coalesced_manifest_ids=[coalesced_manifest.id],
         )
 
         views_to_check = [view for view in OCP_MATERIALIZED_VIEWS if "Cost" in view._meta.db_table]
@@ -860,6 +976,8 @@ class TestUpdateSummaryTablesTask(MasuTestCase):
         with ReportManifestDBAccessor() as manifest_accessor:
             manifest = manifest_accessor.get_manifest_by_id(manifest.id)
             self.assertIsNotNone(manifest.manifest_completed_datetime)
+            coalesced_manifest = manifest_accessor.get_manifest_by_id(coalesced_manifest.id)
+            self.assertIsNotNone(coalesced_manifest.manifest_completed_datetime)
 
         with ProviderDBAccessor(self.ocp_provider_uuid) as accessor:
             self.assertIsNotNone(accessor.provider.data_updated_timestamp)
@@ -3,7 +3,11 @@
 # Copyright 2021 Red Hat Inc.
 # SPDX-License-Identifier: Apache-2.0
 #
+import json
+import os
 import random
+import tempfile
+import threading
 from datetime import datetime
 from unittest import TestCase
 from unittest.mock import Mock
@@ -13,7 +17,9 @@ import boto3
 import pandas as pd
 from botocore.exceptions import ClientError
 from dateutil.relativedelta import relativedelta
+from django.test.utils import override_settings
 from faker import Faker
+from moto import mock_s3
 from tenant_schemas.utils import schema_context
 
 from api.provider.models import Provider
@@ -360,6 +366,91 @@ class TestAWSUtils(MasuTestCase):
                 upload = utils.copy_data_to_s3_bucket("request_id", "path", "filename", "data", "manifest_id")
                 self.assertEqual(upload, None)
 
+    def test_s3_upload_queue(self):
+        """Test that queued uploads are sent to S3 and failures are aggregated."""
+        with tempfile.NamedTemporaryFile() as temp_file:
+            with patch("masu.util.aws.common.get_s3_resource") as mock_s3:
+                with utils.S3UploadQueue("request_id", manifest_id=1, max_workers=2, max_pending=2) as queue:
+                    for i in range(5):
+                        queue.submit("path", temp_file.name, f"file_{i}.parquet")
+                    failures = queue.flush()
+                self.assertEqual(failures, [])
+                self.assertEqual(mock_s3.return_value.Object.return_value.upload_fileobj.call_count, 5)
+                _, kwargs = mock_s3.return_value.Object.return_value.upload_fileobj.call_args
+                self.assertEqual(kwargs.get("ExtraArgs"), {"Metadata": {"ManifestId": "1"}})
+
+            with patch("masu.util.aws.common.get_s3_resource") as mock_s3:
+                mock_s3.return_value.Object.return_value.upload_fileobj.side_effect = ClientError({}, "Error")
+                with utils.S3UploadQueue("request_id") as queue:
+                    queue.submit("path", temp_file.name, "file.parquet")
+                    failures = queue.flush()
+                self.assertEqual(len(failures), 1)
+                self.assertEqual(failures[0][0], "file.parquet")
+                self.assertIsInstance(failures[0][1], ClientError)
+
+    @mock_s3
+    def test_s3_upload_queue_moto(self):
+        """Test multipart uploads and back-pressure of the upload queue against moto's S3."""
+        bucket = "koku-test-bucket"
+        part_size = 5 * 1024 * 1024
+        with override_settings(
+            S3_ENDPOINT="https://s3.amazonaws.com",
+            S3_REGION="us-east-1",
+            S3_BUCKET_NAME=bucket,
+            S3_MULTIPART_THRESHOLD=part_size,
+            S3_MULTIPART_CHUNKSIZE=part_size,
+        ), tempfile.NamedTemporaryFile() as large_file, tempfile.NamedTemporaryFile() as small_file:
+            s3_resource = utils.get_s3_resource()
+            s3_resource.create_bucket(Bucket=bucket)
+            large_file.write(os.urandom(2 * part_size + 1024))
+            large_file.flush()
+            small_file.write(b"data")
+            small_file.flush()
+
+            with utils.S3UploadQueue("request_id", manifest_id=1, max_workers=2, max_pending=2) as queue:
+                queue.submit("path", large_file.name, "large.csv")
+                failures = queue.flush()
+
+                # hold the uploads so the third submit has to wait for a free slot
+                gate = threading.Event()
+                upload = queue._upload
+
+                def gated_upload(*args):
+                    gate.wait(10)
+                    return upload(*args)
+
+                queue._upload = gated_upload
+                submitted = []
+
+                def producer():
+                    for i in range(3):
+                        queue.submit("path", small_file.name, f"file_{i}.parquet")
+                        submitted.append(i)
+
+                thread = threading.Thread(target=producer)
+                thread.start()
+                thread.join(1)
+                self.assertEqual(submitted, [0, 1])
+                gate.set()
+                thread.join(10)
+                self.assertEqual(submitted, [0, 1, 2])
+                failures += queue.flush()
+
+            self.assertEqual(failures, [])
+            large_object = s3_resource.Object(bucket, "path/large.csv")
+            self.assertEqual(large_object.content_length, 2 * part_size + 1024)
+            # S3 reports the part count of a multipart upload in the ETag
+            self.assertTrue(large_object.e_tag.strip('"').endswith("-3"))
+            self.assertEqual(large_object.metadata, {"manifestid": "1"})
+            keys = sorted(obj.key for obj in s3_resource.Bucket(bucket).objects.filter(Prefix="path/file_"))
+            self.assertEqual(keys, [f"path/file_{i}.parquet" for i in range(3)])
+
+            with utils.S3UploadQueue("request_id") as queue, override_settings(S3_BUCKET_NAME="missing-bucket"):
+                queue.submit("path", small_file.name, "file.parquet")
+                failures = queue.flush()
+            self.assertEqual([file_name for file_name, _ in failures], ["file.parquet"])
+            self.assertIsInstance(failures[0][1], ClientError)
+
     def test_aws_post_processor(self):
         """Test that missing columns in a report end up in the data frame."""
         column_one = "column_one"
@@ -384,6 +475,28 @@ class TestAWSUtils(MasuTestCase):
         for column in PRESTO_REQUIRED_COLUMNS:
             self.assertIn(column.replace("-", "_").replace("/", "_").replace(":", "_").lower(), columns)
 
+    def test_pack_resource_tags(self):
+        """Test that packed tags match a per-row json.dumps of the non-empty values."""
+        tag_df = pd.DataFrame(
+            {
+                "resourceTags/user:app": ["web", "", "db", ""],
+                "resourceTags/user:env": ["prod", "dev", "", ""],
+                "resourceTags/user:quote\"d": ['say "hi"', "", "caf\u00e9", ""],
+            }
+        )
+        tag_keys = ["app", "env", 'quote"d']
+        expected = [
+            json.dumps({key: value for key, value in zip(tag_keys, row) if value})
+            for row in tag_df.itertuples(index=False)
+        ]
+
+        result = utils.pack_resource_tags(tag_df, tag_keys)
+        self.assertEqual(list(result), expected)
+        self.assertEqual(result[3], "{}")
+
+        result = utils.pack_resource_tags(pd.DataFrame(index=range(2)), [])
+        self.assertEqual(list(result), ["{}", "{}"])
+
     def test_aws_generate_daily_data(self):
         """Test that we aggregate data at a daily level."""
         lineitem_usageamount = random.randint(1, 10)
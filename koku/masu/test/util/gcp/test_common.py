@@ -4,6 +4,7 @@
 #
 """Test the GCP common util."""
 import pandas as pd
+import pyarrow as pa
 from dateutil.relativedelta import relativedelta
 from tenant_schemas.utils import schema_context
 
@@ -151,3 +152,28 @@ class TestGCPUtils(MasuTestCase):
 
         result_columns = list(result_df)
         self.assertEqual(sorted(result_columns), sorted(expected_columns))
+
+    def test_gcp_bigquery_to_data_frame(self):
+        """Test that BigQuery result pages convert to the values of the converted CSV export."""
+        label_type = pa.list_(pa.struct([("key", pa.string()), ("value", pa.string())]))
+        credit_type = pa.list_(pa.struct([("name", pa.string()), ("amount", pa.float64()), ("id", pa.string())]))
+        # BigQuery builds its data frame pages from Arrow record batches
+        page_frame = pa.table(
+            {
+                "sku.description": pa.array(["Core", None]),
+                "labels": pa.array([[{"key": "app", "value": "web"}], None], type=label_type),
+                "credits": pa.array([[{"name": "free", "amount": -1.5, "id": None}], []], type=credit_type),
+                "cost": pa.array([1.25, None]),
+            }
+        ).to_pandas()
+
+        data_frame = utils.gcp_bigquery_to_data_frame(page_frame)
+        self.assertEqual(list(data_frame["sku.description"]), ["Core", ""])
+        self.assertEqual(list(data_frame["labels"]), ['{"app": "web"}', "{}"])
+        self.assertEqual(list(data_frame["credits"]), ['{"name": "free", "amount": -1.5, "id": "None"}', "{}"])
+        self.assertEqual(list(data_frame["cost"]), [1.25, 0.0])
+
+        csv_frame = utils.gcp_bigquery_to_csv_data_frame(page_frame)
+        self.assertEqual(csv_frame["labels"][0], "[{'key': 'app', 'value': 'web'}]")
+        self.assertEqual(utils.process_gcp_labels(csv_frame["labels"][0]), data_frame["labels"][0])
+        self.assertEqual(utils.process_gcp_credits(csv_frame["credits"][0]), data_frame["credits"][0])
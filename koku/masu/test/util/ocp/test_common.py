@@ -8,6 +8,7 @@ import datetime
 import json
 import os
 import random
+import re
 import shutil
 import tempfile
 from unittest.mock import patch
@@ -260,6 +261,58 @@ class OCPUtilTests(MasuTestCase):
             result = utils.match_openshift_labels(td, matched_tags, cluster_topology)
             self.assertEqual(result, expected)
 
+    def test_match_openshift_labels_series(self):
+        """Test that column-wise label matching equals per-row matching."""
+        cluster_topology = {
+            "cluster_id": self.ocp_cluster_id,
+            "cluster_alias": "my-ocp-cluster",
+            "nodes": ["compute-1"],
+            "projects": ["cost-management"],
+        }
+        matched_tags = [{"key": "value"}]
+        tags = pd.Series(
+            [
+                json.dumps({"key": "value"}),
+                json.dumps({"key": "other_value"}),
+                json.dumps({"OpenShift_Project": "Cost-Management"}),
+                json.dumps({"openshift_node": "COMPUTE-1"}),
+                json.dumps({"key": "value"}),
+                json.dumps({}),
+            ]
+        )
+        expected = [utils.match_openshift_labels(tag, matched_tags, cluster_topology) for tag in tags]
+        result = utils.match_openshift_labels_series(tags, matched_tags, cluster_topology)
+        self.assertEqual(list(result), expected)
+
+    def test_build_substring_regex(self):
+        """Test that the trie regex matches exactly when any value is a substring."""
+        self.assertIsNone(utils.build_substring_regex([]))
+        self.assertEqual(utils.build_substring_regex(["id1", "id2", "id3"]), "id(?:1|2|3)")
+
+        values = ["i-0abc", "i-0abd", "vol-1", "i-0ab", "node.x"]
+        pattern = utils.build_substring_regex(values)
+        rows = ["arn:aws:ec2:i-0abc/x", "i-0aXX", "vol-1", "prefix-i-0ab", "nodeAx", "node.x", ""]
+        for row in rows:
+            with self.subTest(row=row):
+                self.assertEqual(bool(re.search(pattern, row)), any(value in row for value in values))
+
+    def test_match_resource_ids_series(self):
+        """Test that column-wise resource id matching equals per-row substring matching."""
+        resource_ids = ["id1", "id2", "id3"]
+        column = pd.Series(["id1", "arn/id2", "id4", "id5", "xid3x", None])
+        result = utils.match_resource_ids_series(column, resource_ids)
+        self.assertEqual(list(result), [True, True, False, False, True, False])
+
+        result = utils.match_resource_ids_series(column, [])
+        self.assertFalse(result.any())
+
+    def test_generate_uuids(self):
+        """Test that unique UUID strings are generated."""
+        uuids = utils.generate_uuids(5)
+        self.assertEqual(len(set(uuids)), 5)
+        for value in uuids:
+            self.assertEqual(str(UUID(value)), value)
+
     def test_get_report_details(self):
         """Test that we handle manifest files properly."""
         with tempfile.TemporaryDirectory() as manifest_path:
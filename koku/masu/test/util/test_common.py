@@ -12,6 +12,8 @@ from datetime import timedelta
 from decimal import Decimal
 from os.path import exists
 
+import ciso8601
+import pandas as pd
 from dateutil import parser
 from django.test import TestCase
 from tenant_schemas.utils import schema_context
@@ -23,6 +25,8 @@ from masu.config import Config
 from masu.external import LISTEN_INGEST
 from masu.external import POLL_INGEST
 from masu.test import MasuTestCase
+from masu.util.aws.common import get_column_converters as aws_column_converters
+from masu.util.ocp.common import get_column_converters as ocp_column_converters
 from reporting.provider.aws.models import AWSCostEntryBill
 from reporting.provider.aws.models import AWSEnabledTagKeys
 
@@ -198,6 +202,70 @@ class CommonUtilTests(MasuTestCase):
         out = common_utils.safe_float("1.1")
         self.assertEqual(out, float("1.1"))
 
+    def test_vectorized_safe_float(self):
+        """Test that vectorized_safe_float matches safe_float."""
+        values = ["foo", "1.1", "", "2"]
+        result = common_utils.vectorized_safe_float(pd.Series(values))
+        self.assertEqual(list(result), [common_utils.safe_float(value) for value in values])
+
+    def test_vectorized_parse_datetime(self):
+        """Test that vectorized_parse_datetime matches ciso8601.parse_datetime."""
+        values = ["2021-01-01T00:00:00Z", "2021-01-01T01:30:00Z", "2021-01-02T00:00:00.123456Z"]
+        result = common_utils.vectorized_parse_datetime(pd.Series(values))
+        self.assertEqual(list(result), [ciso8601.parse_datetime(value) for value in values])
+
+        for value in ("", "foo", "01/02/2021", "2021-01-01T00:00:00Z extra"):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    ciso8601.parse_datetime(value)
+                with self.assertRaises(ValueError):
+                    common_utils.vectorized_parse_datetime(pd.Series(["2021-01-01T00:00:00Z", value]))
+
+    def test_vectorized_column_conversion_invalid_datetimes(self):
+        """Test that empty and invalid datetimes fail the same way as the per-cell converter."""
+        converters = {"date": ciso8601.parse_datetime}
+        for value in ("", "foo"):
+            with self.subTest(value=value):
+                data_frame = pd.DataFrame({"date": ["2021-01-01T00:00:00Z", value]})
+                with self.assertRaises(ValueError):
+                    common_utils.vectorized_column_conversion(data_frame, converters)
+
+    def test_vectorized_column_conversion_matches_converters(self):
+        """Test that the vectorized conversion path produces the same data as per-cell converters."""
+        test_matrix = (
+            ("./koku/masu/test/data/test_cur.csv.gz", aws_column_converters, {"compression": "gzip"}),
+            (
+                "./koku/masu/test/data/ocp/e6b3701e-1e91-433b-b238-a31e49937558_storage.csv",
+                ocp_column_converters,
+                {},
+            ),
+        )
+        for csv_file, get_converters, kwargs in test_matrix:
+            with self.subTest(csv_file=csv_file):
+                converters = get_converters()
+                col_names = pd.read_csv(csv_file, nrows=0, **kwargs).columns
+                converters.update({col: str for col in col_names if col not in converters})
+                expected = pd.read_csv(csv_file, converters=converters, **kwargs)
+
+                converters = get_converters()
+                read_kwargs = common_utils.get_vectorized_read_csv_kwargs()
+                result = pd.read_csv(csv_file, **read_kwargs, **kwargs)
+                result = common_utils.vectorized_column_conversion(result, converters)
+
+                pd.testing.assert_frame_equal(result, expected)
+
+    def test_convert_unique_values(self):
+        """Test that a converter is called once per distinct value."""
+        calls = []
+
+        def converter(value):
+            calls.append(value)
+            return value.upper()
+
+        result = common_utils.convert_unique_values(pd.Series(["a", "b", "a", "a"]), converter)
+        self.assertEqual(list(result), ["A", "B", "A", "A"])
+        self.assertEqual(sorted(calls), ["a", "b"])
+
     def test_safe_dict(self):
         """Test the safe_dict method handles good and bad inputs."""
         out = common_utils.safe_dict(1)
@@ -7,11 +7,15 @@ import datetime
 import json
 import logging
 import re
-import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 
 import boto3
 import ciso8601
+import numpy as np
 import pandas as pd
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from botocore.exceptions import EndpointConnectionError
 from dateutil.relativedelta import relativedelta
@@ -26,7 +30,9 @@ from masu.processor import enable_trino_processing
 from masu.util import common as utils
 from masu.util.common import safe_float
 from masu.util.common import strip_characters_from_column_name
-from masu.util.ocp.common import match_openshift_labels
+from masu.util.ocp.common import generate_uuids
+from masu.util.ocp.common import match_openshift_labels_series
+from masu.util.ocp.common import match_resource_ids_series
 from reporting.provider.aws.models import PRESTO_REQUIRED_COLUMNS
 
 LOG = logging.getLogger(__name__)
@@ -321,6 +327,90 @@ def copy_local_report_file_to_s3_bucket(
             copy_data_to_s3_bucket(request_id, s3_path, local_filename, fin, manifest_id, context)
 
 
+class S3UploadQueue:
+    """Bounded queue of local files uploaded to S3 by a pool of threads.
+
+    Submitting blocks once max_pending uploads are outstanding, so producers
+    cannot get arbitrarily far ahead of the network. Errors are collected and
+    returned by flush() rather than raised from the worker threads.
+
+    Example:
+        with S3UploadQueue(request_id, manifest_id=manifest_id, context=context) as queue:
+            queue.submit(s3_path, file_path, file_name)
+            failures = queue.flush()
+
+    """
+
+    def __init__(self, request_id, manifest_id=None, context={}, max_workers=None, max_pending=None):
+        """Initialize the upload queue."""
+        self.request_id = request_id
+        self.manifest_id = manifest_id
+        self.context = context
+        max_workers = max_workers or settings.S3_UPLOAD_CONCURRENCY
+        max_pending = max_pending or settings.S3_UPLOAD_QUEUE_SIZE
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="s3_upload")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._futures = {}
+        self._transfer_config = TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE,
+        )
+
+    def __enter__(self):
+        """Return the upload queue."""
+        return self
+
+    def __exit__(self, *exc):
+        """Wait for outstanding uploads and stop the worker threads."""
+        self.shutdown()
+
+    def _upload(self, s3_path, file_path, file_name):
+        """Upload a single local file to S3."""
+        upload_key = f"{s3_path}/{file_name}"
+        extra_args = {}
+        if self.manifest_id:
+            extra_args = {"Metadata": {"ManifestId": str(self.manifest_id)}}
+        s3_resource = get_s3_resource()
+        upload = s3_resource.Object(bucket_name=settings.S3_BUCKET_NAME, key=upload_key)
+        with open(file_path, "rb") as fin:
+            upload.upload_fileobj(fin, ExtraArgs=extra_args, Config=self._transfer_config)
+        msg = f"{file_path} sent to S3."
+        LOG.info(log_json(self.request_id, msg, self.context))
+        return upload
+
+    def submit(self, s3_path, file_path, file_name):
+        """Queue a local file for upload, blocking while the queue is full."""
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(self._upload, s3_path, file_path, file_name)
+        except RuntimeError:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures[future] = file_name
+        return future
+
+    def flush(self):
+        """Wait for every queued upload and return a list of (file_name, error) for failed uploads."""
+        futures = self._futures
+        self._futures = {}
+        wait(futures)
+        failures = []
+        for future, file_name in futures.items():
+            err = future.exception()
+            if err is not None:
+                msg = f"Unable to copy {file_name} to bucket {settings.S3_BUCKET_NAME}. Reason: {str(err)}"
+                LOG.warning(log_json(self.request_id, msg, self.context))
+                failures.append((file_name, err))
+        return failures
+
+    def shutdown(self):
+        """Wait for outstanding uploads and stop the worker threads."""
+        failures = self.flush()
+        self._executor.shutdown(wait=True)
+        return failures
+
+
 def remove_files_not_in_set_from_s3_bucket(request_id, s3_path, manifest_id, context={}):
     """
     Removes all files in a given prefix if they are not within the given set.
@@ -354,6 +444,35 @@ def remove_files_not_in_set_from_s3_bucket(request_id, s3_path, manifest_id, con
     return removed
 
 
+def pack_resource_tags(tag_df, tag_keys):
+    """
+    Build a JSON object string per row from sparse tag columns.
+
+    Equivalent to json.dumps({key: value for key, value in row if value}) for
+    every row, but built column by column so only non-empty cells are touched.
+
+    Args:
+        tag_df (DataFrame): One column per tag key
+        tag_keys (list): Tag key names, in the same order as the tag_df columns
+
+    Returns:
+        (Series): The JSON string for each row
+
+    """
+    packed = np.full(len(tag_df), "", dtype=object)
+    for column, key in zip(tag_df.columns, tag_keys):
+        values = tag_df[column]
+        mask = values.astype(bool).to_numpy()
+        if not mask.any():
+            continue
+        present = values[mask]
+        encoded = present.map({value: json.dumps(value) for value in present.unique()}).to_numpy(dtype=object)
+        current = packed[mask]
+        separator = np.where(current == "", "", ", ").astype(object)
+        packed[mask] = current + separator + f"{json.dumps(key)}: " + encoded
+    return pd.Series("{" + packed + "}", index=tag_df.index, dtype=object)
+
+
 def aws_post_processor(data_frame):
     """
     Consume the AWS data and add a column creating a dictionary for the aws tags
@@ -369,12 +488,9 @@ def aws_post_processor(data_frame):
     resource_tag_columns = [column for column in columns if "resourceTags/user:" in column]
     unique_keys = {scrub_resource_col_name(column) for column in resource_tag_columns}
     tag_df = data_frame[resource_tag_columns]
-    resource_tags_dict = tag_df.apply(
-        lambda row: {scrub_resource_col_name(column): value for column, value in row.items() if value}, axis=1
-    )
-    resource_tags_dict.where(resource_tags_dict.notna(), lambda _: [{}], inplace=True)
+    tag_keys = [scrub_resource_col_name(column) for column in resource_tag_columns]
 
-    data_frame["resourceTags"] = resource_tags_dict.apply(json.dumps)
+    data_frame["resourceTags"] = pack_resource_tags(tag_df, tag_keys)
     # Make sure we have entries for our required columns
     data_frame = data_frame.reindex(columns=columns)
 
@@ -435,17 +551,17 @@ def match_openshift_resources_and_labels(data_frame, cluster_topology, matched_t
     """Filter a dataframe to the subset that matches an OpenShift source."""
     resource_ids = cluster_topology.get("resource_ids", [])
     resource_id_df = data_frame["lineitem_resourceid"]
-    resource_id_matched = resource_id_df.apply(lambda row: any([value in row for value in resource_ids]))
+    resource_id_matched = match_resource_ids_series(resource_id_df, resource_ids)
     data_frame["resource_id_matched"] = resource_id_matched
 
     tags = data_frame["resourcetags"]
-    tag_matched = tags.apply(match_openshift_labels, args=(matched_tags, cluster_topology))
+    tag_matched = match_openshift_labels_series(tags, matched_tags, cluster_topology)
     data_frame["matched_tag"] = tag_matched
     openshift_matched_data_frame = data_frame[
         (data_frame["resource_id_matched"] == True) | (data_frame["matched_tag"] != "")  # noqa: E712
     ]
 
-    openshift_matched_data_frame["uuid"] = openshift_matched_data_frame.apply(lambda _: str(uuid.uuid4()), axis=1)
+    openshift_matched_data_frame["uuid"] = generate_uuids(len(openshift_matched_data_frame))
 
     return openshift_matched_data_frame
 
@@ -7,7 +7,6 @@ import datetime
 import json
 import logging
 import re
-import uuid
 
 import ciso8601
 from tenant_schemas.utils import schema_context
@@ -17,7 +16,9 @@ from masu.database.azure_report_db_accessor import AzureReportDBAccessor
 from masu.database.provider_db_accessor import ProviderDBAccessor
 from masu.util.common import safe_float
 from masu.util.common import strip_characters_from_column_name
-from masu.util.ocp.common import match_openshift_labels
+from masu.util.ocp.common import generate_uuids
+from masu.util.ocp.common import match_openshift_labels_series
+from masu.util.ocp.common import match_resource_ids_series
 from reporting.provider.azure.models import PRESTO_COLUMNS
 
 LOG = logging.getLogger(__name__)
@@ -185,17 +186,17 @@ def match_openshift_resources_and_labels(data_frame, cluster_topology, matched_t
     resource_id_df = data_frame["resourceid"]
     if resource_id_df.isna().values.all():
         resource_id_df = data_frame["instanceid"]
-    resource_id_matched = resource_id_df.apply(lambda row: any([value in row for value in matchable_resources]))
+    resource_id_matched = match_resource_ids_series(resource_id_df, matchable_resources)
 
     data_frame["resource_id_matched"] = resource_id_matched
 
     tags = data_frame["tags"]
-    tag_matched = tags.apply(match_openshift_labels, args=(matched_tags, cluster_topology))
+    tag_matched = match_openshift_labels_series(tags, matched_tags, cluster_topology)
     data_frame["matched_tag"] = tag_matched
     openshift_matched_data_frame = data_frame[
         (data_frame["resource_id_matched"] == True) | (data_frame["matched_tag"] != "")  # noqa: E712
     ]
 
-    openshift_matched_data_frame["uuid"] = openshift_matched_data_frame.apply(lambda _: str(uuid.uuid4()), axis=1)
+    openshift_matched_data_frame["uuid"] = generate_uuids(len(openshift_matched_data_frame))
 
     return openshift_matched_data_frame
@@ -15,6 +15,8 @@ from os import remove
 from tempfile import gettempdir
 from uuid import uuid4
 
+import ciso8601
+import pandas as pd
 from dateutil import parser
 from dateutil.rrule import DAILY
 from dateutil.rrule import rrule
@@ -28,6 +30,8 @@ from masu.external import LISTEN_INGEST
 from masu.external import POLL_INGEST
 
 LOG = logging.getLogger(__name__)
+# The ISO 8601 datetimes that ciso8601 and pandas parse to the same value
+ISO8601_DATETIME_PATTERN = r"\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d{1,6})?)?(Z|[+-]\d{2}:\d{2})?)?"
 
 
 def extract_uuids_from_string(source_string):
@@ -133,6 +137,70 @@ def safe_float(val):
     return result
 
 
+def vectorized_safe_float(series):
+    """
+    Convert a column of values to floats, using 0f where conversion fails.
+
+    Column-wise equivalent of safe_float.
+    """
+    return pd.to_numeric(series, errors="coerce").fillna(float(0))
+
+
+def vectorized_parse_datetime(series):
+    """
+    Convert a column of ISO 8601 strings to datetimes.
+
+    Column-wise equivalent of ciso8601.parse_datetime. pandas parses empty
+    strings as NaT and accepts formats that ciso8601 rejects, so a column
+    with any value outside the ISO 8601 subset below raises ValueError and
+    is left to the per-value converter.
+    """
+    if not series.astype(str).str.fullmatch(ISO8601_DATETIME_PATTERN).all():
+        raise ValueError("Column contains values that are not ISO 8601 datetimes.")
+    return pd.to_datetime(series)
+
+
+def convert_unique_values(series, converter):
+    """Apply a scalar converter once per distinct value and map the results back onto the column."""
+    mapping = {value: converter(value) for value in series.unique()}
+    return series.map(mapping).infer_objects()
+
+
+VECTORIZED_CONVERTERS = {safe_float: vectorized_safe_float, ciso8601.parse_datetime: vectorized_parse_datetime}
+
+
+def get_vectorized_read_csv_kwargs():
+    """
+    Return pandas.read_csv keyword arguments for the vectorized conversion path.
+
+    Every column is read as a raw string without NA detection, which is what
+    the C parser hands to per-cell converters.
+    """
+    return {"dtype": str, "na_filter": False}
+
+
+def vectorized_column_conversion(data_frame, converters):
+    """
+    Apply source column converters to a data frame column-wise.
+
+    Converters with a vectorized equivalent are applied to the whole column.
+    Any other converter is applied once per distinct value in the column,
+    which keeps the converter output identical to the per-cell path.
+    """
+    for column, converter in converters.items():
+        if column not in data_frame.columns:
+            continue
+        vectorized_converter = VECTORIZED_CONVERTERS.get(converter)
+        if vectorized_converter is not None:
+            try:
+                data_frame[column] = vectorized_converter(data_frame[column])
+                continue
+            except (ValueError, TypeError):
+                LOG.debug(f"Falling back to per-value conversion for column {column}.")
+        data_frame[column] = convert_unique_values(data_frame[column], converter)
+    return data_frame
+
+
 def safe_dict(val):
     """
     Convert the given value to a dictionary or empyt dict.
@@ -131,3 +131,57 @@ def get_column_converters():
         "usage.amount_in_pricing_units": safe_float,
         "credits": process_gcp_credits,
     }
+
+
+def gcp_bigquery_labels(labels):
+    """Convert a BigQuery key/value label list to the JSON dictionary process_gcp_labels returns."""
+    if labels is None:
+        return json.dumps({})
+    return json.dumps({entry.get("key"): entry.get("value") for entry in labels})
+
+
+def gcp_bigquery_credits(credits):
+    """Convert a BigQuery credit list to the JSON dictionary process_gcp_credits returns."""
+    credit_dict = {}
+    if credits is not None and len(credits):
+        credit_dict = {key: "None" if value is None else value for key, value in credits[0].items()}
+    return json.dumps(credit_dict)
+
+
+def get_bigquery_column_converters():
+    """Return converters for the BigQuery columns that are not already typed like the CSV converters."""
+    return {
+        "project.labels": gcp_bigquery_labels,
+        "labels": gcp_bigquery_labels,
+        "system_labels": gcp_bigquery_labels,
+        "credits": gcp_bigquery_credits,
+    }
+
+
+def gcp_bigquery_to_data_frame(page_frame):
+    """Convert a data frame page of BigQuery results to the data frame the CSV column converters produce.
+
+    Timestamps and numbers keep their BigQuery types, repeated records become
+    JSON dictionaries, and missing numbers and text become 0 and an empty
+    string as they do when the CSV export is converted.
+    """
+    data_frame = page_frame.copy()
+    converters = get_bigquery_column_converters()
+    for column, converter in converters.items():
+        if column in data_frame.columns:
+            data_frame[column] = [converter(value) for value in data_frame[column]]
+    for column in data_frame.select_dtypes(include="number").columns:
+        data_frame[column] = data_frame[column].fillna(float(0))
+    for column in data_frame.select_dtypes(include="object").columns:
+        if column not in converters:
+            data_frame[column] = data_frame[column].fillna("")
+    return data_frame
+
+
+def gcp_bigquery_to_csv_data_frame(page_frame):
+    """Convert a data frame page of BigQuery results to the values the CSV export writes for them."""
+    data_frame = page_frame.copy()
+    for column in get_bigquery_column_converters():
+        if column in data_frame.columns:
+            data_frame[column] = [str(list(value)) if value is not None else "" for value in data_frame[column]]
+    return data_frame
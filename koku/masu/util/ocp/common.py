@@ -7,6 +7,8 @@ import copy
 import json
 import logging
 import os
+import re
+import uuid
 from enum import Enum
 
 import ciso8601
@@ -445,13 +447,17 @@ def ocp_generate_daily_data(data_frame, report_type):
     return daily_data_frame
 
 
-def match_openshift_labels(tag_dict, matched_tags, cluster_topology):
-    """Match AWS data by OpenShift label associated with OpenShift cluster."""
+def _get_label_match_context(cluster_topology):
+    """Return the lowercase cluster identifiers, node names, and project names used for label matching."""
+    cluster_ids = (cluster_topology.get("cluster_id").lower(), cluster_topology.get("cluster_alias").lower())
+    nodes = {node.lower() for node in cluster_topology.get("nodes", [])}
+    projects = {project.lower() for project in cluster_topology.get("projects", [])}
+    return cluster_ids, nodes, projects
+
+
+def _match_openshift_labels(tag_dict, matched_tags, cluster_ids, nodes, projects):
+    """Match a tag JSON string against precomputed OpenShift cluster identifiers."""
     tag_dict = json.loads(tag_dict)
-    cluster_id = cluster_topology.get("cluster_id").lower()
-    cluster_alias = cluster_topology.get("cluster_alias").lower()
-    nodes = [node.lower() for node in cluster_topology.get("nodes", [])]
-    projects = [project.lower() for project in cluster_topology.get("projects", [])]
     tag_matches = []
     for key, value in tag_dict.items():
         tag = json.dumps({key.lower(): value.lower()}).replace("{", "").replace("}", "")
@@ -461,6 +467,67 @@ def match_openshift_labels(tag_dict, matched_tags, cluster_topology):
             return tag
         elif key.lower() == "openshift_node" and value.lower() in nodes:
             return tag
-        elif key.lower() == "openshift_cluster" and value.lower() in (cluster_id, cluster_alias):
+        elif key.lower() == "openshift_cluster" and value.lower() in cluster_ids:
             return tag
     return ",".join(tag_matches)
+
+
+def match_openshift_labels(tag_dict, matched_tags, cluster_topology):
+    """Match AWS data by OpenShift label associated with OpenShift cluster."""
+    return _match_openshift_labels(tag_dict, matched_tags, *_get_label_match_context(cluster_topology))
+
+
+def match_openshift_labels_series(tags, matched_tags, cluster_topology):
+    """
+    Match a column of tag JSON strings by OpenShift label.
+
+    The cluster topology is prepared once and each distinct tag string is
+    matched once, with the result mapped back onto the column.
+    """
+    match_context = _get_label_match_context(cluster_topology)
+    matches = {tag: _match_openshift_labels(tag, matched_tags, *match_context) for tag in tags.unique()}
+    return tags.map(matches)
+
+
+def build_substring_regex(values):
+    """
+    Return a regex that matches when any of the values occurs in a string.
+
+    The values are arranged in a prefix trie so alternatives that share a
+    prefix are only scanned once. Returns None when there are no values.
+    """
+    if not values:
+        return None
+    trie = {}
+    for value in values:
+        node = trie
+        for char in value:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _node_pattern(node):
+        if "" in node:
+            # A complete value is already matched, longer continuations do not matter
+            return ""
+        alternatives = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items())]
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return f"(?:{'|'.join(alternatives)})"
+
+    return _node_pattern(trie)
+
+
+def match_resource_ids_series(resource_id_column, resource_ids):
+    """Return a boolean column that is True where any of the resource ids occurs in the row value."""
+    pattern = build_substring_regex(resource_ids)
+    if pattern is None:
+        return pd.Series(False, index=resource_id_column.index)
+    unique_ids = pd.Series(resource_id_column.dropna().unique(), dtype=object)
+    matched = unique_ids.str.contains(pattern, regex=True)
+    matches = dict(zip(unique_ids, matched))
+    return resource_id_column.map(matches).fillna(False).astype(bool)
+
+
+def generate_uuids(count):
+    """Return a list of count random UUID strings."""
+    return [str(uuid.uuid4()) for _ in range(count)]
@@ -0,0 +1,127 @@
+# Generated by Django 3.1.12 on 2021-06-21 14:02
+from django.db import migrations
+from django.db import models
+
+# (provider_type, tag_type, tag summary table, period column, period table, period start column)
+TAG_SUMMARY_SOURCES = (
+    (
+        "AWS",
+        "",
+        "reporting_awstags_summary",
+        "cost_entry_bill_id",
+        "reporting_awscostentrybill",
+        "billing_period_start",
+    ),
+    (
+        "Azure",
+        "",
+        "reporting_azuretags_summary",
+        "cost_entry_bill_id",
+        "reporting_azurecostentrybill",
+        "billing_period_start",
+    ),
+    (
+        "GCP",
+        "",
+        "reporting_gcptags_summary",
+        "cost_entry_bill_id",
+        "reporting_gcpcostentrybill",
+        "billing_period_start",
+    ),
+    (
+        "OCP",
+        "pod",
+        "reporting_ocpusagepodlabel_summary",
+        "report_period_id",
+        "reporting_ocpusagereportperiod",
+        "report_period_start",
+    ),
+    (
+        "OCP",
+        "storage",
+        "reporting_ocpstoragevolumelabel_summary",
+        "report_period_id",
+        "reporting_ocpusagereportperiod",
+        "report_period_start",
+    ),
+)
+
+BACKFILL_VALUE_SQL = """
+INSERT INTO reporting_tag_catalog_value (provider_type, tag_type, key, value, first_seen, last_seen)
+SELECT '{0}', '{1}', ts.key, tv.value, min(p.{5})::date, max(p.{5})::date
+  FROM {2} AS ts
+  JOIN {4} AS p
+    ON p.id = ts.{3},
+       unnest(ts.values) AS tv(value)
+ GROUP BY ts.key, tv.value
+;
+"""
+
+BACKFILL_KEY_SQL = """
+INSERT INTO reporting_tag_catalog_key (provider_type, tag_type, key, value_count, first_seen, last_seen)
+SELECT provider_type, tag_type, key, count(*), min(first_seen), max(last_seen)
+  FROM reporting_tag_catalog_value
+ GROUP BY provider_type, tag_type, key
+;
+"""
+
+
+def backfill_tag_catalog(apps, schema_editor):
+    """Build the tag catalog from the existing tag summary tables."""
+    with schema_editor.connection.cursor() as cursor:
+        for source in TAG_SUMMARY_SOURCES:
+            cursor.execute(BACKFILL_VALUE_SQL.format(*source))
+        cursor.execute(BACKFILL_KEY_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("reporting", "0183_cost_distribution")]
+
+    operations = [
+        migrations.CreateModel(
+            name="TagCatalogKey",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("provider_type", models.TextField()),
+                ("tag_type", models.TextField(default="")),
+                ("key", models.TextField()),
+                ("value_count", models.IntegerField(default=0)),
+                ("first_seen", models.DateField()),
+                ("last_seen", models.DateField()),
+            ],
+            options={
+                "db_table": "reporting_tag_catalog_key",
+                "unique_together": {("provider_type", "tag_type", "key")},
+            },
+        ),
+        migrations.CreateModel(
+            name="TagCatalogValue",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("provider_type", models.TextField()),
+                ("tag_type", models.TextField(default="")),
+                ("key", models.TextField()),
+                ("value", models.TextField()),
+                ("first_seen", models.DateField()),
+                ("last_seen", models.DateField()),
+            ],
+            options={
+                "db_table": "reporting_tag_catalog_value",
+                "unique_together": {("provider_type", "tag_type", "key", "value")},
+            },
+        ),
+        migrations.AddIndex(
+            model_name="tagcatalogkey",
+            index=models.Index(fields=["provider_type", "last_seen"], name="tag_catalog_key_last_seen_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tagcatalogvalue",
+            index=models.Index(
+                fields=["provider_type", "key", "value"],
+                name="tag_catalog_value_prefix_idx",
+                opclasses=["text_ops", "text_ops", "text_pattern_ops"],
+            ),
+        ),
+        migrations.RunPython(backfill_tag_catalog, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 3.1.12 on 2021-06-23 15:20
+import pkgutil
+
+from django.db import migrations
+
+from koku import pg_partition as ppart
+
+# (rollup table, unique index, unique index columns)
+OCP_SUMMARY_ROLLUPS = (
+    ("reporting_ocp_cost_summary", "ocp_cost_summary", "usage_start, cluster_id, cluster_alias, source_uuid"),
+    (
+        "reporting_ocp_cost_summary_by_node",
+        "ocp_cost_summary_by_node",
+        "usage_start, cluster_id, cluster_alias, node, source_uuid",
+    ),
+    (
+        "reporting_ocp_cost_summary_by_project",
+        "ocp_cost_summary_by_project",
+        "usage_start, cluster_id, cluster_alias, namespace, source_uuid",
+    ),
+    ("reporting_ocp_pod_summary", "ocp_pod_summary", "usage_start, cluster_id, cluster_alias, source_uuid"),
+    (
+        "reporting_ocp_pod_summary_by_project",
+        "ocp_pod_summary_by_project",
+        "usage_start, cluster_id, cluster_alias, namespace, source_uuid",
+    ),
+    ("reporting_ocp_volume_summary", "ocp_volume_summary", "usage_start, cluster_id, cluster_alias, source_uuid"),
+    (
+        "reporting_ocp_volume_summary_by_project",
+        "ocp_volume_summary_by_project",
+        "usage_start, cluster_id, cluster_alias, namespace, source_uuid",
+    ),
+)
+
+# Replace the materialized view with a table partitioned by usage_start month holding the same rows
+CONVERT_SQL = """
+ALTER MATERIALIZED VIEW {table} RENAME TO {table}_matview;
+
+CREATE TABLE {table} (
+    LIKE {table}_matview
+)
+PARTITION BY RANGE (usage_start);
+
+-- The partitioned_tables trigger creates the partitions
+INSERT INTO partitioned_tables (
+    schema_name,
+    table_name,
+    partition_of_table_name,
+    partition_type,
+    partition_col,
+    partition_parameters
+)
+VALUES (%s, '{table}_default', '{table}', 'range', 'usage_start', '{{"default": true}}'::jsonb);
+
+CALL public.create_date_partitions('{table}_matview', 'usage_start', %s, '{table}');
+
+INSERT INTO {table} SELECT * FROM {table}_matview;
+
+DROP MATERIALIZED VIEW {table}_matview;
+
+CREATE UNIQUE INDEX {index} ON {table} ({columns});
+
+CREATE SEQUENCE {table}_id_seq OWNED BY {table}.id;
+SELECT setval('{table}_id_seq', coalesce(max(id), 0) + 1, false) FROM {table};
+ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq');
+"""
+
+# Drop the rollup table and its partitions, the partitioned_tables trigger drops the partitions
+REVERT_SQL = """
+DELETE FROM partitioned_tables WHERE schema_name = %s AND partition_of_table_name = '{table}';
+
+DROP TABLE {table};
+"""
+
+
+def convert_ocp_summaries_to_rollups(apps, schema_editor):
+    """Convert the OCP summary materialized views to incrementally updated rollup tables."""
+    target_schema = ppart.resolve_schema(ppart.CURRENT_SCHEMA)
+    with schema_editor.connection.cursor() as cursor:
+        for table, index, columns in OCP_SUMMARY_ROLLUPS:
+            cursor.execute(CONVERT_SQL.format(table=table, index=index, columns=columns), [target_schema] * 2)
+
+
+def convert_ocp_rollups_to_summaries(apps, schema_editor):
+    """Replace the OCP summary rollup tables with the materialized views they were converted from."""
+    version = "_20210615"
+    target_schema = ppart.resolve_schema(ppart.CURRENT_SCHEMA)
+    with schema_editor.connection.cursor() as cursor:
+        for table, _, _ in OCP_SUMMARY_ROLLUPS:
+            cursor.execute(REVERT_SQL.format(table=table), [target_schema])
+            view_sql = pkgutil.get_data("reporting.provider.ocp", f"sql/views/{version}/{table}{version}.sql")
+            cursor.execute(view_sql.decode("utf-8"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("reporting", "0184_tag_catalog")]
+
+    operations = [migrations.RunPython(convert_ocp_summaries_to_rollups, convert_ocp_rollups_to_summaries)]
@@ -5,6 +5,8 @@
 """Models for cost entry tables."""
 # flake8: noqa
 from reporting.partition.models import PartitionedTable
+from reporting.provider.all.models import TagCatalogKey
+from reporting.provider.all.models import TagCatalogValue
 from reporting.provider.all.openshift.models import OCPAllComputeSummary
 from reporting.provider.all.openshift.models import OCPAllCostLineItemDailySummary
 from reporting.provider.all.openshift.models import OCPAllCostLineItemProjectDailySummary
@@ -0,0 +1,59 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Models for tables shared by all providers."""
+from django.db import models
+
+
+class TagCatalogKey(models.Model):
+    """A per-tenant catalog of tag keys across all sources of a provider.
+
+    Maintained incrementally from the tag summary tables, see
+    masu/database/sql/reporting_tag_catalog.sql. first_seen and last_seen
+    hold the start of the first and last billing periods a key was seen in.
+
+    """
+
+    class Meta:
+        """Meta for TagCatalogKey."""
+
+        db_table = "reporting_tag_catalog_key"
+        unique_together = ("provider_type", "tag_type", "key")
+        indexes = [
+            models.Index(fields=["provider_type", "last_seen"], name="tag_catalog_key_last_seen_idx"),
+        ]
+
+    id = models.BigAutoField(primary_key=True)
+    provider_type = models.TextField()
+    # The OCP tag type, pod or storage, or an empty string for cloud providers
+    tag_type = models.TextField(default="")
+    key = models.TextField()
+    value_count = models.IntegerField(default=0)
+    first_seen = models.DateField()
+    last_seen = models.DateField()
+
+
+class TagCatalogValue(models.Model):
+    """A per-tenant catalog of tag values for the keys in TagCatalogKey."""
+
+    class Meta:
+        """Meta for TagCatalogValue."""
+
+        db_table = "reporting_tag_catalog_value"
+        unique_together = ("provider_type", "tag_type", "key", "value")
+        indexes = [
+            models.Index(
+                fields=["provider_type", "key", "value"],
+                name="tag_catalog_value_prefix_idx",
+                opclasses=["text_ops", "text_ops", "text_pattern_ops"],
+            )
+        ]
+
+    id = models.BigAutoField(primary_key=True)
+    provider_type = models.TextField()
+    tag_type = models.TextField(default="")
+    key = models.TextField()
+    value = models.TextField()
+    first_seen = models.DateField()
+    last_seen = models.DateField()
@@ -613,7 +613,7 @@ class OCPProject(models.Model):
 
 
 class OCPCostSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A partitioned summary rollup table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -653,7 +653,7 @@ class OCPCostSummary(models.Model):
 
 
 class OCPCostSummaryByProject(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A partitioned summary rollup table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -696,7 +696,7 @@ class OCPCostSummaryByProject(models.Model):
 
 
 class OCPCostSummaryByNode(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A partitioned summary rollup table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -738,7 +738,7 @@ class OCPCostSummaryByNode(models.Model):
 
 
 class OCPPodSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A partitioned summary rollup table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -802,7 +802,7 @@ class OCPPodSummary(models.Model):
 
 
 class OCPPodSummaryByProject(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A partitioned summary rollup table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -868,7 +868,7 @@ class OCPPodSummaryByProject(models.Model):
 
 
 class OCPVolumeSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A partitioned summary rollup table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -922,7 +922,7 @@ class OCPVolumeSummary(models.Model):
 
 
 class OCPVolumeSummaryByProject(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A partitioned summary rollup table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -0,0 +1,34 @@
+# Generated by Django 3.1.12 on 2021-07-06 13:41
+import django.contrib.postgres.fields
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("reporting_common", "0028_costusagereportmanifest_operator_version")]
+
+    operations = [
+        migrations.CreateModel(
+            name="SummaryDirtyRange",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("schema_name", models.TextField()),
+                ("provider_type", models.TextField()),
+                ("provider_uuid", models.UUIDField()),
+                ("billing_month", models.DateField()),
+                ("start_date", models.DateField()),
+                ("end_date", models.DateField()),
+                (
+                    "manifest_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(), default=list, size=None
+                    ),
+                ),
+                ("request_count", models.IntegerField(default=1)),
+                ("first_marked", models.DateTimeField()),
+                ("last_marked", models.DateTimeField()),
+            ],
+            options={"unique_together": {("schema_name", "provider_uuid", "billing_month")}},
+        )
+    ]
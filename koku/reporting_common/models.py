@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Models for shared reporting tables."""
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
 from django.utils import timezone
 
@@ -61,3 +62,24 @@ class RegionMapping(models.Model):
 
     region = models.CharField(max_length=32, null=False, unique=True)
     region_name = models.CharField(max_length=64, null=False, unique=True)
+
+
+class SummaryDirtyRange(models.Model):
+    """Dates of a provider billing month waiting for one merged summarization."""
+
+    class Meta:
+        """Meta for SummaryDirtyRange."""
+
+        unique_together = ("schema_name", "provider_uuid", "billing_month")
+
+    schema_name = models.TextField()
+    provider_type = models.TextField()
+    provider_uuid = models.UUIDField()
+    billing_month = models.DateField()
+    start_date = models.DateField()
+    end_date = models.DateField()
+    manifest_ids = ArrayField(models.IntegerField(), default=list)
+    # The number of summarizations merged into this range
+    request_count = models.IntegerField(default=1)
+    first_marked = models.DateTimeField()
+    last_marked = models.DateTimeField()
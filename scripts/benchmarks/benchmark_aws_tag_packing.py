@@ -0,0 +1,79 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare per-row and columnar packing of AWS resourceTags columns.
+
+Usage:
+    python scripts/benchmarks/benchmark_aws_tag_packing.py --rows 1000000 --columns 300 --density 0.05
+
+The per-row reference is the DataFrame.apply(axis=1) implementation that
+aws_post_processor used before pack_resource_tags. Pass --skip-reference to
+only time the columnar path on very large inputs.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import django
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../koku/")))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+django.setup()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from masu.util.aws.common import pack_resource_tags  # noqa: E402
+
+
+def generate_tags(rows, columns, density, seed=42):
+    """Return a sparse tag data frame with empty strings for missing tags."""
+    rng = np.random.default_rng(seed)
+    values = np.array([f"value_{i}" for i in range(20)], dtype=object)
+    data = {}
+    for i in range(columns):
+        column = np.full(rows, "", dtype=object)
+        mask = rng.random(rows) < density
+        column[mask] = values[rng.integers(0, len(values), mask.sum())]
+        data[f"resourceTags/user:key_{i}"] = column
+    return pd.DataFrame(data)
+
+
+def reference_pack(tag_df, tag_keys):
+    """Per-row implementation used before pack_resource_tags."""
+    key_map = dict(zip(tag_df.columns, tag_keys))
+    packed = tag_df.apply(lambda row: {key_map[column]: value for column, value in row.items() if value}, axis=1)
+    packed.where(packed.notna(), lambda _: [{}], inplace=True)
+    return packed.apply(json.dumps)
+
+
+def main():
+    """Run the benchmark."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--rows", type=int, default=1000000)
+    arg_parser.add_argument("--columns", type=int, default=300)
+    arg_parser.add_argument("--density", type=float, default=0.05, help="Fraction of non-empty tag cells.")
+    arg_parser.add_argument("--skip-reference", action="store_true")
+    args = arg_parser.parse_args()
+
+    tag_df = generate_tags(args.rows, args.columns, args.density)
+    tag_keys = [column.replace("resourceTags/user:", "") for column in tag_df.columns]
+
+    start = time.perf_counter()
+    result = pack_resource_tags(tag_df, tag_keys)
+    columnar = time.perf_counter() - start
+    print(f"  columnar: {columnar:.2f}s ({args.rows / columnar:,.0f} rows/sec)")
+
+    if not args.skip_reference:
+        start = time.perf_counter()
+        expected = reference_pack(tag_df, tag_keys)
+        per_row = time.perf_counter() - start
+        print(f"   per-row: {per_row:.2f}s ({args.rows / per_row:,.0f} rows/sec)")
+        print(f"   speedup: {per_row / columnar:.1f}x, identical output: {result.equals(expected)}")
+
+
+if __name__ == "__main__":
+    main()
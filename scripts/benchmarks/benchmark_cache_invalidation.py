@@ -0,0 +1,101 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare view cache invalidation strategies on a populated Redis database.
+
+Usage:
+    python scripts/benchmarks/benchmark_cache_invalidation.py --keys 1000000 --tenants 500 --db 15
+
+The database given by --db is flushed before every run, do not point it at a
+database in use. Keys are written in the format the tenant aware key function
+produces for cache_page views, along with the per-tenant, per-prefix key
+registry that KokuRedisCache maintains. One tenant/prefix pair is then
+invalidated with:
+
+    keys      the previous KEYS * scan, decode, substring filter, and DEL per key
+    scan      SCAN with a tenant match pattern and pipelined UNLINK
+    registry  the KokuRedisCache key registry with pipelined UNLINK
+"""
+import argparse
+import os
+import sys
+import time
+
+import django
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../koku/")))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+
+from koku.cache import _scan_delete_redis_keys  # noqa: E402
+from koku.cache import get_view_cache_keys_registry_key  # noqa: E402
+from koku.cache import KokuRedisCache  # noqa: E402
+from koku.cache import VIEW_CACHE_PREFIXES  # noqa: E402
+
+BATCH_SIZE = 10000
+
+
+def populate(client, keys, tenants):
+    """Write cache_page style keys spread across tenants and view prefixes, with their registries."""
+    client.flushdb()
+    pipe = client.pipeline(transaction=False)
+    for i in range(keys):
+        schema_name = f"acct{i % tenants}"
+        prefix = VIEW_CACHE_PREFIXES[(i // tenants) % len(VIEW_CACHE_PREFIXES)]
+        key = f"{schema_name}::1:views.decorators.cache.cache_page.{prefix}.GET.{i:032x}.{i:032x}"
+        pipe.set(key, b"x")
+        pipe.sadd(get_view_cache_keys_registry_key(schema_name, prefix), key)
+        if i % BATCH_SIZE == 0:
+            pipe.execute()
+    pipe.execute()
+
+
+def legacy_invalidate(client, schema_name, prefix):
+    """Invalidation as it was done before the key registry."""
+    all_keys = [key.decode("utf-8") for key in client.keys("*")]
+    keys_to_invalidate = [key for key in all_keys if schema_name in key and prefix in key]
+    for key in keys_to_invalidate:
+        client.delete(key)
+    return len(keys_to_invalidate)
+
+
+def main():
+    """Run the benchmark."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--keys", type=int, default=1000000)
+    arg_parser.add_argument("--tenants", type=int, default=500)
+    arg_parser.add_argument("--db", type=int, default=15)
+    arg_parser.add_argument("--strategies", nargs="+", default=["keys", "scan", "registry"])
+    args = arg_parser.parse_args()
+
+    cache = KokuRedisCache(
+        f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/{args.db}",
+        {
+            "KEY_FUNCTION": "tenant_schemas.cache.make_key",
+            "REVERSE_KEY_FUNCTION": "tenant_schemas.cache.reverse_key",
+            "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+        },
+    )
+    client = cache.client.get_client(write=True)
+    schema_name = "acct1"
+    prefix = VIEW_CACHE_PREFIXES[0]
+    strategies = {
+        "keys": lambda: legacy_invalidate(client, schema_name, prefix),
+        "scan": lambda: _scan_delete_redis_keys(cache, schema_name, (prefix,)),
+        "registry": lambda: cache.invalidate_view_keys(schema_name, prefix),
+    }
+
+    for name in args.strategies:
+        populate(client, args.keys, args.tenants)
+        start = time.perf_counter()
+        deleted = strategies[name]()
+        elapsed = time.perf_counter() - start
+        print(f"{name:>8}: {elapsed * 1000:10.1f} ms, {deleted} keys deleted from {args.keys} keys")
+    client.flushdb()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare peak memory of rendered and streamed CSV report exports.
+
+Usage:
+    python scripts/benchmarks/benchmark_csv_export.py --schema acct10001 --months 12 --group-by project
+
+Exports an OpenShift costs report at daily resolution over the given number
+of months against an existing tenant, without pagination. Exports longer than
+MASU_RETAIN_NUM_MONTHS are cut to the retained months. The rendered export
+builds the report with execute_query and renders it with PaginatedCSVRenderer;
+the streamed export reads rows from a server side cursor with
+StreamingReportCSVRenderer. Peak Python memory is measured with tracemalloc.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import django
+from dateutil.relativedelta import relativedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../koku/")))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+django.setup()
+
+from django.test import RequestFactory  # noqa: E402
+
+from api.common.csv import PaginatedCSVRenderer  # noqa: E402
+from api.common.csv import StreamingReportCSVRenderer  # noqa: E402
+from api.query_params import QueryParameters  # noqa: E402
+from api.report.ocp.query_handler import OCPReportQueryHandler  # noqa: E402
+from api.report.ocp.view import OCPCostView  # noqa: E402
+from api.utils import DateHelper  # noqa: E402
+from api.utils import materialized_view_month_start  # noqa: E402
+
+
+def build_handler(schema, url):
+    """Build a CSV report handler for an unrestricted user in the schema."""
+    request = RequestFactory().get(url, HTTP_ACCEPT="text/csv")
+    request.user = SimpleNamespace(access=None, customer=SimpleNamespace(schema_name=schema))
+    return OCPReportQueryHandler(QueryParameters(request, OCPCostView))
+
+
+def rendered_export(handler):
+    """Build the whole report, then render it."""
+    output = handler.execute_query()
+    content = PaginatedCSVRenderer().render(output)
+    return len(content)
+
+
+def streamed_export(handler):
+    """Stream the report rows through the CSV writer."""
+    rows = handler.stream_csv_rows()
+    return sum(len(line) for line in StreamingReportCSVRenderer().render(rows))
+
+
+def measure(export, handler):
+    """Return (seconds, peak bytes, CSV bytes) for an export."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = export(handler)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+
+def main():
+    """Run the benchmark."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--schema", default="acct10001")
+    arg_parser.add_argument("--months", type=int, default=12)
+    arg_parser.add_argument("--group-by", default="project")
+    args = arg_parser.parse_args()
+
+    dh = DateHelper()
+    end_date = dh.today.date()
+    start_date = end_date - relativedelta(months=args.months)
+    earliest_date = materialized_view_month_start(dh).date()
+    if start_date < earliest_date:
+        print(f"MASU_RETAIN_NUM_MONTHS limits the report to start on {earliest_date}.")
+        start_date = earliest_date
+    url = (
+        f"/?start_date={start_date}&end_date={end_date}&filter[resolution]=daily"
+        f"&group_by[{args.group_by}]=*"
+    )
+    for name, export in (("rendered", rendered_export), ("streamed", streamed_export)):
+        elapsed, peak, size = measure(export, build_handler(args.schema, url))
+        print(f"{name:>8}: {elapsed:8.2f}s, peak {peak / 2 ** 20:10.1f} MiB, {size / 2 ** 20:10.1f} MiB of CSV")
+
+
+if __name__ == "__main__":
+    main()
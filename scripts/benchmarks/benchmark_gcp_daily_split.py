@@ -0,0 +1,110 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare splitting a GCP export into daily files in memory and in chunks.
+
+Usage:
+    python scripts/benchmarks/benchmark_gcp_daily_split.py --rows 10000000 --days 31
+
+A BigQuery export covering the requested number of days is generated. The
+in-memory split filters the whole file once per day, the chunked split is
+divide_csv_daily. Each split runs in its own process so peak RSS is measured
+independently.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import django
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../koku/")))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+django.setup()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from masu.external.downloader.gcp.gcp_report_downloader import divide_csv_daily  # noqa: E402
+
+GENERATE_BATCH_SIZE = 1000000
+
+
+def generate_export(path, rows, days):
+    """Write a GCP export with rows spread evenly over the days of a month."""
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp("2021-01-01T00:00:00Z")
+    for offset in range(0, rows, GENERATE_BATCH_SIZE):
+        count = min(GENERATE_BATCH_SIZE, rows - offset)
+        hours = (np.arange(offset, offset + count) * days * 24) // rows
+        usage_start = start + pd.to_timedelta(hours, unit="h")
+        data_frame = pd.DataFrame(
+            {
+                "billing_account_id": "01AB23-CD45EF-678901",
+                "service.description": rng.choice(["Compute Engine", "Cloud Storage", "BigQuery"], count),
+                "sku.description": rng.choice(["N1 Core", "Standard Storage", "Analysis"], count),
+                "usage_start_time": usage_start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "usage_end_time": (usage_start + pd.Timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "project.id": rng.choice([f"project-{i}" for i in range(20)], count),
+                "labels": '[{"key": "environment", "value": "prod"}]',
+                "cost": rng.random(count).round(9),
+                "usage.amount": rng.random(count) * 3600,
+                "invoice.month": "202101",
+            }
+        )
+        data_frame.to_csv(path, mode="a" if offset else "w", index=False, header=not offset)
+
+
+def divide_in_memory(file_path):
+    """Split the export the way divide_csv_daily did before it read in chunks."""
+    directory = os.path.dirname(file_path)
+    data_frame = pd.read_csv(file_path)
+    days = list({cur_dt[:10] for cur_dt in data_frame.usage_start_time.unique()})
+    for day in days:
+        data_frame[data_frame.usage_start_time.str.contains(day)].to_csv(
+            f"{directory}/{day}.csv", index=False, header=True
+        )
+    return days
+
+
+def split(path, chunked, queue):
+    """Split the export in a fresh directory and report elapsed time, day count, and peak RSS."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        export_path = f"{tmp_dir}/{os.path.basename(path)}"
+        os.symlink(path, export_path)
+        start = time.perf_counter()
+        days = divide_csv_daily(export_path) if chunked else divide_in_memory(export_path)
+        elapsed = time.perf_counter() - start
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put((len(days), elapsed, peak_rss_mb))
+
+
+def main():
+    """Run the benchmark."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--rows", type=int, default=10000000, help="Number of export rows to generate.")
+    arg_parser.add_argument("--days", type=int, default=31, help="Number of days the export covers.")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = f"{tmp_dir}/benchmark_gcp_export.csv"
+        generate_export(path, args.rows, args.days)
+        results = {}
+        for label, chunked in (("in memory", False), ("chunked", True)):
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=split, args=(path, chunked, queue))
+            process.start()
+            results[label] = queue.get()
+            process.join()
+
+    for label, (days, elapsed, peak_rss_mb) in results.items():
+        rate = args.rows / elapsed
+        print(f"{label:>10}: {days} days in {elapsed:.2f}s ({rate:,.0f} rows/sec), peak RSS {peak_rss_mb:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
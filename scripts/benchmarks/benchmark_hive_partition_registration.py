@@ -0,0 +1,104 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare a FULL partition sync with registering only the new Hive partition.
+
+Usage:
+    python scripts/benchmarks/benchmark_hive_partition_registration.py --schema acct10001 --months 24
+
+Writes a small Parquet file for each of the given months of history to the
+S3 bucket (MinIO in the development setup) and creates a Trino table over
+them. Each round then adds a new month and makes it known to Trino once with
+sync_partition_metadata FULL and once with register_partition. Trino needs
+hive.allow-register-partition-procedure=true. The table and files are removed
+afterwards.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+import django
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../koku/")))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+django.setup()
+
+import pandas as pd  # noqa: E402
+from dateutil.relativedelta import relativedelta  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+from api.utils import DateHelper  # noqa: E402
+from masu.processor.report_parquet_processor_base import ReportParquetProcessorBase  # noqa: E402
+from masu.util.aws.common import get_s3_resource  # noqa: E402
+
+TABLE_NAME = "benchmark_hive_partitions"
+COLUMN_TYPES = {"numeric_columns": ["cost"], "date_columns": ["usage_start"], "boolean_columns": []}
+
+
+def upload_month(bucket, processor, parquet_file, bill_date):
+    """Upload the Parquet file into the partition of a billing month."""
+    key = (
+        f"{processor._s3_path}/source={processor._provider_uuid}"
+        f"/year={bill_date.strftime('%Y')}/month={bill_date.strftime('%m')}/data_0.parquet"
+    )
+    bucket.upload_file(parquet_file, key)
+
+
+def timed(func, *args):
+    """Return the seconds a call took."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--schema", default="acct10001")
+    arg_parser.add_argument("--months", type=int, default=24, help="Months of partitions already in the table.")
+    arg_parser.add_argument("--rounds", type=int, default=3, help="New months added per registration mode.")
+    args = arg_parser.parse_args()
+
+    bucket = get_s3_resource().Bucket(settings.S3_BUCKET_NAME)
+    s3_path = f"{TABLE_NAME}/{uuid.uuid4()}"
+    first_month = DateHelper().this_month_start.date() - relativedelta(months=args.months)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        parquet_file = f"{tmp_dir}/data_0.parquet"
+        pd.DataFrame({"usage_start": [pd.Timestamp(first_month)], "cost": [1.0]}).to_parquet(parquet_file)
+        processor = ReportParquetProcessorBase(
+            None, args.schema[4:], s3_path, str(uuid.uuid4()), parquet_file, COLUMN_TYPES, TABLE_NAME
+        )
+        processor.create_schema()
+        processor.create_table()
+        try:
+            for month in range(args.months):
+                upload_month(bucket, processor, parquet_file, first_month + relativedelta(months=month))
+            print(f"initial FULL sync of {args.months} months: {timed(processor._sync_all_hive_partitions):.3f}s")
+
+            results = {"FULL sync": [], "register": []}
+            next_month = first_month + relativedelta(months=args.months)
+            for _ in range(args.rounds):
+                upload_month(bucket, processor, parquet_file, next_month)
+                results["FULL sync"].append(timed(processor._sync_all_hive_partitions))
+                next_month += relativedelta(months=1)
+
+                upload_month(bucket, processor, parquet_file, next_month)
+                values = (str(processor._provider_uuid), next_month.strftime("%Y"), next_month.strftime("%m"))
+                results["register"].append(timed(processor._register_hive_partition, values))
+                next_month += relativedelta(months=1)
+        finally:
+            drop_sql = f"DROP TABLE IF EXISTS {processor._schema_name}.{TABLE_NAME}"
+            processor._execute_sql(drop_sql, processor._schema_name)
+            bucket.objects.filter(Prefix=f"{s3_path}/").delete()
+
+    for label, durations in results.items():
+        print(f"{label:>10}: mean {sum(durations) / len(durations):.3f}s over {len(durations)} new months")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare the converter-based and vectorized CSV to Parquet conversion paths.
+
+Usage:
+    python scripts/benchmarks/benchmark_parquet_conversion.py --rows 2000000
+
+A large AWS CUR is generated by repeating the rows of the test CUR. Each
+conversion mode runs in its own process so peak RSS is measured independently.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import django
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../koku/")))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+django.setup()
+
+import pandas as pd  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+from masu.util.aws.common import get_column_converters  # noqa: E402
+from masu.util.common import get_vectorized_read_csv_kwargs  # noqa: E402
+from masu.util.common import vectorized_column_conversion  # noqa: E402
+
+TEST_CUR = os.path.join(os.path.dirname(__file__), "../../koku/masu/test/data/test_cur.csv.gz")
+BATCH_SIZE = 200000
+
+
+def generate_cur(path, rows):
+    """Write a gzipped CUR with the requested number of rows."""
+    sample = pd.read_csv(TEST_CUR, dtype=str, keep_default_na=False)
+    repeats = rows // len(sample) + 1
+    data_frame = pd.concat([sample] * repeats, ignore_index=True).head(rows)
+    data_frame.to_csv(path, index=False, compression="gzip")
+
+
+def convert(path, vectorized, queue):
+    """Convert the CSV to parquet and report elapsed time, row count, schema, and peak RSS."""
+    converters = get_column_converters()
+    col_names = pd.read_csv(path, nrows=0, compression="gzip").columns
+    if vectorized:
+        kwargs = get_vectorized_read_csv_kwargs()
+    else:
+        converters.update({col: str for col in col_names if col not in converters})
+        kwargs = {"converters": converters}
+
+    rows = 0
+    schema = None
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with pd.read_csv(path, chunksize=BATCH_SIZE, compression="gzip", **kwargs) as reader:
+            for i, data_frame in enumerate(reader):
+                if vectorized:
+                    data_frame = vectorized_column_conversion(data_frame, converters)
+                parquet_file = f"{tmp_dir}/bench_{i}.parquet"
+                data_frame.to_parquet(
+                    parquet_file, allow_truncated_timestamps=True, coerce_timestamps="ms", index=False
+                )
+                if schema is None:
+                    schema = pq.read_schema(parquet_file).remove_metadata().to_string()
+                rows += len(data_frame)
+    elapsed = time.perf_counter() - start
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put((rows, elapsed, peak_rss_mb, schema))
+
+
+def main():
+    """Run the benchmark."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--rows", type=int, default=1000000, help="Number of CUR rows to generate.")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = f"{tmp_dir}/benchmark_cur.csv.gz"
+        generate_cur(path, args.rows)
+        results = {}
+        for label, vectorized in (("converters", False), ("vectorized", True)):
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=convert, args=(path, vectorized, queue))
+            process.start()
+            results[label] = queue.get()
+            process.join()
+
+    for label, (rows, elapsed, peak_rss_mb, _) in results.items():
+        rate = rows / elapsed
+        print(f"{label:>12}: {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec), peak RSS {peak_rss_mb:.0f} MB")
+    print(f"Parquet schemas identical: {results['converters'][3] == results['vectorized'][3]}")
+
+
+if __name__ == "__main__":
+    main()
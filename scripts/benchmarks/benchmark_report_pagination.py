@@ -0,0 +1,85 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare ranked report pagination in Python and in SQL.
+
+Usage:
+    python scripts/benchmarks/benchmark_report_pagination.py --schema acct10001 --limit 100 --offset 0
+
+Runs an OpenShift costs report grouped by project with filter[limit] and
+filter[offset] against an existing tenant, once with the ranks paginated in
+Python and once with REPORT_SQL_PAGINATION_ENABLED. The tenant should hold
+enough projects to be representative, e.g. 50k projects over 90 days.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import django
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../koku/")))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from tenant_schemas.utils import schema_context  # noqa: E402
+
+from api.query_params import QueryParameters  # noqa: E402
+from api.report.ocp.query_handler import OCPReportQueryHandler  # noqa: E402
+from api.report.ocp.view import OCPCostView  # noqa: E402
+from api.utils import DateHelper  # noqa: E402
+from reporting.provider.ocp.models import OCPUsageLineItemDailySummary  # noqa: E402
+
+
+def build_params(schema, url):
+    """Build QueryParameters for a request from an unrestricted user in the schema."""
+    request = RequestFactory().get(url)
+    request.user = SimpleNamespace(access=None, customer=SimpleNamespace(schema_name=schema))
+    return QueryParameters(request, OCPCostView)
+
+
+def run(schema, url):
+    """Execute the report and return (seconds, statements, rows, count)."""
+    handler = OCPReportQueryHandler(build_params(schema, url))
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        output = handler.execute_query()
+        elapsed = time.perf_counter() - start
+    rows = sum(len(date.get("projects", [])) for date in output.get("data", []))
+    return elapsed, len(queries), rows, handler.max_rank
+
+
+def main():
+    """Run the benchmark."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--schema", default="acct10001")
+    arg_parser.add_argument("--limit", type=int, default=100)
+    arg_parser.add_argument("--offset", type=int, default=0)
+    arg_parser.add_argument("--days", type=int, default=90)
+    args = arg_parser.parse_args()
+
+    with schema_context(args.schema):
+        projects = OCPUsageLineItemDailySummary.objects.values("namespace").distinct().count()
+    print(f"{args.schema}: {projects} projects")
+
+    end_date = DateHelper().today.date()
+    start_date = end_date - timedelta(days=args.days - 1)
+    url = (
+        f"?start_date={start_date}&end_date={end_date}&filter[resolution]=daily"
+        f"&filter[limit]={args.limit}&filter[offset]={args.offset}&group_by[project]=*&order_by[cost]=desc"
+    )
+    for name, enabled in (("python", False), ("sql", True)):
+        with override_settings(REPORT_SQL_PAGINATION_ENABLED=enabled):
+            elapsed, statements, rows, count = run(args.schema, url)
+        print(f"{name:>6}: {elapsed:8.2f}s, {statements} statements, {rows} project rows, meta.count {count}")
+
+
+if __name__ == "__main__":
+    main()
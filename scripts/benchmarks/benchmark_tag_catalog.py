@@ -0,0 +1,129 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare the OpenShift tags API answered from the label summaries and from the tag catalog.
+
+Usage:
+    python scripts/benchmarks/benchmark_tag_catalog.py --schema acct10001 --keys 20000 --values 5
+
+Adds --keys synthetic pod label keys with --values values each to the label
+summary of the latest OpenShift report period of an existing tenant, adds them
+to the tag catalog the way the summary pipeline does, and times the tags API
+queries the UI makes with TAG_CATALOG_ENABLED off and on. The synthetic labels
+are removed afterwards.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+from types import SimpleNamespace
+
+import django
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../koku/")))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+django.setup()
+
+from django.test import RequestFactory  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from tenant_schemas.utils import schema_context  # noqa: E402
+
+from api.models import Provider  # noqa: E402
+from api.query_params import QueryParameters  # noqa: E402
+from api.tags.ocp.queries import OCPTagQueryHandler  # noqa: E402
+from api.tags.ocp.view import OCPTagView  # noqa: E402
+from masu.database import OCP_REPORT_TABLE_MAP  # noqa: E402
+from masu.database.ocp_report_db_accessor import OCPReportDBAccessor  # noqa: E402
+from reporting.models import OCPUsagePodLabelSummary  # noqa: E402
+from reporting.models import OCPUsageReportPeriod  # noqa: E402
+from reporting.models import TagCatalogKey  # noqa: E402
+from reporting.models import TagCatalogValue  # noqa: E402
+
+KEY_PREFIX = "benchmark-"
+QUERIES = {
+    "keys": ("?key_only=True", None),
+    "tags": ("?filter[type]=*", None),
+    "values": ("?filter[value]=val-1", f"{KEY_PREFIX}1"),
+}
+
+
+def populate(schema, keys, values):
+    """Add synthetic pod labels to the latest report period and to the tag catalog."""
+    with schema_context(schema):
+        report_period = OCPUsageReportPeriod.objects.order_by("-report_period_start").first()
+        if report_period is None:
+            sys.exit(f"{schema} has no OpenShift report periods.")
+        OCPUsagePodLabelSummary.objects.bulk_create(
+            (
+                OCPUsagePodLabelSummary(
+                    uuid=uuid.uuid4(),
+                    key=f"{KEY_PREFIX}{i}",
+                    values=[f"val-{j}" for j in range(values)],
+                    report_period=report_period,
+                    namespace="benchmark",
+                )
+                for i in range(keys)
+            ),
+            batch_size=5000,
+        )
+    with OCPReportDBAccessor(schema) as accessor:
+        accessor.populate_tag_catalog(
+            Provider.PROVIDER_OCP,
+            OCP_REPORT_TABLE_MAP["pod_label_summary"],
+            OCP_REPORT_TABLE_MAP["report_period"],
+            "report_period_id",
+            "report_period_start",
+            [report_period.id],
+            tag_type="pod",
+        )
+
+
+def cleanup(schema):
+    """Remove the synthetic pod labels."""
+    with schema_context(schema):
+        OCPUsagePodLabelSummary.objects.filter(key__startswith=KEY_PREFIX).delete()
+        TagCatalogValue.objects.filter(key__startswith=KEY_PREFIX).delete()
+        TagCatalogKey.objects.filter(key__startswith=KEY_PREFIX).delete()
+
+
+def run(schema, url, key, repeat):
+    """Return the median seconds of the tags query and the number of keys returned."""
+    timings = []
+    for _ in range(repeat):
+        request = RequestFactory().get(url)
+        request.user = SimpleNamespace(access=None, customer=SimpleNamespace(schema_name=schema))
+        query_params = QueryParameters(request, OCPTagView)
+        if key:
+            query_params.kwargs = {"key": key}
+        handler = OCPTagQueryHandler(query_params)
+        start = time.perf_counter()
+        output = handler.execute_query()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), len(output.get("data", []))
+
+
+def main():
+    """Run the benchmark."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--schema", default="acct10001")
+    arg_parser.add_argument("--keys", type=int, default=20000)
+    arg_parser.add_argument("--values", type=int, default=5)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    populate(args.schema, args.keys, args.values)
+    try:
+        for name, (url, key) in QUERIES.items():
+            for source, enabled in (("summary", False), ("catalog", True)):
+                with override_settings(TAG_CATALOG_ENABLED=enabled):
+                    elapsed, count = run(args.schema, url, key, args.repeat)
+                print(f"{name:>6} {source:>7}: {elapsed * 1000:10.1f} ms, {count} entries")
+    finally:
+        cleanup(args.schema)
+
+
+if __name__ == "__main__":
+    main()
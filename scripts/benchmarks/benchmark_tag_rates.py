@@ -0,0 +1,134 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Time tag-rate cost application against a seeded tenant.
+
+Usage:
+    python scripts/benchmarks/benchmark_tag_rates.py --schema acct10001 --cluster-id my-ocp-cluster-1 \\
+        --keys 10 --values 50
+
+Tag rates are generated from the pod and volume labels already present in the
+daily summary table. Each run happens in a transaction that is rolled back, so
+the tenant data is left untouched. The per-value implementation issued one
+UPDATE for every tag value (or every defaulted tag key); that count is
+reported next to the statements now issued.
+"""
+import argparse
+import os
+import sys
+import time
+
+import django
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../koku/")))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.db import transaction  # noqa: E402
+from tenant_schemas.utils import schema_context  # noqa: E402
+
+from api.utils import DateHelper  # noqa: E402
+from masu.database.ocp_report_db_accessor import OCPReportDBAccessor  # noqa: E402
+from reporting.provider.ocp.models import OCPUsageLineItemDailySummary  # noqa: E402
+
+METRICS = ["cpu_core_usage_per_hour", "memory_gb_request_per_hour", "storage_gb_usage_per_month"]
+
+
+class StatementCounter:
+    """Count the statements executed on the default connection."""
+
+    def __init__(self):
+        """Initialize the counter."""
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Count and execute the statement."""
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def collect_labels(schema, cluster_id, keys, values):
+    """Return {tag_key: [tag_value, ...]} from the labels in the daily summary table."""
+    labels = {}
+    with schema_context(schema):
+        rows = (
+            OCPUsageLineItemDailySummary.objects.filter(cluster_id=cluster_id)
+            .values_list("pod_labels", "volume_labels")
+            .distinct()
+        )
+        for pod_labels, volume_labels in rows.iterator(chunk_size=5000):
+            for label_dict in (pod_labels or {}, volume_labels or {}):
+                for key, value in label_dict.items():
+                    if key not in labels and len(labels) >= keys:
+                        continue
+                    key_values = labels.setdefault(key, [])
+                    if value not in key_values and len(key_values) < values:
+                        key_values.append(value)
+    return labels
+
+
+def build_rates(labels, default=False):
+    """Build infrastructure rates in the shape the cost model updater passes in."""
+    rates = {}
+    for metric in METRICS:
+        if default:
+            rates[metric] = {
+                key: {"default_value": "0.5000000000", "defined_keys": key_values[:1]}
+                for key, key_values in labels.items()
+            }
+        else:
+            rates[metric] = {
+                key: {value: "0.5000000000" for value in key_values} for key, key_values in labels.items()
+            }
+    return rates
+
+
+def legacy_statement_count(rates, default=False):
+    """Return the number of UPDATE statements the per-value implementation issued."""
+    if default:
+        return sum(len(tags) for tags in rates.values())
+    return sum(len(tag_values) for tags in rates.values() for tag_values in tags.values())
+
+
+def run(schema, cluster_id, method, rates, start_date, end_date):
+    """Run a populate method inside a rolled back transaction and return (seconds, statements)."""
+    counter = StatementCounter()
+    with OCPReportDBAccessor(schema) as accessor:
+        with transaction.atomic():
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                getattr(accessor, method)(rates, {}, start_date, end_date, cluster_id)
+                elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+    return elapsed, counter.count
+
+
+def main():
+    """Run the benchmark."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--schema", default="acct10001")
+    arg_parser.add_argument("--cluster-id", required=True)
+    arg_parser.add_argument("--keys", type=int, default=10, help="Maximum number of tag keys to rate.")
+    arg_parser.add_argument("--values", type=int, default=50, help="Maximum number of values per tag key.")
+    args = arg_parser.parse_args()
+
+    dh = DateHelper()
+    labels = collect_labels(args.schema, args.cluster_id, args.keys, args.values)
+    if not labels:
+        print(f"No labels found for cluster {args.cluster_id} in {args.schema}.")
+        return
+    print(f"Rating {len(labels)} tag keys and {sum(len(v) for v in labels.values())} tag values.")
+
+    for method, default in (("populate_tag_usage_costs", False), ("populate_tag_usage_default_costs", True)):
+        rates = build_rates(labels, default=default)
+        elapsed, statements = run(args.schema, args.cluster_id, method, rates, dh.this_month_start, dh.this_month_end)
+        print(
+            f"{method}: {elapsed:.2f}s, {statements} statements "
+            f"(per-value implementation: {legacy_statement_count(rates, default=default)} UPDATEs)"
+        )
+
+
+if __name__ == "__main__":
+    main()
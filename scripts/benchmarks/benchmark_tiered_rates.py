@@ -0,0 +1,111 @@
+#
+# Copyright 2021 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare charging tiered usage rates row by row in Python and over whole columns in SQL.
+
+Usage:
+    python scripts/benchmarks/benchmark_tiered_rates.py --schema acct10001 --cluster-id my-ocp-cluster-1
+
+Charges the CPU usage of a month of OpenShift daily summary rows with a 5 tier
+rate, once with OCPCostModelCostUpdater._calculate_variable_charge for every row
+and once with the tiered expressions populate_usage_costs runs in the database,
+then compares the charges. The database update is rolled back.
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+from decimal import Decimal
+
+import django
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../koku/")))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+django.setup()
+
+from django.db import transaction  # noqa: E402
+from tenant_schemas.utils import schema_context  # noqa: E402
+
+from api.utils import DateHelper  # noqa: E402
+from masu.database.ocp_report_db_accessor import OCPReportDBAccessor  # noqa: E402
+from masu.processor.ocp.ocp_cost_model_cost_updater import OCPCostModelCostUpdater  # noqa: E402
+from reporting.models import OCPUsageLineItemDailySummary  # noqa: E402
+
+TIERED_RATES = [
+    {"usage": {"usage_start": None, "usage_end": "0.5"}, "value": "0.50", "unit": "USD"},
+    {"usage": {"usage_start": "0.5", "usage_end": "1"}, "value": "0.40", "unit": "USD"},
+    {"usage": {"usage_start": "1", "usage_end": "2.5"}, "value": "0.30", "unit": "USD"},
+    {"usage": {"usage_start": "2.5", "usage_end": "5"}, "value": "0.20", "unit": "USD"},
+    {"usage": {"usage_start": "5", "usage_end": None}, "value": "0.10", "unit": "USD"},
+]
+
+
+def get_rows(schema, cluster_id, start_date, end_date):
+    """Return the (id, cpu usage) of the pod summary rows of a cluster."""
+    with schema_context(schema):
+        return list(
+            OCPUsageLineItemDailySummary.objects.filter(
+                cluster_id=cluster_id, usage_start__gte=start_date, usage_start__lte=end_date, data_source="Pod"
+            ).values_list("uuid", "pod_usage_cpu_core_hours")
+        )
+
+
+def charge_in_python(updater, rows):
+    """Return the charge of every row calculated one usage value at a time."""
+    rates = {"tiered_rates": TIERED_RATES}
+    return {
+        row_id: updater._calculate_variable_charge(usage or Decimal(0), copy.deepcopy(rates)) for row_id, usage in rows
+    }
+
+
+def charge_in_sql(updater, schema, cluster_id, start_date, end_date):
+    """Return the seconds the tiered update took and the charge of every row, rolling the update back."""
+    infrastructure_rates = {"cpu_core_usage_per_hour": updater._get_tier_schedule(copy.deepcopy(TIERED_RATES))}
+    with schema_context(schema):
+        with transaction.atomic():
+            start = time.perf_counter()
+            with OCPReportDBAccessor(schema) as accessor:
+                accessor.populate_usage_costs(infrastructure_rates, {}, start_date, end_date, cluster_id)
+            elapsed = time.perf_counter() - start
+            charges = dict(
+                OCPUsageLineItemDailySummary.objects.filter(
+                    cluster_id=cluster_id, usage_start__gte=start_date, usage_start__lte=end_date, data_source="Pod"
+                ).values_list("uuid", "infrastructure_usage_cost__cpu")
+            )
+            transaction.set_rollback(True)
+    return elapsed, charges
+
+
+def main():
+    """Run the benchmark."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--schema", default="acct10001")
+    arg_parser.add_argument("--cluster-id", required=True)
+    args = arg_parser.parse_args()
+
+    dh = DateHelper()
+    start_date = dh.this_month_start.date()
+    end_date = dh.this_month_end.date()
+    # The updater is only used for its tier calculations, which need no cost model
+    updater = OCPCostModelCostUpdater.__new__(OCPCostModelCostUpdater)
+
+    rows = get_rows(args.schema, args.cluster_id, start_date, end_date)
+    start = time.perf_counter()
+    python_charges = charge_in_python(updater, rows)
+    python_elapsed = time.perf_counter() - start
+    sql_elapsed, sql_charges = charge_in_sql(updater, args.schema, args.cluster_id, start_date, end_date)
+
+    max_difference = max(
+        (abs(Decimal(str(sql_charges[row_id])) - charge) for row_id, charge in python_charges.items()),
+        default=Decimal(0),
+    )
+    print(f"{len(rows)} summary rows, {len(TIERED_RATES)} tiers")
+    print(f"python per row (charges only): {python_elapsed * 1000:10.1f} ms")
+    print(f"sql tiered update:             {sql_elapsed * 1000:10.1f} ms")
+    print(f"largest charge difference:     {max_difference}")
+
+
+if __name__ == "__main__":
+    main()